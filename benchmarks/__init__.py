@@ -0,0 +1,8 @@
+"""
+Benchmarks, run from the repository root with the dev requirements installed:
+
+    python -m benchmarks.connect --help
+    python -m benchmarks.handshake --loop uvloop
+    python -m benchmarks.ip_address
+    python -m benchmarks.ssl_transport
+"""
@@ -0,0 +1,35 @@
+import anyio
+
+from python_socks.async_.anyio import Proxy as ProxyV1
+from python_socks.async_.anyio.v2 import Proxy as ProxyV2
+
+from ._common import Driver, Job, Sample, read_payload, run_worker, shares
+from ._servers import CHUNK_SIZE, HOST, REQUEST, TARGET_PORT
+
+
+async def _run(job: Job, proxy_cls) -> Sample:
+    proxy = proxy_cls.from_url(job.proxy_url, proxy_ssl=job.proxy_ssl)
+
+    async def connect():
+        return await proxy.connect(dest_host=HOST, dest_port=TARGET_PORT)
+
+    async def transfer(stream):
+        await stream.write_all(REQUEST.pack(job.payload))
+        return await read_payload(lambda: stream.read(CHUNK_SIZE), job.payload)
+
+    async def close(stream):
+        await stream.close()
+
+    sample = Sample(concurrency=job.concurrency)
+    start = anyio.current_time()
+    async with anyio.create_task_group() as tg:
+        for count in shares(job.connections, job.concurrency):
+            tg.start_soon(run_worker, sample, count, connect, transfer, close, job.payload)
+    sample.elapsed = anyio.current_time() - start
+    return sample
+
+
+DRIVERS = {
+    'anyio': Driver(run=lambda job: anyio.run(_run, job, ProxyV1), proxy_ssl=True),
+    'anyio_v2': Driver(run=lambda job: anyio.run(_run, job, ProxyV2), proxy_ssl=True),
+}
@@ -0,0 +1,60 @@
+import asyncio
+
+from python_socks.async_.asyncio import Proxy as ProxyV1
+from python_socks.async_.asyncio.v2 import Proxy as ProxyV2
+
+from ._common import Driver, Job, Sample, read_payload, run_worker, shares
+from ._servers import CHUNK_SIZE, HOST, REQUEST, TARGET_PORT
+
+
+async def _run(job: Job, connect, transfer, close) -> Sample:
+    sample = Sample(concurrency=job.concurrency)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(
+        *[
+            run_worker(sample, count, connect, transfer, close, job.payload)
+            for count in shares(job.connections, job.concurrency)
+        ]
+    )
+    sample.elapsed = loop.time() - start
+    return sample
+
+
+async def _run_v1(job: Job) -> Sample:
+    loop = asyncio.get_running_loop()
+    proxy = ProxyV1.from_url(job.proxy_url, loop=loop)
+
+    async def connect():
+        return await proxy.connect(dest_host=HOST, dest_port=TARGET_PORT)
+
+    async def transfer(sock):
+        await loop.sock_sendall(sock, REQUEST.pack(job.payload))
+        return await read_payload(lambda: loop.sock_recv(sock, CHUNK_SIZE), job.payload)
+
+    async def close(sock):
+        sock.close()
+
+    return await _run(job, connect, transfer, close)
+
+
+async def _run_v2(job: Job) -> Sample:
+    proxy = ProxyV2.from_url(job.proxy_url, proxy_ssl=job.proxy_ssl)
+
+    async def connect():
+        return await proxy.connect(dest_host=HOST, dest_port=TARGET_PORT)
+
+    async def transfer(stream):
+        await stream.write_all(REQUEST.pack(job.payload))
+        return await read_payload(lambda: stream.read(CHUNK_SIZE), job.payload)
+
+    async def close(stream):
+        await stream.close()
+
+    return await _run(job, connect, transfer, close)
+
+
+DRIVERS = {
+    'asyncio': Driver(run=lambda job: asyncio.run(_run_v1(job)), proxy_ssl=False),
+    'asyncio_v2': Driver(run=lambda job: asyncio.run(_run_v2(job)), proxy_ssl=True),
+}
@@ -0,0 +1,131 @@
+import math
+import ssl
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, NamedTuple, Optional
+
+
+class Job(NamedTuple):
+    proxy_url: str
+    proxy_ssl: Optional[ssl.SSLContext]
+    concurrency: int
+    connections: int
+    payload: int  # bytes each tunnel asks the target for, 0 to only measure handshakes
+
+
+class Driver(NamedTuple):
+    run: Callable[[Job], 'Sample']
+    proxy_ssl: bool  # whether it can connect to HTTPS proxies
+
+
+@dataclass
+class Sample:
+    """What a driver measured in a single run."""
+
+    concurrency: int
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)  # seconds per proxy.connect()
+    received: int = 0  # payload bytes read through the tunnels
+    # when the first payload transfer started and the last one ended
+    transfer_start: Optional[float] = None
+    transfer_end: Optional[float] = None
+    errors: int = 0
+    error: Optional[str] = None  # the first one
+
+    def add_error(self, e: BaseException):
+        self.errors += 1
+        if self.error is None:
+            self.error = repr(e)
+
+    def add_transfer(self, start: float, end: float, received: int):
+        self.received += received
+        if self.transfer_start is None or start < self.transfer_start:
+            self.transfer_start = start
+        if self.transfer_end is None or end > self.transfer_end:
+            self.transfer_end = end
+
+
+async def run_worker(
+    sample: Sample,
+    count: int,
+    connect: Callable[[], Awaitable],
+    transfer: Callable[[object], Awaitable[int]],
+    close: Callable[[object], Awaitable],
+    payload: int,
+):
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            conn = await connect()
+        except Exception as e:
+            sample.add_error(e)
+            continue
+        sample.latencies.append(time.perf_counter() - start)
+
+        try:
+            if payload:
+                start = time.perf_counter()
+                received = await transfer(conn)
+                sample.add_transfer(start, time.perf_counter(), received)
+        except Exception as e:
+            sample.add_error(e)
+        finally:
+            await close(conn)
+
+
+async def read_payload(recv: Callable[[], Awaitable[bytes]], size: int) -> int:
+    received = 0
+    while received < size:
+        data = await recv()
+        if not data:
+            raise ConnectionError('Connection closed by the target server')
+        received += len(data)
+    return received
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    k = max(math.ceil(p / 100 * len(values)) - 1, 0)
+    return values[k]
+
+
+def shares(total: int, workers: int) -> List[int]:
+    """Splits total jobs between workers as evenly as possible."""
+    workers = max(min(workers, total), 1)
+    q, r = divmod(total, workers)
+    return [q + 1 if i < r else q for i in range(workers)]
+
+
+def handshake_result(sample: Sample) -> dict:
+    ms = [v * 1000 for v in sample.latencies]
+    return {
+        'concurrency': sample.concurrency,
+        'connections': len(sample.latencies),
+        'errors': sample.errors,
+        'error': sample.error,
+        'elapsed_s': round(sample.elapsed, 6),
+        'connects_per_s': round(len(ms) / sample.elapsed, 2) if sample.elapsed else None,
+        'latency_p50_ms': _round(percentile(ms, 50)),
+        'latency_p99_ms': _round(percentile(ms, 99)),
+    }
+
+
+def throughput_result(sample: Sample) -> dict:
+    mib = sample.received / (1 << 20)
+    elapsed = 0.0
+    if sample.transfer_start is not None:
+        elapsed = sample.transfer_end - sample.transfer_start
+    return {
+        'tunnels': len(sample.latencies),
+        'errors': sample.errors,
+        'error': sample.error,
+        'received_mib': round(mib, 3),
+        'elapsed_s': round(elapsed, 6),
+        'throughput_mib_s': round(mib / elapsed, 2) if elapsed else None,
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 3)
@@ -0,0 +1,33 @@
+import curio
+
+from python_socks.async_.curio import Proxy
+
+from ._common import Driver, Job, Sample, read_payload, run_worker, shares
+from ._servers import CHUNK_SIZE, HOST, REQUEST, TARGET_PORT
+
+
+async def _run(job: Job) -> Sample:
+    proxy = Proxy.from_url(job.proxy_url)
+
+    async def connect():
+        return await proxy.connect(dest_host=HOST, dest_port=TARGET_PORT)
+
+    async def transfer(sock):
+        await sock.sendall(REQUEST.pack(job.payload))
+        return await read_payload(lambda: sock.recv(CHUNK_SIZE), job.payload)
+
+    async def close(sock):
+        await sock.close()
+
+    sample = Sample(concurrency=job.concurrency)
+    start = await curio.clock()
+    async with curio.TaskGroup() as g:
+        for count in shares(job.connections, job.concurrency):
+            await g.spawn(run_worker, sample, count, connect, transfer, close, job.payload)
+    sample.elapsed = await curio.clock() - start
+    return sample
+
+
+DRIVERS = {
+    'curio': Driver(run=lambda job: curio.run(_run, job), proxy_ssl=False),
+}
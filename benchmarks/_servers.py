@@ -0,0 +1,181 @@
+"""
+Local tiny_proxy servers and a target server to tunnel to,
+each running in a process of its own.
+"""
+import asyncio
+import contextlib
+import logging
+import ssl
+import struct
+import tempfile
+import typing
+from multiprocessing import Process
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from tests.utils import wait_until_connectable
+
+HOST = '127.0.0.1'
+LOGIN = 'bench'
+PASSWORD = 'bench'
+
+TARGET_PORT = 17790
+TARGET_TLS_PORT = 17791
+
+# the target server sends back as many bytes as a client asks for with this header
+REQUEST = struct.Struct('!Q')
+CHUNK_SIZE = 65536
+
+
+class ProxyConfig(typing.NamedTuple):
+    proxy_type: str
+    port: int
+    url: str
+    ssl: bool = False
+
+
+PROXIES = {
+    'socks4': ProxyConfig('socks4', 17780, f'socks4://{LOGIN}:@{HOST}:17780'),
+    'socks5': ProxyConfig('socks5', 17781, f'socks5://{LOGIN}:{PASSWORD}@{HOST}:17781'),
+    'http': ProxyConfig('http', 17782, f'http://{LOGIN}:{PASSWORD}@{HOST}:17782'),
+    'https': ProxyConfig('http', 17783, f'http://{LOGIN}:{PASSWORD}@{HOST}:17783', ssl=True),
+}
+
+
+def raise_open_files_limit():
+    # every tunnel takes two descriptors on the proxy side and one on the client side
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def _serve_proxy(proxy_type: str, port: int, certfile=None, keyfile=None):
+    import anyio
+    from anyio.streams.tls import TLSListener
+    from tiny_proxy import HttpProxyHandler, Socks4ProxyHandler, Socks5ProxyHandler
+
+    raise_open_files_limit()
+    # failed handshakes under load are counted by the drivers, not logged here
+    logging.disable(logging.CRITICAL)
+
+    if proxy_type == 'socks4':
+        handler = Socks4ProxyHandler(username=LOGIN)
+    elif proxy_type == 'socks5':
+        handler = Socks5ProxyHandler(username=LOGIN, password=PASSWORD)
+    else:
+        handler = HttpProxyHandler(username=LOGIN, password=PASSWORD)
+
+    async def serve():
+        listener = await anyio.create_tcp_listener(local_host=HOST, local_port=port, backlog=4096)
+        if certfile is not None:
+            ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            ssl_context.load_cert_chain(certfile, keyfile)
+            listener = TLSListener(listener=listener, ssl_context=ssl_context)
+
+        async with listener:
+            await listener.serve(handler.handle)
+
+    anyio.run(serve)
+
+
+def _serve_target(port: int, certfile=None, keyfile=None):
+    raise_open_files_limit()
+    chunk = bytes(CHUNK_SIZE)
+
+    ssl_context = None
+    if certfile is not None:
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ssl_context.load_cert_chain(certfile, keyfile)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                (size,) = REQUEST.unpack(await reader.readexactly(REQUEST.size))
+                while size > 0:
+                    n = min(size, CHUNK_SIZE)
+                    writer.write(chunk[:n])
+                    await writer.drain()
+                    size -= n
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve():
+        server = await asyncio.start_server(handle, HOST, port, backlog=4096, ssl=ssl_context)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+class Servers:
+    def __init__(self, proxies: typing.Iterable[str], tls_target: bool = False):
+        self.proxies = list(proxies)
+        self.tls_target = tls_target  # also serve the target over TLS on TARGET_TLS_PORT
+        # both trust the certificate of the proxies and of the TLS target
+        self.proxy_ssl: typing.Optional[ssl.SSLContext] = None
+        self.target_ssl: typing.Optional[ssl.SSLContext] = None
+        self._workers: typing.List[Process] = []
+        self._stack = contextlib.ExitStack()
+
+    def start(self):
+        certfile = keyfile = None
+        if self.tls_target or any(PROXIES[name].ssl for name in self.proxies):
+            certfile, keyfile = self._create_certificate()
+
+        self._spawn(_serve_target, port=TARGET_PORT)
+        if self.tls_target:
+            self._spawn(_serve_target, port=TARGET_TLS_PORT, certfile=certfile, keyfile=keyfile)
+        for name in self.proxies:
+            config = PROXIES[name]
+            kwargs = dict(proxy_type=config.proxy_type, port=config.port)
+            if config.ssl:
+                kwargs.update(certfile=certfile, keyfile=keyfile)
+            self._spawn(_serve_proxy, **kwargs)
+
+        wait_until_connectable(HOST, TARGET_PORT)
+        if self.tls_target:
+            wait_until_connectable(HOST, TARGET_TLS_PORT)
+        for name in self.proxies:
+            wait_until_connectable(HOST, PROXIES[name].port)
+
+    def stop(self):
+        for p in self._workers:
+            p.terminate()
+        for p in self._workers:
+            p.join()
+        self._stack.close()
+
+    def __enter__(self) -> 'Servers':
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _spawn(self, target, **kwargs):
+        p = Process(target=target, kwargs=kwargs, daemon=True)
+        p.start()
+        self._workers.append(p)
+
+    def _create_certificate(self):
+        import trustme
+
+        ca = trustme.CA()
+        cert = ca.issue_cert('localhost', HOST)
+        directory = self._stack.enter_context(tempfile.TemporaryDirectory())
+        certfile = f'{directory}/cert.pem'
+        keyfile = f'{directory}/key.pem'
+        cert.cert_chain_pems[0].write_to_path(certfile)
+        cert.private_key_pem.write_to_path(keyfile)
+
+        self.proxy_ssl = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        ca.configure_trust(self.proxy_ssl)
+        self.target_ssl = self.proxy_ssl
+        return certfile, keyfile
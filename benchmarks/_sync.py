@@ -0,0 +1,84 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from python_socks.sync import Proxy as ProxyV1
+from python_socks.sync.v2 import Proxy as ProxyV2
+
+from ._common import Driver, Job, Sample, shares
+from ._servers import CHUNK_SIZE, HOST, REQUEST, TARGET_PORT
+
+# one thread per connection in flight, tens of thousands of them
+# would measure the scheduler rather than the library
+MAX_THREADS = 1024
+
+
+def _read_payload(recv, size: int) -> int:
+    received = 0
+    while received < size:
+        data = recv(CHUNK_SIZE)
+        if not data:
+            raise ConnectionError('Connection closed by the target server')
+        received += len(data)
+    return received
+
+
+def _run(job: Job, proxy, send, recv) -> Sample:
+    sample = Sample(concurrency=min(job.concurrency, MAX_THREADS))
+    lock = threading.Lock()
+
+    def worker(count: int):
+        for _ in range(count):
+            start = time.perf_counter()
+            try:
+                conn = proxy.connect(dest_host=HOST, dest_port=TARGET_PORT)
+            except Exception as e:
+                with lock:
+                    sample.add_error(e)
+                continue
+            latency = time.perf_counter() - start
+
+            with lock:
+                sample.latencies.append(latency)
+
+            try:
+                if job.payload:
+                    start = time.perf_counter()
+                    send(conn, REQUEST.pack(job.payload))
+                    received = _read_payload(lambda n: recv(conn, n), job.payload)
+                    with lock:
+                        sample.add_transfer(start, time.perf_counter(), received)
+            except Exception as e:
+                with lock:
+                    sample.add_error(e)
+            finally:
+                conn.close()
+
+    counts = shares(job.connections, sample.concurrency)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(counts)) as executor:
+        for future in [executor.submit(worker, count) for count in counts]:
+            future.result()
+    sample.elapsed = time.perf_counter() - start
+    return sample
+
+
+def _run_v1(job: Job) -> Sample:
+    proxy = ProxyV1.from_url(job.proxy_url)
+    return _run(job, proxy, send=lambda s, data: s.sendall(data), recv=lambda s, n: s.recv(n))
+
+
+def _run_v2(job: Job) -> Sample:
+    proxy = ProxyV2.from_url(job.proxy_url, proxy_ssl=job.proxy_ssl)
+    return _run(
+        job,
+        proxy,
+        send=lambda stream, data: stream.write_all(data),
+        recv=lambda stream, n: stream.read(n),
+    )
+
+
+DRIVERS = {
+    'sync': Driver(run=_run_v1, proxy_ssl=False),
+    'sync_v2': Driver(run=_run_v2, proxy_ssl=True),
+}
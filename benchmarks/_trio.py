@@ -0,0 +1,58 @@
+import trio
+
+from python_socks.async_.trio import Proxy as ProxyV1
+from python_socks.async_.trio.v2 import Proxy as ProxyV2
+
+from ._common import Driver, Job, Sample, read_payload, run_worker, shares
+from ._servers import CHUNK_SIZE, HOST, REQUEST, TARGET_PORT
+
+
+async def _run(job: Job, connect, transfer, close) -> Sample:
+    sample = Sample(concurrency=job.concurrency)
+    start = trio.current_time()
+    async with trio.open_nursery() as nursery:
+        for count in shares(job.connections, job.concurrency):
+            nursery.start_soon(run_worker, sample, count, connect, transfer, close, job.payload)
+    sample.elapsed = trio.current_time() - start
+    return sample
+
+
+async def _run_v1(job: Job) -> Sample:
+    proxy = ProxyV1.from_url(job.proxy_url)
+
+    async def connect():
+        return await proxy.connect(dest_host=HOST, dest_port=TARGET_PORT)
+
+    async def transfer(sock):
+        data = REQUEST.pack(job.payload)
+        while data:
+            sent = await sock.send(data)
+            data = data[sent:]
+        return await read_payload(lambda: sock.recv(CHUNK_SIZE), job.payload)
+
+    async def close(sock):
+        sock.close()
+
+    return await _run(job, connect, transfer, close)
+
+
+async def _run_v2(job: Job) -> Sample:
+    proxy = ProxyV2.from_url(job.proxy_url, proxy_ssl=job.proxy_ssl)
+
+    async def connect():
+        return await proxy.connect(dest_host=HOST, dest_port=TARGET_PORT)
+
+    async def transfer(stream):
+        await stream.write_all(REQUEST.pack(job.payload))
+        return await read_payload(lambda: stream.read(CHUNK_SIZE), job.payload)
+
+    async def close(stream):
+        await stream.close()
+
+    return await _run(job, connect, transfer, close)
+
+
+DRIVERS = {
+    'trio': Driver(run=lambda job: trio.run(_run_v1, job), proxy_ssl=False),
+    'trio_v2': Driver(run=lambda job: trio.run(_run_v2, job), proxy_ssl=True),
+}
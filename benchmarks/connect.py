@@ -0,0 +1,165 @@
+"""
+Handshake latency and tunnel throughput of every backend
+against local SOCKS4, SOCKS5, HTTP and HTTPS proxies.
+
+    python -m benchmarks.connect --backend asyncio_v2 --backend trio \\
+        --concurrency 1,100,10000 --output results.json
+
+For each backend, proxy and concurrency level, `connections` tunnels
+(at least one per concurrent worker) are opened and closed right away
+to measure connects/s and p50/p99 handshake latency. Then one tunnel
+per worker downloads `payload` bytes from the target server to measure
+throughput. Results are written as JSON so that runs can be compared.
+"""
+import argparse
+import datetime
+import importlib
+import json
+import platform
+import sys
+from typing import Dict
+
+import python_socks
+
+from ._common import Driver, Job, handshake_result, throughput_result
+from ._servers import PROXIES, Servers, raise_open_files_limit
+
+BACKEND_MODULES = {
+    'asyncio': '._asyncio',
+    'asyncio_v2': '._asyncio',
+    'trio': '._trio',
+    'trio_v2': '._trio',
+    'anyio': '._anyio',
+    'anyio_v2': '._anyio',
+    'curio': '._curio',
+    'sync': '._sync',
+    'sync_v2': '._sync',
+}
+
+DEFAULT_CONCURRENCY = '1,10,100,1000,10000'
+DEFAULT_CONNECTIONS = 1000
+DEFAULT_PAYLOAD = 1 << 20
+
+
+def load_drivers(backends) -> Dict[str, Driver]:
+    drivers = {}
+    for backend in backends:
+        try:
+            module = importlib.import_module(BACKEND_MODULES[backend], __package__)
+        except ImportError as e:
+            print(f'Skipping {backend}: {e}', file=sys.stderr)
+            continue
+        drivers[backend] = module.DRIVERS[backend]
+    return drivers
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.connect',
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        '--backend',
+        action='append',
+        choices=list(BACKEND_MODULES),
+        help='backend to run, can be repeated (default: all installed)',
+    )
+    parser.add_argument(
+        '--proxy',
+        action='append',
+        choices=list(PROXIES),
+        help='proxy type to run against, can be repeated (default: all)',
+    )
+    parser.add_argument(
+        '--concurrency',
+        default=DEFAULT_CONCURRENCY,
+        help=f'comma separated concurrency levels (default: {DEFAULT_CONCURRENCY})',
+    )
+    parser.add_argument(
+        '--connections',
+        type=int,
+        default=DEFAULT_CONNECTIONS,
+        help=f'handshakes per concurrency level (default: {DEFAULT_CONNECTIONS})',
+    )
+    parser.add_argument(
+        '--payload',
+        type=int,
+        default=DEFAULT_PAYLOAD,
+        help=f'bytes per tunnel for throughput, 0 to skip (default: {DEFAULT_PAYLOAD})',
+    )
+    parser.add_argument('--output', help='JSON file to write results to (default: stdout)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    drivers = load_drivers(args.backend or list(BACKEND_MODULES))
+    proxies = args.proxy or list(PROXIES)
+    levels = [int(v) for v in args.concurrency.split(',')]
+
+    raise_open_files_limit()
+
+    results = []
+    with Servers(proxies) as servers:
+        for backend, driver in drivers.items():
+            for name in proxies:
+                config = PROXIES[name]
+                if config.ssl and not driver.proxy_ssl:
+                    continue
+
+                proxy_ssl = servers.proxy_ssl if config.ssl else None
+                for concurrency in levels:
+                    job = Job(
+                        proxy_url=config.url,
+                        proxy_ssl=proxy_ssl,
+                        concurrency=concurrency,
+                        connections=max(args.connections, concurrency),
+                        payload=0,
+                    )
+                    result = {'backend': backend, 'proxy': name}
+                    result.update(handshake_result(driver.run(job)))
+
+                    if args.payload:
+                        job = job._replace(connections=concurrency, payload=args.payload)
+                        result['throughput'] = throughput_result(driver.run(job))
+
+                    _report(result)
+                    results.append(result)
+
+    report = {
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'python_socks': python_socks.__version__,
+        'connections': args.connections,
+        'payload': args.payload,
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+def _report(result: dict):
+    line = (
+        f"{result['backend']:<11}{result['proxy']:<8}c={result['concurrency']:<6}"
+        f"{result['connects_per_s'] or 0:>10.1f} conn/s"
+        f"  p50 {result['latency_p50_ms'] or 0:>8.2f} ms"
+        f"  p99 {result['latency_p99_ms'] or 0:>8.2f} ms"
+    )
+    throughput = result.get('throughput')
+    if throughput is not None:
+        line += f"  {throughput['throughput_mib_s'] or 0:>9.1f} MiB/s"
+    if result['errors']:
+        line += f"  errors: {result['errors']} ({result['error']})"
+    print(line, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+"""
+CPU cost of the proxy handshake with the asyncio APIs, on the asyncio
+event loop or on uvloop, comparing how the handshake is driven:
+
+    v1            loop.sock_recv_into()/sock_sendall() on the socket
+    v1_protocol   an exact BufferedProtocol over a duplicate of the socket
+    v2            StreamReader/StreamWriter (Proxy.connect)
+    v2_protocol   the BufferedProtocol of Proxy.create_connection
+
+    python -m benchmarks.handshake --loop uvloop --concurrency 1,100
+
+v1 hands the socket itself over to the caller, so v1_protocol may not
+receive a byte past each proxy reply: its transport only reads while a
+reply is awaited, and no more than is missing. It is not used by the
+library, being slower than v1 (see the results), and kept here only to
+be measured.
+
+Each round opens and closes `connections` tunnels to the target server,
+`concurrency` at a time, with each implementation in turn. The best of
+`rounds` is kept, both of connects/s and of the CPU time the client
+spent per connect (the proxy being Python too, it may bound connects/s).
+"""
+import argparse
+import asyncio
+import socket
+import sys
+import time
+from typing import Callable, Dict, Tuple
+
+from python_socks.async_.asyncio import Proxy as ProxyV1
+from python_socks.async_.asyncio._connect import connect_tcp
+from python_socks.async_.asyncio.v2 import Proxy as ProxyV2
+from python_socks.async_.asyncio.v2._transport import HandshakeProtocol
+from python_socks._connectors.factory_async import create_connector
+from python_socks._errors import ProxyError
+
+from ._common import shares
+from ._servers import HOST, PROXIES, TARGET_PORT, Servers, raise_open_files_limit
+
+DEFAULT_PROXY = 'socks5'
+DEFAULT_CONCURRENCY = '1,100'
+DEFAULT_CONNECTIONS = 2000
+DEFAULT_ROUNDS = 5
+
+
+class ExactHandshakeProtocol(HandshakeProtocol):
+    """Receives no byte past those a pending receive() waits for."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, sock: socket.socket):
+        super().__init__(loop)
+        self._sock = sock  # that of the transport, read from while the transport does not
+        self._transport = None
+
+    def connection_made(self, transport):
+        self._transport = transport
+        transport.pause_reading()
+
+    def get_buffer(self, sizehint):
+        return self.buffer.writable()[:self._wanted - len(self.buffer)]
+
+    def buffer_updated(self, nbytes):
+        self.buffer.commit(nbytes)
+        if len(self.buffer) >= self._wanted:
+            self._transport.pause_reading()
+            self._wakeup()
+
+    async def receive(self, n: int):
+        # what has already arrived is read without going through the loop
+        while len(self.buffer) < n and not self.at_eof:
+            try:
+                received = self._sock.recv_into(self.buffer.writable()[:n - len(self.buffer)])
+            except (BlockingIOError, InterruptedError):
+                break
+            if not received:
+                self.eof = True
+            self.buffer.commit(received)
+
+        while len(self.buffer) < n and not self.at_eof:
+            self._wanted = n
+            self._transport.resume_reading()
+            self._waiter = self._loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+                self._wanted = 0
+                if not self.lost:
+                    self._transport.pause_reading()
+
+        if self.exc is not None and len(self.buffer) < n:
+            raise self.exc
+
+
+class ProtocolStream:
+    """The v1 stream over a transport of its own, on a duplicate of the socket."""
+
+    def __init__(self, transport: asyncio.Transport, protocol: ExactHandshakeProtocol):
+        self._transport = transport
+        self._protocol = protocol
+
+    @classmethod
+    async def open(cls, sock: socket.socket, loop: asyncio.AbstractEventLoop):
+        dup = sock.dup()
+        protocol = ExactHandshakeProtocol(loop, sock=dup)
+        try:
+            transport, _ = await loop.create_connection(lambda: protocol, sock=dup)
+        except BaseException:
+            dup.close()
+            raise
+        return cls(transport, protocol)
+
+    async def write_all(self, data):
+        self._transport.write(data)
+        await self._protocol.drain()
+
+    async def read(self, max_bytes=65536):
+        await self._protocol.receive(1)
+        return bytes(self._protocol.buffer.take(max_bytes))
+
+    async def read_exact(self, n):
+        await self._protocol.receive(n)
+        if len(self._protocol.buffer) < n:
+            raise ProxyError('Connection closed unexpectedly')
+        return self._protocol.buffer.take(n)
+
+    async def close(self):
+        self._transport.abort()  # the duplicate only
+
+
+class ProtocolProxyV1(ProxyV1):
+    async def _connect(self, dest_host, dest_port, _socket=None, local_addr=None):
+        sock = await connect_tcp(
+            host=self._proxy_host,
+            port=self._proxy_port,
+            loop=self._loop,
+            resolver=self._resolver,
+            happy_eyeballs_delay=self._happy_eyeballs_delay,
+        )
+        try:
+            stream = await ProtocolStream.open(sock, self._loop)
+        except BaseException:
+            sock.close()
+            raise
+
+        connector = create_connector(
+            proxy_type=self._proxy_type,
+            username=self._username,
+            password=self._password,
+            rdns=self._rdns,
+            resolver=self._resolver,
+            pipeline=self._pipeline,
+            tracer=self._tracer,
+        )
+        try:
+            await connector.connect(stream=stream, host=dest_host, port=dest_port)
+        except BaseException:
+            sock.close()
+            raise
+        finally:
+            await stream.close()
+        return sock
+
+
+def _v1(proxy_cls):
+    def create(url: str):
+        proxy = proxy_cls.from_url(url, loop=asyncio.get_running_loop())
+
+        async def connect():
+            sock = await proxy.connect(dest_host=HOST, dest_port=TARGET_PORT)
+            sock.close()
+
+        return connect
+
+    return create
+
+
+def _v2(url: str):
+    proxy = ProxyV2.from_url(url)
+
+    async def connect():
+        stream = await proxy.connect(dest_host=HOST, dest_port=TARGET_PORT)
+        await stream.close()
+
+    return connect
+
+
+def _v2_protocol(url: str):
+    proxy = ProxyV2.from_url(url)
+
+    async def connect():
+        transport, _ = await proxy.create_connection(asyncio.Protocol, HOST, TARGET_PORT)
+        transport.abort()
+
+    return connect
+
+
+IMPLEMENTATIONS: Dict[str, Callable] = {
+    'v1': _v1(ProxyV1),
+    'v1_protocol': _v1(ProtocolProxyV1),
+    'v2': _v2,
+    'v2_protocol': _v2_protocol,
+}
+
+
+async def handshakes(create, url: str, concurrency: int, connections: int) -> Tuple[float, float]:
+    """Connects/s and client CPU microseconds per connect."""
+    connect = create(url)
+
+    async def worker(count):
+        for _ in range(count):
+            await connect()
+
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    await asyncio.gather(*[worker(count) for count in shares(connections, concurrency)])
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    return connections / elapsed, cpu / connections * 1e6
+
+
+def get_runner(loop: str):
+    if loop == 'uvloop':
+        import uvloop
+
+        return uvloop.run
+    return asyncio.run
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.handshake',
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        '--loop',
+        choices=['asyncio', 'uvloop'],
+        default='asyncio',
+        help='event loop to run on (default: asyncio)',
+    )
+    parser.add_argument(
+        '--proxy',
+        choices=[name for name, config in PROXIES.items() if not config.ssl],
+        default=DEFAULT_PROXY,
+        help=f'proxy type to run against (default: {DEFAULT_PROXY})',
+    )
+    parser.add_argument(
+        '--concurrency',
+        default=DEFAULT_CONCURRENCY,
+        help=f'comma separated concurrency levels (default: {DEFAULT_CONCURRENCY})',
+    )
+    parser.add_argument(
+        '--connections',
+        type=int,
+        default=DEFAULT_CONNECTIONS,
+        help=f'handshakes per round (default: {DEFAULT_CONNECTIONS})',
+    )
+    parser.add_argument(
+        '--rounds',
+        type=int,
+        default=DEFAULT_ROUNDS,
+        help=f'rounds per implementation (default: {DEFAULT_ROUNDS})',
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        run = get_runner(args.loop)
+    except ImportError as e:
+        print(f'Skipping {args.loop}: {e}', file=sys.stderr)
+        return
+
+    raise_open_files_limit()
+    url = PROXIES[args.proxy].url
+    levels = [int(v) for v in args.concurrency.split(',')]
+
+    with Servers([args.proxy]):
+        for concurrency in levels:
+            connections = max(args.connections, concurrency)
+            rate = {name: 0.0 for name in IMPLEMENTATIONS}
+            cpu = {name: float('inf') for name in IMPLEMENTATIONS}
+            for _ in range(args.rounds):
+                for name, create in IMPLEMENTATIONS.items():
+                    conn_s, cpu_us = run(handshakes(create, url, concurrency, connections))
+                    rate[name] = max(rate[name], conn_s)
+                    cpu[name] = min(cpu[name], cpu_us)
+
+            print(
+                f'{args.loop}, {args.proxy}, concurrency {concurrency}\n'
+                f'{"":<14}{"conn/s":>10}{"CPU us/conn":>14}',
+                file=sys.stderr,
+            )
+            for name in IMPLEMENTATIONS:
+                print(f'{name:<14}{rate[name]:>10.0f}{cpu[name]:>14.1f}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Micro-benchmark of IP address detection: the former regex + ipaddress
+implementation against parse_ip_address (inet_pton + LRU).
+
+    python -m benchmarks.ip_address
+"""
+import ipaddress
+import re
+import timeit
+
+from python_socks._helpers import parse_ip_address, _parse_ip_address  # noqa
+from python_socks._protocols import socks5
+
+_ipv4_regex = re.compile(
+    r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}'
+    r'(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
+)
+_ipv6_regex = re.compile(
+    r'^(?:(?:(?:[A-F0-9]{1,4}:){6}|(?=(?:[A-F0-9]{0,4}:){0,6}'
+    r'(?:[0-9]{1,3}\.){3}[0-9]{1,3}$)(([0-9A-F]{1,4}:){0,5}|:)'
+    r'((:[0-9A-F]{1,4}){1,5}:|:)|::(?:[A-F0-9]{1,4}:){5})'
+    r'(?:(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])\.){3}'
+    r'(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])|(?:[A-F0-9]{1,4}:){7}'
+    r'[A-F0-9]{1,4}|(?=(?:[A-F0-9]{0,4}:){0,7}[A-F0-9]{0,4}$)'
+    r'(([0-9A-F]{1,4}:){1,7}|:)((:[0-9A-F]{1,4}){1,7}|:)|(?:[A-F0-9]{1,4}:){7}'
+    r':|:(:[A-F0-9]{1,4}){7})$',
+    flags=re.IGNORECASE,
+)
+
+HOSTS = {
+    'ipv4': '93.184.216.34',
+    'ipv6': '2606:2800:220:1:248:1893:25c8:1946',
+    'hostname': 'www.example.com',
+}
+
+NUMBER = 200_000
+
+
+def regex_classify(host):
+    # is_ip_address() in the connector, then again in ConnectRequest,
+    # followed by ipaddress.ip_address() to get the packed form
+    for _ in range(2):
+        is_ip = bool(_ipv4_regex.match(host)) or bool(_ipv6_regex.match(host))
+    if is_ip:
+        return ipaddress.ip_address(host).packed
+    return None
+
+
+def inet_pton_classify(host):
+    for _ in range(2):
+        ip = parse_ip_address(host)
+    return ip
+
+
+def main():
+    print(f'{"host":<10}{"regex, us":>12}{"inet_pton, us":>16}{"cold, us":>12}{"speedup":>10}')
+    for name, host in HOSTS.items():
+        regex = timeit.timeit(lambda: regex_classify(host), number=NUMBER)
+        cached = timeit.timeit(lambda: inet_pton_classify(host), number=NUMBER)
+
+        def cold():
+            _parse_ip_address.cache_clear()
+            inet_pton_classify(host)
+
+        uncached = timeit.timeit(cold, number=NUMBER)
+
+        print(
+            f'{name:<10}'
+            f'{regex / NUMBER * 1e6:>12.3f}'
+            f'{cached / NUMBER * 1e6:>16.3f}'
+            f'{uncached / NUMBER * 1e6:>12.3f}'
+            f'{regex / cached:>9.1f}x'
+        )
+
+    request = socks5.ConnectRequest(host=HOSTS['ipv6'], port=443)
+    dumps = timeit.timeit(request.dumps, number=NUMBER)
+    print(f'\nsocks5.ConnectRequest.dumps() for IPv6: {dumps / NUMBER * 1e6:.3f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Throughput of TLS-in-TLS tunnels with the sync v2 API: an HTTPS proxy
+and a TLS target, the inner connection running over SSLTransport.
+Compares the I/O loop as copied from urllib3 with the current one.
+
+    python -m benchmarks.ssl_transport --payload 268435456
+
+Each round downloads `payload` bytes from the target through a single
+tunnel, with each implementation in turn. The best of `rounds` is kept,
+both of MiB/s and of the CPU time the client spent per GiB received
+(the proxy and the target, being Python too, may bound MiB/s).
+"""
+import argparse
+import ssl
+import sys
+import time
+from typing import Tuple
+from unittest import mock
+
+from python_socks.sync.v2 import Proxy
+from python_socks.sync.v2 import _stream
+from python_socks.sync.v2._ssl_transport import SSL_BLOCKSIZE, SSLTransport
+
+from ._servers import CHUNK_SIZE, HOST, PROXIES, REQUEST, TARGET_TLS_PORT, Servers
+
+DEFAULT_PAYLOAD = 1 << 28
+DEFAULT_ROUNDS = 5
+
+
+class LegacySSLTransport(SSLTransport):
+    """The I/O loop as copied from urllib3, for comparison."""
+
+    def sendall(self, data, flags=0):
+        count = 0
+        with memoryview(data) as view, view.cast('B') as byte_view:
+            amount = len(byte_view)
+            while count < amount:
+                count += self.send(byte_view[count:])
+
+    def send(self, data, flags=0):
+        return self._ssl_io_loop(self.sslobj.write, data)
+
+    def _ssl_io_loop(self, func, *args, flush=True):
+        should_loop = True
+        ret = None
+
+        while should_loop:
+            errno = None
+            try:
+                ret = func(*args)
+            except ssl.SSLError as e:
+                if e.errno not in (ssl.SSL_ERROR_WANT_READ, ssl.SSL_ERROR_WANT_WRITE):
+                    raise e
+                errno = e.errno
+
+            buf = self.outgoing.read()
+            self.socket.sendall(buf)
+
+            if errno is None:
+                should_loop = False
+            elif errno == ssl.SSL_ERROR_WANT_READ:
+                buf = self.socket.recv(SSL_BLOCKSIZE)
+                if buf:
+                    self.incoming.write(buf)
+                else:
+                    self.incoming.write_eof()
+        return ret
+
+
+IMPLEMENTATIONS = {
+    'before': LegacySSLTransport,
+    'after': SSLTransport,
+}
+
+
+def download(servers: Servers, transport_cls, payload: int) -> Tuple[float, float]:
+    """MiB/s and client CPU seconds per GiB of one download through a TLS-in-TLS tunnel."""
+    proxy = Proxy.from_url(PROXIES['https'].url, proxy_ssl=servers.proxy_ssl)
+    with mock.patch.object(_stream, 'SSLTransport', transport_cls):
+        stream = proxy.connect(
+            dest_host=HOST,
+            dest_port=TARGET_TLS_PORT,
+            dest_ssl=servers.target_ssl,
+        )
+
+    try:
+        assert isinstance(stream.socket, transport_cls)
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        stream.write_all(REQUEST.pack(payload))
+        received = 0
+        while received < payload:
+            data = stream.read(CHUNK_SIZE)
+            if not data:
+                raise ConnectionError('Connection closed by the target server')
+            received += len(data)
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+    finally:
+        stream.close()
+
+    return received / (1 << 20) / elapsed, cpu / (received / (1 << 30))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.ssl_transport',
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        '--payload',
+        type=int,
+        default=DEFAULT_PAYLOAD,
+        help=f'bytes per download (default: {DEFAULT_PAYLOAD})',
+    )
+    parser.add_argument(
+        '--rounds',
+        type=int,
+        default=DEFAULT_ROUNDS,
+        help=f'downloads per implementation (default: {DEFAULT_ROUNDS})',
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    throughput = {name: 0.0 for name in IMPLEMENTATIONS}
+    cpu = {name: float('inf') for name in IMPLEMENTATIONS}
+
+    with Servers(['https'], tls_target=True) as servers:
+        for _ in range(args.rounds):
+            for name, transport_cls in IMPLEMENTATIONS.items():
+                mib_s, cpu_s = download(servers, transport_cls, args.payload)
+                throughput[name] = max(throughput[name], mib_s)
+                cpu[name] = min(cpu[name], cpu_s)
+
+    print(f'{"":<10}{"MiB/s":>10}{"CPU s/GiB":>12}', file=sys.stderr)
+    for name in IMPLEMENTATIONS:
+        print(f'{name:<10}{throughput[name]:>10.1f}{cpu[name]:>12.3f}', file=sys.stderr)
+    print(
+        f'{"ratio":<10}{throughput["after"] / throughput["before"]:>10.2f}'
+        f'{cpu["after"] / cpu["before"]:>12.2f}',
+        file=sys.stderr,
+    )
+
+
+if __name__ == '__main__':
+    main()
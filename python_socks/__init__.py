@@ -2,11 +2,18 @@ from ._version import __version__, __title__
 
 from ._types import ProxyType
 from ._helpers import parse_proxy_url
+from ._trace import TraceConfig, TraceEvent, TracePhase
+from ._deadline import PhaseTimeouts
+from ._source_address import SourceAddressPool
+from ._socket_options import DEFAULT_SOCKET_OPTIONS, keepalive_options
+from ._ktls import KTLSState
+from ._tls_sessions import TLSSessionCache
 
 from ._errors import (
     ProxyError,
     ProxyTimeoutError,
     ProxyConnectionError,
+    PortExhaustionError,
 )
 
 __all__ = (
@@ -15,6 +22,16 @@ __all__ = (
     'ProxyError',
     'ProxyTimeoutError',
     'ProxyConnectionError',
+    'PortExhaustionError',
     'ProxyType',
     'parse_proxy_url',
+    'TraceConfig',
+    'TraceEvent',
+    'TracePhase',
+    'PhaseTimeouts',
+    'SourceAddressPool',
+    'DEFAULT_SOCKET_OPTIONS',
+    'keepalive_options',
+    'KTLSState',
+    'TLSSessionCache',
 )
@@ -5,11 +5,17 @@ class SyncResolver:
     def resolve(self, host, port=0, family=0):
         raise NotImplementedError()
 
+    def resolve_all(self, host, port=0, family=0):
+        return [self.resolve(host, port=port, family=family)]
+
 
 class AsyncResolver:
     async def resolve(self, host, port=0, family=0):
         raise NotImplementedError()
 
+    async def resolve_all(self, host, port=0, family=0):
+        return [await self.resolve(host, port=port, family=family)]
+
 
 class SyncSocketStream:
 
@@ -22,10 +28,39 @@ class SyncSocketStream:
     def read_exact(self, n: int):
         raise NotImplementedError()
 
+    def read_exact_view(self, n: int):
+        """
+        What read_exact() returns, or a view into the stream's own buffer,
+        which is only valid until the stream is read again.
+        """
+        return self.read_exact(n)
+
+    def read_until(self, separator: bytes, max_bytes: int):
+        """
+        Up to max_bytes, ending with separator if it is within them, and not
+        a byte past it. This one receives a byte at a time, streams able to
+        look ahead of what they receive do it in one go.
+        """
+        data = bytearray()
+        while len(data) < max_bytes and not data.endswith(separator):
+            data += self.read_exact(1)
+        return data
+
     def close(self):
         raise NotImplementedError()
 
 
+class BufferedSyncSocketStream(SyncSocketStream):
+    """
+    A stream that receives in large chunks into a buffer of its own, from
+    which the bytes past a proxy reply are served to the next reads.
+    """
+
+    def unread(self, data: bytes):
+        """Puts data back, to be read before anything else."""
+        raise NotImplementedError()
+
+
 class AsyncSocketStream:
     async def write_all(self, data: bytes):
         raise NotImplementedError()
@@ -36,5 +71,34 @@ class AsyncSocketStream:
     async def read_exact(self, n: int):
         raise NotImplementedError()
 
+    async def read_exact_view(self, n: int):
+        """
+        What read_exact() returns, or a view into the stream's own buffer,
+        which is only valid until the stream is read again.
+        """
+        return await self.read_exact(n)
+
+    async def read_until(self, separator: bytes, max_bytes: int):
+        """
+        Up to max_bytes, ending with separator if it is within them, and not
+        a byte past it. This one receives a byte at a time, streams able to
+        look ahead of what they receive do it in one go.
+        """
+        data = bytearray()
+        while len(data) < max_bytes and not data.endswith(separator):
+            data += await self.read_exact(1)
+        return data
+
     async def close(self):
         raise NotImplementedError()
+
+
+class BufferedAsyncSocketStream(AsyncSocketStream):
+    """
+    A stream that receives in large chunks into a buffer of its own, from
+    which the bytes past a proxy reply are served to the next reads.
+    """
+
+    def unread(self, data: bytes):
+        """Puts data back, to be read before anything else."""
+        raise NotImplementedError()
@@ -0,0 +1,76 @@
+import ssl
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+DEFAULT_CONCURRENCY = 100
+
+
+class ConnectTarget(NamedTuple):
+    proxy: Any  # a proxy URL or a Proxy instance
+    dest_host: str
+    dest_port: int
+    dest_ssl: Optional[ssl.SSLContext] = None
+
+
+class _Entry:
+    __slots__ = ('proxy', 'limiter', 'users')
+
+    def __init__(self, proxy, limiter):
+        self.proxy = proxy
+        self.limiter = limiter
+        self.users = 0
+
+
+class BatchProxies:
+    """
+    Proxies in use by a connect_many() batch.
+
+    Proxies given by URL are created on first use and share the batch
+    resolver. Every proxy gets its own limiter when a per-proxy
+    concurrency is set. Entries are dropped as soon as no connection
+    uses them, so memory depends on the number of connections in
+    flight, not on the number of proxies in the batch.
+    """
+
+    def __init__(
+        self,
+        create_proxy: Callable[[str], Any],
+        create_limiter: Callable[[int], Any],
+        per_proxy_concurrency: Optional[int] = None,
+    ):
+        if per_proxy_concurrency is not None and per_proxy_concurrency < 1:
+            raise ValueError(f'Invalid per-proxy concurrency: {per_proxy_concurrency}')
+
+        self._create_proxy = create_proxy
+        self._create_limiter = create_limiter
+        self._per_proxy_concurrency = per_proxy_concurrency
+        self._entries: Dict[Hashable, _Entry] = {}
+
+    def acquire(self, proxy) -> Tuple[Any, Any]:
+        """Returns the Proxy instance to use and its limiter, or None."""
+        entry = self._entries.get(proxy)
+        if entry is None:
+            limiter = None
+            if self._per_proxy_concurrency is not None:
+                limiter = self._create_limiter(self._per_proxy_concurrency)
+            instance = self._create_proxy(proxy) if isinstance(proxy, str) else proxy
+            entry = self._entries[proxy] = _Entry(instance, limiter)
+
+        entry.users += 1
+        return entry.proxy, entry.limiter
+
+    def release(self, proxy):
+        entry = self._entries[proxy]
+        entry.users -= 1
+        if entry.users == 0:
+            del self._entries[proxy]
+
+
+def check_concurrency(concurrency: int):
+    if concurrency < 1:
+        raise ValueError(f'Invalid concurrency: {concurrency}')
+
+
+def as_target(target) -> ConnectTarget:
+    if isinstance(target, ConnectTarget):
+        return target
+    return ConnectTarget(*target)
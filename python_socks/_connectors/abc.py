@@ -1,4 +1,6 @@
 from .._abc import SyncSocketStream, AsyncSocketStream
+from .._abc import BufferedSyncSocketStream, BufferedAsyncSocketStream
+from .._errors import ProxyError
 
 
 class SyncConnector:
@@ -10,6 +12,42 @@ class SyncConnector:
     ):
         raise NotImplementedError
 
+    # noinspection PyMethodMayBeStatic
+    def _receive(self, stream: SyncSocketStream, conn):
+        # reads no more than the connection asks for,
+        # so that no byte of the tunneled data is consumed,
+        # feed() copies what it is given, views included
+        while True:
+            replies = conn.feed(stream.read_exact_view(conn.bytes_needed))
+            if replies:
+                return replies[0]
+
+    def _receive_buffered(self, stream: SyncSocketStream, conn):
+        # buffered streams are read in large chunks,
+        # whatever follows the reply is returned to them as pre-read data
+        if not isinstance(stream, BufferedSyncSocketStream):
+            return self._receive(stream, conn)
+
+        while True:
+            data = stream.read()
+            if not data:
+                raise ProxyError('Connection closed unexpectedly')
+            replies = conn.feed(data)
+            if replies:
+                stream.unread(conn.leftover)
+                return replies[0]
+
+    def _receive_until(self, stream: SyncSocketStream, conn, separator: bytes, max_bytes: int):
+        # other streams read a reply that ends with separator in one go
+        # if they can look ahead of what they receive
+        if isinstance(stream, BufferedSyncSocketStream):
+            return self._receive_buffered(stream, conn)
+
+        replies = conn.feed(stream.read_until(separator, max_bytes))
+        if replies:
+            return replies[0]
+        return self._receive(stream, conn)
+
 
 class AsyncConnector:
     async def connect(
@@ -19,3 +57,41 @@ class AsyncConnector:
         port: int,
     ):
         raise NotImplementedError
+
+    # noinspection PyMethodMayBeStatic
+    async def _receive(self, stream: AsyncSocketStream, conn):
+        # reads no more than the connection asks for,
+        # so that no byte of the tunneled data is consumed,
+        # feed() copies what it is given, views included
+        while True:
+            replies = conn.feed(await stream.read_exact_view(conn.bytes_needed))
+            if replies:
+                return replies[0]
+
+    async def _receive_buffered(self, stream: AsyncSocketStream, conn):
+        # buffered streams are read in large chunks,
+        # whatever follows the reply is returned to them as pre-read data
+        if not isinstance(stream, BufferedAsyncSocketStream):
+            return await self._receive(stream, conn)
+
+        while True:
+            data = await stream.read()
+            if not data:
+                raise ProxyError('Connection closed unexpectedly')
+            replies = conn.feed(data)
+            if replies:
+                stream.unread(conn.leftover)
+                return replies[0]
+
+    async def _receive_until(
+        self, stream: AsyncSocketStream, conn, separator: bytes, max_bytes: int
+    ):
+        # other streams read a reply that ends with separator in one go
+        # if they can look ahead of what they receive
+        if isinstance(stream, BufferedAsyncSocketStream):
+            return await self._receive_buffered(stream, conn)
+
+        replies = conn.feed(await stream.read_until(separator, max_bytes))
+        if replies:
+            return replies[0]
+        return await self._receive(stream, conn)
@@ -1,6 +1,7 @@
 from typing import Optional
 from .._abc import SyncResolver
 from .._types import ProxyType
+from .._trace import NULL_TRACER
 
 from .abc import SyncConnector
 from .socks5_sync import Socks5SyncConnector
@@ -14,12 +15,15 @@ def create_connector(
     password: Optional[str],
     rdns: Optional[bool],
     resolver: SyncResolver,
+    pipeline: bool = False,
+    tracer=NULL_TRACER,
 ) -> SyncConnector:
     if proxy_type == ProxyType.SOCKS4:
         return Socks4SyncConnector(
             user_id=username,
             rdns=rdns,
             resolver=resolver,
+            tracer=tracer,
         )
 
     if proxy_type == ProxyType.SOCKS5:
@@ -28,6 +32,8 @@ def create_connector(
             password=password,
             rdns=rdns,
             resolver=resolver,
+            pipeline=pipeline,
+            tracer=tracer,
         )
 
     if proxy_type == ProxyType.HTTP:
@@ -35,6 +41,7 @@ def create_connector(
             username=username,
             password=password,
             resolver=resolver,
+            tracer=tracer,
         )
 
     raise ValueError(f'Invalid proxy type: {proxy_type}')
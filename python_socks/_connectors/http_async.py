@@ -3,6 +3,7 @@ from .._abc import AsyncSocketStream, AsyncResolver
 from .abc import AsyncConnector
 
 from .._protocols import http
+from .._trace import NULL_TRACER, TracePhase
 
 
 class HttpAsyncConnector(AsyncConnector):
@@ -11,10 +12,12 @@ class HttpAsyncConnector(AsyncConnector):
         username: Optional[str],
         password: Optional[str],
         resolver: AsyncResolver,
+        tracer=NULL_TRACER,
     ):
         self._username = username
         self._password = password
         self._resolver = resolver
+        self._tracer = tracer
 
     async def connect(
         self,
@@ -30,9 +33,11 @@ class HttpAsyncConnector(AsyncConnector):
             username=self._username,
             password=self._password,
         )
-        data = conn.send(request)
-        await stream.write_all(data)
+        with self._tracer.phase(TracePhase.REQUEST):
+            data = conn.send(request)
+            await stream.write_all(data)
 
-        data = await stream.read()
-        reply: http.ConnectReply = conn.receive(data)
+            reply: http.ConnectReply = await self._receive_until(
+                stream, conn, http.END_OF_HEADERS, http.MAX_REPLY_SIZE
+            )
         return reply
@@ -3,6 +3,7 @@ from .._abc import SyncSocketStream, SyncResolver
 from .abc import SyncConnector
 
 from .._protocols import http
+from .._trace import NULL_TRACER, TracePhase
 
 
 class HttpSyncConnector(SyncConnector):
@@ -11,10 +12,12 @@ class HttpSyncConnector(SyncConnector):
         username: Optional[str],
         password: Optional[str],
         resolver: SyncResolver,
+        tracer=NULL_TRACER,
     ):
         self._username = username
         self._password = password
         self._resolver = resolver
+        self._tracer = tracer
 
     def connect(
         self,
@@ -30,9 +33,11 @@ class HttpSyncConnector(SyncConnector):
             username=self._username,
             password=self._password,
         )
-        data = conn.send(request)
-        stream.write_all(data)
+        with self._tracer.phase(TracePhase.REQUEST):
+            data = conn.send(request)
+            stream.write_all(data)
 
-        data = stream.read()
-        reply: http.ConnectReply = conn.receive(data)
+            reply: http.ConnectReply = self._receive_until(
+                stream, conn, http.END_OF_HEADERS, http.MAX_REPLY_SIZE
+            )
         return reply
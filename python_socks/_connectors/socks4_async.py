@@ -5,6 +5,7 @@ from .._abc import AsyncSocketStream, AsyncResolver
 from .abc import AsyncConnector
 
 from .._protocols import socks4
+from .._trace import NULL_TRACER, TracePhase
 from .._helpers import is_ip_address
 
 
@@ -14,6 +15,7 @@ class Socks4AsyncConnector(AsyncConnector):
         user_id: Optional[str],
         rdns: Optional[bool],
         resolver: AsyncResolver,
+        tracer=NULL_TRACER,
     ):
         if rdns is None:
             rdns = False
@@ -21,6 +23,7 @@ class Socks4AsyncConnector(AsyncConnector):
         self._user_id = user_id
         self._rdns = rdns
         self._resolver = resolver
+        self._tracer = tracer
 
     async def connect(
         self,
@@ -31,15 +34,16 @@ class Socks4AsyncConnector(AsyncConnector):
         conn = socks4.Connection()
 
         if not is_ip_address(host) and not self._rdns:
-            _, host = await self._resolver.resolve(
-                host,
-                family=socket.AF_INET,
-            )
-
-        request = socks4.ConnectRequest(host=host, port=port, user_id=self._user_id)
-        data = conn.send(request)
-        await stream.write_all(data)
-
-        data = await stream.read_exact(socks4.ConnectReply.SIZE)
-        reply: socks4.ConnectReply = conn.receive(data)
+            with self._tracer.phase(TracePhase.RESOLVE):
+                _, host = await self._resolver.resolve(
+                    host,
+                    family=socket.AF_INET,
+                )
+
+        with self._tracer.phase(TracePhase.REQUEST):
+            request = socks4.ConnectRequest(host=host, port=port, user_id=self._user_id)
+            data = conn.send(request)
+            await stream.write_all(data)
+
+            reply: socks4.ConnectReply = await self._receive(stream, conn)
         return reply
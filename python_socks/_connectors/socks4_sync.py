@@ -5,6 +5,7 @@ from .._abc import SyncSocketStream, SyncResolver
 from .abc import SyncConnector
 
 from .._protocols import socks4
+from .._trace import NULL_TRACER, TracePhase
 from .._helpers import is_ip_address
 
 
@@ -14,6 +15,7 @@ class Socks4SyncConnector(SyncConnector):
         user_id: Optional[str],
         rdns: Optional[bool],
         resolver: SyncResolver,
+        tracer=NULL_TRACER,
     ):
         if rdns is None:
             rdns = False
@@ -21,6 +23,7 @@ class Socks4SyncConnector(SyncConnector):
         self._user_id = user_id
         self._rdns = rdns
         self._resolver = resolver
+        self._tracer = tracer
 
     def connect(
         self,
@@ -31,15 +34,16 @@ class Socks4SyncConnector(SyncConnector):
         conn = socks4.Connection()
 
         if not is_ip_address(host) and not self._rdns:
-            _, host = self._resolver.resolve(
-                host,
-                family=socket.AF_INET,
-            )
-
-        request = socks4.ConnectRequest(host=host, port=port, user_id=self._user_id)
-        data = conn.send(request)
-        stream.write_all(data)
-
-        data = stream.read_exact(socks4.ConnectReply.SIZE)
-        reply: socks4.ConnectReply = conn.receive(data)
+            with self._tracer.phase(TracePhase.RESOLVE):
+                _, host = self._resolver.resolve(
+                    host,
+                    family=socket.AF_INET,
+                )
+
+        with self._tracer.phase(TracePhase.REQUEST):
+            request = socks4.ConnectRequest(host=host, port=port, user_id=self._user_id)
+            data = conn.send(request)
+            stream.write_all(data)
+
+            reply: socks4.ConnectReply = self._receive(stream, conn)
         return reply
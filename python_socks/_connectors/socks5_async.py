@@ -5,6 +5,7 @@ from .._abc import AsyncSocketStream, AsyncResolver
 from .abc import AsyncConnector
 
 from .._protocols import socks5
+from .._trace import NULL_TRACER, TracePhase
 from .._helpers import is_ip_address
 
 
@@ -15,6 +16,8 @@ class Socks5AsyncConnector(AsyncConnector):
         password: Optional[str],
         rdns: Optional[bool],
         resolver: AsyncResolver,
+        pipeline: bool = False,
+        tracer=NULL_TRACER,
     ):
         if rdns is None:
             rdns = True
@@ -23,6 +26,8 @@ class Socks5AsyncConnector(AsyncConnector):
         self._password = password
         self._rdns = rdns
         self._resolver = resolver
+        self._pipeline = pipeline
+        self._tracer = tracer
 
     async def connect(
         self,
@@ -30,66 +35,101 @@ class Socks5AsyncConnector(AsyncConnector):
         host: str,
         port: int,
     ) -> socks5.ConnectReply:
-        conn = socks5.Connection()
+        if self._pipeline:
+            return await self._connect_pipelined(stream, host, port)
 
-        # Auth methods
-        request = socks5.AuthMethodsRequest(
-            username=self._username,
-            password=self._password,
-        )
-        data = conn.send(request)
-        await stream.write_all(data)
+        conn = await self.authenticate(stream)
+        return await self.request(stream, conn, host, port)
 
-        data = await stream.read_exact(socks5.AuthMethodReply.SIZE)
-        reply: socks5.AuthMethodReply = conn.receive(data)
+    async def authenticate(self, stream: AsyncSocketStream) -> socks5.Connection:
+        conn = socks5.Connection()
 
-        # Authenticate
-        if reply.method == socks5.AuthMethod.USERNAME_PASSWORD:
-            request = socks5.AuthRequest(
+        with self._tracer.phase(TracePhase.AUTH):
+            # Auth methods
+            request = socks5.AuthMethodsRequest(
                 username=self._username,
                 password=self._password,
             )
             data = conn.send(request)
             await stream.write_all(data)
 
-            data = await stream.read_exact(socks5.AuthReply.SIZE)
-            _: socks5.AuthReply = conn.receive(data)
+            reply: socks5.AuthMethodReply = await self._receive(stream, conn)
+
+            # Authenticate
+            if reply.method == socks5.AuthMethod.USERNAME_PASSWORD:
+                request = socks5.AuthRequest(
+                    username=self._username,
+                    password=self._password,
+                )
+                data = conn.send(request)
+                await stream.write_all(data)
+
+                _: socks5.AuthReply = await self._receive(stream, conn)
+
+        return conn
+
+    async def request(
+        self,
+        stream: AsyncSocketStream,
+        conn: socks5.Connection,
+        host: str,
+        port: int,
+    ) -> socks5.ConnectReply:
+        if not is_ip_address(host) and not self._rdns:
+            with self._tracer.phase(TracePhase.RESOLVE):
+                _, host = await self._resolver.resolve(
+                    host,
+                    family=socket.AF_UNSPEC,
+                )
+
+        with self._tracer.phase(TracePhase.REQUEST):
+            request = socks5.ConnectRequest(host=host, port=port)
+            data = conn.send(request)
+            await stream.write_all(data)
+
+            reply: socks5.ConnectReply = await self._receive(stream, conn)
+        return reply
+
+    async def _connect_pipelined(
+        self,
+        stream: AsyncSocketStream,
+        host: str,
+        port: int,
+    ) -> socks5.ConnectReply:
+        conn = socks5.Connection(pipeline=True)
 
-        # Connect
         if not is_ip_address(host) and not self._rdns:
-            _, host = await self._resolver.resolve(
-                host,
-                family=socket.AF_UNSPEC,
+            with self._tracer.phase(TracePhase.RESOLVE):
+                _, host = await self._resolver.resolve(
+                    host,
+                    family=socket.AF_UNSPEC,
+                )
+
+        # the replies arrive together, so it's all one request phase
+        with self._tracer.phase(TracePhase.REQUEST):
+            request = socks5.AuthMethodsRequest(
+                username=self._username,
+                password=self._password,
+                pipeline=True,
             )
+            data = conn.send(request)
 
-        request = socks5.ConnectRequest(host=host, port=port)
-        data = conn.send(request)
-        await stream.write_all(data)
+            auth_required = socks5.AuthMethod.USERNAME_PASSWORD in request.methods
+            if auth_required:
+                data += conn.send(
+                    socks5.AuthRequest(
+                        username=self._username,
+                        password=self._password,
+                    )
+                )
 
-        data = await self._read_reply(stream)
-        reply: socks5.ConnectReply = conn.receive(data)
-        return reply
+            data += conn.send(socks5.ConnectRequest(host=host, port=port))
+            await stream.write_all(data)
 
-    # noinspection PyMethodMayBeStatic
-    async def _read_reply(self, stream: AsyncSocketStream) -> bytes:
-        data = await stream.read_exact(3)
-        if data[0] != socks5.SOCKS_VER:
-            return data
-        if data[1] != socks5.ReplyCode.SUCCEEDED:
-            return data
-        if data[2] != socks5.RSV:
-            return data
-
-        data += await stream.read_exact(1)
-        addr_type = data[3]
-
-        if addr_type == socks5.AddressType.IPV4:
-            data += await stream.read_exact(6)
-        elif addr_type == socks5.AddressType.IPV6:
-            data += await stream.read_exact(18)
-        elif addr_type == socks5.AddressType.DOMAIN:
-            data += await stream.read_exact(1)
-            host_len = data[-1]
-            data += await stream.read_exact(host_len + 2)
-
-        return data
+            _: socks5.AuthMethodReply = await self._receive(stream, conn)
+
+            if auth_required:
+                _: socks5.AuthReply = await self._receive(stream, conn)
+
+            reply: socks5.ConnectReply = await self._receive(stream, conn)
+        return reply
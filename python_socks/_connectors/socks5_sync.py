@@ -5,6 +5,7 @@ from .._abc import SyncSocketStream, SyncResolver
 from .abc import SyncConnector
 
 from .._protocols import socks5
+from .._trace import NULL_TRACER, TracePhase
 from .._helpers import is_ip_address
 
 
@@ -15,6 +16,8 @@ class Socks5SyncConnector(SyncConnector):
         password: Optional[str],
         rdns: Optional[bool],
         resolver: SyncResolver,
+        pipeline: bool = False,
+        tracer=NULL_TRACER,
     ):
         if rdns is None:
             rdns = True
@@ -23,6 +26,8 @@ class Socks5SyncConnector(SyncConnector):
         self._password = password
         self._rdns = rdns
         self._resolver = resolver
+        self._pipeline = pipeline
+        self._tracer = tracer
 
     def connect(
         self,
@@ -30,57 +35,86 @@ class Socks5SyncConnector(SyncConnector):
         host: str,
         port: int,
     ) -> socks5.ConnectReply:
-        conn = socks5.Connection()
+        if self._pipeline:
+            return self._connect_pipelined(stream, host, port)
 
-        # Auth methods
-        request = socks5.AuthMethodsRequest(username=self._username, password=self._password)
-        data = conn.send(request)
-        stream.write_all(data)
+        conn = self.authenticate(stream)
+        return self.request(stream, conn, host, port)
 
-        data = stream.read_exact(socks5.AuthMethodReply.SIZE)
-        reply: socks5.AuthMethodReply = conn.receive(data)
+    def authenticate(self, stream: SyncSocketStream) -> socks5.Connection:
+        conn = socks5.Connection()
 
-        # Authenticate
-        if reply.method == socks5.AuthMethod.USERNAME_PASSWORD:
-            request = socks5.AuthRequest(username=self._username, password=self._password)
+        with self._tracer.phase(TracePhase.AUTH):
+            # Auth methods
+            request = socks5.AuthMethodsRequest(username=self._username, password=self._password)
             data = conn.send(request)
             stream.write_all(data)
 
-            data = stream.read_exact(socks5.AuthReply.SIZE)
-            _: socks5.AuthReply = conn.receive(data)
+            reply: socks5.AuthMethodReply = self._receive(stream, conn)
+
+            # Authenticate
+            if reply.method == socks5.AuthMethod.USERNAME_PASSWORD:
+                request = socks5.AuthRequest(username=self._username, password=self._password)
+                data = conn.send(request)
+                stream.write_all(data)
+
+                _: socks5.AuthReply = self._receive(stream, conn)
 
-        # Connect
+        return conn
+
+    def request(
+        self,
+        stream: SyncSocketStream,
+        conn: socks5.Connection,
+        host: str,
+        port: int,
+    ) -> socks5.ConnectReply:
         if not is_ip_address(host) and not self._rdns:
-            _, host = self._resolver.resolve(host, family=socket.AF_UNSPEC)
+            with self._tracer.phase(TracePhase.RESOLVE):
+                _, host = self._resolver.resolve(host, family=socket.AF_UNSPEC)
 
-        request = socks5.ConnectRequest(host=host, port=port)
-        data = conn.send(request)
-        stream.write_all(data)
+        with self._tracer.phase(TracePhase.REQUEST):
+            request = socks5.ConnectRequest(host=host, port=port)
+            data = conn.send(request)
+            stream.write_all(data)
 
-        data = self._read_reply(stream)
-        reply: socks5.ConnectReply = conn.receive(data)
+            reply: socks5.ConnectReply = self._receive(stream, conn)
         return reply
 
-    # noinspection PyMethodMayBeStatic
-    def _read_reply(self, stream: SyncSocketStream) -> bytes:
-        data = stream.read_exact(3)
-        if data[0] != socks5.SOCKS_VER:
-            return data
-        if data[1] != socks5.ReplyCode.SUCCEEDED:
-            return data
-        if data[2] != socks5.RSV:
-            return data
-
-        data += stream.read_exact(1)
-        addr_type = data[3]
-
-        if addr_type == socks5.AddressType.IPV4:
-            data += stream.read_exact(6)
-        elif addr_type == socks5.AddressType.IPV6:
-            data += stream.read_exact(18)
-        elif addr_type == socks5.AddressType.DOMAIN:
-            data += stream.read_exact(1)
-            host_len = data[-1]
-            data += stream.read_exact(host_len + 2)
-
-        return data
+    def _connect_pipelined(
+        self,
+        stream: SyncSocketStream,
+        host: str,
+        port: int,
+    ) -> socks5.ConnectReply:
+        conn = socks5.Connection(pipeline=True)
+
+        if not is_ip_address(host) and not self._rdns:
+            with self._tracer.phase(TracePhase.RESOLVE):
+                _, host = self._resolver.resolve(host, family=socket.AF_UNSPEC)
+
+        # the replies arrive together, so it's all one request phase
+        with self._tracer.phase(TracePhase.REQUEST):
+            request = socks5.AuthMethodsRequest(
+                username=self._username,
+                password=self._password,
+                pipeline=True,
+            )
+            data = conn.send(request)
+
+            auth_required = socks5.AuthMethod.USERNAME_PASSWORD in request.methods
+            if auth_required:
+                data += conn.send(
+                    socks5.AuthRequest(username=self._username, password=self._password)
+                )
+
+            data += conn.send(socks5.ConnectRequest(host=host, port=port))
+            stream.write_all(data)
+
+            _: socks5.AuthMethodReply = self._receive(stream, conn)
+
+            if auth_required:
+                _: socks5.AuthReply = self._receive(stream, conn)
+
+            reply: socks5.ConnectReply = self._receive(stream, conn)
+        return reply
@@ -0,0 +1,126 @@
+import contextlib
+import contextvars
+import socket
+import time
+from dataclasses import dataclass
+from typing import Callable, ContextManager, Dict, Iterator, Optional
+
+from ._trace import TracePhase
+
+
+@dataclass(frozen=True)
+class PhaseTimeouts:
+    """
+    Optional caps, in seconds, on single connection phases. They apply
+    on top of the connect timeout, which always bounds the whole connection
+    including every hop of a chain.
+    """
+
+    connect: Optional[float] = None  # TCP connection to the proxy
+    tls: Optional[float] = None  # each TLS handshake, with the proxy or the destination
+    auth: Optional[float] = None  # SOCKS5 authentication
+    reply: Optional[float] = None  # connect request and the proxy reply to it
+
+    def caps(self) -> Dict[TracePhase, float]:
+        caps = {
+            TracePhase.CONNECT: self.connect,
+            TracePhase.PROXY_TLS: self.tls,
+            TracePhase.DEST_TLS: self.tls,
+            TracePhase.AUTH: self.auth,
+            TracePhase.REQUEST: self.reply,
+        }
+        return {phase: cap for phase, cap in caps.items() if cap is not None}
+
+
+class _CappedPhase:
+    __slots__ = ('_trace', '_scope')
+
+    def __init__(self, trace: ContextManager, scope: ContextManager):
+        self._trace = trace
+        self._scope = scope
+
+    def __enter__(self):
+        self._trace.__enter__()
+        self._scope.__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        # the trace sees the timeout error raised by the scope, if any
+        try:
+            self._scope.__exit__(exc_type, exc, tb)
+        except BaseException as e:
+            self._trace.__exit__(type(e), e, e.__traceback__)
+            raise
+        self._trace.__exit__(exc_type, exc, tb)
+        return False
+
+
+class _CappedTracer:
+    """Runs the phases that have a cap in a timeout scope of the backend."""
+
+    __slots__ = ('_tracer', '_caps', '_scope')
+
+    def __init__(self, tracer, caps: Dict[TracePhase, float], scope: Callable):
+        self._tracer = tracer
+        self._caps = caps
+        self._scope = scope
+
+    def phase(self, phase: TracePhase) -> ContextManager:
+        cap = self._caps.get(phase)
+        if cap is None:
+            return self._tracer.phase(phase)
+        return _CappedPhase(self._tracer.phase(phase), self._scope(cap))
+
+
+def cap_phases(
+    tracer,
+    timeouts: Optional[PhaseTimeouts],
+    scope: Callable[[float], ContextManager],
+):
+    """
+    Adds the phase caps to a tracer, so that they are applied wherever
+    the phases are traced. `scope(seconds)` returns a context manager that
+    times out the code it wraps.
+    """
+    caps = timeouts.caps() if timeouts is not None else {}
+    if not caps:
+        return tracer
+    return _CappedTracer(tracer, caps, scope)
+
+
+# Sync sockets time out operation by operation, so the absolute deadline
+# of the connection in progress is kept here and every socket operation
+# is given what is left of it.
+_current_deadline: 'contextvars.ContextVar[Optional[float]]' = contextvars.ContextVar(
+    'python_socks_deadline',
+    default=None,
+)
+
+
+@contextlib.contextmanager
+def deadline_scope(timeout: float) -> Iterator[None]:
+    """Narrows the current deadline, never extends it."""
+    deadline = time.monotonic() + timeout
+    current = _current_deadline.get()
+    if current is not None and current < deadline:
+        deadline = current
+
+    token = _current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+def time_left() -> Optional[float]:
+    """
+    What is left of the current deadline, None outside of any.
+    Raises socket.timeout once it has passed.
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return None
+
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise socket.timeout('timed out')
+    return left
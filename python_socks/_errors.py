@@ -1,3 +1,6 @@
+import errno
+
+
 class ProxyException(Exception):
     pass
 
@@ -10,7 +13,36 @@ class ProxyConnectionError(ProxyException, OSError):
     pass
 
 
+class PortExhaustionError(ProxyConnectionError):
+    """No local port was left to connect to the proxy from."""
+
+
 class ProxyError(ProxyException):
     def __init__(self, message, error_code=None):
         super().__init__(message)
         self.error_code = error_code
+
+
+# what bind() and connect() fail with once the ephemeral ports are used up
+_PORT_EXHAUSTION_ERRNOS = frozenset((errno.EADDRNOTAVAIL, errno.EADDRINUSE))
+
+
+def proxy_connection_error(error_no, message) -> ProxyConnectionError:
+    if error_no in _PORT_EXHAUSTION_ERRNOS:
+        return PortExhaustionError(error_no, message)
+    return ProxyConnectionError(error_no, message)
+
+
+# what connect() fails with, which over a socket connected with TCP Fast Open
+# shows up on the first send or receive instead
+_CONNECT_ERRNOS = frozenset(
+    (errno.ECONNREFUSED, errno.EHOSTUNREACH, errno.ENETUNREACH, errno.ETIMEDOUT)
+)
+
+
+def is_connect_error(error: BaseException) -> bool:
+    return (
+        isinstance(error, OSError)
+        and not isinstance(error, ProxyException)
+        and error.errno in _CONNECT_ERRNOS
+    )
@@ -0,0 +1,47 @@
+import itertools
+from collections import OrderedDict
+from typing import Iterable, List, Sequence, Tuple
+
+# RFC 8305 section 5 recommends 250 ms
+DEFAULT_HAPPY_EYEBALLS_DELAY = 0.25
+
+Address = Tuple[int, str]
+
+
+def unique_addresses(infos: Iterable[tuple]) -> List[Address]:
+    """(family, host) pairs from getaddrinfo results, in resolver order."""
+    seen = set()
+    addresses = []
+    for family, _, _, _, address in infos:
+        item = (family, address[0])
+        if item not in seen:
+            seen.add(item)
+            addresses.append(item)
+    return addresses
+
+
+def interleave_addresses(addresses: Sequence[Address]) -> List[Address]:
+    """
+    Alternates address families, starting with the family
+    of the first address (RFC 8305 section 4).
+    """
+    by_family: 'OrderedDict[int, List[Address]]' = OrderedDict()
+    for address in addresses:
+        by_family.setdefault(address[0], []).append(address)
+
+    return [
+        address
+        for group in itertools.zip_longest(*by_family.values())
+        for address in group
+        if address is not None
+    ]
+
+
+def connect_error(errors: Sequence[OSError]) -> OSError:
+    if len(errors) == 1 or all(str(e) == str(errors[0]) for e in errors):
+        return errors[0]
+
+    return OSError(
+        errors[0].errno,
+        'Multiple exceptions: {}'.format(', '.join(str(e) for e in errors)),
+    )
@@ -0,0 +1,63 @@
+import itertools
+import math
+from collections import deque
+from typing import Deque, Optional, Sequence, TypeVar
+
+# used until enough connect times are known to derive the delay from
+DEFAULT_HEDGE_DELAY = 0.5
+DEFAULT_MAX_ATTEMPTS = 2
+
+HEDGE_PERCENTILE = 0.95
+MIN_SAMPLES = 20
+MAX_SAMPLES = 200
+
+T = TypeVar('T')
+
+
+class Hedging:
+    """
+    Picks the proxies a hedged connect tries, in turn, and how long
+    to wait for one of them before trying the next.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        delay: Optional[float] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ):
+        if size < 1:
+            raise ValueError('Proxy group must contain at least one proxy')
+
+        if max_attempts < 1:
+            raise ValueError(f'Invalid max_attempts: {max_attempts}')
+
+        self._size = size
+        self._delay = delay
+        self._attempts = min(max_attempts, size)
+        self._latencies: Deque[float] = deque(maxlen=MAX_SAMPLES)
+        self._counter = itertools.count()
+
+    def order(self, proxies: Sequence[T]) -> Sequence[T]:
+        """The proxies to try, the first one in round-robin order."""
+        first = next(self._counter) % self._size
+        return [proxies[(first + i) % self._size] for i in range(self._attempts)]
+
+    def delay(self) -> float:
+        if self._delay is not None:
+            return self._delay
+
+        if len(self._latencies) < MIN_SAMPLES:
+            return DEFAULT_HEDGE_DELAY
+
+        latencies = sorted(self._latencies)
+        return latencies[math.ceil(HEDGE_PERCENTILE * len(latencies)) - 1]
+
+    def record(self, latency: float):
+        """
+        Adds the time an attempt took, or for an attempt given up on (one
+        that lost to another proxy or was cancelled) the time it had taken
+        so far. Leaving the latter out would take the slowest proxies out of
+        the percentile, and hedge ever sooner.
+        """
+        self._latencies.append(latency)
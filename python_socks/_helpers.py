@@ -1,53 +1,53 @@
 import functools
-import re
+import socket
 from typing import Optional, Tuple
 from urllib.parse import urlparse, unquote
 
 from ._types import ProxyType
 
-# pylint:disable-next=invalid-name
-_ipv4_pattern = (
-    r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}'
-    r'(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
-)
-
-# pylint:disable-next=invalid-name
-_ipv6_pattern = (
-    r'^(?:(?:(?:[A-F0-9]{1,4}:){6}|(?=(?:[A-F0-9]{0,4}:){0,6}'
-    r'(?:[0-9]{1,3}\.){3}[0-9]{1,3}$)(([0-9A-F]{1,4}:){0,5}|:)'
-    r'((:[0-9A-F]{1,4}){1,5}:|:)|::(?:[A-F0-9]{1,4}:){5})'
-    r'(?:(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])\.){3}'
-    r'(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])|(?:[A-F0-9]{1,4}:){7}'
-    r'[A-F0-9]{1,4}|(?=(?:[A-F0-9]{0,4}:){0,7}[A-F0-9]{0,4}$)'
-    r'(([0-9A-F]{1,4}:){1,7}|:)((:[0-9A-F]{1,4}){1,7}|:)|(?:[A-F0-9]{1,4}:){7}'
-    r':|:(:[A-F0-9]{1,4}){7})$'
-)
-
-_ipv4_regex = re.compile(_ipv4_pattern)
-_ipv6_regex = re.compile(_ipv6_pattern, flags=re.IGNORECASE)
-_ipv4_regexb = re.compile(_ipv4_pattern.encode('ascii'))
-_ipv6_regexb = re.compile(_ipv6_pattern.encode('ascii'), flags=re.IGNORECASE)
-
-
-def _is_ip_address(regex, regexb, host):
-    # if host is None:
-    #     return False
+IP_ADDRESS_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=IP_ADDRESS_CACHE_SIZE)
+def _parse_ip_address(host: str) -> Optional[Tuple[int, bytes]]:
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            return family, socket.inet_pton(family, host)
+        except (OSError, ValueError):
+            pass
+    return None
+
+
+def parse_ip_address(host) -> Optional[Tuple[int, bytes]]:
+    """
+    Returns (address family, packed address) if host is an IPv4 or IPv6 address,
+    None otherwise (e.g. for a domain name).
+    """
     if isinstance(host, str):
-        return bool(regex.match(host))
+        return _parse_ip_address(host)
     elif isinstance(host, (bytes, bytearray, memoryview)):
-        return bool(regexb.match(host))
+        try:
+            return _parse_ip_address(bytes(host).decode('ascii'))
+        except UnicodeDecodeError:
+            return None
     else:
         raise TypeError(
             '{} [{}] is not a str or bytes'.format(host, type(host))  # pragma: no cover
         )
 
 
-is_ipv4_address = functools.partial(_is_ip_address, _ipv4_regex, _ipv4_regexb)
-is_ipv6_address = functools.partial(_is_ip_address, _ipv6_regex, _ipv6_regexb)
+def is_ipv4_address(host):
+    parsed = parse_ip_address(host)
+    return parsed is not None and parsed[0] == socket.AF_INET
+
+
+def is_ipv6_address(host):
+    parsed = parse_ip_address(host)
+    return parsed is not None and parsed[0] == socket.AF_INET6
 
 
 def is_ip_address(host):
-    return is_ipv4_address(host) or is_ipv6_address(host)
+    return parse_ip_address(host) is not None
 
 
 def parse_proxy_url(url: str) -> Tuple[ProxyType, str, int, Optional[str], Optional[str]]:
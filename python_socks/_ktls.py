@@ -0,0 +1,46 @@
+import ssl
+import sys
+from typing import NamedTuple
+
+# Python 3.12+ built against OpenSSL 3
+OP_ENABLE_KTLS: int = getattr(ssl, 'OP_ENABLE_KTLS', 0)
+
+KTLS_AVAILABLE = sys.platform.startswith('linux') and OP_ENABLE_KTLS != 0
+
+
+class KTLSState(NamedTuple):
+    send: bool  # records sent are encrypted by the kernel
+    receive: bool  # records received are decrypted by the kernel
+
+    @property
+    def offloaded(self) -> bool:
+        return self.send or self.receive
+
+
+NO_KTLS = KTLSState(send=False, receive=False)
+
+
+def enable_ktls(ssl_context: ssl.SSLContext) -> bool:
+    """
+    Lets OpenSSL hand the record layer of the connections made with
+    ssl_context over to the kernel (Linux with the tls module loaded),
+    once the handshake is done. It only does so for sockets it reads and
+    writes itself, with a cipher the kernel supports, and keeps to user
+    space otherwise, so whether it did is told by ktls_state().
+    """
+    if not KTLS_AVAILABLE:
+        return False
+    ssl_context.options |= OP_ENABLE_KTLS
+    return True
+
+
+def ktls_state(ssl_object) -> KTLSState:
+    """Whether the kernel took over an SSLSocket's or SSLObject's records."""
+    sslobj = getattr(ssl_object, '_sslobj', None)
+    uses_ktls_for_send = getattr(sslobj, 'uses_ktls_for_send', None)
+    if uses_ktls_for_send is None:  # not a TLS connection, or Python<3.12
+        return NO_KTLS
+    return KTLSState(
+        send=bool(uses_ktls_for_send()),
+        receive=bool(sslobj.uses_ktls_for_recv()),
+    )
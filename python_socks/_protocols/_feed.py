@@ -0,0 +1,57 @@
+from typing import List
+
+
+class FeedMixin:
+    """
+    Incremental parsing for Connection classes.
+
+    Bytes received from the proxy server are accumulated in one reusable
+    buffer, which is cut into replies as soon as they are complete.
+    Subclasses implement _expects_reply() and _reply_size(), the latter
+    returning the size of the next reply, or a lower bound of it while
+    the buffer doesn't yet contain enough to tell.
+    """
+
+    _buffer: bytearray
+
+    def feed(self, data) -> List:
+        """
+        Accepts bytes received from the proxy server in chunks of any size.
+        Returns the replies completed by them, oldest first.
+        """
+        self._buffer += data
+        replies = []
+        while self._expects_reply():
+            size = self._reply_size(self._buffer)
+            if len(self._buffer) < size:
+                break
+
+            with memoryview(self._buffer) as view:
+                replies.append(self.receive(view[:size]))  # type: ignore[attr-defined]
+            del self._buffer[:size]
+
+        return replies
+
+    @property
+    def bytes_needed(self) -> int:
+        """
+        How many bytes can be read without reading past the next reply.
+        """
+        if not self._expects_reply():
+            return 0
+        return max(self._reply_size(self._buffer) - len(self._buffer), 0)
+
+    @property
+    def leftover(self) -> bytes:
+        """
+        Bytes received after the last expected reply, e.g. tunneled data.
+        """
+        if self._expects_reply():
+            return b''
+        return bytes(self._buffer)
+
+    def _expects_reply(self) -> bool:
+        raise NotImplementedError()
+
+    def _reply_size(self, data: bytearray) -> int:
+        raise NotImplementedError()
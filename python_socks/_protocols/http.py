@@ -1,12 +1,13 @@
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import base64
 import binascii
 from collections import namedtuple
-from typing import Optional
+from typing import Dict, Optional
 
 from .._version import __title__, __version__
 
+from ._feed import FeedMixin
 from .errors import ReplyError
 
 DEFAULT_USER_AGENT = 'Python/{0[0]}.{0[1]} {1}/{2}'.format(
@@ -16,6 +17,11 @@ DEFAULT_USER_AGENT = 'Python/{0[0]}.{0[1]} {1}/{2}'.format(
 )
 
 CRLF = '\r\n'
+END_OF_HEADERS = b'\r\n\r\n'
+
+# the shortest reply possible, e.g. b'HTTP/1.1 200\r\n\r\n'
+MIN_REPLY_SIZE = 16
+MAX_REPLY_SIZE = 65536
 
 
 class BasicAuth(namedtuple('BasicAuth', ['login', 'password', 'encoding'])):
@@ -111,14 +117,15 @@ class ConnectRequest:
 class ConnectReply:
     status_code: int
     message: str
+    headers: Dict[str, str] = field(default_factory=dict)
 
     @classmethod
     def loads(cls, data: bytes) -> 'ConnectReply':
         if not data:
             raise ReplyError('Invalid proxy response')  # pragma: no cover
 
-        line = data.split(CRLF.encode('ascii'), 1)[0]
-        line = line.decode('utf-8', 'surrogateescape')
+        head = bytes(data).split(END_OF_HEADERS, 1)[0]
+        line, *header_lines = head.decode('utf-8', 'surrogateescape').split(CRLF)
 
         try:
             version, code, *reason = line.split()
@@ -136,13 +143,50 @@ class ConnectReply:
             msg = f'{status_code} {status_message}'
             raise ReplyError(msg, error_code=status_code)
 
-        return cls(status_code=status_code, message=status_message)
+        headers: Dict[str, str] = {}
+        for header_line in header_lines:
+            if not header_line:
+                continue
+            name, sep, value = header_line.partition(':')
+            if not sep or not name or name != name.strip():
+                raise ReplyError(f'Invalid header line: {header_line}')
+
+            name = name.lower()
+            value = value.strip()
+            if name in headers:
+                headers[name] = f'{headers[name]}, {value}'
+            else:
+                headers[name] = value
+
+        return cls(status_code=status_code, message=status_message, headers=headers)
 
 
-# noinspection PyMethodMayBeStatic
-class Connection:
+class Connection(FeedMixin):
+    def __init__(self):
+        self._request_sent = False
+        self._buffer = bytearray()
+
     def send(self, request: ConnectRequest) -> bytes:
+        self._request_sent = True
         return request.dumps()
 
     def receive(self, data: bytes) -> ConnectReply:
+        self._request_sent = False
         return ConnectReply.loads(data)
+
+    def _expects_reply(self) -> bool:
+        return self._request_sent
+
+    # noinspection PyMethodMayBeStatic
+    def _reply_size(self, data: bytearray) -> int:
+        end = data.find(END_OF_HEADERS, 0, MAX_REPLY_SIZE)
+        if end != -1:
+            return end + len(END_OF_HEADERS)
+        if len(data) >= MAX_REPLY_SIZE:
+            raise ReplyError(f'Proxy response headers exceed {MAX_REPLY_SIZE} bytes')
+
+        # the reply can't end before the partial terminator at the end of data is completed
+        for n in range(len(END_OF_HEADERS) - 1, 0, -1):
+            if data.endswith(END_OF_HEADERS[:n]):
+                return max(len(data) + len(END_OF_HEADERS) - n, MIN_REPLY_SIZE)
+        return max(len(data) + len(END_OF_HEADERS), MIN_REPLY_SIZE)
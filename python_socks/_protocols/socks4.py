@@ -1,11 +1,12 @@
 import enum
-import ipaddress
 import socket
+import struct
 from dataclasses import dataclass
 from typing import Optional
 
+from ._feed import FeedMixin
 from .errors import ReplyError
-from .._helpers import is_ipv4_address
+from .._helpers import parse_ip_address
 
 RSV = NULL = 0x00
 SOCKS_VER = 0x04
@@ -45,8 +46,9 @@ class ConnectRequest:
         port_bytes = self.port.to_bytes(2, 'big')
         include_hostname = False
 
-        if is_ipv4_address(self.host):
-            host_bytes = ipaddress.IPv4Address(self.host).packed
+        ip = parse_ip_address(self.host)
+        if ip is not None and ip[0] == socket.AF_INET:
+            host_bytes = ip[1]
         else:
             include_hostname = True
             host_bytes = bytes([NULL, NULL, NULL, 1])
@@ -81,36 +83,40 @@ class ConnectReply:
         if len(data) != cls.SIZE:
             raise ReplyError('Malformed connect reply')
 
-        rsv = data[0]
+        rsv, reply_code, port, host_data = struct.unpack_from('!BBH4s', data)
         if rsv != RSV:  # pragma: no cover
-            raise ReplyError(f'Unexpected reply version: {data[0]:#02X}')
+            raise ReplyError(f'Unexpected reply version: {rsv:#02X}')
 
         try:
-            reply = ReplyCode(data[1])
+            reply = ReplyCode(reply_code)
         except ValueError:
-            raise ReplyError(f'Invalid reply code: {data[1]:#02X}')
+            raise ReplyError(f'Invalid reply code: {reply_code:#02X}')
 
         if reply != ReplyCode.REQUEST_GRANTED:  # pragma: no cover
             msg = ReplyMessages.get(reply, 'Unknown error')
             raise ReplyError(msg, error_code=reply)
 
-        try:
-            port = int.from_bytes(data[2:4], byteorder="big")
-        except ValueError:
-            raise ReplyError('Invalid port data')
-
-        try:
-            host = socket.inet_ntop(socket.AF_INET, data[4:8])
-        except ValueError:
-            raise ReplyError('Invalid port data')
+        host = socket.inet_ntop(socket.AF_INET, host_data)
 
         return cls(rsv=rsv, reply=reply, host=host, port=port)
 
 
-# noinspection PyMethodMayBeStatic
-class Connection:
+class Connection(FeedMixin):
+    def __init__(self):
+        self._request_sent = False
+        self._buffer = bytearray()
+
     def send(self, request: ConnectRequest) -> bytes:
+        self._request_sent = True
         return request.dumps()
 
     def receive(self, data: bytes) -> ConnectReply:
+        self._request_sent = False
         return ConnectReply.loads(data)
+
+    def _expects_reply(self) -> bool:
+        return self._request_sent
+
+    # noinspection PyMethodMayBeStatic
+    def _reply_size(self, data: bytearray) -> int:
+        return ConnectReply.SIZE
@@ -1,12 +1,14 @@
 import enum
+from collections import deque
 from functools import singledispatchmethod
-import ipaddress
 import socket
-from typing import Optional, Type, Union
+import struct
+from typing import Deque, Optional, Type, Union
 from dataclasses import dataclass, field
 
+from ._feed import FeedMixin
 from .errors import ReplyError
-from .._helpers import is_ip_address
+from .._helpers import parse_ip_address
 
 RSV = NULL = AUTH_GRANTED = 0x00
 SOCKS_VER = 0x05
@@ -69,13 +71,19 @@ ReplyMessages = {
 class AuthMethodsRequest:
     username: Optional[str]
     password: Optional[str]
+    # when pipelining, the server must not be able to choose a method
+    # other than the one the client has already committed to
+    pipeline: bool = False
     methods: bytearray = field(init=False)
 
     def __post_init__(self):
-        methods = bytearray([AuthMethod.ANONYMOUS])
-
         if self.username and self.password:
-            methods.append(AuthMethod.USERNAME_PASSWORD)
+            if self.pipeline:
+                methods = bytearray([AuthMethod.USERNAME_PASSWORD])
+            else:
+                methods = bytearray([AuthMethod.ANONYMOUS, AuthMethod.USERNAME_PASSWORD])
+        else:
+            methods = bytearray([AuthMethod.ANONYMOUS])
 
         self.methods = methods
 
@@ -167,10 +175,11 @@ class ConnectRequest:
     def _build_addr_request(self) -> bytes:
         port = self.port.to_bytes(2, 'big')
 
-        if is_ip_address(self.host):
-            ip = ipaddress.ip_address(self.host)
-            address_type = AddressType.from_ip_ver(ip.version)
-            return bytes([address_type]) + ip.packed + port
+        ip = parse_ip_address(self.host)
+        if ip is not None:
+            family, packed = ip
+            address_type = AddressType.from_ip_ver(4 if family == socket.AF_INET else 6)
+            return bytes([address_type]) + packed + port
         else:
             address_type = AddressType.DOMAIN
             host = self.host.encode('idna')
@@ -179,6 +188,9 @@ class ConnectRequest:
 
 @dataclass
 class ConnectReply:
+    HEADER_SIZE = 3  # VER, REP, RSV: enough to tell a failure
+    MIN_SIZE = 7  # an empty domain name as bound address
+
     ver: int
     reply: ReplyCode
     rsv: int
@@ -188,6 +200,31 @@ class ConnectReply:
     def validate(self):
         pass
 
+    @classmethod
+    def size(cls, data) -> int:
+        """
+        The size of the reply starting with data, or a lower bound of it
+        if data is too short to tell.
+        """
+        if len(data) < cls.HEADER_SIZE:
+            return cls.HEADER_SIZE
+
+        ver, reply, rsv = struct.unpack_from('!BBB', data)
+        if ver != SOCKS_VER or reply != ReplyCode.SUCCEEDED or rsv != RSV:
+            return cls.HEADER_SIZE  # loads() will raise
+
+        if len(data) < 5:
+            return cls.MIN_SIZE
+
+        addr_type, addr_len = struct.unpack_from('!BB', data, 3)
+        if addr_type == AddressType.IPV4:
+            return 4 + 4 + 2
+        if addr_type == AddressType.IPV6:
+            return 4 + 16 + 2
+        if addr_type == AddressType.DOMAIN:
+            return 4 + 1 + addr_len + 2
+        return 5  # loads() will raise
+
     @classmethod
     def loads(cls, data: bytes) -> 'ConnectReply':
         if not data:
@@ -219,8 +256,8 @@ class ConnectReply:
         try:
             addr_type = data[3]
             bnd_host_data = data[4:-2]
-            bnd_port_data = data[-2:]
-        except IndexError:
+            (bnd_port,) = struct.unpack_from('!H', data, len(data) - 2)
+        except (IndexError, struct.error):
             raise ReplyError('Malformed connect reply')
 
         if addr_type == AddressType.IPV4:
@@ -229,12 +266,10 @@ class ConnectReply:
             bnd_host = socket.inet_ntop(socket.AF_INET6, bnd_host_data)
         elif addr_type == AddressType.DOMAIN:  # pragma: no cover
             # host_len = bnd_host_data[0]
-            bnd_host = bnd_host_data[1:].decode()
+            bnd_host = bytes(bnd_host_data[1:]).decode()
         else:  # pragma: no cover
             raise ReplyError(f'Invalid address type: {addr_type:#02X}')
 
-        bnd_port = int.from_bytes(bnd_port_data, 'big')
-
         return cls(
             ver=ver,
             reply=reply,
@@ -301,9 +336,13 @@ ConnectionState = Union[
 ]
 
 
-class Connection:
-    def __init__(self):
+class Connection(FeedMixin):
+    def __init__(self, pipeline: bool = False):
         self._state = StateServerWaitingForAuthMethods()
+        self._pipeline = pipeline
+        # requests that have been sent but not yet replied to, oldest first
+        self._pending: Deque[ConnectionState] = deque()
+        self._buffer = bytearray()
 
     @singledispatchmethod
     def send(self, request: Request) -> bytes:
@@ -313,46 +352,81 @@ class Connection:
     def _send_auth_methods(self, request: AuthMethodsRequest) -> bytes:
         if not self._state_is(StateServerWaitingForAuthMethods):
             raise RuntimeError('Server is not currently waiting for auth methods')
-        self._state = StateClientSentAuthMethods(request)
+        self._set_sent_state(StateClientSentAuthMethods(request))
         return request.dumps()
 
     @send.register
     def _send_auth(self, request: AuthRequest) -> bytes:
-        if not self._state_is(StateServerWaitingForAuth):
+        if not (
+            self._state_is(StateServerWaitingForAuth)
+            or self._pipelined_after(StateClientSentAuthMethods, AuthMethod.USERNAME_PASSWORD)
+        ):
             raise RuntimeError('Server is not currently waiting for authentication')
-        self._state = StateClientSentAuthRequest(request)
+        self._set_sent_state(StateClientSentAuthRequest(request))
         return request.dumps()
 
     @send.register
     def _send_connect(self, request: ConnectRequest) -> bytes:
-        if not self._state_is(StateClientAuthenticated):
+        if not (
+            self._state_is(StateClientAuthenticated)
+            or self._pipelined_after(StateClientSentAuthMethods, AuthMethod.ANONYMOUS)
+            or self._pipelined_after(StateClientSentAuthRequest)
+        ):
             raise RuntimeError('Client is not authenticated')
-        self._state = StateClientSentConnectRequest(request)
+        self._set_sent_state(StateClientSentConnectRequest(request))
         return request.dumps()
 
     def receive(self, data: bytes) -> Reply:
+        if not self._pending:
+            raise RuntimeError(f'Invalid connection state: {self._state}')
+
+        state = self._pending.popleft()
+        new_state: ConnectionState
         reply: Reply
 
-        if self._state_is(StateClientSentAuthMethods):
+        if isinstance(state, StateClientSentAuthMethods):
             reply = AuthMethodReply.loads(data)
-            reply.validate(self._state.data)
+            reply.validate(state.data)
             if reply.method == AuthMethod.USERNAME_PASSWORD:
-                self._state = StateServerWaitingForAuth(data=reply)
+                new_state = StateServerWaitingForAuth(data=reply)
             else:
-                self._state = StateClientAuthenticated()
-            return reply
-
-        if self._state_is(StateClientSentAuthRequest):
+                new_state = StateClientAuthenticated()
+        elif isinstance(state, StateClientSentAuthRequest):
             reply = AuthReply.loads(data)
-            self._state = StateClientAuthenticated(data=reply)
-            return reply
-
-        if self._state_is(StateClientSentConnectRequest):
+            new_state = StateClientAuthenticated(data=reply)
+        elif isinstance(state, StateClientSentConnectRequest):
             reply = ConnectReply.loads(data)
-            self._state = StateServerConnected(data=reply)
-            return reply
-
-        raise RuntimeError(f'Invalid connection state: {self._state}')
+            new_state = StateServerConnected(data=reply)
+        else:  # pragma: no cover
+            raise RuntimeError(f'Invalid connection state: {state}')
+
+        # with pipelining the client may already be ahead of the server
+        if not self._pending:
+            self._state = new_state
+
+        return reply
+
+    def _expects_reply(self) -> bool:
+        return bool(self._pending)
+
+    def _reply_size(self, data: bytearray) -> int:
+        state = self._pending[0]
+        if isinstance(state, StateClientSentAuthMethods):
+            return AuthMethodReply.SIZE
+        if isinstance(state, StateClientSentAuthRequest):
+            return AuthReply.SIZE
+        return ConnectReply.size(data)
+
+    def _set_sent_state(self, state: ConnectionState):
+        self._state = state
+        self._pending.append(state)
+
+    def _pipelined_after(self, state_cls: Type[ConnectionState], method=None) -> bool:
+        if not self._pipeline or not self._state_is(state_cls):
+            return False
+        if method is None:
+            return True
+        return bytes(self._state.data.methods) == bytes([method])
 
     def _state_is(self, state_cls: Type[ConnectionState]):
         return self.state.__class__ is state_cls
@@ -0,0 +1,180 @@
+import threading
+import time
+from typing import Any, Dict, Hashable, Iterable, List, NamedTuple, Optional
+
+from ._errors import ProxyConnectionError, ProxyError, ProxyTimeoutError
+
+DEFAULT_EWMA_ALPHA = 0.2
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_BACKOFF = 1.0
+DEFAULT_MAX_BACKOFF = 60.0
+
+# the latency proxies are taken for while none has connected yet
+UNMEASURED_LATENCY = 1.0
+
+
+class ProxyStats(NamedTuple):
+    proxy: Any
+    latency: Optional[float]  # EWMA of successful connect times, None until one succeeds
+    error_rates: Dict[Hashable, float]  # EWMA of failures, by error class
+    in_flight: int
+    circuit_open: bool
+
+    @property
+    def error_rate(self) -> float:
+        return min(sum(self.error_rates.values()), 1.0)
+
+
+def error_class(error: BaseException) -> Hashable:
+    """
+    'timeout', 'connection', the error code of a ProxyError
+    ('reply' if it has none) or the exception type name.
+    """
+    if isinstance(error, ProxyTimeoutError):
+        return 'timeout'
+    if isinstance(error, ProxyConnectionError):
+        return 'connection'
+    if isinstance(error, ProxyError):
+        return error.error_code if error.error_code is not None else 'reply'
+    return type(error).__name__
+
+
+class _Entry:
+    __slots__ = (
+        'proxy',
+        'latency',
+        'error_rates',
+        'in_flight',
+        'failures',
+        'backoff',
+        'open_until',
+        'probing',
+    )
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.latency: Optional[float] = None
+        self.error_rates: Dict[Hashable, float] = {}
+        self.in_flight = 0
+        self.failures = 0  # in a row, of those that tell the proxy is down
+        self.backoff = 0.0
+        self.open_until: Optional[float] = None
+        self.probing = False
+
+    def score(self, unmeasured: float) -> float:
+        # the expected connect time, worse with load and with errors;
+        # proxies not measured yet are taken for unmeasured, until they are
+        latency = self.latency if self.latency is not None else unmeasured
+        error_rate = min(sum(self.error_rates.values()), 0.99)
+        return latency * (self.in_flight + 1) / (1 - error_rate)
+
+
+class ProxySelector:
+    """
+    Picks the proxy to connect through from live statistics: EWMA of
+    connect latency, error rates and connects in flight. A proxy that
+    keeps failing to connect or timing out gets its circuit opened, then
+    after a backoff that doubles each time a single probe connect is let
+    through to find out whether it is back.
+    """
+
+    def __init__(
+        self,
+        proxies: Iterable[Any],
+        alpha: float = DEFAULT_EWMA_ALPHA,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        backoff: float = DEFAULT_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+    ):
+        self._entries = [_Entry(proxy) for proxy in proxies]
+        if not self._entries:
+            raise ValueError('Proxy pool must contain at least one proxy')
+
+        self._alpha = alpha
+        self._failure_threshold = failure_threshold
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._lock = threading.Lock()
+
+    def acquire(self) -> _Entry:
+        now = time.monotonic()
+        with self._lock:
+            # as fast as the fastest proxy, for those not measured yet to get
+            # measured, but no longer once they fail without ever connecting
+            measured = [entry.latency for entry in self._entries if entry.latency is not None]
+            unmeasured = min(measured, default=UNMEASURED_LATENCY)
+
+            best = None
+            best_key = None
+            for entry in self._entries:
+                if entry.open_until is not None and (entry.probing or now < entry.open_until):
+                    continue
+                key = (entry.score(unmeasured), entry.in_flight, entry.latency is not None)
+                if best is None or key < best_key:
+                    best, best_key = entry, key
+
+            if best is None:
+                raise ProxyConnectionError('All proxies are unavailable')
+
+            if best.open_until is not None:  # half-open, this connect is the probe
+                best.probing = True
+            best.in_flight += 1
+            return best
+
+    def release(
+        self,
+        entry: _Entry,
+        latency: Optional[float] = None,
+        error: Optional[BaseException] = None,
+    ):
+        """Reports the outcome of a connect, neither latency nor error if cancelled."""
+        with self._lock:
+            entry.in_flight -= 1
+            was_probing, entry.probing = entry.probing, False
+
+            if error is None and latency is None:
+                return
+
+            alpha = self._alpha
+            for key, rate in entry.error_rates.items():
+                entry.error_rates[key] = rate * (1 - alpha)
+
+            key = error_class(error) if error is not None else None
+            if key is not None:
+                entry.error_rates[key] = entry.error_rates.get(key, 0.0) + alpha
+
+            if latency is not None:
+                if entry.latency is None:
+                    entry.latency = latency
+                else:
+                    entry.latency += alpha * (latency - entry.latency)
+
+            if key not in ('timeout', 'connection'):  # the proxy is up
+                entry.failures = 0
+                entry.backoff = 0.0
+                entry.open_until = None
+                return
+
+            entry.failures += 1
+            # connects started before the circuit opened don't extend it
+            opening = entry.open_until is None and entry.failures >= self._failure_threshold
+            if was_probing or opening:
+                if entry.backoff:
+                    entry.backoff = min(entry.backoff * 2, self._max_backoff)
+                else:
+                    entry.backoff = self._backoff
+                entry.open_until = time.monotonic() + entry.backoff
+
+    def stats(self) -> List[ProxyStats]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                ProxyStats(
+                    proxy=entry.proxy,
+                    latency=entry.latency,
+                    error_rates=dict(entry.error_rates),
+                    in_flight=entry.in_flight,
+                    circuit_open=entry.open_until is not None and now < entry.open_until,
+                )
+                for entry in self._entries
+            ]
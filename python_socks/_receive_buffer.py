@@ -0,0 +1,74 @@
+from typing import Union
+
+DEFAULT_BUFFER_SIZE = 8192
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+class ReceiveBuffer:
+    """
+    Bytes received from a stream and not consumed yet, kept in one reusable
+    buffer. It is filled in large chunks, either in place (writable() then
+    commit()) or by append(), and consumed with take(), which returns
+    memoryview slices that stay valid until the buffer is filled again.
+    """
+
+    def __init__(self, size: int = DEFAULT_BUFFER_SIZE):
+        self._size = size
+        self._data = bytearray()  # allocated once something is received
+        self._view = memoryview(self._data)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def writable(self) -> memoryview:
+        """The free space to receive into, commit() tells how much was."""
+        self._reserve(1)
+        return self._view[self._end:]
+
+    def commit(self, n: int):
+        self._end += n
+
+    def append(self, data: BytesLike):
+        n = len(data)
+        self._reserve(n)
+        self._view[self._end:self._end + n] = data
+        self._end += n
+
+    def take(self, n: int) -> memoryview:
+        """Up to n bytes, oldest first."""
+        n = min(n, len(self))
+        data = self._view[self._start:self._start + n]
+        self._start += n
+        return data
+
+    def unread(self, data: BytesLike):
+        """Puts data back, to be taken before anything else."""
+        n = len(data)
+        if n > self._start:
+            rest = bytes(self.take(len(self)))
+            self._start = self._end = 0
+            self.append(data)
+            self.append(rest)
+            return
+
+        self._start -= n
+        self._view[self._start:self._start + n] = data
+
+    def _reserve(self, n: int):
+        if self._start == self._end:
+            self._start = self._end = 0
+        if len(self._data) - self._end >= n:
+            return
+
+        size = len(self)
+        if size + n > len(self._data):
+            # slices taken earlier keep the old buffer alive, so it is not resized
+            data = bytearray(max(self._size, 2 * len(self._data), size + n))
+            data[:size] = self._view[self._start:self._end]
+            self._data, self._view = data, memoryview(data)
+        else:
+            self._view[:size] = self._view[self._start:self._end]  # overlapping is fine
+        self._start, self._end = 0, size
@@ -0,0 +1,269 @@
+import abc
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from ._abc import SyncResolver, AsyncResolver
+
+DEFAULT_MAXSIZE = 1024
+DEFAULT_TTL = 60
+DEFAULT_NEGATIVE_TTL = 5
+DEFAULT_STALE_TTL = 30
+
+
+class _Entry:
+    __slots__ = ('value', 'error', 'expires_at', 'stale_until')
+
+    def __init__(self, value, error, expires_at, stale_until):
+        self.value = value
+        # what a new error is made of, every caller gets one of its own
+        self.error = None if error is None else (type(error), error.args)
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+    def result(self):
+        if self.error is not None:
+            error_type, args = self.error
+            raise error_type(*args)
+        return self.value
+
+
+class ResolverCache:
+    """
+    Bounded LRU of resolver results with TTL, negative caching
+    and a grace period during which expired results may still be served.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+    ):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._stale_ttl = stale_ttl
+        self._entries: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable):
+        """Returns (entry, is_fresh) or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            if now < entry.expires_at:
+                self._entries.move_to_end(key)
+                return entry, True
+
+            if now < entry.stale_until:
+                self._entries.move_to_end(key)
+                return entry, False
+
+            del self._entries[key]
+            return None
+
+    def set(self, key: Hashable, value: Any):
+        now = time.monotonic()
+        expires_at = now + self._ttl
+        self._put(key, _Entry(value, None, expires_at, expires_at + self._stale_ttl))
+
+    def set_error(self, key: Hashable, error: BaseException):
+        now = time.monotonic()
+        expires_at = now + self._negative_ttl
+        self._put(key, _Entry(None, error, expires_at, expires_at))
+
+    def _put(self, key: Hashable, entry: _Entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _SyncCall:
+    def __init__(self):
+        self.event = threading.Event()
+        self.entry: Optional[_Entry] = None
+
+
+class SyncCachingResolver(SyncResolver):
+    def __init__(self, resolver: SyncResolver, cache: Optional[ResolverCache] = None):
+        self._resolver = resolver
+        self._cache = cache if cache is not None else ResolverCache()
+        self._calls: Dict[Hashable, _SyncCall] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host, port=0, family=0):
+        key = ('resolve', host, port, family)
+        return self._cached(key, lambda: self._resolver.resolve(host, port=port, family=family))
+
+    def resolve_all(self, host, port=0, family=0):
+        key = ('resolve_all', host, port, family)
+        return self._cached(
+            key,
+            lambda: self._resolver.resolve_all(host, port=port, family=family),
+        )
+
+    def _cached(self, key: Hashable, fn: Callable):
+        found = self._cache.get(key)
+        if found is not None:
+            entry, fresh = found
+            if not fresh:
+                self._refresh_in_background(key, fn)
+            return entry.result()
+
+        return self._call(key, fn).result()
+
+    def _call(self, key: Hashable, fn: Callable) -> _Entry:
+        with self._lock:
+            call = self._calls.get(key)
+            owner = call is None
+            if owner:
+                call = self._calls[key] = _SyncCall()
+
+        if not owner:
+            call.event.wait()
+            if call.entry is None:  # the lookup we waited for has failed unexpectedly
+                return self._call(key, fn)
+            return call.entry
+
+        return self._run(key, fn, call)
+
+    def _run(self, key: Hashable, fn: Callable, call: _SyncCall) -> _Entry:
+        try:
+            try:
+                value = fn()
+            except OSError as e:
+                self._cache.set_error(key, e)
+                call.entry = _Entry(None, e, 0, 0)
+            else:
+                self._cache.set(key, value)
+                call.entry = _Entry(value, None, 0, 0)
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+        return call.entry
+
+    def _refresh_in_background(self, key: Hashable, fn: Callable):
+        # claimed before the thread starts, so that a burst of stale hits starts one
+        with self._lock:
+            if key in self._calls:
+                return
+            call = self._calls[key] = _SyncCall()
+
+        def refresh():
+            try:
+                self._run(key, fn, call)
+            except Exception:  # pragma: no cover
+                pass
+
+        try:
+            threading.Thread(target=refresh, daemon=True).start()
+        except RuntimeError:  # pragma: no cover
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+class _AsyncCall:
+    def __init__(self, event):
+        self.event = event
+        self.entry: Optional[_Entry] = None
+
+
+class AsyncCachingResolver(AsyncResolver, metaclass=abc.ABCMeta):
+    def __init__(self, resolver: AsyncResolver, cache: Optional[ResolverCache] = None):
+        self._resolver = resolver
+        self._cache = cache if cache is not None else ResolverCache()
+        self._calls: Dict[Hashable, _AsyncCall] = {}
+
+    async def resolve(self, host, port=0, family=0):
+        key = ('resolve', host, port, family)
+        return await self._cached(
+            key,
+            lambda: self._resolver.resolve(host, port=port, family=family),
+        )
+
+    async def resolve_all(self, host, port=0, family=0):
+        key = ('resolve_all', host, port, family)
+        return await self._cached(
+            key,
+            lambda: self._resolver.resolve_all(host, port=port, family=family),
+        )
+
+    async def _cached(self, key: Hashable, fn: Callable):
+        found = self._cache.get(key)
+        if found is not None:
+            entry, fresh = found
+            if fresh:
+                return entry.result()
+
+            if key not in self._calls and await self._spawn(self._refresh, key, fn):
+                return entry.result()
+
+            try:
+                return (await self._call(key, fn)).result()
+            except OSError:
+                # no way to revalidate in the background: serve stale on error
+                return entry.result()
+
+        return (await self._call(key, fn)).result()
+
+    async def _call(self, key: Hashable, fn: Callable) -> _Entry:
+        call = self._calls.get(key)
+        if call is not None:
+            await call.event.wait()
+            if call.entry is None:  # the lookup we waited for has failed unexpectedly
+                return await self._call(key, fn)
+            return call.entry
+
+        call = self._calls[key] = _AsyncCall(self._create_event())
+        try:
+            try:
+                value = await fn()
+            except OSError as e:
+                self._cache.set_error(key, e)
+                call.entry = _Entry(None, e, 0, 0)
+            else:
+                self._cache.set(key, value)
+                call.entry = _Entry(value, None, 0, 0)
+        finally:
+            del self._calls[key]
+            await self._set_event(call.event)
+
+        return call.entry
+
+    async def _refresh(self, key: Hashable, fn: Callable):
+        try:
+            await self._call(key, fn)
+        except Exception:  # pragma: no cover
+            pass
+
+    @abc.abstractmethod
+    def _create_event(self):
+        """An event of the backend, awaited by the lookups that wait for this one."""
+
+    async def _set_event(self, event):
+        event.set()
+
+    async def _spawn(self, async_fn, *args) -> bool:
+        """
+        Starts async_fn(*args) in the background.
+        Returns False if the backend can't do that.
+        """
+        return False
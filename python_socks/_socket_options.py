@@ -0,0 +1,69 @@
+import socket
+import sys
+from typing import List, Optional, Sequence, Tuple, Union
+
+SocketOption = Tuple[int, int, Union[int, bytes]]  # level, option, value for setsockopt
+SocketOptions = Sequence[SocketOption]
+
+# the handshake is a few small writes, each waiting for the reply to the previous one
+DEFAULT_SOCKET_OPTIONS: SocketOptions = ((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),)
+
+# not exposed by the socket module
+if sys.platform.startswith('linux'):
+    TCP_FASTOPEN_CONNECT: Optional[int] = getattr(socket, 'TCP_FASTOPEN_CONNECT', 30)
+else:
+    TCP_FASTOPEN_CONNECT = None
+
+
+def keepalive_options(
+    idle: Optional[int] = None,
+    interval: Optional[int] = None,
+    count: Optional[int] = None,
+    user_timeout: Optional[float] = None,
+) -> List[SocketOption]:
+    """
+    Options to find out that a long-lived connection is dead: TCP keepalive
+    probes after `idle` seconds without traffic, every `interval` seconds,
+    given up after `count` probes, and TCP_USER_TIMEOUT, the seconds sent
+    data may remain unacknowledged. Those the platform lacks are left out.
+    """
+    options: List[SocketOption] = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+    if user_timeout is not None:
+        user_timeout = int(user_timeout * 1000)  # in milliseconds
+
+    for name, value in (
+        (getattr(socket, 'TCP_KEEPIDLE', getattr(socket, 'TCP_KEEPALIVE', None)), idle),
+        (getattr(socket, 'TCP_KEEPINTVL', None), interval),
+        (getattr(socket, 'TCP_KEEPCNT', None), count),
+        (getattr(socket, 'TCP_USER_TIMEOUT', None), user_timeout),
+    ):
+        if name is not None and value is not None:
+            options.append((socket.IPPROTO_TCP, name, value))
+
+    return options
+
+
+def apply_socket_options(sock, options: Optional[SocketOptions]):
+    """Sets the options on sock, the default ones if options is None."""
+    if options is None:
+        options = DEFAULT_SOCKET_OPTIONS
+    for level, name, value in options:
+        sock.setsockopt(level, name, value)
+
+
+def enable_fast_open(sock) -> bool:
+    """
+    Has the first data sent ride in the SYN to servers that have given
+    the kernel a TCP Fast Open cookie (Linux 4.11+). connect() then returns
+    before the connection is established, and errors connecting show up
+    on the first send or receive. The kernel falls back to a regular
+    handshake by itself, so does this if the option can't be set.
+    """
+    if TCP_FASTOPEN_CONNECT is None:
+        return False
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, TCP_FASTOPEN_CONNECT, 1)
+    except OSError:
+        return False
+    return True
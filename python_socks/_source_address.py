@@ -0,0 +1,84 @@
+import itertools
+import socket
+import sys
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from ._helpers import is_ip_address, is_ipv6_address
+
+# not exposed by the socket module before Python 3.12
+if sys.platform.startswith('linux'):
+    IP_BIND_ADDRESS_NO_PORT: Optional[int] = getattr(socket, 'IP_BIND_ADDRESS_NO_PORT', 24)
+else:
+    IP_BIND_ADDRESS_NO_PORT = None
+
+
+class SourceAddressPool:
+    """
+    Local IP addresses to connect from, taken in turn for each connection.
+    Every address has ephemeral ports of its own, so connecting from several
+    of them multiplies the connections that can be open to the same proxy.
+    Can be passed wherever a local address is accepted.
+    """
+
+    def __init__(self, hosts: Iterable[str]):
+        by_family: Dict[int, list] = {}
+        for host in hosts:
+            if not is_ip_address(host):
+                raise ValueError(f'Invalid source address: {host!r}')
+            family = socket.AF_INET6 if is_ipv6_address(host) else socket.AF_INET
+            by_family.setdefault(family, []).append(host)
+
+        if not by_family:
+            raise ValueError('Source address pool must contain at least one address')
+
+        self._hosts: Dict[int, Iterator[str]] = {
+            family: itertools.cycle(hosts) for family, hosts in by_family.items()
+        }
+
+    def next_host(self, family: int) -> Optional[str]:
+        """The next address of the family, None if there is none."""
+        hosts = self._hosts.get(family)
+        return next(hosts) if hosts is not None else None
+
+
+LocalAddr = Union[Tuple[str, int], SourceAddressPool]
+LocalHost = Union[str, SourceAddressPool]
+
+
+def family_of(host: str) -> int:
+    return socket.AF_INET6 if is_ipv6_address(host) else socket.AF_INET
+
+
+def bind_address(local_addr: Optional[LocalAddr], family: int) -> Optional[Tuple[str, int]]:
+    """The address to bind a socket of the family to, if any."""
+    if isinstance(local_addr, SourceAddressPool):
+        host = local_addr.next_host(family)
+        return (host, 0) if host is not None else None
+    return local_addr
+
+
+def bind_host(host: Optional[LocalHost], family: int) -> Optional[str]:
+    if isinstance(host, SourceAddressPool):
+        return host.next_host(family)
+    return host
+
+
+def prepare_bind(sock, address: Tuple[str, int]):
+    """
+    Leaves picking the local port to connect() rather than bind(), so
+    that a port can be reused for connections to different destinations
+    (Linux 4.2+, elsewhere bind() picks it as usual).
+    """
+    if address[1] != 0 or IP_BIND_ADDRESS_NO_PORT is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_IP, IP_BIND_ADDRESS_NO_PORT, 1)
+    except OSError:  # pragma: no cover
+        pass
+
+
+def bind_socket(sock: socket.socket, local_addr: Optional[LocalAddr]):
+    address = bind_address(local_addr, sock.family)
+    if address is not None:
+        prepare_bind(sock, address)
+        sock.bind(address)
@@ -0,0 +1,69 @@
+import ssl
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+DEFAULT_MAXSIZE = 256
+DEFAULT_TTL = 300
+
+
+class _Entry:
+    __slots__ = ('session', 'expires_at')
+
+    def __init__(self, session, expires_at):
+        self.session = session
+        self.expires_at = expires_at
+
+
+class TLSSessionCache:
+    """
+    Bounded LRU of TLS sessions by SSL context and hostname, with TTL,
+    so that the next handshake with the same server is an abbreviated one.
+    Only the sessions are kept, never the connections they come from.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, ssl_context: ssl.SSLContext, hostname: str) -> Optional[ssl.SSLSession]:
+        key = (ssl_context, hostname)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            if now >= entry.expires_at:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return entry.session
+
+    def put(self, ssl_context: ssl.SSLContext, hostname: str, session: Optional[ssl.SSLSession]):
+        """
+        Remembers session, unless it can't be resumed yet. With TLS 1.3 the
+        session ticket only arrives once the connection has been read from,
+        so the streams put the session of a connection again before they
+        go any further with it (start TLS over it, close it).
+        """
+        if session is None or not session.has_ticket:
+            return
+
+        key = (ssl_context, hostname)
+        with self._lock:
+            self._entries[key] = _Entry(session, time.monotonic() + self._ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,134 @@
+import contextlib
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, ContextManager, List, Optional
+
+from ._types import ProxyType
+
+
+class TracePhase(Enum):
+    CONNECT = 'connect'  # TCP connection to the proxy, including its host name lookup
+    PROXY_TLS = 'proxy_tls'  # TLS handshake with the proxy (proxy_ssl)
+    RESOLVE = 'resolve'  # destination host name lookup (rdns is off)
+    AUTH = 'auth'  # SOCKS5 authentication
+    REQUEST = 'request'  # connect request and the proxy reply to it
+    DEST_TLS = 'dest_tls'  # TLS handshake with the destination (dest_ssl)
+
+
+@dataclass(frozen=True)
+class TraceEvent:
+    phase: TracePhase
+    proxy_type: ProxyType
+    proxy_host: str
+    proxy_port: int
+    start: float  # time.monotonic()
+    end: Optional[float] = None  # None when the phase starts
+    error: Optional[BaseException] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.end is None:
+            return None
+        return self.end - self.start
+
+
+TraceCallback = Callable[[TraceEvent], None]
+
+
+class TraceConfig:
+    """
+    Callbacks run at the start and at the end of each connection phase.
+
+    They are plain functions, called in place for every backend,
+    so they shouldn't block.
+    """
+
+    def __init__(self):
+        self.on_phase_start: List[TraceCallback] = []
+        self.on_phase_end: List[TraceCallback] = []
+
+
+class _PhaseTrace:
+    __slots__ = ('_tracer', '_phase', '_start')
+
+    def __init__(self, tracer: 'Tracer', phase: TracePhase):
+        self._tracer = tracer
+        self._phase = phase
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.monotonic()
+        self._tracer.emit(self._tracer.config.on_phase_start, self._phase, self._start)
+
+    def __exit__(self, exc_type, exc, tb):
+        self._tracer.emit(
+            self._tracer.config.on_phase_end,
+            self._phase,
+            self._start,
+            end=time.monotonic(),
+            error=exc,
+        )
+        return False
+
+
+class Tracer:
+    def __init__(
+        self,
+        config: TraceConfig,
+        proxy_type: ProxyType,
+        proxy_host: str,
+        proxy_port: int,
+    ):
+        self.config = config
+        self._proxy_type = proxy_type
+        self._proxy_host = proxy_host
+        self._proxy_port = proxy_port
+
+    def phase(self, phase: TracePhase) -> ContextManager:
+        return _PhaseTrace(self, phase)
+
+    def emit(
+        self,
+        callbacks: List[TraceCallback],
+        phase: TracePhase,
+        start: float,
+        end: Optional[float] = None,
+        error: Optional[BaseException] = None,
+    ):
+        if not callbacks:
+            return
+
+        event = TraceEvent(
+            phase=phase,
+            proxy_type=self._proxy_type,
+            proxy_host=self._proxy_host,
+            proxy_port=self._proxy_port,
+            start=start,
+            end=end,
+            error=error,
+        )
+        for callback in callbacks:
+            callback(event)
+
+
+class _NullTracer:
+    # shared by all proxies without a TraceConfig, costs one method call per phase
+    _context = contextlib.nullcontext()
+
+    def phase(self, phase: TracePhase) -> ContextManager:
+        return self._context
+
+
+NULL_TRACER = _NullTracer()
+
+
+def create_tracer(
+    config: Optional[TraceConfig],
+    proxy_type: ProxyType,
+    proxy_host: str,
+    proxy_port: int,
+):
+    if config is None:
+        return NULL_TRACER
+    return Tracer(config, proxy_type, proxy_host, proxy_port)
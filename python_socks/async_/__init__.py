@@ -1,3 +1,4 @@
 from ._proxy_chain import ProxyChain
+from ._proxy_pool import ProxyPool
 
-__all__ = ('ProxyChain',)
+__all__ = ('ProxyChain', 'ProxyPool')
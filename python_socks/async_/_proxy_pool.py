@@ -0,0 +1,56 @@
+import time
+from typing import Any, Iterable, List
+
+from .._proxy_pool import (
+    DEFAULT_BACKOFF,
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_MAX_BACKOFF,
+    ProxySelector,
+    ProxyStats,
+)
+
+
+class ProxyPool:
+    """
+    Connects through the proxy that is doing best, going by the live
+    statistics of the connects made through the pool, and keeps away from
+    proxies that fail to connect or time out until a probe finds them back.
+    Works with the proxies of any async backend.
+    """
+
+    def __init__(
+        self,
+        proxies: Iterable[Any],
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        backoff: float = DEFAULT_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+    ):
+        self._selector = ProxySelector(
+            proxies,
+            failure_threshold=failure_threshold,
+            backoff=backoff,
+            max_backoff=max_backoff,
+        )
+
+    async def connect(self, dest_host, dest_port, timeout=None, **kwargs):
+        entry = self._selector.acquire()
+        started = time.monotonic()
+        try:
+            stream = await entry.proxy.connect(
+                dest_host=dest_host,
+                dest_port=dest_port,
+                timeout=timeout,
+                **kwargs,
+            )
+        except Exception as e:
+            self._selector.release(entry, error=e)
+            raise
+        except BaseException:
+            self._selector.release(entry)
+            raise
+
+        self._selector.release(entry, latency=time.monotonic() - started)
+        return stream
+
+    def stats(self) -> List[ProxyStats]:
+        return self._selector.stats()
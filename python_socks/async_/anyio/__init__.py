@@ -1,4 +1,5 @@
 from ._proxy import AnyioProxy as Proxy
 from ._chain import ProxyChain
+from ._resolver import CachingResolver
 
-__all__ = ('Proxy', 'ProxyChain')
+__all__ = ('Proxy', 'ProxyChain', 'CachingResolver')
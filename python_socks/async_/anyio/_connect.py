@@ -1,16 +1,112 @@
-from typing import Optional
+from typing import List, Optional, Sequence
 import anyio
 import anyio.abc
 
+from ... import _abc as abc
+from ..._happy_eyeballs import (
+    DEFAULT_HAPPY_EYEBALLS_DELAY,
+    Address,
+    connect_error,
+    interleave_addresses,
+)
+from ..._helpers import is_ip_address
+from ..._socket_options import SocketOptions, apply_socket_options
+from ..._source_address import LocalHost, SourceAddressPool, bind_host, family_of
+from ._resolver import Resolver
+
 
 async def connect_tcp(
     host: str,
     port: int,
-    local_host: Optional[str] = None,
+    local_host: Optional[LocalHost] = None,
+    resolver: Optional[abc.AsyncResolver] = None,
+    happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+    socket_options: Optional[SocketOptions] = None,
 ) -> anyio.abc.SocketStream:
+    if isinstance(local_host, SourceAddressPool) and resolver is None:
+        resolver = Resolver()  # the family tells which local address to bind to
+
+    if resolver is not None and not is_ip_address(host):
+        addresses = interleave_addresses(await resolver.resolve_all(host=host, port=port))
+        if len(addresses) > 1:
+            return await _connect_happy_eyeballs(
+                addresses=addresses,
+                port=port,
+                local_host=local_host,
+                socket_options=socket_options,
+                delay=happy_eyeballs_delay,
+            )
+        _, host = addresses[0]
+
+    # anyio resolves host names and races the addresses by itself
+    return await _connect_stream(
+        host=host,
+        port=port,
+        local_host=bind_host(local_host, family_of(host)),
+        socket_options=socket_options,
+        happy_eyeballs_delay=happy_eyeballs_delay,
+    )
 
-    return await anyio.connect_tcp(
+
+async def _connect_stream(
+    host: str,
+    port: int,
+    local_host: Optional[str],
+    socket_options: Optional[SocketOptions],
+    **kwargs,
+) -> anyio.abc.SocketStream:
+    stream = await anyio.connect_tcp(
         remote_host=host,
         remote_port=port,
         local_host=local_host,
+        **kwargs,
     )
+    # anyio connects the socket itself, the options are set once connected
+    try:
+        apply_socket_options(stream.extra(anyio.abc.SocketAttribute.raw_socket), socket_options)
+    except OSError:
+        await stream.aclose()
+        raise
+    return stream
+
+
+async def _connect_happy_eyeballs(
+    addresses: Sequence[Address],
+    port: int,
+    local_host: Optional[LocalHost],
+    socket_options: Optional[SocketOptions],
+    delay: Optional[float],
+) -> anyio.abc.SocketStream:
+    winner: Optional[anyio.abc.SocketStream] = None
+    errors: List[OSError] = []
+
+    async def attempt(family, host, failed: anyio.Event):
+        nonlocal winner
+        try:
+            stream = await _connect_stream(
+                host=host,
+                port=port,
+                local_host=bind_host(local_host, family),
+                socket_options=socket_options,
+            )
+        except OSError as e:
+            errors.append(e)
+            failed.set()
+            return
+
+        if winner is None:
+            winner = stream
+            tg.cancel_scope.cancel()
+        else:
+            await stream.aclose()  # pragma: no cover
+
+    async with anyio.create_task_group() as tg:
+        for family, host in addresses:
+            failed = anyio.Event()
+            tg.start_soon(attempt, family, host, failed)
+            with anyio.move_on_after(delay):
+                await failed.wait()
+
+    if winner is None:
+        raise connect_error(errors)
+    return winner
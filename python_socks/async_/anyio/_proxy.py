@@ -4,9 +4,13 @@ import warnings
 
 import anyio
 
+from ... import _abc as abc
+from ..._happy_eyeballs import DEFAULT_HAPPY_EYEBALLS_DELAY
 from ..._types import ProxyType
+from ..._socket_options import SocketOptions
+from ..._trace import TraceConfig, TracePhase, create_tracer
 from ..._helpers import parse_proxy_url
-from ..._errors import ProxyConnectionError, ProxyTimeoutError, ProxyError
+from ..._errors import ProxyTimeoutError, ProxyError, proxy_connection_error
 
 from ._resolver import Resolver
 from ._stream import AnyioSocketStream
@@ -30,6 +34,11 @@ class AnyioProxy:
         password: Optional[str] = None,
         rdns: Optional[bool] = None,
         proxy_ssl: Optional[ssl.SSLContext] = None,
+        pipeline: bool = False,
+        resolver: Optional[abc.AsyncResolver] = None,
+        happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+        trace_config: Optional[TraceConfig] = None,
+        socket_options: Optional[SocketOptions] = None,
     ):
         self._proxy_type = proxy_type
         self._proxy_host = host
@@ -37,9 +46,16 @@ class AnyioProxy:
         self._password = password
         self._username = username
         self._rdns = rdns
+        self._pipeline = pipeline
+        self._happy_eyeballs_delay = happy_eyeballs_delay
+        self._socket_options = socket_options
 
         self._proxy_ssl = proxy_ssl
-        self._resolver = Resolver()
+        self._resolver = resolver if resolver is not None else Resolver()
+        # unless a resolver is given, connect_tcp resolves the proxy host itself
+        self._proxy_host_resolver = resolver
+
+        self._tracer = create_tracer(trace_config, proxy_type, host, port)
 
     async def connect(
         self,
@@ -65,29 +81,34 @@ class AnyioProxy:
             with anyio.fail_after(timeout):
                 if _stream is None:
                     try:
-                        _stream = AnyioSocketStream(
-                            await connect_tcp(
-                                host=self._proxy_host,
-                                port=self._proxy_port,
-                                local_host=local_host,
+                        with self._tracer.phase(TracePhase.CONNECT):
+                            _stream = AnyioSocketStream(
+                                await connect_tcp(
+                                    host=self._proxy_host,
+                                    port=self._proxy_port,
+                                    local_host=local_host,
+                                    resolver=self._proxy_host_resolver,
+                                    happy_eyeballs_delay=self._happy_eyeballs_delay,
+                                    socket_options=self._socket_options,
+                                )
                             )
-                        )
                     except OSError as e:
                         msg = 'Could not connect to proxy {}:{} [{}]'.format(
                             self._proxy_host,
                             self._proxy_port,
                             e.strerror,
                         )
-                        raise ProxyConnectionError(e.errno, msg) from e
+                        raise proxy_connection_error(e.errno, msg) from e
 
                 stream = _stream
 
                 try:
                     if self._proxy_ssl is not None:
-                        stream = await stream.start_tls(
-                            hostname=self._proxy_host,
-                            ssl_context=self._proxy_ssl,
-                        )
+                        with self._tracer.phase(TracePhase.PROXY_TLS):
+                            stream = await stream.start_tls(
+                                hostname=self._proxy_host,
+                                ssl_context=self._proxy_ssl,
+                            )
 
                     connector = create_connector(
                         proxy_type=self._proxy_type,
@@ -95,6 +116,8 @@ class AnyioProxy:
                         password=self._password,
                         rdns=self._rdns,
                         resolver=self._resolver,
+                        pipeline=self._pipeline,
+                        tracer=self._tracer,
                     )
                     await connector.connect(
                         stream=stream,
@@ -103,10 +126,11 @@ class AnyioProxy:
                     )
 
                     if dest_ssl is not None:
-                        stream = await stream.start_tls(
-                            hostname=dest_host,
-                            ssl_context=dest_ssl,
-                        )
+                        with self._tracer.phase(TracePhase.DEST_TLS):
+                            stream = await stream.start_tls(
+                                hostname=dest_host,
+                                ssl_context=dest_ssl,
+                            )
 
                     return stream
                 except ReplyError as e:
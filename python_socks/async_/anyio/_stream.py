@@ -6,6 +6,7 @@ import anyio.abc
 from anyio.streams.tls import TLSStream
 
 from ..._errors import ProxyError
+from ..._receive_buffer import ReceiveBuffer
 from ... import _abc as abc
 
 DEFAULT_RECEIVE_SIZE = 65536
@@ -13,35 +14,50 @@ DEFAULT_RECEIVE_SIZE = 65536
 AnyioStreamType = Union[anyio.abc.SocketStream, TLSStream]
 
 
-class AnyioSocketStream(abc.AsyncSocketStream):
+class AnyioSocketStream(abc.BufferedAsyncSocketStream):
     _stream: AnyioStreamType
+    _buffer: ReceiveBuffer
 
     def __init__(self, stream: AnyioStreamType) -> None:
         self._stream = stream
+        self._buffer = ReceiveBuffer()
+
+    def unread(self, data: bytes):
+        # bytes received past a proxy reply are served before reading any further
+        self._buffer.unread(data)
 
     async def write_all(self, data: bytes):
         await self._stream.send(item=data)
 
     async def read(self, max_bytes: int = DEFAULT_RECEIVE_SIZE):
+        if self._buffer:
+            return bytes(self._buffer.take(max_bytes))
         try:
             return await self._stream.receive(max_bytes=max_bytes)
         except anyio.EndOfStream:  # pragma: no cover
             return b""
 
     async def read_exact(self, n: int):
-        data = bytearray()
-        while len(data) < n:
-            packet = await self.read(n - len(data))
-            if not packet:  # pragma: no cover
+        return bytes(await self.read_exact_view(n))
+
+    async def read_exact_view(self, n: int):
+        # receives whatever has arrived, bytes past n are served by the next reads
+        while len(self._buffer) < n:
+            try:
+                data = await self._stream.receive(max_bytes=len(self._buffer.writable()))
+            except anyio.EndOfStream:  # pragma: no cover
                 raise ProxyError('Connection closed unexpectedly')
-            data += packet
-        return data
+            self._buffer.append(data)
+        return self._buffer.take(n)
 
     async def start_tls(
         self,
         hostname: str,
         ssl_context: ssl.SSLContext,
     ) -> 'AnyioSocketStream':
+        if self._buffer:
+            raise ProxyError('Unexpected data received before TLS handshake')
+
         ssl_stream = await TLSStream.wrap(
             self._stream,
             ssl_context=ssl_context,
@@ -1,7 +1,16 @@
 from ._proxy import AnyioProxy as Proxy
-from ._chain import ProxyChain
+from ._chain import ProxyChain, PooledProxyChain
+from ._hedged import HedgedProxy
+from ._connect_many import connect_many
+from .._resolver import CachingResolver
+from ...._connect_many import ConnectTarget
 
 __all__ = (
     'Proxy',
     'ProxyChain',
+    'PooledProxyChain',
+    'HedgedProxy',
+    'CachingResolver',
+    'ConnectTarget',
+    'connect_many',
 )
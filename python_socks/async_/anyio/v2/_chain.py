@@ -1,16 +1,41 @@
-from typing import Sequence
-import warnings
-from ._proxy import AnyioProxy
+import ssl
+import time
+from collections import deque
+from typing import Deque, Iterable, NamedTuple, Optional
+
+import anyio
+import anyio.abc
+
+from ...._types import ProxyType
+from ...._trace import TracePhase
+from ...._errors import ProxyTimeoutError, ProxyError
+from ...._protocols import socks5
+from ...._protocols.errors import ReplyError
+from ._proxy import DEFAULT_TIMEOUT, AnyioProxy
+from ._stream import AnyioSocketStream
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_IDLE_TIMEOUT = 30
 
 
 class ProxyChain:
-    def __init__(self, proxies: Sequence[AnyioProxy]):
-        warnings.warn(
-            'This implementation of ProxyChain is deprecated and will be removed in the future',
-            DeprecationWarning,
-            stacklevel=2,
+    """
+    Connects through the given proxies in order. The chain never modifies
+    the proxies, so it can be shared by concurrent tasks and a proxy can
+    be part of several chains.
+    """
+
+    def __init__(self, proxies: Iterable[AnyioProxy]):
+        proxies = tuple(proxies)
+        if not proxies:
+            raise ValueError('Proxy chain must contain at least one proxy')
+
+        # every proxy but the last tunnels to the next one
+        self._hops = tuple(
+            (proxy, next_proxy._proxy_host, next_proxy._proxy_port)
+            for proxy, next_proxy in zip(proxies, proxies[1:])
         )
-        self._proxies = proxies
+        self._last = proxies[-1]
 
     async def connect(
         self,
@@ -19,14 +44,198 @@ class ProxyChain:
         dest_ssl=None,
         timeout=None,
     ):
-        forward = None
-        for proxy in self._proxies:
-            proxy._forward = forward
-            forward = proxy
-
-        return await forward.connect(
-            dest_host=dest_host,
-            dest_port=dest_port,
-            dest_ssl=dest_ssl,
-            timeout=timeout,
-        )
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT
+
+        try:
+            with anyio.fail_after(timeout):
+                stream = None
+                for proxy, host, port in self._hops:
+                    stream = await proxy._connect(dest_host=host, dest_port=port, stream=stream)
+
+                return await self._last._connect(
+                    dest_host=dest_host,
+                    dest_port=dest_port,
+                    dest_ssl=dest_ssl,
+                    stream=stream,
+                )
+        except TimeoutError as e:
+            raise ProxyTimeoutError('Proxy connection timed out: {}'.format(timeout)) from e
+
+
+class _Tunnel(NamedTuple):
+    stream: AnyioSocketStream
+    conn: Optional[socks5.Connection]  # set when authenticated with the last proxy
+    parked_at: float
+
+
+class PooledProxyChain(ProxyChain):
+    """
+    A proxy chain that keeps up to `size` tunnels through all proxies but
+    the last one ready, already authenticated with the last proxy, so that
+    connect() only has to send the final CONNECT request. Tunnels are
+    opened in the background while the chain is used as an async context
+    manager.
+    """
+
+    def __init__(
+        self,
+        proxies: Iterable[AnyioProxy],
+        size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        super().__init__(proxies)
+
+        if size < 1:
+            raise ValueError(f'Invalid pool size: {size}')
+
+        self._size = size
+        self._idle_timeout = idle_timeout
+
+        self._tunnels: Deque[_Tunnel] = deque()
+        self._opening = 0
+        self._task_group: Optional[anyio.abc.TaskGroup] = None
+        self._closed = False
+
+    async def __aenter__(self) -> 'PooledProxyChain':
+        task_group = anyio.create_task_group()
+        await task_group.__aenter__()
+        self._task_group = task_group
+        self._refill()
+        return self
+
+    async def __aexit__(self, *args):
+        self._closed = True
+        task_group, self._task_group = self._task_group, None
+        task_group.cancel_scope.cancel()
+        await task_group.__aexit__(None, None, None)
+
+        with anyio.CancelScope(shield=True):
+            while self._tunnels:
+                await self._tunnels.popleft().stream.close()
+
+    @property
+    def size(self) -> int:
+        return len(self._tunnels)
+
+    async def connect(
+        self,
+        dest_host,
+        dest_port,
+        dest_ssl: Optional[ssl.SSLContext] = None,
+        timeout=None,
+    ) -> AnyioSocketStream:
+        if self._task_group is None:
+            raise RuntimeError('Proxy chain is not open, use it as an async context manager')
+
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT
+
+        try:
+            with anyio.fail_after(timeout):
+                stream = await self._request(dest_host=dest_host, dest_port=dest_port)
+
+                if dest_ssl is not None:
+                    try:
+                        # noinspection PyProtectedMember
+                        with self._last._tracer.phase(TracePhase.DEST_TLS):
+                            stream = await stream.start_tls(
+                                hostname=dest_host,
+                                ssl_context=dest_ssl,
+                            )
+                    except BaseException:
+                        with anyio.CancelScope(shield=True):
+                            await stream.close()
+                        raise
+
+                return stream
+        except TimeoutError as e:
+            raise ProxyTimeoutError('Proxy connection timed out: {}'.format(timeout)) from e
+
+    async def _request(self, dest_host: str, dest_port: int) -> AnyioSocketStream:
+        # noinspection PyProtectedMember
+        connector = self._last._create_connector()
+
+        while True:
+            tunnel = await self._acquire()
+            self._refill()
+
+            pooled = tunnel is not None
+            if tunnel is None:
+                tunnel = await self._open_tunnel()
+
+            try:
+                if tunnel.conn is not None:
+                    await connector.request(
+                        stream=tunnel.stream,
+                        conn=tunnel.conn,
+                        host=dest_host,
+                        port=dest_port,
+                    )
+                else:
+                    await connector.connect(stream=tunnel.stream, host=dest_host, port=dest_port)
+            except ReplyError as e:
+                await tunnel.stream.close()
+                raise ProxyError(e, error_code=e.error_code)
+            except Exception:
+                await tunnel.stream.close()
+                if pooled:  # a proxy has dropped the idle tunnel, try another one
+                    continue
+                raise
+            except BaseException:
+                with anyio.CancelScope(shield=True):
+                    await tunnel.stream.close()
+                raise
+
+            return tunnel.stream
+
+    async def _acquire(self) -> Optional[_Tunnel]:
+        deadline = time.monotonic() - self._idle_timeout
+        while self._tunnels and self._tunnels[0].parked_at < deadline:
+            await self._tunnels.popleft().stream.close()
+
+        if self._tunnels:
+            return self._tunnels.pop()  # the most recently parked one
+        return None
+
+    def _refill(self):
+        for _ in range(self._size - len(self._tunnels) - self._opening):
+            self._opening += 1
+            self._task_group.start_soon(self._park_tunnel)
+
+    async def _park_tunnel(self):
+        try:
+            with anyio.fail_after(DEFAULT_TIMEOUT):
+                tunnel = await self._open_tunnel()
+        except Exception:  # the next connect() tries again
+            return
+        finally:
+            self._opening -= 1
+
+        if self._closed:
+            with anyio.CancelScope(shield=True):
+                await tunnel.stream.close()
+        else:
+            self._tunnels.append(tunnel)
+
+    async def _open_tunnel(self) -> _Tunnel:
+        stream = None
+        for proxy, host, port in self._hops:
+            stream = await proxy._connect(dest_host=host, dest_port=port, stream=stream)
+
+        proxy = self._last
+        stream = await proxy._connect_to_proxy(stream=stream)
+        if proxy._proxy_type != ProxyType.SOCKS5:
+            return _Tunnel(stream=stream, conn=None, parked_at=time.monotonic())
+
+        try:
+            conn = await proxy._create_connector().authenticate(stream)
+        except ReplyError as e:
+            await stream.close()
+            raise ProxyError(e, error_code=e.error_code)
+        except BaseException:
+            with anyio.CancelScope(shield=True):
+                await stream.close()
+            raise
+
+        return _Tunnel(stream=stream, conn=conn, parked_at=time.monotonic())
@@ -1,17 +1,26 @@
 from typing import Optional
-import anyio
-import anyio.abc
 from ._stream import AnyioSocketStream
+from .. import _connect
+from .... import _abc as abc
+from ...._happy_eyeballs import DEFAULT_HAPPY_EYEBALLS_DELAY
+from ...._socket_options import SocketOptions
+from ...._source_address import LocalHost
 
 
 async def connect_tcp(
     host: str,
     port: int,
-    local_host: Optional[str] = None,
+    local_host: Optional[LocalHost] = None,
+    resolver: Optional[abc.AsyncResolver] = None,
+    happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+    socket_options: Optional[SocketOptions] = None,
 ) -> AnyioSocketStream:
-    s = await anyio.connect_tcp(
-        remote_host=host,
-        remote_port=port,
+    s = await _connect.connect_tcp(
+        host=host,
+        port=port,
         local_host=local_host,
+        resolver=resolver,
+        happy_eyeballs_delay=happy_eyeballs_delay,
+        socket_options=socket_options,
     )
     return AnyioSocketStream(s)
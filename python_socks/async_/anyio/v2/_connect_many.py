@@ -0,0 +1,122 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable, Optional, Tuple, Union
+
+import anyio
+
+from .... import _abc as abc
+from .._resolver import CachingResolver
+from ...._connect_many import (
+    DEFAULT_CONCURRENCY,
+    BatchProxies,
+    as_target,
+    check_concurrency,
+)
+from ._proxy import AnyioProxy
+from ._stream import AnyioSocketStream
+
+Result = Tuple[Any, Union[AnyioSocketStream, Exception]]
+
+
+async def _connect(proxies: BatchProxies, target, timeout: Optional[float]):
+    target = as_target(target)
+    proxy, limiter = proxies.acquire(target.proxy)
+    try:
+        if limiter is None:
+            return await proxy.connect(
+                dest_host=target.dest_host,
+                dest_port=target.dest_port,
+                dest_ssl=target.dest_ssl,
+                timeout=timeout,
+            )
+        async with limiter:
+            return await proxy.connect(
+                dest_host=target.dest_host,
+                dest_port=target.dest_port,
+                dest_ssl=target.dest_ssl,
+                timeout=timeout,
+            )
+    finally:
+        proxies.release(target.proxy)
+
+
+async def _worker(proxies, target, timeout, send_channel, slots):
+    async with send_channel:
+        try:
+            try:
+                result = await _connect(proxies, target, timeout)
+            except Exception as e:
+                result = e
+
+            try:
+                await send_channel.send((target, result))
+            except BaseException:
+                if isinstance(result, AnyioSocketStream):
+                    with anyio.CancelScope(shield=True):
+                        await result.close()
+                raise
+        finally:
+            slots.release()
+
+
+async def _produce(tg, targets, proxies, timeout, send_channel, slots):
+    async with send_channel:
+        for target in targets:
+            await slots.acquire()
+            tg.start_soon(
+                _worker,
+                proxies,
+                target,
+                timeout,
+                send_channel.clone(),
+                slots,
+            )
+
+
+@asynccontextmanager
+async def connect_many(
+    targets: Iterable[Any],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_proxy_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    resolver: Optional[abc.AsyncResolver] = None,
+) -> AsyncIterator[AsyncIterator[Result]]:
+    """
+    Connects to many destinations, each through its own proxy, and provides
+    (target, stream) or (target, exception) pairs in completion order:
+
+        async with connect_many(targets) as results:
+            async for target, result in results:
+                ...
+
+    Targets are ConnectTarget tuples (or plain tuples of the same shape),
+    pulled from `targets` lazily so that no more than `concurrency`
+    connections are in progress at once. Connections still in progress
+    when the block is left are cancelled.
+    """
+    check_concurrency(concurrency)
+    if resolver is None:
+        resolver = CachingResolver()
+
+    proxies = BatchProxies(
+        create_proxy=lambda url: AnyioProxy.from_url(url, resolver=resolver),
+        create_limiter=anyio.Semaphore,
+        per_proxy_concurrency=per_proxy_concurrency,
+    )
+
+    send_channel, receive_channel = anyio.create_memory_object_stream(0)
+    slots = anyio.Semaphore(concurrency)
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(
+            _produce,
+            tg,
+            iter(targets),
+            proxies,
+            timeout,
+            send_channel,
+            slots,
+        )
+        async with receive_channel:
+            try:
+                yield receive_channel
+            finally:
+                tg.cancel_scope.cancel()
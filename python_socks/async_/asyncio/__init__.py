@@ -1,4 +1,5 @@
 from ._proxy import AsyncioProxy as Proxy
+from ._resolver import CachingResolver
 
 
-__all__ = ('Proxy',)
+__all__ = ('Proxy', 'CachingResolver')
@@ -1,24 +1,53 @@
 import socket
 import asyncio
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence
 
 from ._resolver import Resolver
+from ... import _abc as abc
+from ..._happy_eyeballs import (
+    DEFAULT_HAPPY_EYEBALLS_DELAY,
+    Address,
+    connect_error,
+    interleave_addresses,
+)
 from ..._helpers import is_ipv4_address, is_ipv6_address
+from ..._socket_options import SocketOptions, apply_socket_options, enable_fast_open
+from ..._source_address import LocalAddr, bind_socket
 
 
 async def connect_tcp(
     host: str,
     port: int,
     loop: asyncio.AbstractEventLoop,
-    local_addr: Optional[Tuple[str, int]] = None,
+    local_addr: Optional[LocalAddr] = None,
+    resolver: Optional[abc.AsyncResolver] = None,
+    happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+    socket_options: Optional[SocketOptions] = None,
+    fast_open: bool = False,
 ) -> socket.socket:
 
-    family, host = await _resolve_host(host, loop)
+    addresses = await _resolve_host(host, port, loop, resolver)
 
+    if len(addresses) == 1:
+        family, host = addresses[0]
+        return await _connect_sock(family, host, port, loop, local_addr, socket_options, fast_open)
+
+    # no fast open while racing, attempts would "connect" before reaching the host
+    return await _connect_happy_eyeballs(
+        addresses=addresses,
+        port=port,
+        loop=loop,
+        local_addr=local_addr,
+        socket_options=socket_options,
+        delay=happy_eyeballs_delay,
+    )
+
+
+async def _connect_sock(
+    family, host, port, loop, local_addr, socket_options, fast_open=False
+) -> socket.socket:
     sock = socket.socket(family=family, type=socket.SOCK_STREAM)
     sock.setblocking(False)
-    if local_addr is not None:  # pragma: no cover
-        sock.bind(local_addr)
 
     if is_ipv6_address(host):
         address = (host, port, 0, 0)  # to fix OSError: [WinError 10022]
@@ -26,18 +55,78 @@ async def connect_tcp(
         address = (host, port)  # type: ignore[assignment]
 
     try:
+        apply_socket_options(sock, socket_options)
+        if fast_open:
+            enable_fast_open(sock)
+        bind_socket(sock, local_addr)
         await loop.sock_connect(sock=sock, address=address)
-    except OSError:
+    except (asyncio.CancelledError, Exception):
         sock.close()
         raise
     return sock
 
 
-async def _resolve_host(host, loop):
+async def _connect_happy_eyeballs(
+    addresses: Sequence[Address],
+    port: int,
+    loop: asyncio.AbstractEventLoop,
+    local_addr: Optional[LocalAddr],
+    socket_options: Optional[SocketOptions],
+    delay: Optional[float],
+) -> socket.socket:
+    remaining = list(addresses)
+    errors: List[OSError] = []
+    pending: set = set()
+
+    try:
+        while remaining or pending:
+            if remaining:
+                family, host = remaining.pop(0)
+                pending.add(
+                    loop.create_task(
+                        _connect_sock(family, host, port, loop, local_addr, socket_options)
+                    )
+                )
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=delay if remaining else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:  # delay has passed, start the next attempt
+                    break
+
+                for task in done:
+                    if task.exception() is None:
+                        _close_connected(done - {task})
+                        return task.result()
+                    errors.append(task.exception())  # type: ignore[arg-type]
+
+                if remaining:  # an attempt has failed, don't wait for the delay
+                    break
+
+        raise connect_error(errors)
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+            _close_connected(pending)
+
+
+def _close_connected(tasks):
+    for task in tasks:
+        if not task.cancelled() and task.exception() is None:
+            task.result().close()
+
+
+async def _resolve_host(host, port, loop, resolver=None) -> List[Address]:
     if is_ipv4_address(host):
-        return socket.AF_INET, host
+        return [(socket.AF_INET, host)]
     if is_ipv6_address(host):
-        return socket.AF_INET6, host
+        return [(socket.AF_INET6, host)]
 
-    resolver = Resolver(loop=loop)
-    return await resolver.resolve(host=host)
+    if resolver is None:
+        resolver = Resolver(loop=loop)
+    return interleave_addresses(await resolver.resolve_all(host=host, port=port))
@@ -4,9 +4,14 @@ import sys
 from typing import Any, Optional
 import warnings
 
+from ... import _abc as abc
+from ..._happy_eyeballs import DEFAULT_HAPPY_EYEBALLS_DELAY
 from ..._types import ProxyType
+from ..._socket_options import SocketOptions
+from ..._trace import TraceConfig, TracePhase, create_tracer
 from ..._helpers import parse_proxy_url
 from ..._errors import ProxyConnectionError, ProxyTimeoutError, ProxyError
+from ..._errors import is_connect_error, proxy_connection_error
 from ._stream import AsyncioSocketStream
 from ._resolver import Resolver
 
@@ -33,6 +38,12 @@ class AsyncioProxy:
         password: Optional[str] = None,
         rdns: Optional[bool] = None,
         loop: Optional[asyncio.AbstractEventLoop] = None,
+        pipeline: bool = False,
+        resolver: Optional[abc.AsyncResolver] = None,
+        happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+        trace_config: Optional[TraceConfig] = None,
+        socket_options: Optional[SocketOptions] = None,
+        fast_open: bool = False,
     ):
         if loop is None:
             loop = asyncio.get_event_loop()
@@ -45,8 +56,14 @@ class AsyncioProxy:
         self._password = password
         self._username = username
         self._rdns = rdns
+        self._pipeline = pipeline
+        self._happy_eyeballs_delay = happy_eyeballs_delay
+        self._socket_options = socket_options
+        self._fast_open = fast_open
 
-        self._resolver = Resolver(loop=loop)
+        self._resolver = resolver if resolver is not None else Resolver(loop=loop)
+
+        self._tracer = create_tracer(trace_config, proxy_type, host, port)
 
     async def connect(
         self,
@@ -85,21 +102,25 @@ class AsyncioProxy:
         _socket=None,
         local_addr=None,
     ) -> socket.socket:
+        # over a socket connected with fast open, the proxy may turn out
+        # unreachable only once the handshake is sent
+        fast_open = self._fast_open and _socket is None
+
         if _socket is None:
             try:
-                _socket = await connect_tcp(
-                    host=self._proxy_host,
-                    port=self._proxy_port,
-                    loop=self._loop,
-                    local_addr=local_addr,
-                )
+                with self._tracer.phase(TracePhase.CONNECT):
+                    _socket = await connect_tcp(
+                        host=self._proxy_host,
+                        port=self._proxy_port,
+                        loop=self._loop,
+                        local_addr=local_addr,
+                        resolver=self._resolver,
+                        happy_eyeballs_delay=self._happy_eyeballs_delay,
+                        socket_options=self._socket_options,
+                        fast_open=self._fast_open,
+                    )
             except OSError as e:
-                msg = 'Could not connect to proxy {}:{} [{}]'.format(
-                    self._proxy_host,
-                    self._proxy_port,
-                    e.strerror,
-                )
-                raise ProxyConnectionError(e.errno, msg) from e
+                raise self._connection_error(e) from e
 
         stream = AsyncioSocketStream(sock=_socket, loop=self._loop)
 
@@ -110,6 +131,8 @@ class AsyncioProxy:
                 password=self._password,
                 rdns=self._rdns,
                 resolver=self._resolver,
+                pipeline=self._pipeline,
+                tracer=self._tracer,
             )
             await connector.connect(
                 stream=stream,
@@ -121,10 +144,23 @@ class AsyncioProxy:
         except ReplyError as e:
             await stream.close()
             raise ProxyError(e, error_code=e.error_code)
+        except OSError as e:
+            await stream.close()
+            if fast_open and is_connect_error(e):
+                raise self._connection_error(e) from e
+            raise
         except (asyncio.CancelledError, Exception):  # pragma: no cover
             await stream.close()
             raise
 
+    def _connection_error(self, e: OSError) -> ProxyConnectionError:
+        msg = 'Could not connect to proxy {}:{} [{}]'.format(
+            self._proxy_host,
+            self._proxy_port,
+            e.strerror,
+        )
+        return proxy_connection_error(e.errno, msg)
+
     @property
     def proxy_host(self):
         return self._proxy_host
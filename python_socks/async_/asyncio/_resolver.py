@@ -1,15 +1,25 @@
 import asyncio
 import socket
+from typing import Optional, Set
 
 from ... import _abc as abc
+from ..._happy_eyeballs import unique_addresses
+from ..._resolver_cache import (
+    AsyncCachingResolver,
+    ResolverCache,
+    DEFAULT_MAXSIZE,
+    DEFAULT_TTL,
+    DEFAULT_NEGATIVE_TTL,
+    DEFAULT_STALE_TTL,
+)
 
 
 class Resolver(abc.AsyncResolver):
-    def __init__(self, loop: asyncio.AbstractEventLoop):
-        self._loop = loop
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self._loop = loop  # the running loop by default
 
     async def resolve(self, host, port=0, family=socket.AF_UNSPEC):
-        infos = await self._loop.getaddrinfo(
+        infos = await self._get_loop().getaddrinfo(
             host=host,
             port=port,
             family=family,
@@ -23,3 +33,55 @@ class Resolver(abc.AsyncResolver):
 
         family, _, _, _, address = infos[0]
         return family, address[0]
+
+    async def resolve_all(self, host, port=0, family=socket.AF_UNSPEC):
+        infos = await self._get_loop().getaddrinfo(
+            host=host,
+            port=port,
+            family=family,
+            type=socket.SOCK_STREAM,
+        )
+
+        if not infos:  # pragma: no cover
+            raise OSError('Can`t resolve address {}:{} [{}]'.format(host, port, family))
+
+        return unique_addresses(infos)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is not None:
+            return self._loop
+        return asyncio.get_running_loop()
+
+
+class CachingResolver(AsyncCachingResolver):
+    def __init__(
+        self,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        resolver: Optional[abc.AsyncResolver] = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+    ):
+        if resolver is None:
+            resolver = Resolver(loop=loop)
+
+        super().__init__(
+            resolver,
+            ResolverCache(
+                maxsize=maxsize,
+                ttl=ttl,
+                negative_ttl=negative_ttl,
+                stale_ttl=stale_ttl,
+            ),
+        )
+        self._tasks: Set[asyncio.Future] = set()
+
+    def _create_event(self):
+        return asyncio.Event()
+
+    async def _spawn(self, async_fn, *args) -> bool:
+        task = asyncio.ensure_future(async_fn(*args))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
@@ -23,14 +23,59 @@ class AsyncioSocketStream(abc.AsyncSocketStream):
         return await self._loop.sock_recv(self._socket, max_bytes)
 
     async def read_exact(self, n):
+        # not a byte past n, the socket is handed over to the caller once connected
+        data = bytearray(n)
+        received = 0
+        with memoryview(data) as view:
+            while received < n:
+                size = await self._loop.sock_recv_into(self._socket, view[received:])
+                if not size:  # pragma: no cover
+                    raise ProxyError('Connection closed unexpectedly')
+                received += size
+        return data
+
+    async def read_until(self, separator: bytes, max_bytes: int):
+        # what has arrived is looked at before being received,
+        # so that not a byte past separator is
         data = bytearray()
-        while len(data) < n:
-            packet = await self._loop.sock_recv(self._socket, n - len(data))
-            if not packet:  # pragma: no cover
+        while len(data) < max_bytes:
+            try:
+                peeked = await self._peek(max_bytes - len(data))
+            except NotImplementedError:  # pragma: no cover
+                # event loops with no readiness callbacks (proactor): a byte at a time
+                data += await self.read_exact(1)
+                if data.endswith(separator):
+                    break
+                continue
+            if not peeked:
                 raise ProxyError('Connection closed unexpectedly')
-            data += packet
+            end = (data + peeked).find(separator, max(len(data) - len(separator) + 1, 0))
+            n = len(peeked) if end == -1 else end + len(separator) - len(data)
+            data += await self.read_exact(n)
+            if end != -1:
+                break
         return data
 
+    async def _peek(self, max_bytes: int) -> bytes:
+        while True:
+            try:
+                return self._socket.recv(max_bytes, socket.MSG_PEEK)
+            except (BlockingIOError, InterruptedError):
+                pass
+
+            waiter = self._loop.create_future()
+            fd = self._socket.fileno()
+            self._loop.add_reader(fd, _wakeup, waiter)
+            try:
+                await waiter
+            finally:
+                self._loop.remove_reader(fd)
+
     async def close(self):
         if self._socket is not None:
             self._socket.close()
+
+
+def _wakeup(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
@@ -1,4 +1,18 @@
 from ._proxy import AsyncioProxy as Proxy
-from ._chain import ProxyChain
+from ._chain import ProxyChain, PooledProxyChain
+from ._hedged import HedgedProxy
+from ._pool import WarmProxyPool
+from ._connect_many import connect_many
+from .._resolver import CachingResolver
+from ...._connect_many import ConnectTarget
 
-__all__ = ('Proxy', 'ProxyChain')
+__all__ = (
+    'Proxy',
+    'ProxyChain',
+    'PooledProxyChain',
+    'HedgedProxy',
+    'WarmProxyPool',
+    'CachingResolver',
+    'ConnectTarget',
+    'connect_many',
+)
@@ -1,26 +1,109 @@
 import asyncio
-from typing import Optional, Tuple
+from typing import Optional
 from ._stream import AsyncioSocketStream
+from ._transport import HandshakeProtocol, TransportSocketStream
+from .. import _connect
+from .... import _abc as abc
+from ...._happy_eyeballs import DEFAULT_HAPPY_EYEBALLS_DELAY
+from ...._socket_options import SocketOptions, apply_socket_options
+from ...._source_address import LocalAddr
+
+
+def _connects_itself(loop, local_addr, resolver, fast_open) -> bool:
+    # bound here rather than by asyncio, to leave the port choice to connect(),
+    # fast open has to be enabled before connecting, and other event loops
+    # (uvloop) don't do happy eyeballs
+    return (
+        resolver is not None
+        or local_addr is not None
+        or fast_open
+        or not isinstance(loop, asyncio.BaseEventLoop)
+    )
 
 
 async def connect_tcp(
     host: str,
     port: int,
     loop: asyncio.AbstractEventLoop,
-    local_addr: Optional[Tuple[str, int]] = None,
+    local_addr: Optional[LocalAddr] = None,
+    resolver: Optional[abc.AsyncResolver] = None,
+    happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+    socket_options: Optional[SocketOptions] = None,
+    fast_open: bool = False,
 ) -> AsyncioSocketStream:
-    kwargs = {}
-    if local_addr is not None:
-        kwargs['local_addr'] = local_addr  # pragma: no cover
-
-    reader, writer = await asyncio.open_connection(
-        host=host,
-        port=port,
-        **kwargs,  # type: ignore
-    )
+    if _connects_itself(loop, local_addr, resolver, fast_open):
+        sock = await _connect.connect_tcp(
+            host=host,
+            port=port,
+            loop=loop,
+            local_addr=local_addr,
+            resolver=resolver,
+            happy_eyeballs_delay=happy_eyeballs_delay,
+            socket_options=socket_options,
+            fast_open=fast_open,
+        )
+        reader, writer = await asyncio.open_connection(sock=sock)
+    else:
+        reader, writer = await asyncio.open_connection(
+            host=host,
+            port=port,
+            happy_eyeballs_delay=happy_eyeballs_delay,
+            interleave=1,
+        )
+        # asyncio connects the socket itself, the options are set once connected
+        try:
+            apply_socket_options(writer.get_extra_info('socket'), socket_options)
+        except OSError:
+            writer.close()
+            raise
 
     return AsyncioSocketStream(
         loop=loop,
         reader=reader,
         writer=writer,
     )
+
+
+async def connect_transport(
+    host: str,
+    port: int,
+    loop: asyncio.AbstractEventLoop,
+    local_addr: Optional[LocalAddr] = None,
+    resolver: Optional[abc.AsyncResolver] = None,
+    happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+    socket_options: Optional[SocketOptions] = None,
+    fast_open: bool = False,
+) -> TransportSocketStream:
+    """As connect_tcp, with no stream reader and writer over the transport."""
+    protocol = HandshakeProtocol(loop)
+    if _connects_itself(loop, local_addr, resolver, fast_open):
+        sock = await _connect.connect_tcp(
+            host=host,
+            port=port,
+            loop=loop,
+            local_addr=local_addr,
+            resolver=resolver,
+            happy_eyeballs_delay=happy_eyeballs_delay,
+            socket_options=socket_options,
+            fast_open=fast_open,
+        )
+        transport, _ = await loop.create_connection(lambda: protocol, sock=sock)
+    else:
+        transport, _ = await loop.create_connection(
+            lambda: protocol,
+            host=host,
+            port=port,
+            happy_eyeballs_delay=happy_eyeballs_delay,
+            interleave=1,
+        )
+        try:
+            apply_socket_options(transport.get_extra_info('socket'), socket_options)
+        except OSError:
+            transport.abort()
+            raise
+
+    return TransportSocketStream(
+        loop=loop,
+        transport=transport,  # type: ignore[arg-type]
+        protocol=protocol,
+    )
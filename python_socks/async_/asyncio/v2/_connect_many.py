@@ -0,0 +1,98 @@
+import asyncio
+import collections
+import itertools
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, Optional, Tuple, Union
+
+from .... import _abc as abc
+from .._resolver import CachingResolver
+from ...._connect_many import (
+    DEFAULT_CONCURRENCY,
+    BatchProxies,
+    as_target,
+    check_concurrency,
+)
+from ._proxy import AsyncioProxy
+from ._stream import AsyncioSocketStream
+
+Result = Tuple[Any, Union[AsyncioSocketStream, Exception]]
+
+
+async def _connect(proxies: BatchProxies, target, timeout: Optional[float]):
+    target = as_target(target)
+    proxy, limiter = proxies.acquire(target.proxy)
+    try:
+        if limiter is None:
+            return await proxy.connect(
+                dest_host=target.dest_host,
+                dest_port=target.dest_port,
+                dest_ssl=target.dest_ssl,
+                timeout=timeout,
+            )
+        async with limiter:
+            return await proxy.connect(
+                dest_host=target.dest_host,
+                dest_port=target.dest_port,
+                dest_ssl=target.dest_ssl,
+                timeout=timeout,
+            )
+    finally:
+        proxies.release(target.proxy)
+
+
+async def connect_many(
+    targets: Iterable[Any],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_proxy_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    resolver: Optional[abc.AsyncResolver] = None,
+) -> AsyncIterator[Result]:
+    """
+    Connects to many destinations, each through its own proxy, and yields
+    (target, stream) or (target, exception) pairs in completion order.
+
+    Targets are ConnectTarget tuples (or plain tuples of the same shape),
+    pulled from `targets` lazily so that no more than `concurrency`
+    connections are in progress at once. Streams left unconsumed when the
+    generator is closed early are closed, so wrap it in
+    contextlib.aclosing() when breaking out of the loop.
+    """
+    check_concurrency(concurrency)
+    if resolver is None:
+        resolver = CachingResolver()
+
+    proxies = BatchProxies(
+        create_proxy=lambda url: AsyncioProxy.from_url(url, resolver=resolver),
+        create_limiter=asyncio.Semaphore,
+        per_proxy_concurrency=per_proxy_concurrency,
+    )
+
+    targets = iter(targets)
+    pending: Dict[asyncio.Task, Any] = {}
+    ready: Deque[Result] = collections.deque()
+    try:
+        while True:
+            for target in itertools.islice(targets, concurrency - len(pending)):
+                task = asyncio.ensure_future(_connect(proxies, target, timeout))
+                pending[task] = target
+
+            if not pending:
+                break
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                target = pending.pop(task)
+                try:
+                    ready.append((target, task.result()))
+                except Exception as e:
+                    ready.append((target, e))
+
+            while ready:
+                yield ready.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        results.extend(result for _, result in ready)
+        for result in results:
+            if isinstance(result, AsyncioSocketStream):
+                await result.close()
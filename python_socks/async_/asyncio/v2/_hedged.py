@@ -0,0 +1,116 @@
+import asyncio
+import ssl
+import sys
+from typing import Iterable, List, Optional
+
+from ...._errors import ProxyTimeoutError
+from ...._hedging import DEFAULT_MAX_ATTEMPTS, Hedging
+from ._proxy import DEFAULT_TIMEOUT, AsyncioProxy
+from ._stream import AsyncioSocketStream
+
+if sys.version_info >= (3, 11):
+    import asyncio as async_timeout  # pylint:disable=reimported
+else:
+    import async_timeout
+
+
+class HedgedProxy:
+    """
+    Connects through one of several equivalent proxies, taken in turn.
+    When a connection takes longer than `hedge_delay` (by default the 95th
+    percentile of recent connect times), another proxy is tried alongside,
+    up to `max_attempts` proxies. The first stream established is returned,
+    the other attempts are cancelled.
+    """
+
+    def __init__(
+        self,
+        proxies: Iterable[AsyncioProxy],
+        hedge_delay: Optional[float] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ):
+        self._proxies = tuple(proxies)
+        self._hedging = Hedging(len(self._proxies), delay=hedge_delay, max_attempts=max_attempts)
+
+    async def connect(
+        self,
+        dest_host: str,
+        dest_port: int,
+        dest_ssl: Optional[ssl.SSLContext] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncioSocketStream:
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT
+
+        try:
+            async with async_timeout.timeout(timeout):
+                return await self._connect(
+                    dest_host=dest_host,
+                    dest_port=dest_port,
+                    dest_ssl=dest_ssl,
+                )
+        except asyncio.TimeoutError as e:
+            raise ProxyTimeoutError('Proxy connection timed out: {}'.format(timeout)) from e
+
+    async def _connect(
+        self,
+        dest_host: str,
+        dest_port: int,
+        dest_ssl: Optional[ssl.SSLContext] = None,
+    ) -> AsyncioSocketStream:
+        loop = asyncio.get_running_loop()
+        delay = self._hedging.delay()
+        remaining = list(self._hedging.order(self._proxies))
+        errors: List[Exception] = []
+        pending: set = set()
+
+        async def attempt(proxy: AsyncioProxy) -> AsyncioSocketStream:
+            started = loop.time()
+            try:
+                stream = await proxy._connect(
+                    dest_host=dest_host,
+                    dest_port=dest_port,
+                    dest_ssl=dest_ssl,
+                )
+            except asyncio.CancelledError:
+                self._hedging.record(loop.time() - started)
+                raise
+            self._hedging.record(loop.time() - started)
+            return stream
+
+        try:
+            while remaining or pending:
+                if remaining:
+                    pending.add(loop.create_task(attempt(remaining.pop(0))))
+
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending,
+                        timeout=delay if remaining else None,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    if not done:  # delay has passed, hedge with the next proxy
+                        break
+
+                    for task in done:
+                        if task.exception() is None:
+                            await _close_connected(done - {task})
+                            return task.result()
+                        errors.append(task.exception())  # type: ignore[arg-type]
+
+                    if remaining:  # an attempt has failed, don't wait for the delay
+                        break
+
+            raise errors[0]
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+                await _close_connected(pending)
+
+
+async def _close_connected(tasks):
+    for task in tasks:
+        if not task.cancelled() and task.exception() is None:
+            await task.result().close()
@@ -0,0 +1,238 @@
+import asyncio
+import ssl
+import sys
+import time
+from collections import deque
+from typing import Deque, NamedTuple, Optional, Tuple
+
+from ...._types import ProxyType
+from ...._trace import TracePhase
+from ...._errors import ProxyTimeoutError, ProxyError
+from ...._protocols import socks5
+from ...._protocols.errors import ReplyError
+from ...._connectors.socks5_async import Socks5AsyncConnector
+
+from ._proxy import AsyncioProxy, DEFAULT_TIMEOUT
+from ._stream import AsyncioSocketStream
+
+if sys.version_info >= (3, 11):
+    import asyncio as async_timeout  # pylint:disable=reimported
+else:
+    import async_timeout
+
+DEFAULT_MIN_SIZE = 1
+DEFAULT_MAX_SIZE = 10
+DEFAULT_IDLE_TIMEOUT = 30
+RETRY_DELAY = 1
+
+
+class _Session(NamedTuple):
+    stream: AsyncioSocketStream
+    conn: socks5.Connection
+    parked_at: float
+
+
+class WarmProxyPool:
+    """
+    Keeps a number of SOCKS5 sessions to a proxy that are already
+    connected and authenticated, so that connect() only has to send
+    the CONNECT request.
+    """
+
+    def __init__(
+        self,
+        proxy: AsyncioProxy,
+        min_size: int = DEFAULT_MIN_SIZE,
+        max_size: int = DEFAULT_MAX_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        local_addr: Optional[Tuple[str, int]] = None,
+    ):
+        if proxy.proxy_type != ProxyType.SOCKS5:
+            raise ValueError(f'Unsupported proxy type: {proxy.proxy_type}')
+
+        if not 0 <= min_size <= max_size:
+            raise ValueError(f'Invalid pool size: min_size={min_size}, max_size={max_size}')
+
+        self._proxy = proxy
+        self._min_size = min_size
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._local_addr = local_addr
+
+        self._sessions: Deque[_Session] = deque()
+        self._target_size = min_size
+        self._opening = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._maintain())
+
+    async def close(self):
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        while self._sessions:
+            await self._sessions.popleft().stream.close()
+
+    async def __aenter__(self) -> 'WarmProxyPool':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    @property
+    def size(self) -> int:
+        return len(self._sessions)
+
+    async def connect(
+        self,
+        dest_host: str,
+        dest_port: int,
+        dest_ssl: Optional[ssl.SSLContext] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncioSocketStream:
+        if self._closed:
+            raise RuntimeError('Pool is closed')
+
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT
+
+        try:
+            async with async_timeout.timeout(timeout):
+                return await self._connect(
+                    dest_host=dest_host,
+                    dest_port=dest_port,
+                    dest_ssl=dest_ssl,
+                )
+        except asyncio.TimeoutError as e:
+            raise ProxyTimeoutError(f'Proxy connection timed out: {timeout}') from e
+
+    async def _connect(
+        self,
+        dest_host: str,
+        dest_port: int,
+        dest_ssl: Optional[ssl.SSLContext] = None,
+    ) -> AsyncioSocketStream:
+        connector = self._create_connector()
+
+        while True:
+            session = self._acquire()
+            pooled = session is not None
+            if session is None:
+                session = await self._open_session()
+
+            stream = session.stream
+            try:
+                await connector.request(
+                    stream=stream,
+                    conn=session.conn,
+                    host=dest_host,
+                    port=dest_port,
+                )
+
+                if dest_ssl is not None:
+                    # noinspection PyProtectedMember
+                    with self._proxy._tracer.phase(TracePhase.DEST_TLS):
+                        stream = await stream.start_tls(
+                            hostname=dest_host,
+                            ssl_context=dest_ssl,
+                        )
+            except ReplyError as e:
+                await stream.close()
+                raise ProxyError(e, error_code=e.error_code)
+            except (OSError, EOFError):
+                await stream.close()
+                if pooled:  # the proxy has dropped an idle session, try another one
+                    continue
+                raise
+            except (asyncio.CancelledError, Exception):
+                await stream.close()
+                raise
+
+            return stream
+
+    def _acquire(self) -> Optional[_Session]:
+        self._expire()
+
+        while self._sessions:
+            session = self._sessions.pop()  # the most recently parked one
+            self._wakeup.set()
+            if session.stream.reader.at_eof():
+                session.stream.writer.transport.abort()
+                continue
+            return session
+
+        # a miss means demand exceeds what we keep warm
+        self._target_size = min(self._target_size + 1, self._max_size)
+        self._wakeup.set()
+        return None
+
+    def _expire(self):
+        deadline = time.monotonic() - self._idle_timeout
+        while self._sessions and self._sessions[0].parked_at < deadline:
+            session = self._sessions.popleft()
+            session.stream.writer.transport.abort()
+            self._target_size = max(self._target_size - 1, self._min_size)
+
+    async def _open_session(self) -> _Session:
+        # noinspection PyProtectedMember
+        stream = await self._proxy._connect_to_proxy(local_addr=self._local_addr)
+        try:
+            conn = await self._create_connector().authenticate(stream)
+        except ReplyError as e:
+            await stream.close()
+            raise ProxyError(e, error_code=e.error_code)
+        except (asyncio.CancelledError, Exception):
+            await stream.close()
+            raise
+
+        return _Session(stream=stream, conn=conn, parked_at=time.monotonic())
+
+    async def _park_session(self):
+        self._opening += 1
+        try:
+            # a proxy that never answers must not hold up the maintenance
+            async with async_timeout.timeout(DEFAULT_TIMEOUT):
+                session = await self._open_session()
+        finally:
+            self._opening -= 1
+
+        if self._closed:
+            await session.stream.close()
+        else:
+            self._sessions.append(session)
+
+    async def _maintain(self):
+        while True:
+            self._expire()
+
+            missing = self._target_size - len(self._sessions) - self._opening
+            if missing > 0:
+                results = await asyncio.gather(
+                    *[self._park_session() for _ in range(missing)],
+                    return_exceptions=True,
+                )
+                if any(isinstance(r, Exception) for r in results):
+                    await asyncio.sleep(RETRY_DELAY)
+                continue
+
+            self._wakeup.clear()
+            try:
+                async with async_timeout.timeout(self._idle_timeout):
+                    await self._wakeup.wait()
+            except asyncio.TimeoutError:
+                pass
+
+    def _create_connector(self) -> Socks5AsyncConnector:
+        # noinspection PyProtectedMember
+        return self._proxy._create_connector()  # type: ignore[return-value]
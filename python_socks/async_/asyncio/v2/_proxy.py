@@ -1,20 +1,28 @@
 import asyncio
 import ssl
-from typing import Any, Optional, Tuple
+from typing import Any, Callable, Optional, Tuple, Union
 import warnings
 import sys
 
 
+from .... import _abc as abc
+from ...._happy_eyeballs import DEFAULT_HAPPY_EYEBALLS_DELAY
 from ...._types import ProxyType
+from ...._socket_options import SocketOptions
+from ...._trace import TraceConfig, TracePhase, create_tracer
+from ...._source_address import LocalAddr
+from ...._deadline import PhaseTimeouts, cap_phases
 from ...._helpers import parse_proxy_url
 from ...._errors import ProxyConnectionError, ProxyTimeoutError, ProxyError
+from ...._errors import is_connect_error, proxy_connection_error
 
 from ...._protocols.errors import ReplyError
 from ...._connectors.factory_async import create_connector
 
 from .._resolver import Resolver
 from ._stream import AsyncioSocketStream
-from ._connect import connect_tcp
+from ._transport import TransportSocketStream
+from ._connect import connect_tcp, connect_transport
 
 if sys.version_info >= (3, 11):
     import asyncio as async_timeout  # pylint:disable=reimported
@@ -24,6 +32,36 @@ else:
 
 DEFAULT_TIMEOUT = 60
 
+SocketStream = Union[AsyncioSocketStream, TransportSocketStream]
+
+
+class _phase_timeout:
+    """Times out a connection phase, usable in a plain with statement."""
+
+    __slots__ = ('_delay', '_task', '_handle', '_expired')
+
+    def __init__(self, delay: float):
+        self._delay = delay
+        self._task: Optional[asyncio.Task] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._expired = False
+
+    def __enter__(self):
+        self._task = asyncio.current_task()
+        self._handle = asyncio.get_running_loop().call_later(self._delay, self._expire)
+
+    def __exit__(self, exc_type, exc, tb):
+        self._handle.cancel()  # type: ignore[union-attr]
+        if self._expired and exc_type is asyncio.CancelledError:
+            if sys.version_info >= (3, 11):
+                self._task.uncancel()  # type: ignore[union-attr]
+            raise ProxyTimeoutError('Proxy connection timed out: {}'.format(self._delay)) from exc
+        return False
+
+    def _expire(self):
+        self._expired = True
+        self._task.cancel()  # type: ignore[union-attr]
+
 
 class AsyncioProxy:
     def __init__(
@@ -37,6 +75,13 @@ class AsyncioProxy:
         proxy_ssl: Optional[ssl.SSLContext] = None,
         forward: Optional['AsyncioProxy'] = None,
         loop: Optional[asyncio.AbstractEventLoop] = None,
+        pipeline: bool = False,
+        resolver: Optional[abc.AsyncResolver] = None,
+        happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+        trace_config: Optional[TraceConfig] = None,
+        phase_timeouts: Optional[PhaseTimeouts] = None,
+        socket_options: Optional[SocketOptions] = None,
+        fast_open: bool = False,
     ):
         if loop is not None:  # pragma: no cover
             warnings.warn(
@@ -56,11 +101,23 @@ class AsyncioProxy:
         self._username = username
         self._password = password
         self._rdns = rdns
+        self._pipeline = pipeline
+        self._happy_eyeballs_delay = happy_eyeballs_delay
+        self._socket_options = socket_options
+        self._fast_open = fast_open
 
         self._proxy_ssl = proxy_ssl
         self._forward = forward
 
-        self._resolver = Resolver(loop=loop)
+        self._resolver = resolver if resolver is not None else Resolver(loop=loop)
+        # unless a resolver is given, connect_tcp resolves the proxy host itself
+        self._proxy_host_resolver = resolver
+
+        self._tracer = cap_phases(
+            create_tracer(trace_config, proxy_type, host, port),
+            phase_timeouts,
+            scope=_phase_timeout,
+        )
 
     async def connect(
         self,
@@ -85,48 +142,59 @@ class AsyncioProxy:
         except asyncio.TimeoutError as e:
             raise ProxyTimeoutError('Proxy connection timed out: {}'.format(timeout)) from e
 
+    async def create_connection(
+        self,
+        protocol_factory: Callable[[], asyncio.BaseProtocol],
+        host: str,
+        port: int,
+        ssl: Optional[ssl.SSLContext] = None,
+        server_hostname: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Tuple[asyncio.Transport, asyncio.BaseProtocol]:
+        """
+        Connects to host:port through the proxy as loop.create_connection()
+        does directly: the transport is bound to a protocol made by
+        protocol_factory, with no stream reader and writer in between.
+        """
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT
+
+        try:
+            async with async_timeout.timeout(timeout):
+                stream = await self._connect(
+                    dest_host=host,
+                    dest_port=port,
+                    dest_ssl=ssl,
+                    local_addr=kwargs.get('local_addr'),
+                    server_hostname=server_hostname,
+                    transport=True,
+                )
+        except asyncio.TimeoutError as e:
+            raise ProxyTimeoutError('Proxy connection timed out: {}'.format(timeout)) from e
+
+        protocol = protocol_factory()
+        return stream.detach(protocol), protocol  # type: ignore[union-attr]
+
     async def _connect(
         self,
         dest_host: str,
         dest_port: int,
         dest_ssl: Optional[ssl.SSLContext] = None,
-        local_addr: Optional[Tuple[str, int]] = None,
-    ) -> AsyncioSocketStream:
-        if self._forward is None:
-            try:
-                stream = await connect_tcp(
-                    host=self._proxy_host,
-                    port=self._proxy_port,
-                    loop=self._loop,
-                    local_addr=local_addr,
-                )
-            except OSError as e:
-                raise ProxyConnectionError(
-                    e.errno,
-                    "Couldn't connect to proxy"
-                    f" {self._proxy_host}:{self._proxy_port} [{e.strerror}]",
-                ) from e
-        else:
-            stream = await self._forward.connect(
-                dest_host=self._proxy_host,
-                dest_port=self._proxy_port,
-            )
+        local_addr: Optional[LocalAddr] = None,
+        stream: Optional[SocketStream] = None,
+        server_hostname: Optional[str] = None,
+        transport: bool = False,
+    ) -> SocketStream:
+        fast_open = self._opens_with_fast_open(stream)
+        stream = await self._connect_to_proxy(
+            local_addr=local_addr,
+            stream=stream,
+            transport=transport,
+        )
 
         try:
-            if self._proxy_ssl is not None:
-                stream = await stream.start_tls(
-                    hostname=self._proxy_host,
-                    ssl_context=self._proxy_ssl,
-                )
-
-            connector = create_connector(
-                proxy_type=self._proxy_type,
-                username=self._username,
-                password=self._password,
-                rdns=self._rdns,
-                resolver=self._resolver,
-            )
-
+            connector = self._create_connector()
             await connector.connect(
                 stream=stream,
                 host=dest_host,
@@ -134,19 +202,121 @@ class AsyncioProxy:
             )
 
             if dest_ssl is not None:
-                stream = await stream.start_tls(
-                    hostname=dest_host,
-                    ssl_context=dest_ssl,
-                )
+                with self._tracer.phase(TracePhase.DEST_TLS):
+                    stream = await stream.start_tls(
+                        hostname=dest_host if server_hostname is None else server_hostname,
+                        ssl_context=dest_ssl,
+                    )
         except ReplyError as e:
             await stream.close()
             raise ProxyError(e, error_code=e.error_code)
+        except OSError as e:
+            await stream.close()
+            if fast_open and is_connect_error(e):
+                raise self._connection_error(e) from e
+            raise
         except (asyncio.CancelledError, Exception):
             await stream.close()
             raise
 
         return stream
 
+    async def _connect_to_proxy(
+        self,
+        local_addr: Optional[LocalAddr] = None,
+        stream: Optional[SocketStream] = None,
+        transport: bool = False,
+    ) -> SocketStream:
+        fast_open = self._opens_with_fast_open(stream)
+        # the stream is given when the proxy is already reached, e.g. by a chain
+        if stream is None:
+            stream = await self._open_stream(local_addr=local_addr, transport=transport)
+
+        if self._proxy_ssl is not None:
+            try:
+                with self._tracer.phase(TracePhase.PROXY_TLS):
+                    stream = await stream.start_tls(
+                        hostname=self._proxy_host,
+                        ssl_context=self._proxy_ssl,
+                    )
+            except OSError as e:
+                await stream.close()
+                if fast_open and is_connect_error(e):
+                    raise self._connection_error(e) from e
+                raise
+            except (asyncio.CancelledError, Exception):
+                await stream.close()
+                raise
+
+        return stream
+
+    def _opens_with_fast_open(self, stream: Optional[SocketStream]) -> bool:
+        # over a socket connected with fast open, the proxy may turn out
+        # unreachable only once the handshake is sent
+        return self._fast_open and stream is None and self._forward is None
+
+    async def _open_stream(
+        self,
+        local_addr: Optional[LocalAddr] = None,
+        transport: bool = False,
+    ) -> SocketStream:
+        # a transport with no stream reader and writer over it, for create_connection
+        if self._forward is not None:
+            # within the timeout of this connection, not a new one
+            return await self._forward._connect(
+                dest_host=self._proxy_host,
+                dest_port=self._proxy_port,
+                transport=transport,
+            )
+
+        open_stream = connect_transport if transport else connect_tcp
+        try:
+            with self._tracer.phase(TracePhase.CONNECT):
+                return await open_stream(
+                    host=self._proxy_host,
+                    port=self._proxy_port,
+                    loop=self._loop,
+                    local_addr=local_addr,
+                    resolver=self._proxy_host_resolver,
+                    happy_eyeballs_delay=self._happy_eyeballs_delay,
+                    socket_options=self._socket_options,
+                    fast_open=self._fast_open,
+                )
+        except ProxyTimeoutError:  # a TimeoutError, thus an OSError, from a phase cap
+            raise
+        except OSError as e:
+            raise self._connection_error(e) from e
+
+    def _connection_error(self, e: OSError) -> ProxyConnectionError:
+        return proxy_connection_error(
+            e.errno,
+            "Couldn't connect to proxy"
+            f" {self._proxy_host}:{self._proxy_port} [{e.strerror}]",
+        )
+
+    def _create_connector(self):
+        return create_connector(
+            proxy_type=self._proxy_type,
+            username=self._username,
+            password=self._password,
+            rdns=self._rdns,
+            resolver=self._resolver,
+            pipeline=self._pipeline,
+            tracer=self._tracer,
+        )
+
+    @property
+    def proxy_type(self):
+        return self._proxy_type
+
+    @property
+    def proxy_host(self):
+        return self._proxy_host
+
+    @property
+    def proxy_port(self):
+        return self._proxy_port
+
     @classmethod
     def create(cls, *args, **kwargs):  # for backward compatibility
         return cls(*args, **kwargs)
@@ -2,6 +2,8 @@ import asyncio
 import ssl
 
 from .... import _abc as abc
+from ...._errors import ProxyError
+from ...._ktls import KTLSState, ktls_state
 
 DEFAULT_RECEIVE_SIZE = 65536
 
@@ -31,11 +33,35 @@ class AsyncioSocketStream(abc.AsyncSocketStream):
     async def read_exact(self, n):
         return await self._reader.readexactly(n)
 
+    async def read_until(self, separator: bytes, max_bytes: int):
+        try:
+            return await self._reader.readuntil(separator)
+        except asyncio.IncompleteReadError as e:
+            raise ProxyError('Connection closed unexpectedly') from e
+        except asyncio.LimitOverrunError as e:
+            # the separator is not within the reader's limit (max_bytes by default)
+            raise ProxyError('Proxy response headers are too large') from e
+
     async def start_tls(
         self,
         hostname: str,
         ssl_context: ssl.SSLContext,
         ssl_handshake_timeout=None,
+        ktls: bool = False,
+    ) -> 'AsyncioSocketStream':
+        """
+        ktls is accepted for the sake of the sync stream's signature only.
+        asyncio runs TLS over memory BIOs, whose records never reach a
+        socket through OpenSSL, so TLS always stays in user space, as the
+        ktls property of the stream tells, and ssl_context is left as is.
+        """
+        return await self._start_tls(hostname, ssl_context, ssl_handshake_timeout)
+
+    async def _start_tls(
+        self,
+        hostname: str,
+        ssl_context: ssl.SSLContext,
+        ssl_handshake_timeout=None,
     ) -> 'AsyncioSocketStream':
         if hasattr(self._writer, 'start_tls'):  # Python>=3.11
             await self._writer.start_tls(
@@ -82,10 +108,14 @@ class AsyncioSocketStream(abc.AsyncSocketStream):
         self._writer.close()
         self._writer.transport.abort()  # noqa
 
+    @property
+    def ktls(self) -> KTLSState:
+        return ktls_state(self._writer.get_extra_info('ssl_object'))
+
     @property
     def reader(self):
         return self._reader  # pragma: no cover
 
     @property
     def writer(self):
-        return self._writer  # pragma: no cover
+        return self._writer
@@ -0,0 +1,196 @@
+import asyncio
+import ssl
+from typing import Optional
+
+from .... import _abc as abc
+from ...._errors import ProxyError
+from ...._receive_buffer import ReceiveBuffer
+
+DEFAULT_RECEIVE_SIZE = 65536
+
+
+class HandshakeProtocol(asyncio.BufferedProtocol):
+    """
+    Collects what a transport receives while the proxy handshake is done
+    over it, for a TransportSocketStream to read, before the transport is
+    handed over to the protocol of the caller. What is received goes
+    straight into a preallocated buffer, and a reader waiting for n bytes
+    is woken up once they have all arrived rather than on every chunk.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self.buffer = ReceiveBuffer()
+        self.eof = False
+        self.lost = False
+        self.exc: Optional[BaseException] = None
+        self.tls = False
+        self._wanted = 0  # bytes a pending receive() waits for
+        self._waiter: Optional[asyncio.Future] = None
+        self._paused = False
+        self._drain_waiter: Optional[asyncio.Future] = None
+
+    def get_buffer(self, sizehint):
+        return self.buffer.writable()
+
+    def buffer_updated(self, nbytes):
+        self.buffer.commit(nbytes)
+        if len(self.buffer) >= self._wanted:
+            self._wakeup()
+
+    def eof_received(self):
+        self.eof = True
+        self._wakeup()
+        # the protocol of the caller decides whether to close, TLS transports close anyway
+        return not self.tls
+
+    def connection_lost(self, exc):
+        self.lost = True
+        self.exc = exc
+        self._wakeup()
+        self._resume_drain()
+
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        self._resume_drain()
+
+    @property
+    def at_eof(self) -> bool:
+        return self.eof or self.lost
+
+    async def receive(self, n: int):
+        """
+        Waits for n bytes to be in the buffer, or for the end of stream,
+        and raises the error the connection was lost with if any.
+        """
+        while len(self.buffer) < n and not self.at_eof:
+            self._wanted = n
+            self._waiter = self._loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+                self._wanted = 0
+
+        if self.exc is not None and len(self.buffer) < n:
+            raise self.exc
+
+    async def drain(self):
+        if self.exc is not None:
+            raise self.exc
+        if not self._paused:
+            return
+        self._drain_waiter = self._loop.create_future()
+        try:
+            await self._drain_waiter
+        finally:
+            self._drain_waiter = None
+
+    def _wakeup(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def _resume_drain(self):
+        if self._drain_waiter is not None and not self._drain_waiter.done():
+            self._drain_waiter.set_result(None)
+
+
+class TransportSocketStream(abc.BufferedAsyncSocketStream):
+    _loop: asyncio.AbstractEventLoop
+    _transport: asyncio.Transport
+    _protocol: HandshakeProtocol
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        transport: asyncio.Transport,
+        protocol: HandshakeProtocol,
+    ):
+        self._loop = loop
+        self._transport = transport
+        self._protocol = protocol
+
+    def unread(self, data: bytes):
+        # bytes received past a proxy reply are served before reading any further
+        self._protocol.buffer.unread(data)
+
+    async def write_all(self, data):
+        self._transport.write(data)
+        await self._protocol.drain()
+
+    async def read(self, max_bytes=DEFAULT_RECEIVE_SIZE):
+        await self._protocol.receive(1)
+        return bytes(self._protocol.buffer.take(max_bytes))
+
+    async def read_exact(self, n):
+        return bytes(await self.read_exact_view(n))
+
+    async def read_exact_view(self, n):
+        await self._protocol.receive(n)
+        buffer = self._protocol.buffer
+        if len(buffer) < n:
+            raise asyncio.IncompleteReadError(bytes(buffer.take(len(buffer))), n)
+        return buffer.take(n)
+
+    async def start_tls(
+        self,
+        hostname: str,
+        ssl_context: ssl.SSLContext,
+        ssl_handshake_timeout=None,
+    ) -> 'TransportSocketStream':
+        if self._protocol.buffer:
+            raise ProxyError('Unexpected data received before TLS handshake')
+
+        self._protocol.tls = True
+        transport = await self._loop.start_tls(
+            self._transport,
+            self._protocol,
+            ssl_context,
+            server_side=False,
+            server_hostname=hostname,
+            ssl_handshake_timeout=ssl_handshake_timeout,
+        )
+        return TransportSocketStream(loop=self._loop, transport=transport, protocol=self._protocol)
+
+    def detach(self, protocol: asyncio.BaseProtocol) -> asyncio.Transport:
+        """
+        Hands the transport over to protocol, along with what has been
+        received past the proxy replies, and the end of stream or the loss
+        of the connection if they happened meanwhile.
+        """
+        handshake = self._protocol
+        transport = self._transport
+        transport.set_protocol(protocol)
+        protocol.connection_made(transport)
+
+        if handshake.buffer:
+            _feed(protocol, handshake.buffer.take(len(handshake.buffer)))
+        if handshake.eof and not handshake.lost:
+            if not protocol.eof_received():  # type: ignore[attr-defined]
+                transport.close()
+        if handshake.lost:
+            protocol.connection_lost(handshake.exc)
+        return transport
+
+    async def close(self):
+        self._transport.abort()
+
+    @property
+    def transport(self) -> asyncio.Transport:
+        return self._transport
+
+
+def _feed(protocol: asyncio.BaseProtocol, data: memoryview):
+    if not isinstance(protocol, asyncio.BufferedProtocol):
+        protocol.data_received(bytes(data))  # type: ignore[attr-defined]
+        return
+
+    while data:
+        buffer = memoryview(protocol.get_buffer(len(data)))
+        n = min(len(buffer), len(data))
+        buffer[:n] = data[:n]
+        protocol.buffer_updated(n)
+        data = data[n:]
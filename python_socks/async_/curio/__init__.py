@@ -1,4 +1,7 @@
 from ._proxy import CurioProxy as Proxy
+from ._resolver import CachingResolver
+from ._connect_many import connect_many
+from ..._connect_many import ConnectTarget
 
 
-__all__ = ('Proxy',)
+__all__ = ('Proxy', 'CachingResolver', 'ConnectTarget', 'connect_many')
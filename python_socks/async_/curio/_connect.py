@@ -1,17 +1,38 @@
-from typing import Optional, Tuple
+from typing import Optional
 
 import curio
 import curio.io
 import curio.socket
 
+from ... import _abc as abc
+from ..._helpers import is_ip_address
+from ..._socket_options import SocketOptions, apply_socket_options
+from ..._source_address import LocalAddr, SourceAddressPool, bind_address, family_of
+from ._resolver import Resolver
+
 
 async def connect_tcp(
     host: str,
     port: int,
-    local_addr: Optional[Tuple[str, int]] = None,
+    local_addr: Optional[LocalAddr] = None,
+    resolver: Optional[abc.AsyncResolver] = None,
+    socket_options: Optional[SocketOptions] = None,
 ) -> curio.io.Socket:
-    return await curio.open_connection(
+    if isinstance(local_addr, SourceAddressPool) and resolver is None:
+        resolver = Resolver()  # the family tells which local address to bind to
+
+    if resolver is not None and not is_ip_address(host):
+        _, host = await resolver.resolve(host=host, port=port)
+
+    sock = await curio.open_connection(
         host=host,
         port=port,
-        source_addr=local_addr,
+        source_addr=bind_address(local_addr, family_of(host)),
     )
+    # curio connects the socket itself, the options are set once connected
+    try:
+        apply_socket_options(sock, socket_options)
+    except OSError:
+        await sock.close()
+        raise
+    return sock
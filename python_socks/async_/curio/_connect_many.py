@@ -0,0 +1,134 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable, Optional, Tuple, Union
+
+import curio
+import curio.io
+
+from ... import _abc as abc
+from ._resolver import CachingResolver
+from ..._connect_many import (
+    DEFAULT_CONCURRENCY,
+    BatchProxies,
+    as_target,
+    check_concurrency,
+)
+from ._proxy import CurioProxy
+
+Result = Tuple[Any, Union[curio.io.Socket, Exception]]
+
+_DONE = object()
+
+
+async def _connect(proxies: BatchProxies, target, timeout: Optional[float]):
+    target = as_target(target)
+    if target.dest_ssl is not None:
+        raise ValueError('dest_ssl is not supported by the curio backend')
+
+    proxy, limiter = proxies.acquire(target.proxy)
+    try:
+        if limiter is None:
+            return await proxy.connect(
+                dest_host=target.dest_host,
+                dest_port=target.dest_port,
+                timeout=timeout,
+            )
+        async with limiter:
+            return await proxy.connect(
+                dest_host=target.dest_host,
+                dest_port=target.dest_port,
+                timeout=timeout,
+            )
+    finally:
+        proxies.release(target.proxy)
+
+
+async def _worker(proxies, target, timeout, queue, slots):
+    try:
+        try:
+            result = await _connect(proxies, target, timeout)
+        except Exception as e:
+            result = e
+
+        try:
+            await queue.put((target, result))
+        except BaseException:
+            if isinstance(result, curio.io.Socket):
+                await result.close()
+            raise
+    finally:
+        await slots.release()
+
+
+async def _produce(targets, proxies, timeout, queue, slots):
+    try:
+        async with curio.TaskGroup() as g:
+            for target in targets:
+                await slots.acquire()
+                await g.spawn(_worker, proxies, target, timeout, queue, slots)
+    finally:
+        await queue.put(_DONE)
+
+
+class _Results:
+    def __init__(self, queue: curio.Queue):
+        self._queue = queue
+        self._done = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Result:
+        if self._done:
+            raise StopAsyncIteration
+        item = await self._queue.get()
+        if item is _DONE:
+            self._done = True
+            raise StopAsyncIteration
+        return item
+
+
+@asynccontextmanager
+async def connect_many(
+    targets: Iterable[Any],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_proxy_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    resolver: Optional[abc.AsyncResolver] = None,
+) -> AsyncIterator[AsyncIterator[Result]]:
+    """
+    Connects to many destinations, each through its own proxy, and provides
+    (target, socket) or (target, exception) pairs in completion order:
+
+        async with connect_many(targets) as results:
+            async for target, result in results:
+                ...
+
+    Targets are ConnectTarget tuples (or plain tuples of the same shape),
+    pulled from `targets` lazily so that no more than `concurrency`
+    connections are in progress at once. Connections still in progress
+    when the block is left are cancelled.
+    """
+    check_concurrency(concurrency)
+    if resolver is None:
+        resolver = CachingResolver()
+
+    proxies = BatchProxies(
+        create_proxy=lambda url: CurioProxy.from_url(url, resolver=resolver),
+        create_limiter=curio.Semaphore,
+        per_proxy_concurrency=per_proxy_concurrency,
+    )
+
+    queue = curio.Queue()
+    slots = curio.Semaphore(concurrency)
+    producer = await curio.spawn(_produce, iter(targets), proxies, timeout, queue, slots)
+    try:
+        yield _Results(queue)
+    finally:
+        await producer.cancel()
+        while not queue.empty():
+            item = await queue.get()
+            if item is not _DONE and isinstance(item[1], curio.io.Socket):
+                await item[1].close()
+
+    if producer.exception is not None and not producer.cancelled:
+        raise producer.exception
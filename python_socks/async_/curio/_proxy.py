@@ -3,9 +3,12 @@ import warnings
 import curio
 import curio.io
 
+from ... import _abc as abc
 from ..._types import ProxyType
+from ..._socket_options import SocketOptions
+from ..._trace import TraceConfig, TracePhase, create_tracer
 from ..._helpers import parse_proxy_url
-from ..._errors import ProxyConnectionError, ProxyTimeoutError, ProxyError
+from ..._errors import ProxyTimeoutError, ProxyError, proxy_connection_error
 
 from ._stream import CurioSocketStream
 from ._resolver import Resolver
@@ -27,6 +30,10 @@ class CurioProxy:
         username: Optional[str] = None,
         password: Optional[str] = None,
         rdns: Optional[bool] = None,
+        pipeline: bool = False,
+        resolver: Optional[abc.AsyncResolver] = None,
+        trace_config: Optional[TraceConfig] = None,
+        socket_options: Optional[SocketOptions] = None,
     ):
         self._proxy_type = proxy_type
         self._proxy_host = host
@@ -34,8 +41,14 @@ class CurioProxy:
         self._password = password
         self._username = username
         self._rdns = rdns
+        self._pipeline = pipeline
+        self._socket_options = socket_options
 
-        self._resolver = Resolver()
+        self._resolver = resolver if resolver is not None else Resolver()
+        # unless a resolver is given, connect_tcp resolves the proxy host itself
+        self._proxy_host_resolver = resolver
+
+        self._tracer = create_tracer(trace_config, proxy_type, host, port)
 
     async def connect(
         self,
@@ -77,18 +90,21 @@ class CurioProxy:
     ):
         if _socket is None:
             try:
-                _socket = await connect_tcp(
-                    host=self._proxy_host,
-                    port=self._proxy_port,
-                    local_addr=local_addr,
-                )
+                with self._tracer.phase(TracePhase.CONNECT):
+                    _socket = await connect_tcp(
+                        host=self._proxy_host,
+                        port=self._proxy_port,
+                        local_addr=local_addr,
+                        resolver=self._proxy_host_resolver,
+                        socket_options=self._socket_options,
+                    )
             except OSError as e:
                 msg = 'Could not connect to proxy {}:{} [{}]'.format(
                     self._proxy_host,
                     self._proxy_port,
                     e.strerror,
                 )
-                raise ProxyConnectionError(e.errno, msg) from e
+                raise proxy_connection_error(e.errno, msg) from e
 
         stream = CurioSocketStream(_socket)
 
@@ -99,6 +115,8 @@ class CurioProxy:
                 password=self._password,
                 rdns=self._rdns,
                 resolver=self._resolver,
+                pipeline=self._pipeline,
+                tracer=self._tracer,
             )
             await connector.connect(
                 stream=stream,
@@ -1,7 +1,18 @@
 import socket
+from typing import Optional
+
+import curio
 from curio.socket import getaddrinfo
 
 from ... import _abc as abc
+from ..._resolver_cache import (
+    AsyncCachingResolver,
+    ResolverCache,
+    DEFAULT_MAXSIZE,
+    DEFAULT_TTL,
+    DEFAULT_NEGATIVE_TTL,
+    DEFAULT_STALE_TTL,
+)
 
 
 class Resolver(abc.AsyncResolver):
@@ -23,3 +34,33 @@ class Resolver(abc.AsyncResolver):
 
         family, _, _, _, address = infos[0]
         return family, address[0]
+
+
+class CachingResolver(AsyncCachingResolver):
+    def __init__(
+        self,
+        resolver: Optional[abc.AsyncResolver] = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+    ):
+        super().__init__(
+            resolver if resolver is not None else Resolver(),
+            ResolverCache(
+                maxsize=maxsize,
+                ttl=ttl,
+                negative_ttl=negative_ttl,
+                stale_ttl=stale_ttl,
+            ),
+        )
+
+    def _create_event(self):
+        return curio.Event()
+
+    async def _set_event(self, event):
+        await event.set()
+
+    async def _spawn(self, async_fn, *args) -> bool:
+        await curio.spawn(async_fn, *args, daemon=True)
+        return True
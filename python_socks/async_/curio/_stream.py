@@ -20,12 +20,30 @@ class CurioSocketStream(abc.AsyncSocketStream):
         return await self._socket.recv(max_bytes)
 
     async def read_exact(self, n):
+        # not a byte past n, the socket is handed over to the caller once connected
+        data = bytearray(n)
+        received = 0
+        with memoryview(data) as view:
+            while received < n:
+                size = await self._socket.recv_into(view[received:])
+                if not size:  # pragma: no cover
+                    raise ProxyError('Connection closed unexpectedly')
+                received += size
+        return data
+
+    async def read_until(self, separator: bytes, max_bytes: int):
+        # what has arrived is looked at before being received,
+        # so that not a byte past separator is
         data = bytearray()
-        while len(data) < n:
-            packet = await self._socket.recv(n - len(data))
-            if not packet:  # pragma: no cover
+        while len(data) < max_bytes:
+            peeked = await self._socket.recv(max_bytes - len(data), curio.socket.MSG_PEEK)
+            if not peeked:
                 raise ProxyError('Connection closed unexpectedly')
-            data += packet
+            end = (data + peeked).find(separator, max(len(data) - len(separator) + 1, 0))
+            n = len(peeked) if end == -1 else end + len(separator) - len(data)
+            data += await self.read_exact(n)
+            if end != -1:
+                break
         return data
 
     async def close(self):
@@ -1,3 +1,4 @@
 from ._proxy import TrioProxy as Proxy
+from ._resolver import CachingResolver
 
-__all__ = ('Proxy',)
+__all__ = ('Proxy', 'CachingResolver')
@@ -1,36 +1,103 @@
-from typing import Optional, Tuple
+import math
+from typing import List, Optional, Sequence
 
 import trio
 
 from ._resolver import Resolver
+from ... import _abc as abc
+from ..._happy_eyeballs import (
+    DEFAULT_HAPPY_EYEBALLS_DELAY,
+    Address,
+    connect_error,
+    interleave_addresses,
+)
 from ..._helpers import is_ipv4_address, is_ipv6_address
+from ..._socket_options import SocketOptions, apply_socket_options
+from ..._source_address import LocalAddr, bind_address, prepare_bind
 
 
 async def connect_tcp(
     host: str,
     port: int,
-    local_addr: Optional[Tuple[str, int]] = None,
+    local_addr: Optional[LocalAddr] = None,
+    resolver: Optional[abc.AsyncResolver] = None,
+    happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+    socket_options: Optional[SocketOptions] = None,
 ) -> trio.socket.SocketType:
 
-    family, host = await _resolve_host(host)
+    addresses = await _resolve_host(host, port, resolver)
+
+    if len(addresses) == 1:
+        family, host = addresses[0]
+        return await _connect_sock(family, host, port, local_addr, socket_options)
+
+    return await _connect_happy_eyeballs(
+        addresses=addresses,
+        port=port,
+        local_addr=local_addr,
+        socket_options=socket_options,
+        delay=happy_eyeballs_delay,
+    )
 
-    sock = trio.socket.socket(family=family, type=trio.socket.SOCK_STREAM)
-    if local_addr is not None:  # pragma: no cover
-        await sock.bind(local_addr)
 
+async def _connect_sock(family, host, port, local_addr, socket_options) -> trio.socket.SocketType:
+    sock = trio.socket.socket(family=family, type=trio.socket.SOCK_STREAM)
     try:
+        apply_socket_options(sock, socket_options)
+        address = bind_address(local_addr, family)
+        if address is not None:
+            prepare_bind(sock, address)
+            await sock.bind(address)
         await sock.connect((host, port))
-    except OSError:
+    except BaseException:
         sock.close()
         raise
     return sock
 
 
-async def _resolve_host(host):
+async def _connect_happy_eyeballs(
+    addresses: Sequence[Address],
+    port: int,
+    local_addr: Optional[LocalAddr],
+    socket_options: Optional[SocketOptions],
+    delay: Optional[float],
+) -> trio.socket.SocketType:
+    winner: Optional[trio.socket.SocketType] = None
+    errors: List[OSError] = []
+
+    async def attempt(family, host, failed: trio.Event):
+        nonlocal winner
+        try:
+            sock = await _connect_sock(family, host, port, local_addr, socket_options)
+        except OSError as e:
+            errors.append(e)
+            failed.set()
+            return
+
+        if winner is None:
+            winner = sock
+            nursery.cancel_scope.cancel()
+        else:
+            sock.close()  # pragma: no cover
+
+    async with trio.open_nursery() as nursery:
+        for family, host in addresses:
+            failed = trio.Event()
+            nursery.start_soon(attempt, family, host, failed)
+            with trio.move_on_after(math.inf if delay is None else delay):
+                await failed.wait()
+
+    if winner is None:
+        raise connect_error(errors)
+    return winner
+
+
+async def _resolve_host(host, port, resolver=None) -> List[Address]:
     if is_ipv4_address(host):
-        return trio.socket.AF_INET, host
+        return [(trio.socket.AF_INET, host)]
     if is_ipv6_address(host):
-        return trio.socket.AF_INET6, host
+        return [(trio.socket.AF_INET6, host)]
 
-    resolver = Resolver()
-    return await resolver.resolve(host=host)
+    if resolver is None:
+        resolver = Resolver()
+    return interleave_addresses(await resolver.resolve_all(host=host, port=port))
@@ -2,9 +2,13 @@ from typing import Any, Optional
 import warnings
 import trio
 
+from ... import _abc as abc
+from ..._happy_eyeballs import DEFAULT_HAPPY_EYEBALLS_DELAY
 from ..._types import ProxyType
+from ..._socket_options import SocketOptions
+from ..._trace import TraceConfig, TracePhase, create_tracer
 from ..._helpers import parse_proxy_url
-from ..._errors import ProxyConnectionError, ProxyTimeoutError, ProxyError
+from ..._errors import ProxyTimeoutError, ProxyError, proxy_connection_error
 
 from ._stream import TrioSocketStream
 from ._resolver import Resolver
@@ -26,6 +30,11 @@ class TrioProxy:
         username: Optional[str] = None,
         password: Optional[str] = None,
         rdns: Optional[bool] = None,
+        pipeline: bool = False,
+        resolver: Optional[abc.AsyncResolver] = None,
+        happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+        trace_config: Optional[TraceConfig] = None,
+        socket_options: Optional[SocketOptions] = None,
     ):
         self._proxy_type = proxy_type
         self._proxy_host = host
@@ -33,8 +42,13 @@ class TrioProxy:
         self._password = password
         self._username = username
         self._rdns = rdns
+        self._pipeline = pipeline
+        self._happy_eyeballs_delay = happy_eyeballs_delay
+        self._socket_options = socket_options
 
-        self._resolver = Resolver()
+        self._resolver = resolver if resolver is not None else Resolver()
+
+        self._tracer = create_tracer(trace_config, proxy_type, host, port)
 
     async def connect(
         self,
@@ -75,18 +89,22 @@ class TrioProxy:
     ) -> trio.socket.SocketType:
         if _socket is None:
             try:
-                _socket = await connect_tcp(
-                    host=self._proxy_host,
-                    port=self._proxy_port,
-                    local_addr=local_addr,
-                )
+                with self._tracer.phase(TracePhase.CONNECT):
+                    _socket = await connect_tcp(
+                        host=self._proxy_host,
+                        port=self._proxy_port,
+                        local_addr=local_addr,
+                        resolver=self._resolver,
+                        happy_eyeballs_delay=self._happy_eyeballs_delay,
+                        socket_options=self._socket_options,
+                    )
             except OSError as e:
                 msg = 'Could not connect to proxy {}:{} [{}]'.format(
                     self._proxy_host,
                     self._proxy_port,
                     e.strerror,
                 )
-                raise ProxyConnectionError(e.errno, msg) from e
+                raise proxy_connection_error(e.errno, msg) from e
 
         stream = TrioSocketStream(sock=_socket)
 
@@ -97,6 +115,8 @@ class TrioProxy:
                 password=self._password,
                 rdns=self._rdns,
                 resolver=self._resolver,
+                pipeline=self._pipeline,
+                tracer=self._tracer,
             )
             await connector.connect(
                 stream=stream,
@@ -1,6 +1,17 @@
+from typing import Optional
+
 import trio
 
 from ... import _abc as abc
+from ..._happy_eyeballs import unique_addresses
+from ..._resolver_cache import (
+    AsyncCachingResolver,
+    ResolverCache,
+    DEFAULT_MAXSIZE,
+    DEFAULT_TTL,
+    DEFAULT_NEGATIVE_TTL,
+    DEFAULT_STALE_TTL,
+)
 
 
 class Resolver(abc.AsyncResolver):
@@ -19,3 +30,43 @@ class Resolver(abc.AsyncResolver):
 
         family, _, _, _, address = infos[0]
         return family, address[0]
+
+    async def resolve_all(self, host, port=0, family=trio.socket.AF_UNSPEC):
+        infos = await trio.socket.getaddrinfo(
+            host=host,
+            port=port,
+            family=family,
+            type=trio.socket.SOCK_STREAM,
+        )
+
+        if not infos:  # pragma: no cover
+            raise OSError('Can`t resolve address {}:{} [{}]'.format(host, port, family))
+
+        return unique_addresses(infos)
+
+
+class CachingResolver(AsyncCachingResolver):
+    def __init__(
+        self,
+        resolver: Optional[abc.AsyncResolver] = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+    ):
+        super().__init__(
+            resolver if resolver is not None else Resolver(),
+            ResolverCache(
+                maxsize=maxsize,
+                ttl=ttl,
+                negative_ttl=negative_ttl,
+                stale_ttl=stale_ttl,
+            ),
+        )
+
+    def _create_event(self):
+        return trio.Event()
+
+    async def _spawn(self, async_fn, *args) -> bool:
+        trio.lowlevel.spawn_system_task(async_fn, *args)
+        return True
@@ -2,16 +2,43 @@ from typing import Optional
 
 import trio
 from ._stream import TrioSocketStream
+from .. import _connect
+from .... import _abc as abc
+from ...._happy_eyeballs import DEFAULT_HAPPY_EYEBALLS_DELAY
+from ...._socket_options import SocketOptions, apply_socket_options
+from ...._source_address import LocalHost, SourceAddressPool
 
 
 async def connect_tcp(
     host: str,
     port: int,
-    local_addr: Optional[str] = None,
+    local_addr: Optional[LocalHost] = None,
+    resolver: Optional[abc.AsyncResolver] = None,
+    happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+    socket_options: Optional[SocketOptions] = None,
 ) -> TrioSocketStream:
+    # trio binds to one local address only
+    if resolver is not None or isinstance(local_addr, SourceAddressPool):
+        sock = await _connect.connect_tcp(
+            host=host,
+            port=port,
+            local_addr=(local_addr, 0) if isinstance(local_addr, str) else local_addr,
+            resolver=resolver,
+            happy_eyeballs_delay=happy_eyeballs_delay,
+            socket_options=socket_options,
+        )
+        return TrioSocketStream(trio.SocketStream(sock))
+
     trio_stream = await trio.open_tcp_stream(
         host=host,
         port=port,
         local_address=local_addr,
+        happy_eyeballs_delay=happy_eyeballs_delay,
     )
+    # trio connects the socket itself, the options are set once connected
+    try:
+        apply_socket_options(trio_stream.socket, socket_options)
+    except OSError:
+        trio_stream.socket.close()
+        raise
     return TrioSocketStream(trio_stream)
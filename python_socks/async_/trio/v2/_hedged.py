@@ -0,0 +1,100 @@
+import ssl
+from typing import Iterable, List, Optional
+
+import trio
+
+from ...._errors import ProxyTimeoutError
+from ...._hedging import DEFAULT_MAX_ATTEMPTS, Hedging
+from ._proxy import DEFAULT_TIMEOUT, TrioProxy
+from ._stream import TrioSocketStream
+
+
+class HedgedProxy:
+    """
+    Connects through one of several equivalent proxies, taken in turn.
+    When a connection takes longer than `hedge_delay` (by default the 95th
+    percentile of recent connect times), another proxy is tried alongside,
+    up to `max_attempts` proxies. The first stream established is returned,
+    the other attempts are cancelled.
+    """
+
+    def __init__(
+        self,
+        proxies: Iterable[TrioProxy],
+        hedge_delay: Optional[float] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ):
+        self._proxies = tuple(proxies)
+        self._hedging = Hedging(len(self._proxies), delay=hedge_delay, max_attempts=max_attempts)
+
+    async def connect(
+        self,
+        dest_host: str,
+        dest_port: int,
+        dest_ssl: Optional[ssl.SSLContext] = None,
+        timeout: Optional[float] = None,
+    ) -> TrioSocketStream:
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT
+
+        try:
+            with trio.fail_after(timeout):
+                return await self._connect(
+                    dest_host=dest_host,
+                    dest_port=dest_port,
+                    dest_ssl=dest_ssl,
+                )
+        except trio.TooSlowError as e:
+            raise ProxyTimeoutError(f'Proxy connection timed out: {timeout}') from e
+
+    async def _connect(
+        self,
+        dest_host: str,
+        dest_port: int,
+        dest_ssl: Optional[ssl.SSLContext] = None,
+    ) -> TrioSocketStream:
+        delay = self._hedging.delay()
+        winner: Optional[TrioSocketStream] = None
+        errors: List[Exception] = []
+
+        async def attempt(proxy: TrioProxy, failed: trio.Event):
+            nonlocal winner
+            started = trio.current_time()
+            try:
+                stream = await proxy._connect(
+                    dest_host=dest_host,
+                    dest_port=dest_port,
+                    dest_ssl=dest_ssl,
+                )
+            except Exception as e:
+                errors.append(e)
+                failed.set()
+                return
+            except BaseException:  # trio.Cancelled...
+                self._hedging.record(trio.current_time() - started)
+                raise
+
+            if winner is None:
+                winner = stream
+                self._hedging.record(trio.current_time() - started)
+                nursery.cancel_scope.cancel()
+            else:  # pragma: no cover
+                with trio.CancelScope(shield=True):
+                    await stream.close()
+
+        try:
+            async with trio.open_nursery() as nursery:
+                for proxy in self._hedging.order(self._proxies):
+                    failed = trio.Event()
+                    nursery.start_soon(attempt, proxy, failed)
+                    with trio.move_on_after(delay):
+                        await failed.wait()
+        except BaseException:  # trio.Cancelled...
+            if winner is not None:
+                with trio.CancelScope(shield=True):
+                    await winner.close()
+            raise
+
+        if winner is None:
+            raise errors[0]
+        return winner
@@ -1,3 +1,4 @@
+import contextlib
 import ssl
 from typing import Any, Optional
 
@@ -7,9 +8,16 @@ from ._connect import connect_tcp
 from ._stream import TrioSocketStream
 from .._resolver import Resolver
 
+from .... import _abc as abc
+from ...._happy_eyeballs import DEFAULT_HAPPY_EYEBALLS_DELAY
 from ...._types import ProxyType
+from ...._socket_options import SocketOptions
+from ...._tls_sessions import TLSSessionCache
+from ...._trace import TraceConfig, TracePhase, create_tracer
+from ...._source_address import LocalHost
+from ...._deadline import PhaseTimeouts, cap_phases
 from ...._helpers import parse_proxy_url
-from ...._errors import ProxyConnectionError, ProxyTimeoutError, ProxyError
+from ...._errors import ProxyTimeoutError, ProxyError, proxy_connection_error
 
 from ...._protocols.errors import ReplyError
 from ...._connectors.factory_async import create_connector
@@ -17,6 +25,15 @@ from ...._connectors.factory_async import create_connector
 DEFAULT_TIMEOUT = 60
 
 
+@contextlib.contextmanager
+def _phase_timeout(delay: float):
+    try:
+        with trio.fail_after(delay):
+            yield
+    except trio.TooSlowError as e:
+        raise ProxyTimeoutError(f'Proxy connection timed out: {delay}') from e
+
+
 class TrioProxy:
     def __init__(
         self,
@@ -28,6 +45,13 @@ class TrioProxy:
         rdns: Optional[bool] = None,
         proxy_ssl: Optional[ssl.SSLContext] = None,
         forward: Optional['TrioProxy'] = None,
+        pipeline: bool = False,
+        resolver: Optional[abc.AsyncResolver] = None,
+        happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+        trace_config: Optional[TraceConfig] = None,
+        phase_timeouts: Optional[PhaseTimeouts] = None,
+        socket_options: Optional[SocketOptions] = None,
+        tls_session_cache: Optional[TLSSessionCache] = None,
     ):
         self._proxy_type = proxy_type
         self._proxy_host = host
@@ -35,11 +59,25 @@ class TrioProxy:
         self._username = username
         self._password = password
         self._rdns = rdns
+        self._pipeline = pipeline
+        self._happy_eyeballs_delay = happy_eyeballs_delay
+        self._socket_options = socket_options
+        if tls_session_cache is None:
+            tls_session_cache = TLSSessionCache()
+        self._tls_sessions = tls_session_cache
 
         self._proxy_ssl = proxy_ssl
         self._forward = forward
 
-        self._resolver = Resolver()
+        self._resolver = resolver if resolver is not None else Resolver()
+        # unless a resolver is given, connect_tcp resolves the proxy host itself
+        self._proxy_host_resolver = resolver
+
+        self._tracer = cap_phases(
+            create_tracer(trace_config, proxy_type, host, port),
+            phase_timeouts,
+            scope=_phase_timeout,
+        )
 
     async def connect(
         self,
@@ -69,41 +107,13 @@ class TrioProxy:
         dest_host: str,
         dest_port: int,
         dest_ssl: Optional[ssl.SSLContext] = None,
-        local_addr: Optional[str] = None,
+        local_addr: Optional[LocalHost] = None,
+        stream: Optional[TrioSocketStream] = None,
     ) -> TrioSocketStream:
-        if self._forward is None:
-            try:
-                stream = await connect_tcp(
-                    host=self._proxy_host,
-                    port=self._proxy_port,
-                    local_addr=local_addr,
-                )
-            except OSError as e:
-                raise ProxyConnectionError(
-                    e.errno,
-                    "Couldn't connect to proxy"
-                    f" {self._proxy_host}:{self._proxy_port} [{e.strerror}]",
-                ) from e
-        else:
-            stream = await self._forward.connect(
-                dest_host=self._proxy_host,
-                dest_port=self._proxy_port,
-            )
+        stream = await self._connect_to_proxy(local_addr=local_addr, stream=stream)
 
         try:
-            if self._proxy_ssl is not None:
-                stream = await stream.start_tls(
-                    hostname=self._proxy_host,
-                    ssl_context=self._proxy_ssl,
-                )
-
-            connector = create_connector(
-                proxy_type=self._proxy_type,
-                username=self._username,
-                password=self._password,
-                rdns=self._rdns,
-                resolver=self._resolver,
-            )
+            connector = self._create_connector()
             await connector.connect(
                 stream=stream,
                 host=dest_host,
@@ -111,10 +121,12 @@ class TrioProxy:
             )
 
             if dest_ssl is not None:
-                stream = await stream.start_tls(
-                    hostname=dest_host,
-                    ssl_context=dest_ssl,
-                )
+                with self._tracer.phase(TracePhase.DEST_TLS):
+                    stream = await stream.start_tls(
+                        hostname=dest_host,
+                        ssl_context=dest_ssl,
+                        session_cache=self._tls_sessions,
+                    )
         except ReplyError as e:
             await stream.close()
             raise ProxyError(e, error_code=e.error_code)
@@ -125,6 +137,68 @@ class TrioProxy:
 
         return stream
 
+    async def _connect_to_proxy(
+        self,
+        local_addr: Optional[LocalHost] = None,
+        stream: Optional[TrioSocketStream] = None,
+    ) -> TrioSocketStream:
+        # the stream is given when the proxy is already reached, e.g. by a chain
+        if stream is None:
+            stream = await self._open_stream(local_addr=local_addr)
+
+        if self._proxy_ssl is not None:
+            try:
+                with self._tracer.phase(TracePhase.PROXY_TLS):
+                    stream = await stream.start_tls(
+                        hostname=self._proxy_host,
+                        ssl_context=self._proxy_ssl,
+                        session_cache=self._tls_sessions,
+                    )
+            except BaseException:  # trio.Cancelled...
+                with trio.CancelScope(shield=True):
+                    await stream.close()
+                raise
+
+        return stream
+
+    async def _open_stream(self, local_addr: Optional[LocalHost] = None) -> TrioSocketStream:
+        if self._forward is not None:
+            # within the timeout of this connection, not a new one
+            return await self._forward._connect(
+                dest_host=self._proxy_host,
+                dest_port=self._proxy_port,
+            )
+
+        try:
+            with self._tracer.phase(TracePhase.CONNECT):
+                return await connect_tcp(
+                    host=self._proxy_host,
+                    port=self._proxy_port,
+                    local_addr=local_addr,
+                    resolver=self._proxy_host_resolver,
+                    happy_eyeballs_delay=self._happy_eyeballs_delay,
+                    socket_options=self._socket_options,
+                )
+        except ProxyTimeoutError:  # a TimeoutError, thus an OSError, from a phase cap
+            raise
+        except OSError as e:
+            raise proxy_connection_error(
+                e.errno,
+                "Couldn't connect to proxy"
+                f" {self._proxy_host}:{self._proxy_port} [{e.strerror}]",
+            ) from e
+
+    def _create_connector(self):
+        return create_connector(
+            proxy_type=self._proxy_type,
+            username=self._username,
+            password=self._password,
+            rdns=self._rdns,
+            resolver=self._resolver,
+            pipeline=self._pipeline,
+            tracer=self._tracer,
+        )
+
     @classmethod
     def create(cls, *args, **kwargs):  # for backward compatibility
         return cls(*args, **kwargs)
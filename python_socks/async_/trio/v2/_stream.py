@@ -1,9 +1,12 @@
+import functools
 import ssl
-from typing import Union
+from typing import Callable, Optional, Union
 
 import trio
 
 from ...._errors import ProxyError
+from ...._receive_buffer import ReceiveBuffer
+from ...._tls_sessions import TLSSessionCache
 from .... import _abc as abc
 
 DEFAULT_RECEIVE_SIZE = 65536
@@ -11,32 +14,60 @@ DEFAULT_RECEIVE_SIZE = 65536
 TrioStreamType = Union[trio.SocketStream, trio.SSLStream]
 
 
-class TrioSocketStream(abc.AsyncSocketStream):
+class TrioSocketStream(abc.BufferedAsyncSocketStream):
     _stream: TrioStreamType
+    _buffer: ReceiveBuffer
+    _put_session: Optional[Callable[[Optional[ssl.SSLSession]], None]]
 
     def __init__(self, stream: TrioStreamType):
         self._stream = stream
+        self._buffer = ReceiveBuffer()
+        self._put_session = None  # puts the TLS session in the cache it came from
+
+    def unread(self, data: bytes):
+        # bytes received past a proxy reply are served before reading any further
+        self._buffer.unread(data)
 
     async def write_all(self, data):
         await self._stream.send_all(data)
 
     async def read(self, max_bytes=DEFAULT_RECEIVE_SIZE):
+        if self._buffer:
+            return bytes(self._buffer.take(max_bytes))
         return await self._stream.receive_some(max_bytes)
 
     async def read_exact(self, n):
-        data = bytearray()
-        while len(data) < n:
-            packet = await self._stream.receive_some(n - len(data))
-            if not packet:  # pragma: no cover
+        return bytes(await self.read_exact_view(n))
+
+    async def read_exact_view(self, n):
+        # receives whatever has arrived, bytes past n are served by the next reads
+        while len(self._buffer) < n:
+            if not await self._receive():  # pragma: no cover
                 raise ProxyError('Connection closed unexpectedly')
-            data += packet
-        return data
+        return self._buffer.take(n)
+
+    async def _receive(self) -> int:
+        buffer = self._buffer.writable()
+        if isinstance(self._stream, trio.SocketStream):
+            received = await self._stream.socket.recv_into(buffer)
+            self._buffer.commit(received)
+            return received
+
+        data = await self._stream.receive_some(len(buffer))
+        self._buffer.append(data)
+        return len(data)
 
     async def start_tls(
         self,
         hostname: str,
         ssl_context: ssl.SSLContext,
+        session_cache: Optional[TLSSessionCache] = None,
     ) -> 'TrioSocketStream':
+        if self._buffer:
+            raise ProxyError('Unexpected data received before TLS handshake')
+
+        self._keep_session()
+
         ssl_stream = trio.SSLStream(
             self._stream,
             ssl_context=ssl_context,
@@ -44,12 +75,29 @@ class TrioSocketStream(abc.AsyncSocketStream):
             https_compatible=True,
             server_side=False,
         )
+        if session_cache is not None:
+            session = session_cache.get(ssl_context, hostname)
+            if session is not None:
+                ssl_stream.session = session  # passed on to the SSLObject
+
         await ssl_stream.do_handshake()
-        return TrioSocketStream(ssl_stream)
+
+        stream = TrioSocketStream(ssl_stream)
+        if session_cache is not None:
+            stream._put_session = functools.partial(session_cache.put, ssl_context, hostname)
+            stream._keep_session()
+        return stream
+
+    def _keep_session(self):
+        # with TLS 1.3 the session ticket arrives along with the data received,
+        # so the session is cached again once the connection has been used
+        if self._put_session is not None:
+            self._put_session(self._stream.session)
 
     async def close(self):
+        self._keep_session()
         await self._stream.aclose()
 
     @property
-    def trio_stream(self) -> TrioStreamType:  # pragma: nocover
+    def trio_stream(self) -> TrioStreamType:
         return self._stream
@@ -1,5 +1,16 @@
 from ._proxy import SyncProxy as Proxy
 from ._chain import ProxyChain
+from ._proxy_pool import ProxyPool
+from ._resolver import CachingResolver
+from ._connect_many import connect_many
+from .._connect_many import ConnectTarget
 
 
-__all__ = ('Proxy', 'ProxyChain')
+__all__ = (
+    'Proxy',
+    'ProxyChain',
+    'ProxyPool',
+    'CachingResolver',
+    'ConnectTarget',
+    'connect_many',
+)
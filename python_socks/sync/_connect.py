@@ -1,16 +1,142 @@
+import selectors
 import socket
-from typing import Optional, Tuple
+import time
+from typing import List, Optional, Sequence
+
+from .. import _abc as abc
+from .._happy_eyeballs import (
+    DEFAULT_HAPPY_EYEBALLS_DELAY,
+    Address,
+    connect_error,
+    interleave_addresses,
+)
+from .._helpers import is_ip_address
+from .._socket_options import SocketOptions, apply_socket_options, enable_fast_open
+from .._source_address import LocalAddr, bind_socket, family_of
+from ._resolver import SyncResolver
 
 
 def connect_tcp(
     host: str,
     port: int,
     timeout: Optional[float] = None,
-    local_addr: Optional[Tuple[str, int]] = None,
+    local_addr: Optional[LocalAddr] = None,
+    resolver: Optional[abc.SyncResolver] = None,
+    happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+    socket_options: Optional[SocketOptions] = None,
+    fast_open: bool = False,
 ) -> socket.socket:
-    address = (host, port)
-    return socket.create_connection(
-        address,
-        timeout,
-        source_address=local_addr,
+    if is_ip_address(host):
+        addresses = [(family_of(host), host)]
+    else:
+        if resolver is None:
+            resolver = SyncResolver()
+        addresses = interleave_addresses(resolver.resolve_all(host=host, port=port))
+
+    if len(addresses) == 1:
+        family, host = addresses[0]
+        return _connect_sock(family, host, port, timeout, local_addr, socket_options, fast_open)
+
+    # no fast open while racing, attempts would "connect" before reaching the host
+    return _connect_happy_eyeballs(
+        addresses=addresses,
+        port=port,
+        timeout=timeout,
+        local_addr=local_addr,
+        socket_options=socket_options,
+        delay=happy_eyeballs_delay,
     )
+
+
+def _connect_happy_eyeballs(
+    addresses: Sequence[Address],
+    port: int,
+    timeout: Optional[float],
+    local_addr: Optional[LocalAddr],
+    socket_options: Optional[SocketOptions],
+    delay: Optional[float],
+) -> socket.socket:
+    """
+    Starts a connection attempt to the next address every `delay` seconds
+    (or as soon as the previous attempt fails) and returns the first socket
+    that gets connected. delay=None means one attempt at a time.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    remaining = list(addresses)
+    errors: List[OSError] = []
+    next_attempt_at = time.monotonic()
+
+    with selectors.DefaultSelector() as selector:
+        try:
+            while True:
+                now = time.monotonic()
+                if remaining and (not selector.get_map() or now >= next_attempt_at):
+                    family, host = remaining.pop(0)
+                    try:
+                        sock = _start_connect(family, host, port, local_addr, socket_options)
+                    except OSError as e:
+                        errors.append(e)
+                        next_attempt_at = now
+                        continue
+                    selector.register(sock, selectors.EVENT_WRITE, (host, port))
+                    next_attempt_at = float('inf') if delay is None else now + delay
+
+                if not selector.get_map():
+                    raise connect_error(errors)
+
+                if deadline is not None and now >= deadline:
+                    raise socket.timeout('timed out')
+
+                wait = None
+                if remaining and next_attempt_at != float('inf'):
+                    wait = max(next_attempt_at - now, 0)
+                if deadline is not None:
+                    wait = deadline - now if wait is None else min(wait, deadline - now)
+
+                for key, _ in selector.select(wait):
+                    sock = key.fileobj
+                    selector.unregister(sock)
+                    err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)  # type: ignore
+                    if err == 0:
+                        sock.settimeout(timeout)  # type: ignore
+                        return sock  # type: ignore
+
+                    sock.close()  # type: ignore
+                    errors.append(OSError(err, 'Connect call failed {}'.format(key.data)))
+                    next_attempt_at = time.monotonic()
+        finally:
+            for key in list(selector.get_map().values()):
+                key.fileobj.close()  # type: ignore
+
+
+def _connect_sock(
+    family, host, port, timeout, local_addr, socket_options, fast_open=False
+) -> socket.socket:
+    sock = socket.socket(family=family, type=socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        apply_socket_options(sock, socket_options)
+        if fast_open:
+            enable_fast_open(sock)
+        bind_socket(sock, local_addr)
+        sock.connect((host, port))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _start_connect(family, host, port, local_addr, socket_options) -> socket.socket:
+    sock = socket.socket(family=family, type=socket.SOCK_STREAM)
+    try:
+        sock.setblocking(False)
+        apply_socket_options(sock, socket_options)
+        bind_socket(sock, local_addr)
+        try:
+            sock.connect((host, port))
+        except BlockingIOError:  # EINPROGRESS, or WSAEWOULDBLOCK on Windows
+            pass
+    except OSError:
+        sock.close()
+        raise
+    return sock
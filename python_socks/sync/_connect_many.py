@@ -0,0 +1,381 @@
+import collections
+import heapq
+import itertools
+import os
+import selectors
+import socket
+import time
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .. import _abc as abc
+from .._connect_many import DEFAULT_CONCURRENCY, BatchProxies, as_target, check_concurrency
+from .._errors import ProxyError, ProxyTimeoutError, proxy_connection_error
+from .._helpers import is_ip_address
+from .._protocols import http, socks4, socks5
+from .._protocols.errors import ReplyError
+from .._types import ProxyType
+from ._connect import _start_connect
+from ._proxy import DEFAULT_TIMEOUT, SyncProxy
+from ._resolver import CachingResolver
+
+Result = Tuple[Any, Union[socket.socket, Exception]]
+
+
+# The handshakes below are generators: each yields the bytes to send
+# and gets back the next reply received (b'' means nothing to send,
+# just wait for the next reply). They do what the sync connectors do,
+# minus the socket I/O, which is left to the selector loop.
+
+
+def _resolve_dest(proxy: SyncProxy, host: str) -> str:
+    # what the connectors resolve themselves, unless the proxy is to (rdns)
+    if proxy._proxy_type == ProxyType.SOCKS4:
+        rdns = proxy._rdns if proxy._rdns is not None else False
+        family = socket.AF_INET
+    elif proxy._proxy_type == ProxyType.SOCKS5:
+        rdns = proxy._rdns if proxy._rdns is not None else True
+        family = socket.AF_UNSPEC
+    else:
+        return host
+
+    if is_ip_address(host) or rdns:
+        return host
+    _, host = proxy._resolver.resolve(host, family=family)
+    return host
+
+
+def _socks4_handshake(proxy: SyncProxy, conn: socks4.Connection, host: str, port: int):
+    yield conn.send(socks4.ConnectRequest(host=host, port=port, user_id=proxy._username))
+
+
+def _socks5_handshake(proxy: SyncProxy, conn: socks5.Connection, host: str, port: int):
+    request = socks5.AuthMethodsRequest(
+        username=proxy._username,
+        password=proxy._password,
+        pipeline=proxy._pipeline,
+    )
+    auth = socks5.AuthRequest(username=proxy._username, password=proxy._password)
+
+    if proxy._pipeline:
+        data = conn.send(request)
+        auth_required = socks5.AuthMethod.USERNAME_PASSWORD in request.methods
+        if auth_required:
+            data += conn.send(auth)
+        data += conn.send(socks5.ConnectRequest(host=host, port=port))
+        yield data
+        if auth_required:
+            yield b''
+        yield b''
+        return
+
+    reply: socks5.AuthMethodReply = yield conn.send(request)
+    if reply.method == socks5.AuthMethod.USERNAME_PASSWORD:
+        yield conn.send(auth)
+    yield conn.send(socks5.ConnectRequest(host=host, port=port))
+
+
+def _http_handshake(proxy: SyncProxy, conn: http.Connection, host: str, port: int):
+    yield conn.send(
+        http.ConnectRequest(
+            host=host,
+            port=port,
+            username=proxy._username,
+            password=proxy._password,
+        )
+    )
+
+
+def _create_handshake(proxy: SyncProxy, host: str, port: int):
+    if proxy._proxy_type == ProxyType.SOCKS4:
+        conn = socks4.Connection()
+        return conn, _socks4_handshake(proxy, conn, host, port)
+
+    if proxy._proxy_type == ProxyType.SOCKS5:
+        conn = socks5.Connection(pipeline=proxy._pipeline)
+        return conn, _socks5_handshake(proxy, conn, host, port)
+
+    if proxy._proxy_type == ProxyType.HTTP:
+        conn = http.Connection()
+        return conn, _http_handshake(proxy, conn, host, port)
+
+    raise ValueError(f'Invalid proxy type: {proxy._proxy_type}')  # pragma: no cover
+
+
+class _Slots:
+    """Per-proxy limit, handshakes waiting for a slot are parked in `waiters`."""
+
+    __slots__ = ('free', 'waiters')
+
+    def __init__(self, size: int):
+        self.free = size
+        self.waiters: Deque['_Handshake'] = collections.deque()
+
+
+class _Handshake:
+    __slots__ = (
+        'target',
+        'dest',
+        'address',
+        'key',
+        'proxy',
+        'slots',
+        'sock',
+        'conn',
+        'steps',
+        'out',
+        'deadline',
+        'done',
+    )
+
+    def __init__(self, target):
+        self.target = target
+        self.dest: Tuple[str, int] = ('', 0)
+        self.address: Tuple[int, str] = (socket.AF_UNSPEC, '')  # of the proxy
+        self.key = None
+        self.proxy: Optional[SyncProxy] = None
+        self.slots: Optional[_Slots] = None
+        self.sock: Optional[socket.socket] = None
+        self.conn = None
+        self.steps = None
+        self.out = None
+        self.deadline = 0.0
+        self.done = False
+
+
+class _Batch:
+    def __init__(self, proxies: BatchProxies, timeout: float):
+        self._proxies = proxies
+        self._timeout = timeout
+        self._selector = selectors.DefaultSelector()
+        self._deadlines: List[Tuple[float, int, _Handshake]] = []
+        self._counter = itertools.count()
+        self._unparked: Deque[_Slots] = collections.deque()
+        self.ready: Deque[Result] = collections.deque()
+        self.active = 0
+
+    def start(self, target):
+        hs = _Handshake(target)
+        self.active += 1
+        try:
+            target = as_target(target)
+            if target.dest_ssl is not None:
+                raise ValueError('dest_ssl is not supported by the bulk connect engine')
+            hs.dest = (target.dest_host, target.dest_port)
+            hs.proxy, hs.slots = self._proxies.acquire(target.proxy)
+            hs.key = target.proxy
+        except Exception as e:
+            self._finish(hs, e)
+            return
+
+        if not isinstance(hs.proxy, SyncProxy):
+            self._finish(hs, TypeError(f'Unsupported proxy: {hs.proxy!r}'))
+        elif not self._resolve(hs):
+            return
+        elif hs.slots is None:
+            self._connect(hs)
+        elif hs.slots.free:
+            hs.slots.free -= 1
+            self._connect(hs)
+        else:
+            hs.slots.waiters.append(hs)
+
+    def poll(self):
+        # parked handshakes are started here rather than from _finish(),
+        # so that a run of failing connects doesn't recurse
+        while self._unparked:
+            slots = self._unparked.popleft()
+            while slots.free and slots.waiters:
+                slots.free -= 1
+                self._connect(slots.waiters.popleft())
+        if self.ready:
+            return
+
+        now = time.monotonic()
+        while self._deadlines and (self._deadlines[0][2].done or self._deadlines[0][0] <= now):
+            _, _, hs = heapq.heappop(self._deadlines)
+            if not hs.done:
+                error = ProxyTimeoutError('Proxy connection timed out: {}'.format(self._timeout))
+                self._finish(hs, error)
+
+        if self.ready or not self._selector.get_map():
+            return
+
+        wait = self._deadlines[0][0] - now if self._deadlines else None
+        for key, _ in self._selector.select(wait):
+            hs = key.data
+            if hs.done:  # pragma: no cover
+                continue
+            try:
+                self._process(hs)
+            except BlockingIOError:  # pragma: no cover
+                pass
+            except ReplyError as e:
+                self._finish(hs, ProxyError(e, error_code=e.error_code))
+            except Exception as e:
+                self._finish(hs, e)
+
+    def close(self):
+        for key in list(self._selector.get_map().values()):
+            key.fileobj.close()  # type: ignore
+        self._selector.close()
+        for _, result in self.ready:
+            if isinstance(result, socket.socket):
+                result.close()
+        self.ready.clear()
+
+    def _resolve(self, hs: _Handshake) -> bool:
+        # lookups block, so they are done before the handshake joins the
+        # selector loop rather than holding up every handshake in it
+        proxy = hs.proxy
+        try:
+            hs.address = proxy._resolver.resolve(proxy._proxy_host)
+        except OSError as e:
+            self._finish(hs, _connection_error(proxy, e))
+            return False
+        except Exception as e:
+            self._finish(hs, e)
+            return False
+
+        try:
+            hs.dest = (_resolve_dest(proxy, hs.dest[0]), hs.dest[1])
+        except Exception as e:
+            self._finish(hs, e)
+            return False
+        return True
+
+    def _connect(self, hs: _Handshake):
+        proxy = hs.proxy
+        hs.deadline = time.monotonic() + self._timeout
+        family, host = hs.address
+        try:
+            hs.sock = _start_connect(family, host, proxy._proxy_port, None, proxy._socket_options)
+        except OSError as e:
+            self._finish(hs, _connection_error(proxy, e))
+            return
+        except Exception as e:
+            self._finish(hs, e)
+            return
+
+        self._selector.register(hs.sock, selectors.EVENT_WRITE, hs)
+        heapq.heappush(self._deadlines, (hs.deadline, next(self._counter), hs))
+
+    def _process(self, hs: _Handshake):
+        sock = hs.sock
+        if hs.steps is None:
+            err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if err != 0:
+                msg = 'Could not connect to proxy {}:{} [{}]'.format(
+                    hs.proxy._proxy_host,
+                    hs.proxy._proxy_port,
+                    os.strerror(err),
+                )
+                raise proxy_connection_error(err, msg)
+
+            hs.conn, hs.steps = _create_handshake(hs.proxy, *hs.dest)
+            self._advance(hs, None)
+        elif hs.out:
+            sent = sock.send(hs.out)
+            hs.out = hs.out[sent:]
+            if not hs.out:
+                self._selector.modify(sock, selectors.EVENT_READ, hs)
+        else:
+            # never reads past the last reply, whatever follows is tunneled data
+            data = sock.recv(hs.conn.bytes_needed)
+            if not data:
+                raise ProxyError('Connection closed unexpectedly')
+            for reply in hs.conn.feed(data):
+                self._advance(hs, reply)
+
+    def _advance(self, hs: _Handshake, reply):
+        try:
+            data = hs.steps.send(reply)
+        except StopIteration:
+            hs.sock.setblocking(True)
+            self._finish(hs, hs.sock)
+            return
+
+        hs.out = memoryview(data) if data else None
+        events = selectors.EVENT_WRITE if data else selectors.EVENT_READ
+        self._selector.modify(hs.sock, events, hs)
+
+    def _finish(self, hs: _Handshake, result):
+        hs.done = True
+        self.active -= 1
+
+        if hs.sock is not None:
+            if hs.sock in self._selector.get_map():
+                self._selector.unregister(hs.sock)
+            if result is not hs.sock:
+                hs.sock.close()
+
+        if hs.key is not None:
+            self._proxies.release(hs.key)
+
+        # only handshakes that got as far as connecting hold a slot
+        slots = hs.slots
+        if slots is not None and hs.deadline:
+            slots.free += 1
+            if slots.waiters:
+                self._unparked.append(slots)
+
+        self.ready.append((hs.target, result))
+
+
+def _connection_error(proxy: SyncProxy, e: OSError) -> Exception:
+    msg = 'Could not connect to proxy {}:{} [{}]'.format(
+        proxy._proxy_host,
+        proxy._proxy_port,
+        e.strerror,
+    )
+    return proxy_connection_error(e.errno, msg)
+
+
+def connect_many(
+    targets: Iterable[Any],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_proxy_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    resolver: Optional[abc.SyncResolver] = None,
+) -> Iterator[Result]:
+    """
+    Connects to many destinations, each through its own SOCKS4, SOCKS5 or
+    HTTP proxy, and yields (target, socket) or (target, exception) pairs
+    in completion order.
+
+    All handshakes are driven from the calling thread by a selector over
+    non-blocking sockets, the sockets yielded are blocking again. Targets
+    are ConnectTarget tuples (or plain tuples of the same shape), pulled
+    from `targets` lazily so that no more than `concurrency` connections
+    are in progress at once. Sockets left unconsumed when the generator is
+    closed early are closed.
+    """
+    check_concurrency(concurrency)
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUT
+    if resolver is None:
+        resolver = CachingResolver()
+
+    proxies = BatchProxies(
+        create_proxy=lambda url: SyncProxy.from_url(url, resolver=resolver),
+        create_limiter=_Slots,
+        per_proxy_concurrency=per_proxy_concurrency,
+    )
+
+    targets = iter(targets)
+    batch = _Batch(proxies, timeout)
+    try:
+        while True:
+            for target in itertools.islice(targets, concurrency - batch.active):
+                batch.start(target)
+
+            if batch.ready:
+                while batch.ready:
+                    yield batch.ready.popleft()
+                continue
+
+            if not batch.active:
+                break
+
+            batch.poll()
+    finally:
+        batch.close()
@@ -3,8 +3,13 @@ from typing import Optional, Any
 import warnings
 
 from .._errors import ProxyConnectionError, ProxyTimeoutError, ProxyError
+from .._errors import is_connect_error, proxy_connection_error
 
+from .. import _abc as abc
+from .._happy_eyeballs import DEFAULT_HAPPY_EYEBALLS_DELAY
 from .._types import ProxyType
+from .._socket_options import SocketOptions
+from .._trace import TraceConfig, TracePhase, create_tracer
 from .._helpers import parse_proxy_url
 from .._protocols.errors import ReplyError
 from .._connectors.factory_sync import create_connector
@@ -26,6 +31,12 @@ class SyncProxy:
         username: Optional[str] = None,
         password: Optional[str] = None,
         rdns: Optional[bool] = None,
+        pipeline: bool = False,
+        resolver: Optional[abc.SyncResolver] = None,
+        happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+        trace_config: Optional[TraceConfig] = None,
+        socket_options: Optional[SocketOptions] = None,
+        fast_open: bool = False,
     ):
         self._proxy_type = proxy_type
         self._proxy_host = host
@@ -33,8 +44,16 @@ class SyncProxy:
         self._password = password
         self._username = username
         self._rdns = rdns
+        self._pipeline = pipeline
+        self._happy_eyeballs_delay = happy_eyeballs_delay
+        self._socket_options = socket_options
+        self._fast_open = fast_open
 
-        self._resolver = SyncResolver()
+        self._resolver = resolver if resolver is not None else SyncResolver()
+        # unless a resolver is given, connect_tcp resolves the proxy host itself
+        self._proxy_host_resolver = resolver
+
+        self._tracer = create_tracer(trace_config, proxy_type, host, port)
 
     def connect(
         self,
@@ -54,22 +73,26 @@ class SyncProxy:
                 stacklevel=2,
             )
 
+        # over a socket connected with fast open, the proxy may turn out
+        # unreachable only once the handshake is sent
+        fast_open = self._fast_open and _socket is None
+
         if _socket is None:
             local_addr = kwargs.get('local_addr')
             try:
-                _socket = connect_tcp(
-                    host=self._proxy_host,
-                    port=self._proxy_port,
-                    timeout=timeout,
-                    local_addr=local_addr,
-                )
+                with self._tracer.phase(TracePhase.CONNECT):
+                    _socket = connect_tcp(
+                        host=self._proxy_host,
+                        port=self._proxy_port,
+                        timeout=timeout,
+                        local_addr=local_addr,
+                        resolver=self._proxy_host_resolver,
+                        happy_eyeballs_delay=self._happy_eyeballs_delay,
+                        socket_options=self._socket_options,
+                        fast_open=self._fast_open,
+                    )
             except OSError as e:
-                msg = 'Could not connect to proxy {}:{} [{}]'.format(
-                    self._proxy_host,
-                    self._proxy_port,
-                    e.strerror,
-                )
-                raise ProxyConnectionError(e.errno, msg) from e
+                raise self._connection_error(e) from e
 
         stream = SyncSocketStream(_socket)
 
@@ -80,6 +103,8 @@ class SyncProxy:
                 password=self._password,
                 rdns=self._rdns,
                 resolver=self._resolver,
+                pipeline=self._pipeline,
+                tracer=self._tracer,
             )
             connector.connect(
                 stream=stream,
@@ -94,10 +119,23 @@ class SyncProxy:
         except ReplyError as e:
             stream.close()
             raise ProxyError(e, error_code=e.error_code)
+        except OSError as e:
+            stream.close()
+            if fast_open and is_connect_error(e):
+                raise self._connection_error(e) from e
+            raise
         except Exception:
             stream.close()
             raise
 
+    def _connection_error(self, e: OSError) -> ProxyConnectionError:
+        msg = 'Could not connect to proxy {}:{} [{}]'.format(
+            self._proxy_host,
+            self._proxy_port,
+            e.strerror,
+        )
+        return proxy_connection_error(e.errno, msg)
+
     @property
     def proxy_host(self):
         return self._proxy_host
@@ -1,5 +1,16 @@
 import socket
+from typing import Optional
+
 from .. import _abc as abc
+from .._happy_eyeballs import unique_addresses
+from .._resolver_cache import (
+    SyncCachingResolver,
+    ResolverCache,
+    DEFAULT_MAXSIZE,
+    DEFAULT_TTL,
+    DEFAULT_NEGATIVE_TTL,
+    DEFAULT_STALE_TTL,
+)
 
 
 class SyncResolver(abc.SyncResolver):
@@ -14,3 +25,32 @@ class SyncResolver(abc.SyncResolver):
 
         family, _, _, _, address = infos[0]
         return family, address[0]
+
+    # noinspection PyMethodMayBeStatic
+    def resolve_all(self, host, port=0, family=socket.AF_UNSPEC):
+        infos = socket.getaddrinfo(host=host, port=port, family=family, type=socket.SOCK_STREAM)
+
+        if not infos:  # pragma: no cover
+            raise OSError('Can`t resolve address {}:{} [{}]'.format(host, port, family))
+
+        return unique_addresses(infos)
+
+
+class CachingResolver(SyncCachingResolver):
+    def __init__(
+        self,
+        resolver: Optional[abc.SyncResolver] = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+    ):
+        super().__init__(
+            resolver if resolver is not None else SyncResolver(),
+            ResolverCache(
+                maxsize=maxsize,
+                ttl=ttl,
+                negative_ttl=negative_ttl,
+                stale_ttl=stale_ttl,
+            ),
+        )
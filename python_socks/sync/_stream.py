@@ -19,12 +19,30 @@ class SyncSocketStream(abc.SyncSocketStream):
         return self._socket.recv(max_bytes)
 
     def read_exact(self, n):
+        # not a byte past n, the socket is handed over to the caller once connected
+        data = bytearray(n)
+        received = 0
+        with memoryview(data) as view:
+            while received < n:
+                size = self._socket.recv_into(view[received:])
+                if not size:  # pragma: no cover
+                    raise ProxyError('Connection closed unexpectedly')
+                received += size
+        return data
+
+    def read_until(self, separator: bytes, max_bytes: int):
+        # what has arrived is looked at before being received,
+        # so that not a byte past separator is
         data = bytearray()
-        while len(data) < n:
-            packet = self._socket.recv(n - len(data))
-            if not packet:  # pragma: no cover
+        while len(data) < max_bytes:
+            peeked = self._socket.recv(max_bytes - len(data), socket.MSG_PEEK)
+            if not peeked:
                 raise ProxyError('Connection closed unexpectedly')
-            data += packet
+            end = (data + peeked).find(separator, max(len(data) - len(separator) + 1, 0))
+            n = len(peeked) if end == -1 else end + len(separator) - len(data)
+            data += self.read_exact(n)
+            if end != -1:
+                break
         return data
 
     def close(self):
@@ -1,7 +1,12 @@
 from ._proxy import SyncProxy as Proxy
-from ._chain import ProxyChain
+from ._chain import ProxyChain, PooledProxyChain
+from ._hedged import HedgedProxy
+from .._resolver import CachingResolver
 
 __all__ = (
     'Proxy',
     'ProxyChain',
+    'PooledProxyChain',
+    'HedgedProxy',
+    'CachingResolver',
 )
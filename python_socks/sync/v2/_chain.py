@@ -1,10 +1,41 @@
-from typing import Iterable
-from ._proxy import SyncProxy
+import socket
+import ssl
+import threading
+import time
+from collections import deque
+from typing import Deque, Iterable, List, NamedTuple, Optional
+
+from ..._types import ProxyType
+from ..._trace import TracePhase
+from ..._deadline import deadline_scope
+from ..._errors import ProxyTimeoutError, ProxyError
+from ..._protocols import socks5
+from ..._protocols.errors import ReplyError
+from ._proxy import DEFAULT_TIMEOUT, SyncProxy
+from ._stream import SyncSocketStream
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_IDLE_TIMEOUT = 30
 
 
 class ProxyChain:
+    """
+    Connects through the given proxies in order. The chain never modifies
+    the proxies, so it can be shared by concurrent callers and a proxy can
+    be part of several chains.
+    """
+
     def __init__(self, proxies: Iterable[SyncProxy]):
-        self._proxies = proxies
+        proxies = tuple(proxies)
+        if not proxies:
+            raise ValueError('Proxy chain must contain at least one proxy')
+
+        # every proxy but the last tunnels to the next one
+        self._hops = tuple(
+            (proxy, next_proxy._proxy_host, next_proxy._proxy_port)
+            for proxy, next_proxy in zip(proxies, proxies[1:])
+        )
+        self._last = proxies[-1]
 
     def connect(
         self,
@@ -13,14 +44,223 @@ class ProxyChain:
         dest_ssl=None,
         timeout=None,
     ):
-        forward = None
-        for proxy in self._proxies:
-            proxy._forward = forward
-            forward = proxy
-
-        return forward.connect(
-            dest_host=dest_host,
-            dest_port=dest_port,
-            dest_ssl=dest_ssl,
-            timeout=timeout,
-        )
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT
+
+        with deadline_scope(timeout):
+            stream = None
+            for proxy, host, port in self._hops:
+                stream = proxy._connect(
+                    dest_host=host,
+                    dest_port=port,
+                    dest_ssl=None,
+                    timeout=timeout,
+                    stream=stream,
+                )
+
+            stream = self._last._connect(
+                dest_host=dest_host,
+                dest_port=dest_port,
+                dest_ssl=dest_ssl,
+                timeout=timeout,
+                stream=stream,
+            )
+
+        stream.socket.settimeout(timeout)
+        return stream
+
+
+class _Tunnel(NamedTuple):
+    stream: SyncSocketStream
+    conn: Optional[socks5.Connection]  # set when authenticated with the last proxy
+    parked_at: float
+
+
+class PooledProxyChain(ProxyChain):
+    """
+    A proxy chain that keeps up to `size` tunnels through all proxies but
+    the last one ready, already authenticated with the last proxy, so that
+    connect() only has to send the final CONNECT request. Tunnels are
+    opened by background threads, connect() can be called from any thread.
+    """
+
+    def __init__(
+        self,
+        proxies: Iterable[SyncProxy],
+        size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        super().__init__(proxies)
+
+        if size < 1:
+            raise ValueError(f'Invalid pool size: {size}')
+
+        self._size = size
+        self._idle_timeout = idle_timeout
+
+        self._tunnels: Deque[_Tunnel] = deque()
+        self._opening = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        self._refill()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            tunnels = list(self._tunnels)
+            self._tunnels.clear()
+
+        for tunnel in tunnels:
+            tunnel.stream.close()
+
+    def __enter__(self) -> 'PooledProxyChain':
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def size(self) -> int:
+        return len(self._tunnels)
+
+    def connect(
+        self,
+        dest_host,
+        dest_port,
+        dest_ssl: Optional[ssl.SSLContext] = None,
+        timeout=None,
+    ) -> SyncSocketStream:
+        if self._closed:
+            raise RuntimeError('Proxy chain is closed')
+
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT
+
+        with deadline_scope(timeout):
+            stream = self._request(dest_host=dest_host, dest_port=dest_port, timeout=timeout)
+
+            if dest_ssl is not None:
+                try:
+                    # noinspection PyProtectedMember
+                    with self._last._tracer.phase(TracePhase.DEST_TLS):
+                        stream = stream.start_tls(
+                            hostname=dest_host,
+                            ssl_context=dest_ssl,
+                            session_cache=self._last._tls_sessions,
+                        )
+                except socket.timeout as e:
+                    stream.close()
+                    raise ProxyTimeoutError(f'Proxy connection timed out: {timeout}') from e
+                except Exception:
+                    stream.close()
+                    raise
+
+        stream.socket.settimeout(timeout)
+        return stream
+
+    def _request(self, dest_host: str, dest_port: int, timeout: float) -> SyncSocketStream:
+        # noinspection PyProtectedMember
+        connector = self._last._create_connector()
+
+        while True:
+            tunnel = self._acquire()
+            self._refill()
+
+            pooled = tunnel is not None
+            if tunnel is None:
+                tunnel = self._open_tunnel(timeout)
+
+            try:
+                if tunnel.conn is not None:
+                    connector.request(
+                        stream=tunnel.stream,
+                        conn=tunnel.conn,
+                        host=dest_host,
+                        port=dest_port,
+                    )
+                else:
+                    connector.connect(stream=tunnel.stream, host=dest_host, port=dest_port)
+            except socket.timeout as e:
+                tunnel.stream.close()
+                raise ProxyTimeoutError(f'Proxy connection timed out: {timeout}') from e
+            except ReplyError as e:
+                tunnel.stream.close()
+                raise ProxyError(e, error_code=e.error_code)
+            except Exception:
+                tunnel.stream.close()
+                if pooled:  # a proxy has dropped the idle tunnel, try another one
+                    continue
+                raise
+
+            return tunnel.stream
+
+    def _acquire(self) -> Optional[_Tunnel]:
+        expired: List[_Tunnel] = []
+        deadline = time.monotonic() - self._idle_timeout
+        with self._lock:
+            while self._tunnels and self._tunnels[0].parked_at < deadline:
+                expired.append(self._tunnels.popleft())
+            tunnel = self._tunnels.pop() if self._tunnels else None  # the most recent one
+
+        for old in expired:
+            old.stream.close()
+        return tunnel
+
+    def _refill(self):
+        with self._lock:
+            missing = self._size - len(self._tunnels) - self._opening
+            if missing <= 0:
+                return
+            self._opening += missing
+
+        for _ in range(missing):
+            threading.Thread(target=self._park_tunnel, daemon=True).start()
+
+    def _park_tunnel(self):
+        try:
+            with deadline_scope(DEFAULT_TIMEOUT):
+                tunnel = self._open_tunnel(DEFAULT_TIMEOUT)
+        except Exception:  # the next connect() tries again
+            return
+        finally:
+            with self._lock:
+                self._opening -= 1
+
+        with self._lock:
+            if not self._closed:
+                self._tunnels.append(tunnel)
+                return
+        tunnel.stream.close()
+
+    def _open_tunnel(self, timeout: float) -> _Tunnel:
+        stream = None
+        for proxy, host, port in self._hops:
+            stream = proxy._connect(
+                dest_host=host,
+                dest_port=port,
+                dest_ssl=None,
+                timeout=timeout,
+                stream=stream,
+            )
+
+        proxy = self._last
+        stream = proxy._connect_to_proxy(timeout=timeout, stream=stream)
+        if proxy._proxy_type != ProxyType.SOCKS5:
+            return _Tunnel(stream=stream, conn=None, parked_at=time.monotonic())
+
+        try:
+            conn = proxy._create_connector().authenticate(stream)
+        except socket.timeout as e:
+            stream.close()
+            raise ProxyTimeoutError(f'Proxy connection timed out: {timeout}') from e
+        except ReplyError as e:
+            stream.close()
+            raise ProxyError(e, error_code=e.error_code)
+        except Exception:
+            stream.close()
+            raise
+
+        return _Tunnel(stream=stream, conn=conn, parked_at=time.monotonic())
@@ -1,19 +1,31 @@
-import socket
-from typing import Optional, Tuple
+from typing import Optional
 from ._stream import SyncSocketStream
+from .. import _connect
+from ... import _abc as abc
+from ..._happy_eyeballs import DEFAULT_HAPPY_EYEBALLS_DELAY
+from ..._socket_options import SocketOptions
+from ..._source_address import LocalAddr
 
 
 def connect_tcp(
     host: str,
     port: int,
     timeout: Optional[float] = None,
-    local_addr: Optional[Tuple[str, int]] = None,
+    local_addr: Optional[LocalAddr] = None,
+    resolver: Optional[abc.SyncResolver] = None,
+    happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+    socket_options: Optional[SocketOptions] = None,
+    fast_open: bool = False,
 ) -> SyncSocketStream:
-    address = (host, port)
-    sock = socket.create_connection(
-        address,
-        timeout,
-        source_address=local_addr,
+    sock = _connect.connect_tcp(
+        host=host,
+        port=port,
+        timeout=timeout,
+        local_addr=local_addr,
+        resolver=resolver,
+        happy_eyeballs_delay=happy_eyeballs_delay,
+        socket_options=socket_options,
+        fast_open=fast_open,
     )
 
     return SyncSocketStream(sock)
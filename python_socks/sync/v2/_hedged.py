@@ -0,0 +1,161 @@
+import contextvars
+import queue
+import ssl
+import threading
+import time
+from typing import Iterable, List, Optional
+
+from ..._deadline import deadline_scope
+from ..._hedging import DEFAULT_MAX_ATTEMPTS, Hedging
+from ._proxy import DEFAULT_TIMEOUT, SyncProxy
+from ._stream import SyncSocketStream
+
+
+class _Attempts:
+    """
+    Attempts run in threads of their own, as a blocking connect can't be
+    cancelled. Those that connect once a stream has been taken close it,
+    and count for the time they had taken by then.
+    """
+
+    def __init__(self, hedging: Hedging):
+        self._hedging = hedging
+        self._results: 'queue.Queue' = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._running: List[float] = []  # when the attempts still running started
+        self.pending = 0
+
+    def start(self, proxy: SyncProxy, **kwargs):
+        # the attempt runs within the deadline of the caller
+        context = contextvars.copy_context()
+        thread = threading.Thread(
+            target=context.run,
+            args=(self._run, proxy),
+            kwargs=kwargs,
+            daemon=True,
+        )
+        thread.start()
+        self.pending += 1
+
+    def wait(self, timeout: Optional[float]):
+        """The next (stream, error) result, None once timeout has passed."""
+        try:
+            result = self._results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        self.pending -= 1
+        return result
+
+    def close(self):
+        now = time.monotonic()
+        with self._lock:
+            self._closed = True
+            for started in self._running:
+                self._hedging.record(now - started)
+        while True:
+            try:
+                stream, _ = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if stream is not None:
+                stream.close()
+
+    def _run(self, proxy: SyncProxy, **kwargs):
+        started = time.monotonic()
+        with self._lock:
+            self._running.append(started)
+
+        try:
+            stream = proxy._connect(**kwargs)
+        except Exception as e:
+            with self._lock:
+                if not self._closed:
+                    self._running.remove(started)
+            self._results.put((None, e))
+            return
+
+        with self._lock:
+            if not self._closed:
+                self._running.remove(started)
+                self._hedging.record(time.monotonic() - started)
+                self._results.put((stream, None))
+                return
+        stream.close()
+
+
+class HedgedProxy:
+    """
+    Connects through one of several equivalent proxies, taken in turn.
+    When a connection takes longer than `hedge_delay` (by default the 95th
+    percentile of recent connect times), another proxy is tried alongside,
+    up to `max_attempts` proxies. The first stream established is returned,
+    the other attempts close theirs.
+    """
+
+    def __init__(
+        self,
+        proxies: Iterable[SyncProxy],
+        hedge_delay: Optional[float] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ):
+        self._proxies = tuple(proxies)
+        self._hedging = Hedging(len(self._proxies), delay=hedge_delay, max_attempts=max_attempts)
+
+    def connect(
+        self,
+        dest_host: str,
+        dest_port: int,
+        dest_ssl: Optional[ssl.SSLContext] = None,
+        timeout: Optional[float] = None,
+    ) -> SyncSocketStream:
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT
+
+        with deadline_scope(timeout):
+            stream = self._connect(
+                dest_host=dest_host,
+                dest_port=dest_port,
+                dest_ssl=dest_ssl,
+                timeout=timeout,
+            )
+
+        stream.socket.settimeout(timeout)
+        return stream
+
+    def _connect(
+        self,
+        dest_host: str,
+        dest_port: int,
+        dest_ssl: Optional[ssl.SSLContext],
+        timeout: float,
+    ) -> SyncSocketStream:
+        delay = self._hedging.delay()
+        remaining = list(self._hedging.order(self._proxies))
+        errors: List[Exception] = []
+        attempts = _Attempts(self._hedging)
+
+        try:
+            while remaining or attempts.pending:
+                if remaining:
+                    attempts.start(
+                        remaining.pop(0),
+                        dest_host=dest_host,
+                        dest_port=dest_port,
+                        dest_ssl=dest_ssl,
+                        timeout=timeout,
+                    )
+
+                # every attempt gives up by the deadline, no need for a timeout
+                result = attempts.wait(timeout=delay if remaining else None)
+                if result is None:  # delay has passed, hedge with the next proxy
+                    continue
+
+                stream, error = result
+                if stream is not None:
+                    return stream
+                errors.append(error)
+
+            raise errors[0]
+        finally:
+            attempts.close()
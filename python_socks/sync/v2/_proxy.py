@@ -5,8 +5,16 @@ from typing import Any, Optional
 from ._connect import connect_tcp
 from ._stream import SyncSocketStream
 from .._resolver import SyncResolver
+from ... import _abc as abc
+from ..._happy_eyeballs import DEFAULT_HAPPY_EYEBALLS_DELAY
 from ..._types import ProxyType
+from ..._socket_options import SocketOptions
+from ..._tls_sessions import TLSSessionCache
+from ..._trace import TraceConfig, TracePhase, create_tracer
+from ..._source_address import LocalAddr
+from ..._deadline import PhaseTimeouts, cap_phases, deadline_scope, time_left
 from ..._errors import ProxyConnectionError, ProxyTimeoutError, ProxyError
+from ..._errors import is_connect_error, proxy_connection_error
 from ..._helpers import parse_proxy_url
 
 from ..._protocols.errors import ReplyError
@@ -27,6 +35,14 @@ class SyncProxy:
         rdns: Optional[bool] = None,
         proxy_ssl: Optional[ssl.SSLContext] = None,
         forward: Optional['SyncProxy'] = None,
+        pipeline: bool = False,
+        resolver: Optional[abc.SyncResolver] = None,
+        happy_eyeballs_delay: Optional[float] = DEFAULT_HAPPY_EYEBALLS_DELAY,
+        trace_config: Optional[TraceConfig] = None,
+        phase_timeouts: Optional[PhaseTimeouts] = None,
+        socket_options: Optional[SocketOptions] = None,
+        fast_open: bool = False,
+        tls_session_cache: Optional[TLSSessionCache] = None,
     ):
         self._proxy_type = proxy_type
         self._proxy_host = host
@@ -34,10 +50,25 @@ class SyncProxy:
         self._username = username
         self._password = password
         self._rdns = rdns
+        self._pipeline = pipeline
+        self._happy_eyeballs_delay = happy_eyeballs_delay
+        self._socket_options = socket_options
+        self._fast_open = fast_open
+        if tls_session_cache is None:
+            tls_session_cache = TLSSessionCache()
+        self._tls_sessions = tls_session_cache
         self._proxy_ssl = proxy_ssl
         self._forward = forward
 
-        self._resolver = SyncResolver()
+        self._resolver = resolver if resolver is not None else SyncResolver()
+        # unless a resolver is given, connect_tcp resolves the proxy host itself
+        self._proxy_host_resolver = resolver
+
+        self._tracer = cap_phases(
+            create_tracer(trace_config, proxy_type, host, port),
+            phase_timeouts,
+            scope=deadline_scope,
+        )
 
     def connect(
         self,
@@ -50,43 +81,33 @@ class SyncProxy:
         if timeout is None:
             timeout = DEFAULT_TIMEOUT
 
-        if self._forward is None:
-            local_addr = kwargs.get('local_addr')
-            try:
-                stream = connect_tcp(
-                    host=self._proxy_host,
-                    port=self._proxy_port,
-                    timeout=timeout,
-                    local_addr=local_addr,
-                )
-            except OSError as e:
-                msg = 'Could not connect to proxy {}:{} [{}]'.format(
-                    self._proxy_host,
-                    self._proxy_port,
-                    e.strerror,
-                )
-                raise ProxyConnectionError(e.errno, msg) from e
-        else:
-            stream = self._forward.connect(
-                dest_host=self._proxy_host,
-                dest_port=self._proxy_port,
+        # one deadline for the whole connection, forward proxies included
+        with deadline_scope(timeout):
+            stream = self._connect(
+                dest_host=dest_host,
+                dest_port=dest_port,
+                dest_ssl=dest_ssl,
                 timeout=timeout,
+                local_addr=kwargs.get('local_addr'),
             )
 
-        try:
-            if self._proxy_ssl is not None:
-                stream = stream.start_tls(
-                    hostname=self._proxy_host,
-                    ssl_context=self._proxy_ssl,
-                )
+        stream.socket.settimeout(timeout)
+        return stream
 
-            connector = create_connector(
-                proxy_type=self._proxy_type,
-                username=self._username,
-                password=self._password,
-                rdns=self._rdns,
-                resolver=self._resolver,
-            )
+    def _connect(
+        self,
+        dest_host: str,
+        dest_port: int,
+        dest_ssl: Optional[ssl.SSLContext],
+        timeout: float,
+        local_addr: Optional[LocalAddr] = None,
+        stream: Optional[SyncSocketStream] = None,
+    ) -> SyncSocketStream:
+        fast_open = self._opens_with_fast_open(stream)
+        stream = self._connect_to_proxy(timeout=timeout, local_addr=local_addr, stream=stream)
+
+        try:
+            connector = self._create_connector()
             connector.connect(
                 stream=stream,
                 host=dest_host,
@@ -94,10 +115,12 @@ class SyncProxy:
             )
 
             if dest_ssl is not None:
-                stream = stream.start_tls(
-                    hostname=dest_host,
-                    ssl_context=dest_ssl,
-                )
+                with self._tracer.phase(TracePhase.DEST_TLS):
+                    stream = stream.start_tls(
+                        hostname=dest_host,
+                        ssl_context=dest_ssl,
+                        session_cache=self._tls_sessions,
+                    )
 
             return stream
 
@@ -107,10 +130,101 @@ class SyncProxy:
         except ReplyError as e:
             stream.close()
             raise ProxyError(e, error_code=e.error_code)
+        except OSError as e:
+            stream.close()
+            if fast_open and is_connect_error(e):
+                raise self._connection_error(e) from e
+            raise
         except Exception:
             stream.close()
             raise
 
+    def _connect_to_proxy(
+        self,
+        timeout: float,
+        local_addr: Optional[LocalAddr] = None,
+        stream: Optional[SyncSocketStream] = None,
+    ) -> SyncSocketStream:
+        fast_open = self._opens_with_fast_open(stream)
+        # the stream is given when the proxy is already reached, e.g. by a chain
+        if stream is None:
+            stream = self._open_stream(timeout=timeout, local_addr=local_addr)
+
+        if self._proxy_ssl is not None:
+            try:
+                with self._tracer.phase(TracePhase.PROXY_TLS):
+                    stream = stream.start_tls(
+                        hostname=self._proxy_host,
+                        ssl_context=self._proxy_ssl,
+                        session_cache=self._tls_sessions,
+                    )
+            except socket.timeout as e:
+                stream.close()
+                raise ProxyTimeoutError(f'Proxy connection timed out: {timeout}') from e
+            except OSError as e:
+                stream.close()
+                if fast_open and is_connect_error(e):
+                    raise self._connection_error(e) from e
+                raise
+            except Exception:
+                stream.close()
+                raise
+
+        return stream
+
+    def _opens_with_fast_open(self, stream: Optional[SyncSocketStream]) -> bool:
+        # over a socket connected with fast open, the proxy may turn out
+        # unreachable only once the handshake is sent
+        return self._fast_open and stream is None and self._forward is None
+
+    def _open_stream(
+        self,
+        timeout: float,
+        local_addr: Optional[LocalAddr] = None,
+    ) -> SyncSocketStream:
+        if self._forward is not None:
+            return self._forward.connect(
+                dest_host=self._proxy_host,
+                dest_port=self._proxy_port,
+                timeout=timeout,
+            )
+
+        try:
+            with self._tracer.phase(TracePhase.CONNECT):
+                return connect_tcp(
+                    host=self._proxy_host,
+                    port=self._proxy_port,
+                    timeout=time_left(),
+                    local_addr=local_addr,
+                    resolver=self._proxy_host_resolver,
+                    happy_eyeballs_delay=self._happy_eyeballs_delay,
+                    socket_options=self._socket_options,
+                    fast_open=self._fast_open,
+                )
+        except socket.timeout as e:
+            raise ProxyTimeoutError(f'Proxy connection timed out: {timeout}') from e
+        except OSError as e:
+            raise self._connection_error(e) from e
+
+    def _connection_error(self, e: OSError) -> ProxyConnectionError:
+        msg = 'Could not connect to proxy {}:{} [{}]'.format(
+            self._proxy_host,
+            self._proxy_port,
+            e.strerror,
+        )
+        return proxy_connection_error(e.errno, msg)
+
+    def _create_connector(self):
+        return create_connector(
+            proxy_type=self._proxy_type,
+            username=self._username,
+            password=self._password,
+            rdns=self._rdns,
+            resolver=self._resolver,
+            pipeline=self._pipeline,
+            tracer=self._tracer,
+        )
+
     @classmethod
     def create(cls, *args, **kwargs):  # for backward compatibility
         return cls(*args, **kwargs)
@@ -1,12 +1,14 @@
 """
-Copied from urllib3.util.ssltransport
+Copied from urllib3.util.ssltransport,
+with the I/O loop reworked for throughput
 """
 import io
 import socket
 import ssl
 
 
-SSL_BLOCKSIZE = 16384
+SSL_BLOCKSIZE = 16384  # the largest plaintext a TLS record carries
+DEFAULT_BUFFER_SIZE = 4 * SSL_BLOCKSIZE  # a few records, allocated for every tunnel
 
 
 class SSLTransport:
@@ -21,19 +23,39 @@ class SSLTransport:
     """
 
     def __init__(
-        self, socket, ssl_context, server_hostname=None, suppress_ragged_eofs=True
+        self,
+        socket,
+        ssl_context,
+        server_hostname=None,
+        suppress_ragged_eofs=True,
+        record_size=SSL_BLOCKSIZE,
+        buffer_size=DEFAULT_BUFFER_SIZE,
+        session=None,
     ):
         """
         Create an SSLTransport around socket using the provided ssl_context.
+
+        Data sent is cut into TLS records of `record_size` bytes at most,
+        which are passed to the socket in batches of about `buffer_size`
+        bytes. Data is received from the socket into a buffer of
+        `buffer_size` bytes, allocated once. The handshake resumes
+        `session` if given and the server agrees to.
         """
+        if not 0 < record_size <= SSL_BLOCKSIZE:
+            raise ValueError("record_size must be between 1 and %d" % SSL_BLOCKSIZE)
+
         self.incoming = ssl.MemoryBIO()
         self.outgoing = ssl.MemoryBIO()
 
         self.suppress_ragged_eofs = suppress_ragged_eofs
         self.socket = socket
 
+        self.record_size = record_size
+        self.buffer_size = buffer_size
+        self._recv_buffer = memoryview(bytearray(buffer_size))
+
         self.sslobj = ssl_context.wrap_bio(
-            self.incoming, self.outgoing, server_hostname=server_hostname
+            self.incoming, self.outgoing, server_hostname=server_hostname, session=session
         )
 
         # Perform initial handshake.
@@ -68,18 +90,17 @@ class SSLTransport:
     def sendall(self, data, flags=0):
         if flags != 0:
             raise ValueError("non-zero flags not allowed in calls to sendall")
-        count = 0
         with memoryview(data) as view, view.cast("B") as byte_view:
+            count = 0
             amount = len(byte_view)
             while count < amount:
-                v = self.send(byte_view[count:])
-                count += v
+                count += self._write(byte_view[count:])
 
     def send(self, data, flags=0):
         if flags != 0:
             raise ValueError("non-zero flags not allowed in calls to send")
-        response = self._ssl_io_loop(self.sslobj.write, data)
-        return response
+        with memoryview(data) as view, view.cast("B") as byte_view:
+            return self._write(byte_view)
 
     def makefile(
         self, mode="r", buffering=None, encoding=None, errors=None, newline=None
@@ -153,6 +174,14 @@ class SSLTransport:
     def compression(self):
         return self.sslobj.compression()
 
+    @property
+    def session(self):
+        return self.sslobj.session
+
+    @property
+    def session_reused(self):
+        return self.sslobj.session_reused
+
     def settimeout(self, value):
         self.socket.settimeout(value)
 
@@ -171,13 +200,33 @@ class SSLTransport:
             else:
                 raise
 
-    def _ssl_io_loop(self, func, *args):
-        """Performs an I/O loop between incoming/outgoing and the socket."""
-        should_loop = True
-        ret = None
+    def _write(self, view):
+        """
+        Encrypts records of view until about buffer_size bytes are ready
+        to be sent, then sends them at once. Returns the bytes consumed.
+        """
+        count = 0
+        amount = len(view)
+        while count < amount and self.outgoing.pending < self.buffer_size:
+            chunk = view[count:count + self.record_size]
+            count += self._ssl_io_loop(self.sslobj.write, chunk, flush=False)
+        self._flush()
+        return count
+
+    def _flush(self):
+        if self.outgoing.pending:
+            self.socket.sendall(self.outgoing.read())
+
+    def _fill(self):
+        n = self.socket.recv_into(self._recv_buffer)
+        if n:
+            self.incoming.write(self._recv_buffer[:n])
+        else:
+            self.incoming.write_eof()
 
-        while should_loop:
-            errno = None
+    def _ssl_io_loop(self, func, *args, flush=True):
+        """Performs an I/O loop between incoming/outgoing and the socket."""
+        while True:
             try:
                 ret = func(*args)
             except ssl.SSLError as e:
@@ -185,16 +234,12 @@ class SSLTransport:
                     # WANT_READ, and WANT_WRITE are expected, others are not.
                     raise e
                 errno = e.errno
-
-            buf = self.outgoing.read()
-            self.socket.sendall(buf)
-
-            if errno is None:
-                should_loop = False
-            elif errno == ssl.SSL_ERROR_WANT_READ:
-                buf = self.socket.recv(SSL_BLOCKSIZE)
-                if buf:
-                    self.incoming.write(buf)
-                else:
-                    self.incoming.write_eof()
-        return ret
+            else:
+                if flush:
+                    self._flush()
+                return ret
+
+            # the peer may wait for what is pending before sending anything
+            self._flush()
+            if errno == ssl.SSL_ERROR_WANT_READ:
+                self._fill()
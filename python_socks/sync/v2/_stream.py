@@ -1,10 +1,16 @@
+import errno
+import functools
 import socket
 import ssl
-from typing import Union
+from typing import Callable, Optional, Union
 
 from ._ssl_transport import SSLTransport
 
+from ..._deadline import time_left
 from ..._errors import ProxyError
+from ..._ktls import KTLSState, enable_ktls, ktls_state
+from ..._receive_buffer import ReceiveBuffer
+from ..._tls_sessions import TLSSessionCache
 from ... import _abc as abc
 
 DEFAULT_RECEIVE_SIZE = 65536
@@ -12,45 +18,126 @@ DEFAULT_RECEIVE_SIZE = 65536
 SocketType = Union[socket.socket, ssl.SSLSocket, SSLTransport]
 
 
-class SyncSocketStream(abc.SyncSocketStream):
+class SyncSocketStream(abc.BufferedSyncSocketStream):
     _socket: SocketType
+    _buffer: ReceiveBuffer
+    _put_session: Optional[Callable[[Optional[ssl.SSLSession]], None]]
 
     def __init__(self, sock: SocketType):
         self._socket = sock
+        self._buffer = ReceiveBuffer()
+        self._put_session = None  # puts the TLS session in the cache it came from
+
+    def unread(self, data: bytes):
+        # bytes received past a proxy reply are served before reading any further
+        self._buffer.unread(data)
 
     def write_all(self, data):
+        self._apply_deadline()
         self._socket.sendall(data)
 
     def read(self, max_bytes=DEFAULT_RECEIVE_SIZE):
+        if self._buffer:
+            return bytes(self._buffer.take(max_bytes))
+        self._apply_deadline()
         return self._socket.recv(max_bytes)
 
     def read_exact(self, n):
-        data = bytearray()
-        while len(data) < n:
-            packet = self._socket.recv(n - len(data))
-            if not packet:  # pragma: no cover
+        return bytes(self.read_exact_view(n))
+
+    def read_exact_view(self, n):
+        # receives whatever has arrived, bytes past n are served by the next reads
+        while len(self._buffer) < n:
+            self._apply_deadline()
+            received = self._socket.recv_into(self._buffer.writable())
+            if not received:  # pragma: no cover
                 raise ProxyError('Connection closed unexpectedly')
-            data += packet
-        return data
+            self._buffer.commit(received)
+        return self._buffer.take(n)
+
+    def start_tls(
+        self,
+        hostname: str,
+        ssl_context: ssl.SSLContext,
+        ktls: bool = False,
+        session_cache: Optional[TLSSessionCache] = None,
+    ) -> 'SyncSocketStream':
+        """
+        With ktls, the kernel is let encrypt and decrypt the records once
+        the handshake is done (Linux, Python 3.12+ with OpenSSL 3), which
+        lowers the CPU used per byte and lets socket.sendfile() use
+        os.sendfile(). It does so by setting ssl.OP_ENABLE_KTLS on
+        ssl_context, which stays set for every connection made with it
+        afterwards. The ktls property of the returned stream tells
+        whether the kernel took over, TLS stays in user space otherwise,
+        as it always does for TLS over TLS and over a connection that fast
+        open has yet to establish. With a session_cache, the session last
+        established with hostname is resumed if the server agrees to.
+        """
+        if self._buffer:
+            raise ProxyError('Unexpected data received before TLS handshake')
 
-    def start_tls(self, hostname: str, ssl_context: ssl.SSLContext) -> 'SyncSocketStream':
-        if isinstance(self._socket, (ssl.SSLSocket, SSLTransport)):
+        self._keep_session()
+
+        session = None
+        if session_cache is not None:
+            session = session_cache.get(ssl_context, hostname)
+
+        self._apply_deadline()
+        # wrap_socket() takes a socket that fast open has yet to connect for one
+        # not connected at all, so its ClientHello goes through SSLTransport too
+        tls_in_tls = isinstance(self._socket, (ssl.SSLSocket, SSLTransport))
+        if tls_in_tls or _connect_pending(self._socket):
             ssl_socket = SSLTransport(
                 self._socket,
                 ssl_context=ssl_context,
                 server_hostname=hostname,
+                session=session,
             )
         else:  # plain socket?
+            if ktls:
+                enable_ktls(ssl_context)
             ssl_socket = ssl_context.wrap_socket(
                 self._socket,
                 server_hostname=hostname,
+                session=session,
             )
 
-        return SyncSocketStream(ssl_socket)
+        stream = SyncSocketStream(ssl_socket)
+        if session_cache is not None:
+            stream._put_session = functools.partial(session_cache.put, ssl_context, hostname)
+            stream._keep_session()
+        return stream
+
+    def _keep_session(self):
+        # with TLS 1.3 the session ticket arrives along with the data received,
+        # so the session is cached again once the connection has been used
+        if self._put_session is not None:
+            self._put_session(self._socket.session)
+
+    def _apply_deadline(self):
+        # while connecting, every operation gets what is left of the deadline
+        left = time_left()
+        if left is not None:
+            self._socket.settimeout(left)
 
     def close(self):
+        self._keep_session()
         self._socket.close()
 
     @property
-    def socket(self) -> SocketType:  # pragma: nocover
+    def socket(self) -> SocketType:
         return self._socket
+
+    @property
+    def ktls(self) -> KTLSState:
+        return ktls_state(self._socket)
+
+
+def _connect_pending(sock: socket.socket) -> bool:
+    # with fast open, the SYN goes out along with the first data sent
+    try:
+        sock.getpeername()
+    except OSError as e:
+        return e.errno == errno.ENOTCONN
+    return False
@@ -4,6 +4,8 @@ LOGIN = 'admin'
 PASSWORD = 'admin'
 
 PROXY_HOST_IPV4 = '127.0.0.1'
+# a loopback address where connection attempts never complete, see blackhole_server
+BLACKHOLE_HOST_IPV4 = '127.0.0.2'
 PROXY_HOST_IPV6 = '::1'
 
 PROXY_HOST_NAME_IPV4 = 'ip4.proxy.example.com'
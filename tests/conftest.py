@@ -1,4 +1,6 @@
+import socket
 import ssl
+import threading
 from contextlib import contextmanager
 from unittest import mock
 
@@ -7,7 +9,9 @@ import trustme
 
 from python_socks.async_.asyncio._resolver import Resolver as AsyncioResolver
 from python_socks.sync._resolver import SyncResolver
+from python_socks._socket_options import TCP_FASTOPEN_CONNECT
 from tests.config import (
+    BLACKHOLE_HOST_IPV4,
     PROXY_HOST_IPV4,
     PROXY_HOST_IPV6,
     PROXY_HOST_NAME_IPV4,
@@ -30,7 +34,12 @@ from tests.config import (
     HTTPS_PROXY_PORT,
 )
 from tests.http_server import HttpServer, HttpServerConfig
-from tests.mocks import sync_resolve_factory, async_resolve_factory
+from tests.mocks import (
+    sync_resolve_factory,
+    async_resolve_factory,
+    sync_resolve_all_factory,
+    async_resolve_all_factory,
+)
 from tests.proxy_server import ProxyConfig, ProxyServer
 from tests.utils import wait_until_connectable
 
@@ -116,16 +125,16 @@ def proxy_ssl_keyfile(proxy_ssl_cert):
 
 @pytest.fixture(scope='session', autouse=True)
 def patch_resolvers():
-    p1 = mock.patch.object(
+    p1 = mock.patch.multiple(
         SyncResolver,
-        attribute='resolve',
-        new=sync_resolve_factory(SyncResolver),
+        resolve=sync_resolve_factory(SyncResolver),
+        resolve_all=sync_resolve_all_factory(SyncResolver),
     )
 
-    p2 = mock.patch.object(
+    p2 = mock.patch.multiple(
         AsyncioResolver,
-        attribute='resolve',
-        new=async_resolve_factory(AsyncioResolver),
+        resolve=async_resolve_factory(AsyncioResolver),
+        resolve_all=async_resolve_all_factory(AsyncioResolver),
     )
 
     try:
@@ -134,10 +143,10 @@ def patch_resolvers():
     except ImportError:
         p3 = nullcontext()
     else:
-        p3 = mock.patch.object(
+        p3 = mock.patch.multiple(
             TrioResolver,
-            attribute='resolve',
-            new=async_resolve_factory(TrioResolver),
+            resolve=async_resolve_factory(TrioResolver),
+            resolve_all=async_resolve_all_factory(TrioResolver),
         )
 
     try:
@@ -146,10 +155,10 @@ def patch_resolvers():
     except ImportError:
         p4 = nullcontext()
     else:
-        p4 = mock.patch.object(
+        p4 = mock.patch.multiple(
             CurioResolver,
-            attribute='resolve',
-            new=async_resolve_factory(CurioResolver),
+            resolve=async_resolve_factory(CurioResolver),
+            resolve_all=async_resolve_all_factory(CurioResolver),
         )
 
     try:
@@ -157,10 +166,10 @@ def patch_resolvers():
     except ImportError:
         p5 = nullcontext()
     else:
-        p5 = mock.patch.object(
+        p5 = mock.patch.multiple(
             AnyioResolver,
-            attribute='resolve',
-            new=async_resolve_factory(AnyioResolver),
+            resolve=async_resolve_factory(AnyioResolver),
+            resolve_all=async_resolve_all_factory(AnyioResolver),
         )
 
     with p1, p2, p3, p4, p5:
@@ -266,3 +275,70 @@ def web_server(target_ssl_certfile, target_ssl_keyfile):
     yield None
 
     server.terminate()
+
+
+@pytest.fixture(scope='session')
+def blackhole_server():
+    """
+    Listens on the SOCKS5 proxy port of BLACKHOLE_HOST_IPV4 with a full
+    accept queue, so that new connection attempts hang like for an unreachable host.
+    """
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        listener.bind((BLACKHOLE_HOST_IPV4, SOCKS5_PROXY_PORT))
+    except OSError as e:  # pragma: no cover
+        listener.close()
+        pytest.skip(f'Could not bind to {BLACKHOLE_HOST_IPV4}: {e}')
+    listener.listen(0)
+
+    clients = []
+    for _ in range(3):
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        client.setblocking(False)
+        client.connect_ex((BLACKHOLE_HOST_IPV4, SOCKS5_PROXY_PORT))
+        clients.append(client)
+
+    yield None
+
+    for client in clients:
+        client.close()
+    listener.close()
+
+
+@pytest.fixture(scope='session')
+def fast_open_proxy():
+    """
+    A stand-in HTTP proxy listening with TCP Fast Open, which answers
+    every CONNECT request with success and closes the connection.
+    """
+    if TCP_FASTOPEN_CONNECT is None:  # pragma: no cover
+        pytest.skip('TCP Fast Open is supported on Linux only')
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.IPPROTO_TCP, socket.TCP_FASTOPEN, 16)
+    listener.bind((PROXY_HOST_IPV4, 0))
+    listener.listen(16)
+
+    def serve():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            with conn:
+                data = b''
+                while not data.endswith(b'\r\n\r\n'):
+                    chunk = conn.recv(1024)
+                    if not chunk:
+                        break
+                    data += chunk
+                conn.sendall(b'HTTP/1.1 200 Connection established\r\n\r\n')
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+
+    yield 'http://{}:{}'.format(*listener.getsockname())
+
+    listener.shutdown(socket.SHUT_RDWR)
+    listener.close()
+    thread.join()
@@ -1,6 +1,11 @@
+import errno
+import os
 import socket
+import time
 
+from python_socks._socket_options import enable_fast_open
 from tests.config import (
+    BLACKHOLE_HOST_IPV4,
     TEST_HOST_NAME_IPV4,
     PROXY_HOST_NAME_IPV4,
     TEST_HOST_NAME_IPV6,
@@ -8,6 +13,41 @@ from tests.config import (
 )
 
 
+# Linux 4.15+, not exposed by the socket module
+TCP_FASTOPEN_NO_COOKIE = 34
+
+
+def enable_fast_open_without_cookie(sock):
+    # data goes in the SYN with no cookie, so connect() always returns at once
+    if not enable_fast_open(sock):  # pragma: no cover
+        return False
+    sock.setsockopt(socket.IPPROTO_TCP, TCP_FASTOPEN_NO_COOKIE, 1)
+    return True
+
+
+# what a non-blocking connect fails with on Windows, where it is not errno.EWOULDBLOCK
+WSAEWOULDBLOCK = 10035
+
+
+class WindowsSocket(socket.socket):
+    """Reports a non-blocking connect in progress the way Windows does."""
+
+    def connect(self, address):
+        if self.gettimeout() != 0:
+            return super().connect(address)
+        err = self.connect_ex(address)
+        if err == WSAEWOULDBLOCK:
+            raise BlockingIOError(err, 'A non-blocking socket operation could not be completed')
+        if err:
+            raise OSError(err, os.strerror(err))
+
+    def connect_ex(self, address):
+        err = super().connect_ex(address)
+        if self.gettimeout() == 0 and err == errno.EINPROGRESS:
+            return WSAEWOULDBLOCK
+        return err
+
+
 def getaddrinfo_sync_mock():
     _orig_getaddrinfo = socket.getaddrinfo
 
@@ -79,3 +119,77 @@ def async_resolve_factory(cls):
         return await original_resolve(self, host=host, port=port, family=family)
 
     return new_resolve
+
+
+def sync_resolve_all_factory(cls):
+    original_resolve_all = cls.resolve_all
+
+    def new_resolve_all(self, host, port=0, family=socket.AF_UNSPEC):
+        res = _resolve_local(host)
+
+        if res is not None:
+            return [res]
+
+        return original_resolve_all(self, host=host, port=port, family=family)
+
+    return new_resolve_all
+
+
+def async_resolve_all_factory(cls):
+    original_resolve_all = cls.resolve_all
+
+    async def new_resolve_all(self, host, port=0, family=socket.AF_UNSPEC):
+        res = _resolve_local(host)
+
+        if res is not None:
+            return [res]
+
+        return await original_resolve_all(self, host=host, port=port, family=family)
+
+    return new_resolve_all
+
+
+class SyncBlackholeResolver:
+    def resolve(self, host, port=0, family=socket.AF_UNSPEC):
+        return socket.AF_INET, '127.0.0.1'
+
+    def resolve_all(self, host, port=0, family=socket.AF_UNSPEC):
+        return [(socket.AF_INET, BLACKHOLE_HOST_IPV4), (socket.AF_INET, '127.0.0.1')]
+
+
+class AsyncBlackholeResolver:
+    async def resolve(self, host, port=0, family=socket.AF_UNSPEC):
+        return socket.AF_INET, '127.0.0.1'
+
+    async def resolve_all(self, host, port=0, family=socket.AF_UNSPEC):
+        return [(socket.AF_INET, BLACKHOLE_HOST_IPV4), (socket.AF_INET, '127.0.0.1')]
+
+
+class SyncSlowResolver:
+    """Takes delay seconds to resolve any host name to BLACKHOLE_HOST_IPV4."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def resolve(self, host, port=0, family=socket.AF_UNSPEC):
+        time.sleep(self.delay)
+        return socket.AF_INET, BLACKHOLE_HOST_IPV4
+
+    def resolve_all(self, host, port=0, family=socket.AF_UNSPEC):
+        return [self.resolve(host, port=port, family=family)]
+
+
+class AsyncSlowResolver:
+    """Takes delay seconds to resolve any host name to BLACKHOLE_HOST_IPV4."""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def resolve(self, host, port=0, family=socket.AF_UNSPEC):
+        import anyio
+
+        await anyio.sleep(self.delay)
+        return socket.AF_INET, BLACKHOLE_HOST_IPV4
+
+    async def resolve_all(self, host, port=0, family=socket.AF_UNSPEC):
+        return [await self.resolve(host, port=port, family=family)]
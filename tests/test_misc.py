@@ -1,8 +1,43 @@
 # noinspection PyPackageRequirements
+import errno
+import os
+import socket
+import ssl
+import threading
+import time
+from unittest.mock import patch
+
 import pytest
 
-from python_socks._helpers import is_ip_address  # noqa
+from python_socks import _abc as abc  # noqa
+from python_socks._helpers import is_ip_address, parse_ip_address  # noqa
+from python_socks import ProxyType, TraceConfig, TracePhase  # noqa
+from python_socks._trace import NULL_TRACER, create_tracer  # noqa
+from python_socks._deadline import PhaseTimeouts, deadline_scope, time_left  # noqa
+from python_socks._proxy_pool import ProxySelector, error_class  # noqa
+from python_socks._source_address import (  # noqa
+    IP_BIND_ADDRESS_NO_PORT,
+    SourceAddressPool,
+    bind_socket,
+)
+from python_socks._socket_options import apply_socket_options, keepalive_options  # noqa
+from python_socks._socket_options import TCP_FASTOPEN_CONNECT, enable_fast_open  # noqa
+from python_socks._receive_buffer import ReceiveBuffer  # noqa
+from python_socks._ktls import KTLS_AVAILABLE, NO_KTLS, OP_ENABLE_KTLS  # noqa
+from python_socks._ktls import enable_ktls, ktls_state  # noqa
+from python_socks._tls_sessions import TLSSessionCache  # noqa
+from python_socks._hedging import DEFAULT_HEDGE_DELAY, MIN_SAMPLES, Hedging  # noqa
+from python_socks._happy_eyeballs import interleave_addresses, connect_error  # noqa
 from python_socks._protocols.http import BasicAuth  # noqa
+from python_socks._protocols import socks4, socks5, http  # noqa
+from python_socks._protocols.errors import ReplyError  # noqa
+from python_socks._errors import ProxyConnectionError, ProxyError, ProxyTimeoutError  # noqa
+from python_socks._errors import PortExhaustionError, proxy_connection_error  # noqa
+from python_socks._connectors.http_sync import HttpSyncConnector  # noqa
+from python_socks._connectors.socks5_sync import Socks5SyncConnector  # noqa
+from python_socks.sync._stream import SyncSocketStream  # noqa
+from python_socks.sync.v2._stream import SyncSocketStream as SyncSocketStreamV2  # noqa
+from python_socks.sync.v2._ssl_transport import SSL_BLOCKSIZE, SSLTransport  # noqa
 
 
 @pytest.mark.parametrize('address', ('::1', b'::1', '127.0.0.1', b'127.0.0.1'))
@@ -10,6 +45,25 @@ def test_is_ip_address(address):
     assert is_ip_address(address)
 
 
+@pytest.mark.parametrize(
+    'address',
+    ('localhost', 'example.com', '1.2.3', '256.1.1.1', '::1%lo', '', b'\xff', 'ip4.\u0442.com'),
+)
+def test_is_not_ip_address(address):
+    assert not is_ip_address(address)
+
+
+def test_parse_ip_address():
+    assert parse_ip_address('127.0.0.1') == (socket.AF_INET, b'\x7f\x00\x00\x01')
+    assert parse_ip_address(b'127.0.0.1') == (socket.AF_INET, b'\x7f\x00\x00\x01')
+    assert parse_ip_address('::1') == (socket.AF_INET6, b'\x00' * 15 + b'\x01')
+    assert parse_ip_address('::ffff:1.2.3.4') == (
+        socket.AF_INET6,
+        b'\x00' * 10 + b'\xff\xff\x01\x02\x03\x04',
+    )
+    assert parse_ip_address('example.com') is None
+
+
 def test_basic_auth():
     login = 'login'
     password = 'password'
@@ -19,3 +73,542 @@ def test_basic_auth():
 
     assert auth2.login == login
     assert auth2.password == password
+
+
+def test_socks5_pipelined_connection():
+    conn = socks5.Connection(pipeline=True)
+    request = socks5.AuthMethodsRequest(username='login', password='password', pipeline=True)
+    assert request.methods == bytearray([socks5.AuthMethod.USERNAME_PASSWORD])
+
+    conn.send(request)
+    conn.send(socks5.AuthRequest(username='login', password='password'))
+    conn.send(socks5.ConnectRequest(host='127.0.0.1', port=80))
+
+    conn.receive(bytes([socks5.SOCKS_VER, socks5.AuthMethod.USERNAME_PASSWORD]))
+    conn.receive(bytes([socks5.AuthRequest.VER, socks5.AUTH_GRANTED]))
+    reply = conn.receive(bytes([5, 0, 0, 1, 127, 0, 0, 1, 0, 80]))
+
+    assert reply.bound_port == 80
+    assert isinstance(conn.state, socks5.StateServerConnected)
+
+
+def test_socks5_connection_rejects_pipelining_by_default():
+    conn = socks5.Connection()
+    conn.send(socks5.AuthMethodsRequest(username=None, password=None))
+    with pytest.raises(RuntimeError):
+        conn.send(socks5.ConnectRequest(host='127.0.0.1', port=80))
+
+
+@pytest.mark.parametrize(
+    'reply_data,bound_host',
+    (
+        (bytes([5, 0, 0, 1, 127, 0, 0, 1, 0, 80]), '127.0.0.1'),
+        (bytes([5, 0, 0, 4]) + b'\x00' * 15 + b'\x01' + bytes([0, 80]), '::1'),
+        (bytes([5, 0, 0, 3, 9]) + b'localhost' + bytes([0, 80]), 'localhost'),
+    ),
+)
+@pytest.mark.parametrize('chunk_size', (1, 3, 100))
+def test_socks5_connection_feed(reply_data, bound_host, chunk_size):
+    conn = socks5.Connection(pipeline=True)
+    conn.send(socks5.AuthMethodsRequest(username='login', password='password', pipeline=True))
+    conn.send(socks5.AuthRequest(username='login', password='password'))
+    conn.send(socks5.ConnectRequest(host='localhost', port=80))
+
+    data = bytes([5, 2, 1, 0]) + reply_data + b'tunneled'
+    replies = []
+    view = memoryview(data)
+    while view:
+        replies += conn.feed(view[:chunk_size])
+        view = view[chunk_size:]
+
+    assert [type(r) for r in replies] == [
+        socks5.AuthMethodReply,
+        socks5.AuthReply,
+        socks5.ConnectReply,
+    ]
+    assert replies[-1].bound_host == bound_host
+    assert replies[-1].bound_port == 80
+    assert conn.bytes_needed == 0
+    assert conn.leftover == b'tunneled'
+
+
+def test_socks5_connection_bytes_needed():
+    conn = socks5.Connection()
+    conn.send(socks5.AuthMethodsRequest(username=None, password=None))
+    assert conn.bytes_needed == 2
+    conn.feed(bytes([5, 0]))
+    conn.send(socks5.ConnectRequest(host='127.0.0.1', port=80))
+
+    assert conn.bytes_needed == 3
+    assert conn.feed(bytes([5, 0, 0])) == []
+    assert conn.bytes_needed == 4
+    assert conn.feed(bytes([1, 127, 0, 0])) == []
+    assert conn.bytes_needed == 3
+    assert len(conn.feed(bytes([1, 0, 80]))) == 1
+
+
+def test_socks5_connection_feed_error():
+    conn = socks5.Connection()
+    conn.send(socks5.AuthMethodsRequest(username=None, password=None))
+    conn.feed(bytes([5, 0]))
+    conn.send(socks5.ConnectRequest(host='127.0.0.1', port=80))
+
+    # a failure is reported as soon as the reply code is known
+    with pytest.raises(ReplyError) as e:
+        conn.feed(bytes([5, socks5.ReplyCode.CONNECTION_REFUSED, 0]))
+    assert e.value.error_code == socks5.ReplyCode.CONNECTION_REFUSED
+
+
+def test_socks4_connection_feed():
+    conn = socks4.Connection()
+    conn.send(socks4.ConnectRequest(host='127.0.0.1', port=80, user_id=None))
+    assert conn.bytes_needed == socks4.ConnectReply.SIZE
+
+    assert conn.feed(bytes([0, socks4.ReplyCode.REQUEST_GRANTED, 0])) == []
+    assert conn.bytes_needed == 5
+    (reply,) = conn.feed(bytes([80, 127, 0, 0, 1]) + b'tunneled')
+    assert reply.host == '127.0.0.1'
+    assert reply.port == 80
+    assert conn.leftover == b'tunneled'
+
+
+def test_http_connection_feed():
+    conn = http.Connection()
+    conn.send(http.ConnectRequest(host='127.0.0.1', port=80, username=None, password=None))
+    assert conn.bytes_needed == http.MIN_REPLY_SIZE
+
+    assert conn.feed(b'HTTP/1.1 200 Connection established\r') == []
+    assert conn.bytes_needed == 3
+    assert conn.feed(b'\n\r') == []
+    assert conn.bytes_needed == 1
+    (reply,) = conn.feed(b'\ntunneled')
+    assert reply.status_code == 200
+    assert conn.leftover == b'tunneled'
+
+
+def test_http_connect_reply_headers():
+    reply = http.ConnectReply.loads(
+        b'HTTP/1.1 200 Connection established\r\n'
+        b'Proxy-Agent: test\r\n'
+        b'Via: 1.1 a\r\n'
+        b'via:1.1 b\r\n'
+        b'\r\n'
+    )
+    assert reply.message == 'Connection established'
+    assert reply.headers == {'proxy-agent': 'test', 'via': '1.1 a, 1.1 b'}
+
+    with pytest.raises(ReplyError):
+        http.ConnectReply.loads(b'HTTP/1.1 200 OK\r\nInvalid header\r\n\r\n')
+
+
+def test_http_connection_reply_too_large():
+    conn = http.Connection()
+    conn.send(http.ConnectRequest(host='127.0.0.1', port=80, username=None, password=None))
+    conn.feed(b'HTTP/1.1 200 OK\r\n')
+    with pytest.raises(ReplyError):
+        conn.feed(b'X-Padding: ' + b'x' * http.MAX_REPLY_SIZE)
+
+
+@pytest.mark.parametrize('stream_cls', (SyncSocketStream, SyncSocketStreamV2))
+def test_http_connector_keeps_tunneled_data(stream_cls):
+    client, server = socket.socketpair()
+    with client, server:
+        server.sendall(b'HTTP/1.1 200 Connection established\r\nProxy-Agent: test\r\n')
+        server.sendall(b'\r\nSSH-2.0-banner\r\n')
+
+        stream = stream_cls(client)
+        connector = HttpSyncConnector(username=None, password=None, resolver=None)
+        reply = connector.connect(stream, host='example.com', port=22)
+        assert reply.headers == {'proxy-agent': 'test'}
+
+        # either served from the stream's pre-read data or left unread in the socket
+        assert stream.read_exact(len(b'SSH-2.0-banner\r\n')) == b'SSH-2.0-banner\r\n'
+        assert server.recv(1024).startswith(b'CONNECT example.com:22 HTTP/1.1\r\n')
+
+
+def test_http_connector_reads_reply_at_once():
+    client, server = socket.socketpair()
+    with client, server:
+        reply = b'HTTP/1.1 200 Connection established\r\nProxy-Agent: test\r\n\r\n'
+        server.sendall(reply + b'SSH-2.0-banner\r\n')
+
+        stream = SyncSocketStream(client)
+        connector = HttpSyncConnector(username=None, password=None, resolver=None)
+        with patch.object(stream, 'read_exact', wraps=stream.read_exact) as read_exact:
+            connector.connect(stream, host='example.com', port=22)
+        # the end of the headers is looked for before receiving, not a few bytes at a time
+        read_exact.assert_called_once_with(len(reply))
+        assert client.recv(1024) == b'SSH-2.0-banner\r\n'
+
+        # the end of the headers split across segments
+        server.sendall(reply[:-2])
+        timer = threading.Timer(0.05, server.sendall, (reply[-2:],))
+        timer.start()
+        assert stream.read_until(http.END_OF_HEADERS, http.MAX_REPLY_SIZE) == reply
+        timer.join()
+
+
+def test_http_connector_with_minimal_stream():
+    # the stream ABC reads up to the separator, a byte at a time
+    class MinimalStream(abc.SyncSocketStream):
+        def __init__(self, sock):
+            self.sock = sock
+
+        def write_all(self, data):
+            self.sock.sendall(data)
+
+        def read_exact(self, n):
+            data = b''
+            while len(data) < n:
+                data += self.sock.recv(n - len(data))
+            return data
+
+    client, server = socket.socketpair()
+    with client, server:
+        reply = b'HTTP/1.1 200 Connection established\r\nProxy-Agent: test\r\n\r\n'
+        server.sendall(reply + b'SSH-2.0-banner\r\n')
+
+        connector = HttpSyncConnector(username=None, password=None, resolver=None)
+        reply = connector.connect(MinimalStream(client), host='example.com', port=22)
+        assert reply.headers == {'proxy-agent': 'test'}
+        assert client.recv(1024) == b'SSH-2.0-banner\r\n'
+
+
+@pytest.mark.parametrize('stream_cls', (SyncSocketStream, SyncSocketStreamV2))
+def test_socks5_connector_keeps_tunneled_data(stream_cls):
+    client, server = socket.socketpair()
+    with client, server:
+        server.sendall(
+            b'\x05\x00'  # no authentication
+            b'\x05\x00\x00\x01\x7f\x00\x00\x01\x00\x16'  # succeeded, bound to 127.0.0.1:22
+            b'SSH-2.0-banner\r\n'
+        )
+
+        stream = stream_cls(client)
+        connector = Socks5SyncConnector(username=None, password=None, rdns=True, resolver=None)
+        reply = connector.connect(stream, host='example.com', port=22)
+        assert (reply.bound_host, reply.bound_port) == ('127.0.0.1', 22)
+
+        # either served from the stream's pre-read data or left unread in the socket
+        assert stream.read(1024) == b'SSH-2.0-banner\r\n'
+
+
+def test_read_exact_returns_bytes():
+    client, server = socket.socketpair()
+    with client, server:
+        stream = SyncSocketStreamV2(client)
+        server.sendall(b'abcd')
+        first = stream.read_exact(4)
+        # the receive buffer is reused for the next bytes received
+        server.sendall(b'efgh')
+        second = stream.read_exact(4)
+        assert isinstance(first, bytes)
+        assert (first, second) == (b'abcd', b'efgh')
+
+        # the zero-copy read the connectors use, copied by what they feed
+        server.sendall(b'ijkl')
+        view = stream.read_exact_view(4)
+        assert isinstance(view, memoryview)
+        assert view == b'ijkl'
+
+        # streams with no buffer of their own read as read_exact() does
+        server.sendall(b'mnop')
+        assert SyncSocketStream(client).read_exact_view(4) == b'mnop'
+
+
+@pytest.mark.parametrize('record_size', (1000, SSL_BLOCKSIZE))
+def test_ssl_transport(record_size, target_ssl_cert, target_ssl_context):
+    server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    target_ssl_cert.configure_cert(server_context)
+    payload = os.urandom(300_000)
+
+    def echo(sock):
+        with server_context.wrap_socket(sock, server_side=True) as conn:
+            received = bytearray()
+            while len(received) < len(payload):
+                received += conn.recv(65536)
+            conn.sendall(received)
+
+    client, server = socket.socketpair()
+    thread = threading.Thread(target=echo, args=(server,))
+    thread.start()
+    with SSLTransport(
+        client,
+        ssl_context=target_ssl_context,
+        server_hostname='localhost',
+        record_size=record_size,
+        buffer_size=65536,
+    ) as transport:
+        transport.sendall(payload)
+        received = bytearray()
+        while len(received) < len(payload):
+            received += transport.recv(65536)
+        assert received == payload
+    thread.join()
+
+    with pytest.raises(ValueError):
+        SSLTransport(client, target_ssl_context, record_size=SSL_BLOCKSIZE + 1)
+
+
+def test_tls_session_cache():
+    class Session:
+        def __init__(self, has_ticket=True):
+            self.has_ticket = has_ticket
+
+    context, other_context = ssl.create_default_context(), ssl.create_default_context()
+    cache = TLSSessionCache(maxsize=2, ttl=0.2)
+    session = Session()
+    cache.put(context, 'a', session)
+    cache.put(context, 'b', Session())
+    cache.put(context, 'a', None)  # no session established
+    cache.put(context, 'a', Session(has_ticket=False))  # no ticket received yet
+    assert cache.get(context, 'a') is session
+    assert cache.get(other_context, 'b') is None
+    assert len(cache) == 2
+
+    cache.put(other_context, 'a', Session())  # evicts (context, 'b'), used least recently
+    assert len(cache) == 2
+    assert cache.get(context, 'b') is None
+    assert len(cache) == 2
+
+    time.sleep(0.2)
+    assert cache.get(context, 'a') is None
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_receive_buffer():
+    buffer = ReceiveBuffer(size=8)
+    assert not buffer
+
+    view = buffer.writable()
+    view[:6] = b'abcdef'
+    buffer.commit(6)
+    assert buffer.take(2) == b'ab'
+
+    buffer.append(b'ghijklmn')  # moved to the front, then grown
+    assert len(buffer) == 12
+    assert buffer.take(3) == b'cde'
+
+    buffer.unread(b'cde')
+    buffer.unread(b'xyz')
+    assert buffer.take(100) == b'xyzcdefghijklmn'
+    assert not buffer
+
+
+def test_tracer():
+    started, ended = [], []
+    config = TraceConfig()
+    config.on_phase_start.append(started.append)
+    config.on_phase_end.append(ended.append)
+    tracer = create_tracer(config, ProxyType.SOCKS5, '127.0.0.1', 1080)
+
+    error = ReplyError('Authentication failed')
+    with pytest.raises(ReplyError):
+        with tracer.phase(TracePhase.AUTH):
+            raise error
+
+    (start,) = started
+    (end,) = ended
+    assert start.phase == end.phase == TracePhase.AUTH
+    assert end.proxy_type == ProxyType.SOCKS5
+    assert (end.proxy_host, end.proxy_port) == ('127.0.0.1', 1080)
+    assert start.end is None and start.duration is None
+    assert end.start == start.start and end.duration >= 0
+    assert end.error is error
+
+    assert create_tracer(None, ProxyType.SOCKS5, '127.0.0.1', 1080) is NULL_TRACER
+
+
+def test_deadline_scope():
+    assert time_left() is None
+    with deadline_scope(10):
+        assert 9 < time_left() <= 10
+        with deadline_scope(100):
+            assert time_left() <= 10
+        with deadline_scope(1):
+            assert time_left() <= 1
+        assert time_left() > 1
+    assert time_left() is None
+
+    with deadline_scope(0):
+        with pytest.raises(socket.timeout):
+            time_left()
+
+
+def test_phase_timeouts_caps():
+    assert PhaseTimeouts().caps() == {}
+    assert PhaseTimeouts(tls=1, reply=2).caps() == {
+        TracePhase.PROXY_TLS: 1,
+        TracePhase.DEST_TLS: 1,
+        TracePhase.REQUEST: 2,
+    }
+
+
+def test_hedging():
+    hedging = Hedging(3, max_attempts=2)
+    assert hedging.order('abc') == ['a', 'b']
+    assert hedging.order('abc') == ['b', 'c']
+    assert hedging.order('abc') == ['c', 'a']
+
+    assert hedging.delay() == DEFAULT_HEDGE_DELAY
+    for i in range(MIN_SAMPLES):
+        hedging.record(i + 1)
+    assert hedging.delay() == MIN_SAMPLES * 0.95
+
+    assert Hedging(1, delay=0.1, max_attempts=5).order('a') == ['a']
+    assert Hedging(1, delay=0.1).delay() == 0.1
+    with pytest.raises(ValueError):
+        Hedging(0)
+
+
+def test_error_class():
+    assert error_class(ProxyTimeoutError('timed out')) == 'timeout'
+    assert error_class(ProxyConnectionError(111, 'refused')) == 'connection'
+    assert error_class(ProxyError('Host unreachable', error_code=4)) == 4
+    assert error_class(ProxyError('Authentication failed')) == 'reply'
+    assert error_class(ValueError()) == 'ValueError'
+
+
+def test_proxy_selector():
+    selector = ProxySelector(['slow', 'fast'], failure_threshold=2, backoff=0.05)
+
+    for latency in (0.3, 0.1):
+        entry = selector.acquire()
+        selector.release(entry, latency=latency)
+    assert selector.acquire().proxy == 'fast'  # now in flight, but still the best
+    assert selector.acquire().proxy == 'fast'
+    assert selector.acquire().proxy == 'slow'
+
+    selector = ProxySelector(['dead', 'live'], failure_threshold=2, backoff=0.05)
+    entry = selector.acquire()
+    assert entry.proxy == 'dead'
+    selector.release(entry, error=ProxyConnectionError(111, 'refused'))
+    live = selector.acquire()
+    assert live.proxy == 'live'
+    entry = selector.acquire()  # the live one is busy
+    assert entry.proxy == 'dead'
+    selector.release(entry, error=ProxyConnectionError(111, 'refused'))
+    selector.release(live, latency=0.01)
+    assert [s.circuit_open for s in selector.stats()] == [True, False]
+    assert selector.acquire().proxy == 'live'
+
+    time.sleep(0.06)
+    probe = selector.acquire()
+    assert probe.proxy == 'dead'
+    selector.release(probe, latency=0.01)
+    assert not selector.stats()[0].circuit_open
+
+    selector = ProxySelector(['dead'], failure_threshold=1)
+    selector.release(selector.acquire(), error=ProxyTimeoutError('timed out'))
+    with pytest.raises(ProxyConnectionError):
+        selector.acquire()
+
+
+def test_proxy_selector_unmeasured_failing_proxy():
+    # replies with an error, so the circuit stays closed, but never connects
+    selector = ProxySelector(['bad', 'good'])
+    picked = []
+    for _ in range(10):
+        entry = selector.acquire()
+        picked.append(entry.proxy)
+        if entry.proxy == 'bad':
+            selector.release(entry, error=ProxyError('General failure', error_code=1))
+        else:
+            selector.release(entry, latency=0.1)
+    assert picked == ['bad'] + ['good'] * 9
+
+    # still tried once the good one is loaded
+    entries = [selector.acquire() for _ in range(3)]
+    assert [entry.proxy for entry in entries] == ['good', 'bad', 'good']
+
+
+def test_source_address_pool():
+    pool = SourceAddressPool(['127.0.0.1', '::1', '127.0.0.2'])
+    assert pool.next_host(socket.AF_INET) == '127.0.0.1'
+    assert pool.next_host(socket.AF_INET6) == '::1'
+    assert pool.next_host(socket.AF_INET) == '127.0.0.2'
+    assert pool.next_host(socket.AF_INET) == '127.0.0.1'
+    assert SourceAddressPool(['::1']).next_host(socket.AF_INET) is None
+
+    with pytest.raises(ValueError):
+        SourceAddressPool(['localhost'])
+    with pytest.raises(ValueError):
+        SourceAddressPool([])
+
+
+@pytest.mark.skipif(IP_BIND_ADDRESS_NO_PORT is None, reason='Linux only')
+def test_bind_socket_defers_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        bind_socket(sock, SourceAddressPool(['127.0.0.1']))
+        assert sock.getsockopt(socket.IPPROTO_IP, IP_BIND_ADDRESS_NO_PORT) == 1
+        assert sock.getsockname() == ('127.0.0.1', 0)
+
+
+def test_keepalive_options():
+    assert keepalive_options() == [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+    options = keepalive_options(idle=30, interval=10, count=3, user_timeout=20)
+    if hasattr(socket, 'TCP_USER_TIMEOUT'):
+        assert (socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, 20000) in options
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        apply_socket_options(sock, options)
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+        assert not sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        apply_socket_options(sock, None)
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+
+
+def test_enable_fast_open():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        assert enable_fast_open(sock) is (TCP_FASTOPEN_CONNECT is not None)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        assert not enable_fast_open(sock)
+
+
+def test_enable_ktls():
+    ssl_context = ssl.create_default_context()
+    assert enable_ktls(ssl_context) is KTLS_AVAILABLE
+    assert bool(ssl_context.options & OP_ENABLE_KTLS) is KTLS_AVAILABLE
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        assert ktls_state(sock) == NO_KTLS
+    ssl_object = ssl_context.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO())
+    assert ktls_state(ssl_object) == NO_KTLS
+
+
+def test_proxy_connection_error():
+    e = proxy_connection_error(errno.EADDRNOTAVAIL, 'Could not connect to proxy')
+    assert isinstance(e, PortExhaustionError)
+    assert e.errno == errno.EADDRNOTAVAIL
+
+    e = proxy_connection_error(errno.ECONNREFUSED, 'Could not connect to proxy')
+    assert type(e) is ProxyConnectionError
+
+
+def test_interleave_addresses():
+    v4 = socket.AF_INET
+    v6 = socket.AF_INET6
+    addresses = [(v6, '::1'), (v6, '::2'), (v6, '::3'), (v4, '10.0.0.1'), (v4, '10.0.0.2')]
+    assert interleave_addresses(addresses) == [
+        (v6, '::1'),
+        (v4, '10.0.0.1'),
+        (v6, '::2'),
+        (v4, '10.0.0.2'),
+        (v6, '::3'),
+    ]
+
+
+def test_connect_error():
+    e1 = ConnectionRefusedError(111, 'Connection refused')
+    assert connect_error([e1]) is e1
+    assert connect_error([e1, ConnectionRefusedError(111, 'Connection refused')]) is e1
+
+    e2 = connect_error([e1, TimeoutError(110, 'Connection timed out')])
+    assert e2.errno == 111
+    assert 'Connection refused' in e2.strerror
+    assert 'Connection timed out' in e2.strerror
@@ -1,12 +1,15 @@
 import asyncio
 import socket
+from unittest.mock import patch
 
 import pytest  # noqa
 from yarl import URL  # noqa
 
 from python_socks import ProxyType, ProxyError, ProxyTimeoutError, ProxyConnectionError
+from python_socks import TraceConfig, TracePhase
 from python_socks.async_ import ProxyChain
 from python_socks.async_.asyncio import Proxy
+from python_socks.async_.asyncio import CachingResolver
 from python_socks.async_.asyncio._resolver import Resolver
 from tests.config import (
     PROXY_HOST_IPV4,
@@ -23,6 +26,7 @@ from tests.config import (
     SOCKS5_IPV4_HOSTNAME_URL,
     TEST_URL_IPV4_HTTPS,
 )
+from tests.mocks import AsyncBlackholeResolver, enable_fast_open_without_cookie
 
 
 async def make_request(
@@ -113,6 +117,52 @@ async def test_socks5_proxy_ipv4_with_auth_none(url, rdns, target_ssl_context):
     assert status_code == 200
 
 
+@pytest.mark.parametrize('proxy_url', (SOCKS5_IPV4_URL, SOCKS5_IPV4_URL_WO_AUTH))
+@pytest.mark.parametrize('rdns', (True, False))
+@pytest.mark.asyncio
+async def test_socks5_proxy_pipeline(proxy_url, rdns):
+    proxy = Proxy.from_url(proxy_url, rdns=rdns, pipeline=True)
+    status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4)
+    assert status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_socks5_proxy_with_caching_resolver():
+    resolver = CachingResolver()
+    proxy = Proxy.from_url(SOCKS5_IPV4_HOSTNAME_URL, rdns=False, resolver=resolver)
+    for _ in range(2):
+        status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4)
+        assert status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_socks5_proxy_trace():
+    events = []
+    trace_config = TraceConfig()
+    trace_config.on_phase_end.append(events.append)
+    proxy = Proxy.from_url(SOCKS5_IPV4_URL, rdns=False, trace_config=trace_config)
+    status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4)
+    assert status_code == 200
+    assert [e.phase for e in events] == [
+        TracePhase.CONNECT,
+        TracePhase.AUTH,
+        TracePhase.RESOLVE,
+        TracePhase.REQUEST,
+    ]
+    assert all(e.error is None and e.duration >= 0 for e in events)
+
+
+@pytest.mark.asyncio
+async def test_socks5_proxy_happy_eyeballs(blackhole_server):
+    proxy = Proxy.from_url(
+        SOCKS5_IPV4_HOSTNAME_URL,
+        resolver=AsyncBlackholeResolver(),
+        happy_eyeballs_delay=0.1,
+    )
+    status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4, timeout=5)
+    assert status_code == 200
+
+
 @pytest.mark.asyncio
 async def test_socks5_proxy_with_invalid_credentials():
     proxy = Proxy.create(
@@ -152,6 +202,18 @@ async def test_socks5_proxy_with_invalid_proxy_port(unused_tcp_port):
         await make_request(proxy=proxy, url=TEST_URL_IPV4)
 
 
+@pytest.mark.asyncio
+async def test_http_proxy_fast_open_with_invalid_proxy_port(unused_tcp_port):
+    proxy = Proxy.from_url(f'http://{PROXY_HOST_IPV4}:{unused_tcp_port}', fast_open=True)
+    # connect() returns at once, that nothing listens shows on the first receive
+    with patch(
+        'python_socks.async_.asyncio._connect.enable_fast_open',
+        new=enable_fast_open_without_cookie,
+    ):
+        with pytest.raises(ProxyConnectionError):
+            await make_request(proxy=proxy, url=TEST_URL_IPV4)
+
+
 @pytest.mark.parametrize('url', (TEST_URL_IPV4, TEST_URL_IPV4_HTTPS))
 @pytest.mark.skipif(SKIP_IPV6_TESTS, reason="TravisCI doesn't support ipv6")
 @pytest.mark.asyncio
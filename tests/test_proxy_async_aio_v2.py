@@ -1,4 +1,7 @@
 import asyncio
+import socket
+import ssl
+import time
 import sys
 from unittest.mock import patch
 
@@ -6,9 +9,18 @@ import pytest
 from yarl import URL
 
 from python_socks import ProxyType, ProxyError, ProxyTimeoutError, ProxyConnectionError
+from python_socks import TraceConfig, TracePhase, PhaseTimeouts, SourceAddressPool
+from python_socks import DEFAULT_SOCKET_OPTIONS, keepalive_options
+from python_socks._ktls import NO_KTLS
+from python_socks._socket_options import TCP_FASTOPEN_CONNECT
+from python_socks._hedging import MIN_SAMPLES
 from python_socks.async_.asyncio._resolver import Resolver
 from python_socks.async_.asyncio.v2 import Proxy
-from python_socks.async_.asyncio.v2 import ProxyChain
+from python_socks.async_.asyncio.v2 import ProxyChain, PooledProxyChain, HedgedProxy
+from python_socks.async_ import ProxyPool
+from python_socks.async_.asyncio.v2 import WarmProxyPool
+from python_socks.async_.asyncio.v2 import CachingResolver
+from python_socks.async_.asyncio.v2 import ConnectTarget, connect_many
 from python_socks.async_.asyncio.v2._proxy import AsyncioProxy
 from tests.config import (
     PROXY_HOST_IPV4,
@@ -21,11 +33,19 @@ from tests.config import (
     SOCKS5_IPV6_URL,
     SOCKS4_URL,
     HTTP_PROXY_URL,
+    HTTPS_PROXY_URL,
     TEST_URL_IPV4,
     SOCKS5_IPV4_HOSTNAME_URL,
     TEST_URL_IPV4_HTTPS, TEST_URL_IPv6,
+    TEST_HOST_IPV4,
+    TEST_HOST_NAME_IPV4,
+    TEST_PORT_IPV4,
+    TEST_PORT_IPV4_HTTPS,
+    BLACKHOLE_HOST_IPV4,
 )
-from tests.mocks import getaddrinfo_async_mock
+from tests.utils import fast_open_enabled, sent_syn_data
+from tests.mocks import enable_fast_open_without_cookie
+from tests.mocks import getaddrinfo_async_mock, AsyncBlackholeResolver, AsyncSlowResolver
 
 
 async def make_request(
@@ -83,6 +103,43 @@ async def make_request(
         return int(status_code)
 
 
+class ResponseProtocol(asyncio.Protocol):
+    def __init__(self):
+        self.transport = None
+        self.received = bytearray()
+        self.done = asyncio.get_running_loop().create_future()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.received += data
+
+    def eof_received(self):
+        return False
+
+    def connection_lost(self, exc):
+        self.done.set_result(bytes(self.received))
+
+
+class BufferedResponseProtocol(ResponseProtocol, asyncio.BufferedProtocol):
+    buffer_size = 65536
+
+    def __init__(self):
+        super().__init__()
+        self.buffer = bytearray(self.buffer_size)
+
+    def get_buffer(self, sizehint):
+        return self.buffer
+
+    def buffer_updated(self, nbytes):
+        self.received += self.buffer[:nbytes]
+
+
+class SmallBufferedResponseProtocol(BufferedResponseProtocol):
+    buffer_size = 3  # smaller than the data received during the handshake
+
+
 @pytest.mark.parametrize('url', (TEST_URL_IPV4, TEST_URL_IPV4_HTTPS))
 @pytest.mark.parametrize('rdns', (True, False))
 @pytest.mark.parametrize('resolve_host', (True, False))
@@ -120,6 +177,281 @@ async def test_socks5_proxy_ipv4_with_auth_none(url, rdns, target_ssl_context):
     assert status_code == 200
 
 
+@pytest.mark.parametrize('proxy_url', (SOCKS5_IPV4_URL, SOCKS5_IPV4_URL_WO_AUTH))
+@pytest.mark.parametrize('rdns', (True, False))
+@pytest.mark.asyncio
+async def test_socks5_proxy_pipeline(proxy_url, rdns):
+    proxy = Proxy.from_url(proxy_url, rdns=rdns, pipeline=True)
+    status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4)
+    assert status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_socks5_proxy_with_caching_resolver():
+    resolver = CachingResolver()
+    proxy = Proxy.from_url(SOCKS5_IPV4_HOSTNAME_URL, rdns=False, resolver=resolver)
+    for _ in range(2):
+        status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4)
+        assert status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_socks5_proxy_trace(target_ssl_context):
+    events = []
+    trace_config = TraceConfig()
+    trace_config.on_phase_end.append(events.append)
+    proxy = Proxy.from_url(SOCKS5_IPV4_URL, rdns=False, trace_config=trace_config)
+    status_code = await make_request(
+        proxy=proxy,
+        url=TEST_URL_IPV4_HTTPS,
+        ssl_context=target_ssl_context,
+    )
+    assert status_code == 200
+    assert [e.phase for e in events] == [
+        TracePhase.CONNECT,
+        TracePhase.AUTH,
+        TracePhase.RESOLVE,
+        TracePhase.REQUEST,
+        TracePhase.DEST_TLS,
+    ]
+    assert all(e.error is None and e.duration >= 0 for e in events)
+
+
+@pytest.mark.asyncio
+async def test_connect_many():
+    invalid_url = f'socks5://{LOGIN}:{PASSWORD}aaa@{PROXY_HOST_IPV4}:{SOCKS5_PROXY_PORT}'
+    targets = [
+        *[ConnectTarget(SOCKS5_IPV4_URL, TEST_HOST_IPV4, TEST_PORT_IPV4)] * 4,
+        *[(SOCKS4_URL, TEST_HOST_IPV4, TEST_PORT_IPV4)] * 2,
+        *[ConnectTarget(invalid_url, TEST_HOST_IPV4, TEST_PORT_IPV4)] * 2,
+        ('not a target',),
+    ]
+    results = []
+    batch = connect_many(targets, concurrency=3, per_proxy_concurrency=1)
+    async for target, result in batch:
+        results.append((target, result))
+        if not isinstance(result, Exception):
+            await result.close()
+
+    assert sorted(map(repr, (t for t, _ in results))) == sorted(map(repr, targets))
+    errors = [t for t, r in results if isinstance(r, Exception)]
+    assert len(errors) == 3
+    assert all(isinstance(r, ProxyError) for t, r in results if t[0] == invalid_url)
+
+
+@pytest.mark.asyncio
+async def test_socks5_proxy_phase_timeouts(blackhole_server):
+    proxy = Proxy.from_url(
+        f'socks5://{BLACKHOLE_HOST_IPV4}:{SOCKS5_PROXY_PORT}',
+        phase_timeouts=PhaseTimeouts(connect=0.1),
+    )
+    with pytest.raises(ProxyTimeoutError):
+        await proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4, timeout=30)
+
+
+@pytest.mark.asyncio
+async def test_proxy_chain_single_deadline(blackhole_server):
+    # the first hop takes a while to resolve the second one, which never answers:
+    # the chain times out once the caller's timeout is spent, not per hop
+    proxy = ProxyChain(
+        [
+            Proxy.from_url(SOCKS5_IPV4_URL, rdns=False, resolver=AsyncSlowResolver(0.5)),
+            Proxy.from_url(f'socks5://blackhole.example.com:{SOCKS5_PROXY_PORT}'),
+        ]
+    )
+    start = time.monotonic()
+    with pytest.raises(ProxyTimeoutError):
+        await proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4, timeout=0.8)
+    assert time.monotonic() - start < 1.2
+
+
+@pytest.mark.asyncio
+async def test_socks5_proxy_source_address_pool():
+    proxy = Proxy.from_url(SOCKS5_IPV4_URL)
+    source_addresses = SourceAddressPool(['127.0.0.1', '127.0.0.3'])
+    hosts = []
+    for _ in range(3):
+        stream = await proxy.connect(
+            dest_host=TEST_HOST_IPV4,
+            dest_port=TEST_PORT_IPV4,
+            local_addr=source_addresses,
+        )
+        hosts.append(stream.writer.get_extra_info('sockname')[0])
+        await stream.close()
+    assert hosts == ['127.0.0.1', '127.0.0.3', '127.0.0.1']
+
+
+@pytest.mark.asyncio
+async def test_socks5_proxy_socket_options():
+    proxy = Proxy.from_url(SOCKS5_IPV4_URL)
+    stream = await proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4)
+    sock = stream.writer.get_extra_info('socket')
+    assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+    assert not sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+    await stream.close()
+
+    proxy = Proxy.from_url(
+        SOCKS5_IPV4_URL,
+        socket_options=[*DEFAULT_SOCKET_OPTIONS, *keepalive_options(idle=30, count=3)],
+    )
+    stream = await proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4)
+    sock = stream.writer.get_extra_info('socket')
+    assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+    await stream.close()
+
+
+@pytest.mark.asyncio
+async def test_socks5_proxy_ktls(target_ssl_context):
+    options = target_ssl_context.options
+    proxy = Proxy.from_url(SOCKS5_IPV4_URL)
+    stream = await proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4_HTTPS)
+    stream = await stream.start_tls(TEST_HOST_NAME_IPV4, target_ssl_context, ktls=True)
+    # TLS over memory BIOs never reaches the kernel
+    assert stream.ktls == NO_KTLS
+    assert target_ssl_context.options == options
+
+    request = 'GET /ip HTTP/1.1\r\nHost: {}\r\nConnection: close\r\n\r\n'
+    await stream.write_all(request.format(TEST_HOST_NAME_IPV4).encode('ascii'))
+    response = await stream.read(1024)
+    assert response.startswith(b'HTTP/1.1 200')
+    await stream.close()
+
+
+@pytest.mark.asyncio
+async def test_secure_proxy_no_session_resumption(proxy_ssl_context):
+    loop = asyncio.get_running_loop()
+    proxy = Proxy.from_url(HTTPS_PROXY_URL, proxy_ssl=proxy_ssl_context)
+    reused = []
+    with patch.object(loop, 'getaddrinfo', new=getaddrinfo_async_mock(loop.getaddrinfo)):
+        for _ in range(2):
+            stream = await proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4)
+            reused.append(stream.writer.get_extra_info('ssl_object').session_reused)
+            await stream.close()
+    # asyncio creates the SSLObject without a session, and the context is left as is
+    assert reused == [False, False]
+    assert 'wrap_bio' not in vars(proxy_ssl_context)
+    assert proxy_ssl_context.sslobject_class is ssl.SSLObject
+
+
+@pytest.mark.asyncio
+async def test_http_proxy_fast_open(fast_open_proxy):
+    proxy = Proxy.from_url(fast_open_proxy, fast_open=True)
+    # the first connection gets a cookie from the proxy, the next ones send data in the SYN
+    for _ in range(2):
+        stream = await proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4)
+        sock = stream.writer.get_extra_info('socket')
+        assert sock.getsockopt(socket.IPPROTO_TCP, TCP_FASTOPEN_CONNECT) == 1
+        syn_data = sent_syn_data(sock)
+        await stream.close()
+    assert syn_data == fast_open_enabled()
+
+
+@pytest.mark.parametrize('protocol_cls', (ResponseProtocol, BufferedResponseProtocol))
+@pytest.mark.parametrize('secure', (False, True))
+@pytest.mark.asyncio
+async def test_socks5_proxy_create_connection(protocol_cls, secure, target_ssl_context):
+    proxy = Proxy.from_url(SOCKS5_IPV4_URL)
+    transport, protocol = await proxy.create_connection(
+        protocol_cls,
+        TEST_HOST_IPV4,
+        TEST_PORT_IPV4_HTTPS if secure else TEST_PORT_IPV4,
+        ssl=target_ssl_context if secure else None,
+        server_hostname=TEST_HOST_NAME_IPV4 if secure else None,
+    )
+    assert isinstance(protocol, protocol_cls)
+    assert protocol.transport is transport
+    assert transport.get_protocol() is protocol
+    assert (transport.get_extra_info('ssl_object') is not None) is secure
+
+    request = 'GET /ip HTTP/1.1\r\nHost: {}\r\nConnection: close\r\n\r\n'
+    transport.write(request.format(TEST_HOST_NAME_IPV4).encode('ascii'))
+    response = await asyncio.wait_for(protocol.done, 10)
+    assert response.startswith(b'HTTP/1.1 200')
+
+
+@pytest.mark.parametrize('protocol_cls', (ResponseProtocol, SmallBufferedResponseProtocol))
+@pytest.mark.asyncio
+async def test_socks5_proxy_create_connection_keeps_tunneled_data(protocol_cls):
+    # the target speaks first and closes, maybe before the proxy reply is read
+    async def greet(reader, writer):
+        writer.write(b'hello')
+        writer.close()
+
+    server = await asyncio.start_server(greet, TEST_HOST_IPV4, 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        proxy = Proxy.from_url(SOCKS5_IPV4_URL)
+        _, protocol = await proxy.create_connection(protocol_cls, TEST_HOST_IPV4, port)
+        assert await asyncio.wait_for(protocol.done, 10) == b'hello'
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.parametrize('secure', (False, True))
+def test_socks5_proxy_create_connection_uvloop(secure, target_ssl_context):
+    uvloop = pytest.importorskip('uvloop')
+
+    async def main():
+        proxy = Proxy.from_url(SOCKS5_IPV4_URL)
+        transport, protocol = await proxy.create_connection(
+            BufferedResponseProtocol,
+            TEST_HOST_IPV4,
+            TEST_PORT_IPV4_HTTPS if secure else TEST_PORT_IPV4,
+            ssl=target_ssl_context if secure else None,
+            server_hostname=TEST_HOST_NAME_IPV4 if secure else None,
+        )
+        request = 'GET /ip HTTP/1.1\r\nHost: {}\r\nConnection: close\r\n\r\n'
+        transport.write(request.format(TEST_HOST_NAME_IPV4).encode('ascii'))
+        return await asyncio.wait_for(protocol.done, 10)
+
+    assert uvloop.run(main()).startswith(b'HTTP/1.1 200')
+
+
+@pytest.mark.asyncio
+async def test_socks5_proxy_create_connection_timeout(blackhole_server):
+    proxy = Proxy.from_url(f'socks5://{BLACKHOLE_HOST_IPV4}:{SOCKS5_PROXY_PORT}')
+    with pytest.raises(ProxyTimeoutError):
+        await proxy.create_connection(
+            ResponseProtocol,
+            TEST_HOST_IPV4,
+            TEST_PORT_IPV4,
+            timeout=0.1,
+        )
+
+
+@pytest.mark.asyncio
+async def test_secure_proxy_fast_open(proxy_ssl_context):
+    proxy = Proxy.from_url(HTTPS_PROXY_URL, proxy_ssl=proxy_ssl_context, fast_open=True)
+    # the ClientHello goes in the SYN, on a socket connect() has returned at once for
+    with patch(
+        'python_socks.async_.asyncio._connect.enable_fast_open',
+        new=enable_fast_open_without_cookie,
+    ):
+        assert await make_request(proxy=proxy, url=TEST_URL_IPV4) == 200
+
+
+@pytest.mark.asyncio
+async def test_socks5_proxy_happy_eyeballs(blackhole_server):
+    proxy = Proxy.from_url(
+        SOCKS5_IPV4_HOSTNAME_URL,
+        resolver=AsyncBlackholeResolver(),
+        happy_eyeballs_delay=0.1,
+    )
+    status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4, timeout=5)
+    assert status_code == 200
+
+
+def test_socks5_proxy_uvloop():
+    uvloop = pytest.importorskip('uvloop')
+
+    async def main():
+        proxy = Proxy.from_url(SOCKS5_IPV4_URL)
+        return await make_request(proxy=proxy, url=TEST_URL_IPV4)
+
+    assert uvloop.run(main()) == 200
+
+
 @pytest.mark.asyncio
 async def test_socks5_proxy_with_invalid_credentials():
     proxy = Proxy.create(
@@ -159,6 +491,25 @@ async def test_socks5_proxy_with_invalid_proxy_port(unused_tcp_port):
         await make_request(proxy=proxy, url=TEST_URL_IPV4)
 
 
+@pytest.mark.parametrize('secure', (False, True))
+@pytest.mark.asyncio
+async def test_http_proxy_fast_open_with_invalid_proxy_port(
+    unused_tcp_port, secure, proxy_ssl_context
+):
+    proxy = Proxy.from_url(
+        f'http://{PROXY_HOST_IPV4}:{unused_tcp_port}',
+        proxy_ssl=proxy_ssl_context if secure else None,
+        fast_open=True,
+    )
+    # connect() returns at once, that nothing listens shows on the first receive
+    with patch(
+        'python_socks.async_.asyncio._connect.enable_fast_open',
+        new=enable_fast_open_without_cookie,
+    ):
+        with pytest.raises(ProxyConnectionError):
+            await make_request(proxy=proxy, url=TEST_URL_IPV4)
+
+
 @pytest.mark.parametrize('url', (TEST_URL_IPV4, TEST_URL_IPV4_HTTPS))
 @pytest.mark.skipif(SKIP_IPV6_TESTS, reason="TravisCI doesn't support ipv6")
 @pytest.mark.asyncio
@@ -208,6 +559,35 @@ async def test_http_proxy(url, target_ssl_context):
     assert status_code == 200
 
 
+@pytest.mark.parametrize(
+    ('reply', 'close', 'message'),
+    (
+        (b'HTTP/1.1 200 Connection established\r\n', True, 'closed unexpectedly'),
+        (b'HTTP/1.1 200 OK\r\nX-Padding: ' + b'x' * 70000, False, 'too large'),
+    ),
+    ids=('closed', 'too-large'),
+)
+@pytest.mark.asyncio
+async def test_http_proxy_with_broken_reply(reply, close, message):
+    async def reply_and_hang(reader, writer):
+        await reader.readuntil(b'\r\n\r\n')
+        writer.write(reply)
+        if close:
+            writer.close()
+        else:
+            await reader.read()
+
+    server = await asyncio.start_server(reply_and_hang, TEST_HOST_IPV4, 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        proxy = Proxy.create(proxy_type=ProxyType.HTTP, host=TEST_HOST_IPV4, port=port)
+        with pytest.raises(ProxyError, match=message):
+            await proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4, timeout=5)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
 @pytest.mark.parametrize('url', (TEST_URL_IPV4, TEST_URL_IPV4_HTTPS))
 @pytest.mark.asyncio
 async def test_proxy_chain(url, target_ssl_context):
@@ -224,3 +604,241 @@ async def test_proxy_chain(url, target_ssl_context):
         ssl_context=target_ssl_context,
     )
     assert status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_proxy_chain_shared_proxy():
+    socks5 = Proxy.from_url(SOCKS5_IPV4_URL)
+    chains = [
+        ProxyChain([socks5, Proxy.from_url(SOCKS4_URL)]),
+        ProxyChain([Proxy.from_url(HTTP_PROXY_URL), socks5]),
+    ]
+    status_codes = await asyncio.gather(
+        *[make_request(proxy=chain, url=TEST_URL_IPV4) for chain in chains * 4]  # type: ignore
+    )
+    assert status_codes == [200] * 8
+    assert socks5._forward is None
+
+
+@pytest.mark.parametrize('url', (TEST_URL_IPV4, TEST_URL_IPV4_HTTPS))
+@pytest.mark.asyncio
+async def test_pooled_proxy_chain(url, target_ssl_context):
+    proxies = [Proxy.from_url(HTTP_PROXY_URL), Proxy.from_url(SOCKS5_IPV4_URL)]
+    async with PooledProxyChain(proxies, size=2) as chain:
+        for _ in range(50):
+            if chain.size == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert chain.size == 2
+
+        status_codes = await asyncio.gather(
+            *[
+                make_request(proxy=chain, url=url, ssl_context=target_ssl_context)  # type: ignore
+                for _ in range(4)
+            ]
+        )
+        assert status_codes == [200] * 4
+
+
+def create_traced_chain(idle_timeout=60):
+    events = []
+    trace_config = TraceConfig()
+    trace_config.on_phase_end.append(events.append)
+    proxies = [
+        Proxy.from_url(HTTP_PROXY_URL, trace_config=trace_config),
+        Proxy.from_url(SOCKS5_IPV4_URL),
+    ]
+    chain = PooledProxyChain(proxies, size=2, idle_timeout=idle_timeout)
+
+    def connects():
+        return sum(e.phase == TracePhase.CONNECT for e in events)
+
+    return chain, connects
+
+
+async def wait_for_tunnels(chain, size=2):
+    for _ in range(50):
+        if chain.size == size:
+            break
+        await asyncio.sleep(0.01)
+    assert chain.size == size
+
+
+@pytest.mark.asyncio
+async def test_pooled_proxy_chain_takes_parked_tunnels():
+    chain, connects = create_traced_chain()
+    async with chain:
+        await wait_for_tunnels(chain)
+        assert connects() == 2
+
+        # without refills what connect() takes out of the pool shows
+        with patch.object(chain, '_refill'):
+            for size in (1, 0):
+                assert await make_request(proxy=chain, url=TEST_URL_IPV4) == 200  # type: ignore
+                assert chain.size == size
+            assert connects() == 2
+
+            # an empty pool opens a tunnel for the caller
+            assert await make_request(proxy=chain, url=TEST_URL_IPV4) == 200  # type: ignore
+            assert connects() == 3
+
+        assert await make_request(proxy=chain, url=TEST_URL_IPV4) == 200  # type: ignore
+        await wait_for_tunnels(chain)
+        assert connects() == 6
+
+
+@pytest.mark.asyncio
+async def test_pooled_proxy_chain_idle_timeout():
+    chain, connects = create_traced_chain(idle_timeout=0.1)
+    async with chain:
+        await wait_for_tunnels(chain)
+        parked = list(chain._tunnels)
+        await asyncio.sleep(0.2)
+
+        with patch.object(chain, '_refill'):
+            assert await make_request(proxy=chain, url=TEST_URL_IPV4) == 200  # type: ignore
+            assert chain.size == 0
+            assert connects() == 3
+        assert all(t.stream.writer.transport.is_closing() for t in parked)
+
+
+@pytest.mark.asyncio
+async def test_pooled_proxy_chain_retries_dropped_tunnel():
+    chain, connects = create_traced_chain()
+    async with chain:
+        await wait_for_tunnels(chain)
+
+        with patch.object(chain, '_refill'):
+            # the most recently parked tunnel is taken first
+            sock = chain._tunnels[-1].stream.writer.get_extra_info('socket')
+            sock.shutdown(socket.SHUT_RDWR)
+            assert await make_request(proxy=chain, url=TEST_URL_IPV4) == 200  # type: ignore
+            assert chain.size == 0
+            assert connects() == 2
+
+
+@pytest.mark.asyncio
+async def test_hedged_proxy(blackhole_server):
+    proxies = [
+        Proxy.from_url(f'socks5://{BLACKHOLE_HOST_IPV4}:{SOCKS5_PROXY_PORT}'),
+        Proxy.from_url(SOCKS5_IPV4_URL),
+    ]
+    proxy = HedgedProxy(proxies, hedge_delay=0.1)
+    status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4, timeout=5)  # type: ignore
+    assert status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_hedged_proxy_delay_with_slow_proxy(blackhole_server):
+    proxies = [
+        Proxy.from_url(f'socks5://{BLACKHOLE_HOST_IPV4}:{SOCKS5_PROXY_PORT}'),
+        Proxy.from_url(SOCKS5_IPV4_URL),
+    ]
+    proxy = HedgedProxy(proxies)
+    with patch('python_socks._hedging.DEFAULT_HEDGE_DELAY', 0.05):
+        for _ in range(MIN_SAMPLES):
+            stream = await proxy.connect(TEST_HOST_IPV4, TEST_PORT_IPV4, timeout=5)
+            await stream.close()
+
+    # the attempts given up on the blackhole count as well, the delay
+    # would otherwise come down to what the other proxy takes
+    assert proxy._hedging.delay() >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_hedged_proxy_with_invalid_credentials():
+    url = f'socks5://{LOGIN}:{PASSWORD}aaa@{PROXY_HOST_IPV4}:{SOCKS5_PROXY_PORT}'
+    proxy = HedgedProxy([Proxy.from_url(url), Proxy.from_url(url)])
+    with pytest.raises(ProxyError):
+        await make_request(proxy=proxy, url=TEST_URL_IPV4)  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_proxy_pool(blackhole_server):
+    dead = Proxy.from_url(
+        f'socks5://{BLACKHOLE_HOST_IPV4}:{SOCKS5_PROXY_PORT}',
+        phase_timeouts=PhaseTimeouts(connect=0.1),
+    )
+    pool = ProxyPool([dead, Proxy.from_url(SOCKS5_IPV4_URL)], failure_threshold=1)
+    with pytest.raises(ProxyTimeoutError):
+        await make_request(proxy=pool, url=TEST_URL_IPV4)  # type: ignore
+
+    for _ in range(3):
+        status_code = await make_request(proxy=pool, url=TEST_URL_IPV4)  # type: ignore
+        assert status_code == 200
+
+    dead_stats, live_stats = pool.stats()
+    assert dead_stats.circuit_open
+    assert list(dead_stats.error_rates) == ['timeout']
+    assert live_stats.latency is not None
+    assert live_stats.error_rate == 0
+    assert live_stats.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_pooled_proxy_chain_with_invalid_credentials():
+    proxy = Proxy.create(
+        proxy_type=ProxyType.SOCKS5,
+        host=PROXY_HOST_IPV4,
+        port=SOCKS5_PROXY_PORT,
+        username=LOGIN,
+        password=PASSWORD + 'aaa',
+    )
+    async with PooledProxyChain([Proxy.from_url(SOCKS4_URL), proxy], size=1) as chain:
+        with pytest.raises(ProxyError):
+            await make_request(proxy=chain, url=TEST_URL_IPV4)  # type: ignore
+
+
+@pytest.mark.parametrize('proxy_url', (SOCKS5_IPV4_URL, SOCKS5_IPV4_URL_WO_AUTH))
+@pytest.mark.parametrize('url', (TEST_URL_IPV4, TEST_URL_IPV4_HTTPS))
+@pytest.mark.asyncio
+async def test_warm_proxy_pool(proxy_url, url, target_ssl_context):
+    async with WarmProxyPool(Proxy.from_url(proxy_url), min_size=2, max_size=4) as pool:
+        for _ in range(50):
+            if pool.size == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.size == 2
+
+        for _ in range(3):
+            status_code = await make_request(
+                proxy=pool,  # type: ignore
+                url=url,
+                ssl_context=target_ssl_context,
+            )
+            assert status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_warm_proxy_pool_with_invalid_credentials():
+    proxy = Proxy.create(
+        proxy_type=ProxyType.SOCKS5,
+        host=PROXY_HOST_IPV4,
+        port=SOCKS5_PROXY_PORT,
+        username=LOGIN,
+        password=PASSWORD + 'aaa',
+    )
+    async with WarmProxyPool(proxy, min_size=0) as pool:
+        with pytest.raises(ProxyError):
+            await make_request(proxy=pool, url=TEST_URL_IPV4)  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_warm_proxy_pool_with_unreachable_proxy(blackhole_server):
+    url = f'socks5://{BLACKHOLE_HOST_IPV4}:{SOCKS5_PROXY_PORT}'
+    pool = WarmProxyPool(Proxy.from_url(url), min_size=1)
+    open_session = patch.object(pool, '_open_session', wraps=pool._open_session)
+    with patch('python_socks.async_.asyncio.v2._pool.DEFAULT_TIMEOUT', 0.1):
+        with patch('python_socks.async_.asyncio.v2._pool.RETRY_DELAY', 0.05):
+            with open_session as open_session:
+                async with pool:
+                    await asyncio.sleep(0.5)
+    # each attempt gives up, so that the next one gets to run
+    assert open_session.call_count >= 2
+    assert pool.size == 0
+
+
+@pytest.mark.asyncio
+async def test_warm_proxy_pool_requires_socks5():
+    with pytest.raises(ValueError):
+        WarmProxyPool(Proxy.from_url(HTTP_PROXY_URL))
@@ -4,6 +4,7 @@ import pytest
 from yarl import URL
 
 from python_socks import ProxyType, ProxyError, ProxyTimeoutError, ProxyConnectionError
+from python_socks import TraceConfig, TracePhase
 from tests.config import (
     PROXY_HOST_IPV4,
     SOCKS5_PROXY_PORT,
@@ -20,13 +21,14 @@ from tests.config import (
     TEST_URL_IPV4_HTTPS,
     HTTPS_PROXY_URL,
 )
-from tests.mocks import getaddrinfo_async_mock
+from tests.mocks import getaddrinfo_async_mock, AsyncBlackholeResolver
 
 anyio = pytest.importorskip('anyio')
 
 from python_socks.async_.anyio._resolver import Resolver  # noqa: E402
 from python_socks.async_.anyio import Proxy  # noqa: E402
 from python_socks.async_.anyio import ProxyChain  # noqa: E402
+from python_socks.async_.anyio import CachingResolver  # noqa: E402
 from python_socks.async_.anyio._proxy import AnyioProxy  # noqa: E402
 
 
@@ -123,6 +125,60 @@ async def test_socks5_proxy_ipv4_with_auth_none(url, rdns, target_ssl_context):
     assert status_code == 200
 
 
+@pytest.mark.parametrize('proxy_url', (SOCKS5_IPV4_URL, SOCKS5_IPV4_URL_WO_AUTH))
+@pytest.mark.parametrize('rdns', (True, False))
+@pytest.mark.anyio
+async def test_socks5_proxy_pipeline(proxy_url, rdns):
+    proxy = Proxy.from_url(proxy_url, rdns=rdns, pipeline=True)
+    status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4)
+    assert status_code == 200
+
+
+@pytest.mark.anyio
+async def test_socks5_proxy_with_caching_resolver():
+    resolver = CachingResolver()
+    proxy = Proxy.from_url(SOCKS5_IPV4_HOSTNAME_URL, rdns=False, resolver=resolver)
+    for _ in range(2):
+        status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4)
+        assert status_code == 200
+
+
+@pytest.mark.anyio
+async def test_secure_proxy_trace(target_ssl_context, proxy_ssl_context):
+    events = []
+    trace_config = TraceConfig()
+    trace_config.on_phase_end.append(events.append)
+    proxy = Proxy.from_url(
+        HTTPS_PROXY_URL,
+        proxy_ssl=proxy_ssl_context,
+        trace_config=trace_config,
+    )
+    status_code = await make_request(
+        proxy=proxy,
+        url=TEST_URL_IPV4_HTTPS,
+        ssl_context=target_ssl_context,
+    )
+    assert status_code == 200
+    assert [e.phase for e in events] == [
+        TracePhase.CONNECT,
+        TracePhase.PROXY_TLS,
+        TracePhase.REQUEST,
+        TracePhase.DEST_TLS,
+    ]
+    assert all(e.error is None and e.duration >= 0 for e in events)
+
+
+@pytest.mark.anyio
+async def test_socks5_proxy_happy_eyeballs(blackhole_server):
+    proxy = Proxy.from_url(
+        SOCKS5_IPV4_HOSTNAME_URL,
+        resolver=AsyncBlackholeResolver(),
+        happy_eyeballs_delay=0.1,
+    )
+    status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4, timeout=5)
+    assert status_code == 200
+
+
 @pytest.mark.anyio
 async def test_socks5_proxy_with_invalid_credentials():
     proxy = Proxy.create(
@@ -1,3 +1,4 @@
+import socket
 from typing import Optional
 from unittest.mock import patch
 
@@ -5,6 +6,7 @@ import pytest
 from yarl import URL
 
 from python_socks import ProxyType, ProxyError, ProxyTimeoutError, ProxyConnectionError
+from python_socks import TraceConfig, TracePhase, keepalive_options
 from python_socks.async_ import ProxyChain
 from tests.config import (
     PROXY_HOST_IPV4,
@@ -20,6 +22,8 @@ from tests.config import (
     TEST_URL_IPV4,
     SOCKS5_IPV4_HOSTNAME_URL,
     TEST_URL_IPV4_HTTPS,
+    TEST_HOST_IPV4,
+    TEST_PORT_IPV4,
 )
 from tests.mocks import getaddrinfo_async_mock
 
@@ -30,6 +34,8 @@ import curio.ssl as curiossl  # noqa: E402
 import curio.socket  # noqa: E402
 from python_socks.async_.curio._resolver import Resolver  # noqa: E402
 from python_socks.async_.curio import Proxy  # noqa: E402
+from python_socks.async_.curio import CachingResolver  # noqa: E402
+from python_socks.async_.curio import ConnectTarget, connect_many  # noqa: E402
 from python_socks.async_.curio._proxy import CurioProxy  # noqa: E402
 
 
@@ -138,6 +144,82 @@ def test_socks5_proxy_ipv4_with_auth_none(url, rdns, target_ssl_context):
     curio.run(main)
 
 
+@pytest.mark.parametrize('proxy_url', (SOCKS5_IPV4_URL, SOCKS5_IPV4_URL_WO_AUTH))
+@pytest.mark.parametrize('rdns', (True, False))
+def test_socks5_proxy_pipeline(proxy_url, rdns):
+    async def main():
+        proxy = Proxy.from_url(proxy_url, rdns=rdns, pipeline=True)
+        status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4)
+        assert status_code == 200
+
+    curio.run(main)
+
+
+def test_socks5_proxy_with_caching_resolver():
+    async def main():
+        resolver = CachingResolver()
+        proxy = Proxy.from_url(SOCKS5_IPV4_HOSTNAME_URL, rdns=False, resolver=resolver)
+        for _ in range(2):
+            status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4)
+            assert status_code == 200
+
+    curio.run(main)
+
+
+def test_socks5_proxy_trace():
+    async def main():
+        events = []
+        trace_config = TraceConfig()
+        trace_config.on_phase_end.append(events.append)
+        proxy = Proxy.from_url(SOCKS5_IPV4_URL, rdns=False, trace_config=trace_config)
+        status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4)
+        assert status_code == 200
+        assert [e.phase for e in events] == [
+            TracePhase.CONNECT,
+            TracePhase.AUTH,
+            TracePhase.RESOLVE,
+            TracePhase.REQUEST,
+        ]
+        assert all(e.error is None and e.duration >= 0 for e in events)
+
+    curio.run(main)
+
+
+def test_socks5_proxy_socket_options():
+    async def main():
+        proxy = Proxy.from_url(SOCKS5_IPV4_URL, socket_options=keepalive_options(idle=30))
+        sock = await proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4)
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+        assert not sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        await sock.close()
+
+    curio.run(main)
+
+
+def test_connect_many():
+    async def main():
+        invalid_url = f'socks5://{LOGIN}:{PASSWORD}aaa@{PROXY_HOST_IPV4}:{SOCKS5_PROXY_PORT}'
+        targets = [
+            *[ConnectTarget(SOCKS5_IPV4_URL, TEST_HOST_IPV4, TEST_PORT_IPV4)] * 4,
+            *[(SOCKS4_URL, TEST_HOST_IPV4, TEST_PORT_IPV4)] * 2,
+            *[ConnectTarget(invalid_url, TEST_HOST_IPV4, TEST_PORT_IPV4)] * 2,
+            ('not a target',),
+        ]
+        results = []
+        async with connect_many(targets, concurrency=3, per_proxy_concurrency=1) as batch:
+            async for target, result in batch:
+                results.append((target, result))
+                if not isinstance(result, Exception):
+                    await result.close()
+
+        assert sorted(map(repr, (t for t, _ in results))) == sorted(map(repr, targets))
+        errors = [t for t, r in results if isinstance(r, Exception)]
+        assert len(errors) == 3
+        assert all(isinstance(r, ProxyError) for t, r in results if t[0] == invalid_url)
+
+    curio.run(main)
+
+
 def test_socks5_proxy_with_invalid_credentials():
     async def main():
         proxy = Proxy.create(
@@ -4,6 +4,7 @@ import pytest
 from yarl import URL
 
 from python_socks import ProxyType, ProxyError, ProxyTimeoutError, ProxyConnectionError
+from python_socks import TraceConfig, TracePhase
 from python_socks.async_ import ProxyChain
 from tests.config import (
     PROXY_HOST_IPV4,
@@ -20,9 +21,11 @@ from tests.config import (
     SOCKS5_IPV4_HOSTNAME_URL,
     TEST_URL_IPV4_HTTPS,
 )
+from tests.mocks import AsyncBlackholeResolver
 
 trio = pytest.importorskip('trio')
 from python_socks.async_.trio import Proxy  # noqa: E402
+from python_socks.async_.trio import CachingResolver  # noqa: E402
 from python_socks.async_.trio._resolver import Resolver  # noqa: E402
 
 
@@ -116,6 +119,52 @@ async def test_socks5_proxy_ipv4_with_auth_none(url, rdns, target_ssl_context):
     assert status_code == 200
 
 
+@pytest.mark.parametrize('proxy_url', (SOCKS5_IPV4_URL, SOCKS5_IPV4_URL_WO_AUTH))
+@pytest.mark.parametrize('rdns', (True, False))
+@pytest.mark.trio
+async def test_socks5_proxy_pipeline(proxy_url, rdns):
+    proxy = Proxy.from_url(proxy_url, rdns=rdns, pipeline=True)
+    status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4)
+    assert status_code == 200
+
+
+@pytest.mark.trio
+async def test_socks5_proxy_with_caching_resolver():
+    resolver = CachingResolver()
+    proxy = Proxy.from_url(SOCKS5_IPV4_HOSTNAME_URL, rdns=False, resolver=resolver)
+    for _ in range(2):
+        status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4)
+        assert status_code == 200
+
+
+@pytest.mark.trio
+async def test_socks5_proxy_trace():
+    events = []
+    trace_config = TraceConfig()
+    trace_config.on_phase_end.append(events.append)
+    proxy = Proxy.from_url(SOCKS5_IPV4_URL, rdns=False, trace_config=trace_config)
+    status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4)
+    assert status_code == 200
+    assert [e.phase for e in events] == [
+        TracePhase.CONNECT,
+        TracePhase.AUTH,
+        TracePhase.RESOLVE,
+        TracePhase.REQUEST,
+    ]
+    assert all(e.error is None and e.duration >= 0 for e in events)
+
+
+@pytest.mark.trio
+async def test_socks5_proxy_happy_eyeballs(blackhole_server):
+    proxy = Proxy.from_url(
+        SOCKS5_IPV4_HOSTNAME_URL,
+        resolver=AsyncBlackholeResolver(),
+        happy_eyeballs_delay=0.1,
+    )
+    status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4, timeout=5)
+    assert status_code == 200
+
+
 @pytest.mark.trio
 async def test_socks5_proxy_with_invalid_credentials():
     proxy = Proxy.create(
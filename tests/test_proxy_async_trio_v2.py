@@ -1,9 +1,15 @@
+import socket
+import ssl
+import time
 from unittest.mock import patch
 
 import pytest
 from yarl import URL
 
 from python_socks import ProxyType, ProxyError, ProxyTimeoutError, ProxyConnectionError
+from python_socks import TraceConfig, TracePhase, PhaseTimeouts, SourceAddressPool
+from python_socks import DEFAULT_SOCKET_OPTIONS, keepalive_options
+from python_socks._hedging import MIN_SAMPLES
 from tests.config import (
     PROXY_HOST_IPV4,
     SOCKS5_PROXY_PORT,
@@ -19,14 +25,19 @@ from tests.config import (
     SOCKS5_IPV4_HOSTNAME_URL,
     TEST_URL_IPV4_HTTPS,
     HTTPS_PROXY_URL,
+    TEST_HOST_IPV4,
+    TEST_PORT_IPV4,
+    BLACKHOLE_HOST_IPV4,
 )
-from tests.mocks import getaddrinfo_async_mock
+from tests.mocks import getaddrinfo_async_mock, AsyncBlackholeResolver, AsyncSlowResolver
 
 trio = pytest.importorskip('trio')
 
 from python_socks.async_.trio._resolver import Resolver  # noqa: E402
 from python_socks.async_.trio.v2 import Proxy  # noqa: E402
-from python_socks.async_.trio.v2 import ProxyChain  # noqa: E402
+from python_socks.async_.trio.v2 import ProxyChain, PooledProxyChain, HedgedProxy  # noqa: E402
+from python_socks.async_.trio.v2 import CachingResolver  # noqa: E402
+from python_socks.async_.trio.v2 import ConnectTarget, connect_many  # noqa: E402
 from python_socks.async_.trio.v2._proxy import TrioProxy  # noqa: E402
 
 
@@ -123,6 +134,143 @@ async def test_socks5_proxy_ipv4_with_auth_none(url, rdns, target_ssl_context):
     assert status_code == 200
 
 
+@pytest.mark.parametrize('proxy_url', (SOCKS5_IPV4_URL, SOCKS5_IPV4_URL_WO_AUTH))
+@pytest.mark.parametrize('rdns', (True, False))
+@pytest.mark.trio
+async def test_socks5_proxy_pipeline(proxy_url, rdns):
+    proxy = Proxy.from_url(proxy_url, rdns=rdns, pipeline=True)
+    status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4)
+    assert status_code == 200
+
+
+@pytest.mark.trio
+async def test_socks5_proxy_with_caching_resolver():
+    resolver = CachingResolver()
+    proxy = Proxy.from_url(SOCKS5_IPV4_HOSTNAME_URL, rdns=False, resolver=resolver)
+    for _ in range(2):
+        status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4)
+        assert status_code == 200
+
+
+@pytest.mark.trio
+async def test_secure_proxy_trace(target_ssl_context, proxy_ssl_context):
+    events = []
+    trace_config = TraceConfig()
+    trace_config.on_phase_end.append(events.append)
+    proxy = Proxy.from_url(
+        HTTPS_PROXY_URL,
+        proxy_ssl=proxy_ssl_context,
+        trace_config=trace_config,
+    )
+    status_code = await make_request(
+        proxy=proxy,
+        url=TEST_URL_IPV4_HTTPS,
+        ssl_context=target_ssl_context,
+    )
+    assert status_code == 200
+    assert [e.phase for e in events] == [
+        TracePhase.CONNECT,
+        TracePhase.PROXY_TLS,
+        TracePhase.REQUEST,
+        TracePhase.DEST_TLS,
+    ]
+    assert all(e.error is None and e.duration >= 0 for e in events)
+
+
+@pytest.mark.trio
+async def test_connect_many():
+    invalid_url = f'socks5://{LOGIN}:{PASSWORD}aaa@{PROXY_HOST_IPV4}:{SOCKS5_PROXY_PORT}'
+    targets = [
+        *[ConnectTarget(SOCKS5_IPV4_URL, TEST_HOST_IPV4, TEST_PORT_IPV4)] * 4,
+        *[(SOCKS4_URL, TEST_HOST_IPV4, TEST_PORT_IPV4)] * 2,
+        *[ConnectTarget(invalid_url, TEST_HOST_IPV4, TEST_PORT_IPV4)] * 2,
+        ('not a target',),
+    ]
+    results = []
+    async with connect_many(targets, concurrency=3, per_proxy_concurrency=1) as batch:
+        async for target, result in batch:
+            results.append((target, result))
+            if not isinstance(result, Exception):
+                await result.close()
+
+    assert sorted(map(repr, (t for t, _ in results))) == sorted(map(repr, targets))
+    errors = [t for t, r in results if isinstance(r, Exception)]
+    assert len(errors) == 3
+    assert all(isinstance(r, ProxyError) for t, r in results if t[0] == invalid_url)
+
+
+@pytest.mark.trio
+async def test_socks5_proxy_phase_timeouts(blackhole_server):
+    proxy = Proxy.from_url(
+        f'socks5://{BLACKHOLE_HOST_IPV4}:{SOCKS5_PROXY_PORT}',
+        phase_timeouts=PhaseTimeouts(connect=0.1),
+    )
+    with pytest.raises(ProxyTimeoutError):
+        await proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4, timeout=30)
+
+
+@pytest.mark.trio
+async def test_proxy_chain_single_deadline(blackhole_server):
+    # the first hop takes a while to resolve the second one, which never answers:
+    # the chain times out once the caller's timeout is spent, not per hop
+    proxy = ProxyChain(
+        [
+            Proxy.from_url(SOCKS5_IPV4_URL, rdns=False, resolver=AsyncSlowResolver(0.5)),
+            Proxy.from_url(f'socks5://blackhole.example.com:{SOCKS5_PROXY_PORT}'),
+        ]
+    )
+    start = time.monotonic()
+    with pytest.raises(ProxyTimeoutError):
+        await proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4, timeout=0.8)
+    assert time.monotonic() - start < 1.2
+
+
+@pytest.mark.trio
+async def test_socks5_proxy_source_address_pool():
+    proxy = Proxy.from_url(SOCKS5_IPV4_URL)
+    source_addresses = SourceAddressPool(['127.0.0.1', '127.0.0.3'])
+    hosts = []
+    for _ in range(3):
+        stream = await proxy.connect(
+            dest_host=TEST_HOST_IPV4,
+            dest_port=TEST_PORT_IPV4,
+            local_addr=source_addresses,
+        )
+        hosts.append(stream.trio_stream.socket.getsockname()[0])
+        await stream.close()
+    assert hosts == ['127.0.0.1', '127.0.0.3', '127.0.0.1']
+
+
+@pytest.mark.trio
+async def test_socks5_proxy_socket_options():
+    proxy = Proxy.from_url(SOCKS5_IPV4_URL)
+    stream = await proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4)
+    sock = stream.trio_stream.socket
+    assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+    assert not sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+    await stream.close()
+
+    proxy = Proxy.from_url(
+        SOCKS5_IPV4_URL,
+        socket_options=[*DEFAULT_SOCKET_OPTIONS, *keepalive_options(idle=30, count=3)],
+    )
+    stream = await proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4)
+    sock = stream.trio_stream.socket
+    assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+    await stream.close()
+
+
+@pytest.mark.trio
+async def test_socks5_proxy_happy_eyeballs(blackhole_server):
+    proxy = Proxy.from_url(
+        SOCKS5_IPV4_HOSTNAME_URL,
+        resolver=AsyncBlackholeResolver(),
+        happy_eyeballs_delay=0.1,
+    )
+    status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4, timeout=5)
+    assert status_code == 200
+
+
 @pytest.mark.trio
 async def test_socks5_proxy_with_invalid_credentials():
     proxy = Proxy.create(
@@ -214,6 +362,22 @@ async def test_secure_proxy(url, target_ssl_context, proxy_ssl_context):
     assert status_code == 200
 
 
+@pytest.mark.trio
+async def test_secure_proxy_session_resumption(proxy_ssl_context):
+    getaddrinfo = getaddrinfo_async_mock(trio.socket.getaddrinfo)
+    proxy = Proxy.from_url(HTTPS_PROXY_URL, proxy_ssl=proxy_ssl_context)
+    reused = []
+    with patch('trio._highlevel_open_tcp_stream.getaddrinfo', new=getaddrinfo):
+        for _ in range(2):
+            stream = await proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4)
+            reused.append(stream.trio_stream.session_reused)
+            await stream.close()
+    assert reused == [False, True]
+    # only the session is kept, not the connection
+    session = proxy._tls_sessions.get(proxy_ssl_context, proxy._proxy_host)
+    assert isinstance(session, ssl.SSLSession)
+
+
 @pytest.mark.parametrize('url', (TEST_URL_IPV4, TEST_URL_IPV4_HTTPS))
 @pytest.mark.trio
 async def test_proxy_chain(url, target_ssl_context):
@@ -230,3 +394,163 @@ async def test_proxy_chain(url, target_ssl_context):
         ssl_context=target_ssl_context,
     )
     assert status_code == 200
+
+
+@pytest.mark.trio
+async def test_proxy_chain_shared_proxy():
+    socks5 = Proxy.from_url(SOCKS5_IPV4_URL)
+    chains = [
+        ProxyChain([socks5, Proxy.from_url(SOCKS4_URL)]),
+        ProxyChain([Proxy.from_url(HTTP_PROXY_URL), socks5]),
+    ]
+    status_codes = []
+
+    async def request(chain):
+        status_codes.append(await make_request(proxy=chain, url=TEST_URL_IPV4))  # type: ignore
+
+    async with trio.open_nursery() as nursery:
+        for chain in chains * 4:
+            nursery.start_soon(request, chain)
+
+    assert status_codes == [200] * 8
+    assert socks5._forward is None
+
+
+@pytest.mark.parametrize('url', (TEST_URL_IPV4, TEST_URL_IPV4_HTTPS))
+@pytest.mark.trio
+async def test_pooled_proxy_chain(url, target_ssl_context):
+    proxies = [Proxy.from_url(HTTP_PROXY_URL), Proxy.from_url(SOCKS5_IPV4_URL)]
+    status_codes = []
+
+    async def request(chain):
+        status_code = await make_request(
+            proxy=chain,  # type: ignore
+            url=url,
+            ssl_context=target_ssl_context,
+        )
+        status_codes.append(status_code)
+
+    async with PooledProxyChain(proxies, size=2) as chain:
+        for _ in range(50):
+            if chain.size == 2:
+                break
+            await trio.sleep(0.01)
+        assert chain.size == 2
+
+        async with trio.open_nursery() as nursery:
+            for _ in range(4):
+                nursery.start_soon(request, chain)
+
+    assert status_codes == [200] * 4
+
+
+def create_traced_chain(idle_timeout=60):
+    events = []
+    trace_config = TraceConfig()
+    trace_config.on_phase_end.append(events.append)
+    proxies = [
+        Proxy.from_url(HTTP_PROXY_URL, trace_config=trace_config),
+        Proxy.from_url(SOCKS5_IPV4_URL),
+    ]
+    chain = PooledProxyChain(proxies, size=2, idle_timeout=idle_timeout)
+
+    def connects():
+        return sum(e.phase == TracePhase.CONNECT for e in events)
+
+    return chain, connects
+
+
+async def wait_for_tunnels(chain, size=2):
+    for _ in range(50):
+        if chain.size == size:
+            break
+        await trio.sleep(0.01)
+    assert chain.size == size
+
+
+@pytest.mark.trio
+async def test_pooled_proxy_chain_takes_parked_tunnels():
+    chain, connects = create_traced_chain()
+    async with chain:
+        await wait_for_tunnels(chain)
+        assert connects() == 2
+
+        # without refills what connect() takes out of the pool shows
+        with patch.object(chain, '_refill'):
+            for size in (1, 0):
+                assert await make_request(proxy=chain, url=TEST_URL_IPV4) == 200  # type: ignore
+                assert chain.size == size
+            assert connects() == 2
+
+            # an empty pool opens a tunnel for the caller
+            assert await make_request(proxy=chain, url=TEST_URL_IPV4) == 200  # type: ignore
+            assert connects() == 3
+
+        assert await make_request(proxy=chain, url=TEST_URL_IPV4) == 200  # type: ignore
+        await wait_for_tunnels(chain)
+        assert connects() == 6
+
+
+@pytest.mark.trio
+async def test_pooled_proxy_chain_idle_timeout():
+    chain, connects = create_traced_chain(idle_timeout=0.1)
+    async with chain:
+        await wait_for_tunnels(chain)
+        parked = list(chain._tunnels)
+        await trio.sleep(0.2)
+
+        with patch.object(chain, '_refill'):
+            assert await make_request(proxy=chain, url=TEST_URL_IPV4) == 200  # type: ignore
+            assert chain.size == 0
+            assert connects() == 3
+        assert all(t.stream._stream.socket.fileno() == -1 for t in parked)
+
+
+@pytest.mark.trio
+async def test_pooled_proxy_chain_retries_dropped_tunnel():
+    chain, connects = create_traced_chain()
+    async with chain:
+        await wait_for_tunnels(chain)
+
+        with patch.object(chain, '_refill'):
+            # the most recently parked tunnel is taken first
+            chain._tunnels[-1].stream._stream.socket.shutdown(socket.SHUT_RDWR)
+            assert await make_request(proxy=chain, url=TEST_URL_IPV4) == 200  # type: ignore
+            assert chain.size == 0
+            assert connects() == 2
+
+
+@pytest.mark.trio
+async def test_hedged_proxy(blackhole_server):
+    proxies = [
+        Proxy.from_url(f'socks5://{BLACKHOLE_HOST_IPV4}:{SOCKS5_PROXY_PORT}'),
+        Proxy.from_url(SOCKS5_IPV4_URL),
+    ]
+    proxy = HedgedProxy(proxies, hedge_delay=0.1)
+    status_code = await make_request(proxy=proxy, url=TEST_URL_IPV4, timeout=5)  # type: ignore
+    assert status_code == 200
+
+
+@pytest.mark.trio
+async def test_hedged_proxy_delay_with_slow_proxy(blackhole_server):
+    proxies = [
+        Proxy.from_url(f'socks5://{BLACKHOLE_HOST_IPV4}:{SOCKS5_PROXY_PORT}'),
+        Proxy.from_url(SOCKS5_IPV4_URL),
+    ]
+    proxy = HedgedProxy(proxies)
+    with patch('python_socks._hedging.DEFAULT_HEDGE_DELAY', 0.05):
+        for _ in range(MIN_SAMPLES):
+            stream = await proxy.connect(TEST_HOST_IPV4, TEST_PORT_IPV4, timeout=5)
+            await stream.close()
+
+    # the attempts given up on the blackhole count as well, the delay
+    # would otherwise come down to what the other proxy takes
+    assert proxy._hedging.delay() >= 0.05
+
+
+@pytest.mark.trio
+async def test_hedged_proxy_with_invalid_credentials():
+    url = f'socks5://{LOGIN}:{PASSWORD}aaa@{PROXY_HOST_IPV4}:{SOCKS5_PROXY_PORT}'
+    proxy = HedgedProxy([Proxy.from_url(url), Proxy.from_url(url)])
+    with pytest.raises(ProxyError):
+        await make_request(proxy=proxy, url=TEST_URL_IPV4)  # type: ignore
@@ -5,10 +5,14 @@ import pytest
 from yarl import URL
 
 from python_socks import ProxyType, ProxyError, ProxyTimeoutError, ProxyConnectionError
+from python_socks import TraceConfig, TracePhase
 from python_socks.sync import Proxy
 from python_socks.sync import ProxyChain
+from python_socks.sync import CachingResolver
+from python_socks.sync import ConnectTarget, connect_many
 from python_socks.sync._proxy import SyncProxy  # noqa
 from python_socks.sync._resolver import SyncResolver  # noqa
+from python_socks.sync._connect_many import _Batch  # noqa
 from tests.config import (
     PROXY_HOST_IPV4,
     SOCKS5_PROXY_PORT,
@@ -19,14 +23,21 @@ from tests.config import (
     SOCKS5_IPV4_URL_WO_AUTH,
     SOCKS5_IPV6_URL,
     SOCKS4_URL,
+    SOCKS4_PROXY_PORT,
+    PROXY_HOST_NAME_IPV4,
     HTTP_PROXY_URL,
     HTTP_PROXY_PORT,
     TEST_URL_IPV4,
     TEST_URL_IPv6,
     SOCKS5_IPV4_HOSTNAME_URL,
     TEST_URL_IPV4_HTTPS,
+    TEST_HOST_IPV4,
+    TEST_HOST_NAME_IPV4,
+    TEST_PORT_IPV4,
+    BLACKHOLE_HOST_IPV4,
 )
-from tests.mocks import getaddrinfo_sync_mock
+from tests.mocks import enable_fast_open_without_cookie
+from tests.mocks import getaddrinfo_sync_mock, SyncBlackholeResolver, WindowsSocket
 
 
 def read_status_code(sock: socket.socket) -> int:
@@ -100,6 +111,125 @@ def test_socks5_proxy_ipv4_with_auth_none(rdns):
     assert status_code == 200
 
 
+@pytest.mark.parametrize('proxy_url', (SOCKS5_IPV4_URL, SOCKS5_IPV4_URL_WO_AUTH))
+@pytest.mark.parametrize('rdns', (True, False))
+def test_socks5_proxy_pipeline(proxy_url, rdns):
+    proxy = Proxy.from_url(proxy_url, rdns=rdns, pipeline=True)
+    status_code = make_request(proxy=proxy, url=TEST_URL_IPV4)
+    assert status_code == 200
+
+
+def test_socks5_proxy_with_caching_resolver():
+    resolver = CachingResolver()
+    proxy = Proxy.from_url(SOCKS5_IPV4_HOSTNAME_URL, rdns=False, resolver=resolver)
+    for _ in range(2):
+        status_code = make_request(proxy=proxy, url=TEST_URL_IPV4)
+        assert status_code == 200
+
+
+def test_socks5_proxy_trace():
+    events = []
+    trace_config = TraceConfig()
+    trace_config.on_phase_end.append(events.append)
+    proxy = Proxy.from_url(SOCKS5_IPV4_URL, rdns=False, trace_config=trace_config)
+    status_code = make_request(proxy=proxy, url=TEST_URL_IPV4)
+    assert status_code == 200
+    assert [e.phase for e in events] == [
+        TracePhase.CONNECT,
+        TracePhase.AUTH,
+        TracePhase.RESOLVE,
+        TracePhase.REQUEST,
+    ]
+    assert all(e.error is None and e.duration >= 0 for e in events)
+
+
+def test_connect_many():
+    invalid_url = f'socks5://{LOGIN}:{PASSWORD}aaa@{PROXY_HOST_IPV4}:{SOCKS5_PROXY_PORT}'
+    pipelined = Proxy.from_url(SOCKS5_IPV4_URL, pipeline=True)
+    targets = [
+        *[ConnectTarget(SOCKS5_IPV4_URL, TEST_HOST_IPV4, TEST_PORT_IPV4)] * 4,
+        *[(SOCKS4_URL, TEST_HOST_IPV4, TEST_PORT_IPV4)] * 2,
+        *[(HTTP_PROXY_URL, TEST_HOST_IPV4, TEST_PORT_IPV4)] * 2,
+        *[(pipelined, TEST_HOST_IPV4, TEST_PORT_IPV4)] * 2,
+        *[ConnectTarget(invalid_url, TEST_HOST_IPV4, TEST_PORT_IPV4)] * 2,
+        ('not a target',),
+    ]
+    request = f'GET /ip HTTP/1.1\r\nHost: {TEST_HOST_IPV4}\r\nConnection: close\r\n\r\n'
+
+    results = []
+    for target, result in connect_many(targets, concurrency=3, per_proxy_concurrency=1):
+        results.append((target, result))
+        if not isinstance(result, Exception):
+            assert result.gettimeout() is None
+            result.sendall(request.encode('ascii'))
+            assert read_status_code(result) == 200
+            result.close()
+
+    assert sorted(map(repr, (t for t, _ in results))) == sorted(map(repr, targets))
+    errors = [t for t, r in results if isinstance(r, Exception)]
+    assert len(errors) == 3
+    assert all(isinstance(r, ProxyError) for t, r in results if t[0] == invalid_url)
+
+
+def test_connect_many_timeout(blackhole_server):
+    url = f'socks5://{BLACKHOLE_HOST_IPV4}:{SOCKS5_PROXY_PORT}'
+    results = list(connect_many([(url, TEST_HOST_IPV4, TEST_PORT_IPV4)], timeout=0.1))
+    assert len(results) == 1
+    assert isinstance(results[0][1], ProxyTimeoutError)
+
+
+def test_connect_many_resolves_out_of_handshakes():
+    # a slow lookup must not hold up the handshakes in progress, on Windows either
+    lookups = []
+    handshaking = []
+    process = _Batch._process
+
+    def tracked_process(self, hs):
+        handshaking.append(hs)
+        try:
+            return process(self, hs)
+        finally:
+            handshaking.pop()
+
+    class Resolver:
+        def resolve(self, host, port=0, family=socket.AF_UNSPEC):
+            lookups.append((host, bool(handshaking)))
+            return socket.AF_INET, TEST_HOST_IPV4
+
+    url = f'socks4://{LOGIN}:{PASSWORD}@{PROXY_HOST_NAME_IPV4}:{SOCKS4_PROXY_PORT}'
+    targets = [(url, TEST_HOST_NAME_IPV4, TEST_PORT_IPV4)] * 3
+    with mock.patch.object(_Batch, '_process', tracked_process):
+        with mock.patch('socket.socket', WindowsSocket):
+            results = list(connect_many(targets, concurrency=2, resolver=Resolver()))
+
+    assert not [r for _, r in results if isinstance(r, Exception)]
+    for _, sock in results:
+        sock.close()
+    assert len(lookups) == 6
+    assert not any(in_handshake for _, in_handshake in lookups)
+
+
+def test_socks5_proxy_happy_eyeballs(blackhole_server):
+    proxy = Proxy.from_url(
+        SOCKS5_IPV4_HOSTNAME_URL,
+        resolver=SyncBlackholeResolver(),
+        happy_eyeballs_delay=0.1,
+    )
+    status_code = make_request(proxy=proxy, url=TEST_URL_IPV4, timeout=5)
+    assert status_code == 200
+
+
+def test_socks5_proxy_happy_eyeballs_on_windows(blackhole_server):
+    proxy = Proxy.from_url(
+        SOCKS5_IPV4_HOSTNAME_URL,
+        resolver=SyncBlackholeResolver(),
+        happy_eyeballs_delay=0.1,
+    )
+    with mock.patch('socket.socket', WindowsSocket):
+        status_code = make_request(proxy=proxy, url=TEST_URL_IPV4, timeout=5)
+    assert status_code == 200
+
+
 def test_socks5_proxy_with_invalid_credentials():
     proxy = Proxy.create(
         proxy_type=ProxyType.SOCKS5,
@@ -136,6 +266,17 @@ def test_socks5_proxy_with_invalid_proxy_port(unused_tcp_port):
         make_request(proxy=proxy, url=TEST_URL_IPV4)
 
 
+def test_http_proxy_fast_open_with_invalid_proxy_port(unused_tcp_port):
+    proxy = Proxy.from_url(f'http://{PROXY_HOST_IPV4}:{unused_tcp_port}', fast_open=True)
+    # connect() returns at once, that nothing listens shows on the first receive
+    with mock.patch(
+        'python_socks.sync._connect.enable_fast_open',
+        new=enable_fast_open_without_cookie,
+    ):
+        with pytest.raises(ProxyConnectionError):
+            make_request(proxy=proxy, url=TEST_URL_IPV4)
+
+
 @pytest.mark.skipif(SKIP_IPV6_TESTS, reason="TravisCI doesn't support ipv6")
 def test_socks5_proxy_ipv6():
     proxy = Proxy.from_url(SOCKS5_IPV6_URL)
@@ -1,4 +1,7 @@
 import socket
+import ssl
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 from unittest import mock
 
@@ -6,9 +9,16 @@ import pytest
 from yarl import URL
 
 from python_socks import ProxyType, ProxyError, ProxyTimeoutError, ProxyConnectionError
+from python_socks import TraceConfig, TracePhase, PhaseTimeouts, SourceAddressPool
+from python_socks import DEFAULT_SOCKET_OPTIONS, keepalive_options, KTLSState
+from python_socks._ktls import KTLS_AVAILABLE
+from python_socks._socket_options import TCP_FASTOPEN_CONNECT
+from python_socks._hedging import MIN_SAMPLES
 from python_socks.sync._resolver import SyncResolver
 from python_socks.sync.v2 import Proxy
-from python_socks.sync.v2 import ProxyChain
+from python_socks.sync.v2 import ProxyChain, PooledProxyChain, HedgedProxy
+from python_socks.sync import ProxyPool
+from python_socks.sync.v2 import CachingResolver
 from python_socks.sync.v2._proxy import SyncProxy
 from tests.config import (
     PROXY_HOST_IPV4,
@@ -27,8 +37,15 @@ from tests.config import (
     SOCKS5_IPV4_HOSTNAME_URL,
     TEST_URL_IPV4_HTTPS,
     HTTPS_PROXY_URL,
+    BLACKHOLE_HOST_IPV4,
+    TEST_HOST_IPV4,
+    TEST_HOST_NAME_IPV4,
+    TEST_PORT_IPV4,
+    TEST_PORT_IPV4_HTTPS,
 )
-from tests.mocks import getaddrinfo_sync_mock
+from tests.utils import fast_open_enabled, sent_syn_data
+from tests.mocks import enable_fast_open_without_cookie
+from tests.mocks import getaddrinfo_sync_mock, SyncBlackholeResolver, SyncSlowResolver
 
 
 def read_status_code(sock: socket.socket) -> int:
@@ -119,6 +136,154 @@ def test_socks5_proxy_ipv4_with_auth_none(rdns):
     assert status_code == 200
 
 
+@pytest.mark.parametrize('proxy_url', (SOCKS5_IPV4_URL, SOCKS5_IPV4_URL_WO_AUTH))
+@pytest.mark.parametrize('rdns', (True, False))
+def test_socks5_proxy_pipeline(proxy_url, rdns):
+    proxy = Proxy.from_url(proxy_url, rdns=rdns, pipeline=True)
+    status_code = make_request(proxy=proxy, url=TEST_URL_IPV4)
+    assert status_code == 200
+
+
+def test_socks5_proxy_with_caching_resolver():
+    resolver = CachingResolver()
+    proxy = Proxy.from_url(SOCKS5_IPV4_HOSTNAME_URL, rdns=False, resolver=resolver)
+    for _ in range(2):
+        status_code = make_request(proxy=proxy, url=TEST_URL_IPV4)
+        assert status_code == 200
+
+
+def test_secure_proxy_trace(target_ssl_context, proxy_ssl_context):
+    events = []
+    trace_config = TraceConfig()
+    trace_config.on_phase_end.append(events.append)
+    proxy = Proxy.from_url(
+        HTTPS_PROXY_URL,
+        proxy_ssl=proxy_ssl_context,
+        trace_config=trace_config,
+    )
+    status_code = make_request(
+        proxy=proxy,
+        url=TEST_URL_IPV4_HTTPS,
+        ssl_context=target_ssl_context,
+    )
+    assert status_code == 200
+    assert [e.phase for e in events] == [
+        TracePhase.CONNECT,
+        TracePhase.PROXY_TLS,
+        TracePhase.REQUEST,
+        TracePhase.DEST_TLS,
+    ]
+    assert all(e.error is None and e.duration >= 0 for e in events)
+
+
+def test_socks5_proxy_phase_timeouts(blackhole_server):
+    proxy = Proxy.from_url(
+        f'socks5://{BLACKHOLE_HOST_IPV4}:{SOCKS5_PROXY_PORT}',
+        phase_timeouts=PhaseTimeouts(connect=0.1),
+    )
+    with pytest.raises(ProxyTimeoutError):
+        proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4, timeout=30)
+
+
+def test_proxy_chain_single_deadline(blackhole_server):
+    # the first hop takes a while to resolve the second one, which never answers:
+    # the chain times out once the caller's timeout is spent, not per hop
+    proxy = ProxyChain(
+        [
+            Proxy.from_url(SOCKS5_IPV4_URL, rdns=False, resolver=SyncSlowResolver(0.5)),
+            Proxy.from_url(f'socks5://blackhole.example.com:{SOCKS5_PROXY_PORT}'),
+        ]
+    )
+    start = time.monotonic()
+    with pytest.raises(ProxyTimeoutError):
+        proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4, timeout=0.8)
+    assert time.monotonic() - start < 1.2
+
+
+def test_socks5_proxy_source_address_pool():
+    proxy = Proxy.from_url(SOCKS5_IPV4_URL)
+    source_addresses = SourceAddressPool(['127.0.0.1', '127.0.0.3'])
+    hosts = []
+    for _ in range(3):
+        stream = proxy.connect(
+            dest_host=TEST_HOST_IPV4,
+            dest_port=TEST_PORT_IPV4,
+            local_addr=source_addresses,
+        )
+        hosts.append(stream.socket.getsockname()[0])
+        stream.close()
+    assert hosts == ['127.0.0.1', '127.0.0.3', '127.0.0.1']
+
+
+def test_socks5_proxy_socket_options():
+    proxy = Proxy.from_url(SOCKS5_IPV4_URL)
+    stream = proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4)
+    sock = stream.socket
+    assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+    assert not sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+    stream.close()
+
+    proxy = Proxy.from_url(
+        SOCKS5_IPV4_URL,
+        socket_options=[*DEFAULT_SOCKET_OPTIONS, *keepalive_options(idle=30, count=3)],
+    )
+    stream = proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4)
+    sock = stream.socket
+    assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+    stream.close()
+
+
+def test_socks5_proxy_ktls(target_ssl_ca):
+    # a context of its own, as OP_ENABLE_KTLS stays set on it
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    target_ssl_ca.configure_trust(ssl_context)
+    proxy = Proxy.from_url(SOCKS5_IPV4_URL)
+    stream = proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4_HTTPS)
+    stream = stream.start_tls(TEST_HOST_NAME_IPV4, ssl_context, ktls=True)
+    # whether the kernel took the records over depends on the platform
+    assert isinstance(stream.ktls, KTLSState)
+    if not KTLS_AVAILABLE:
+        assert not stream.ktls.offloaded
+
+    request = 'GET /ip HTTP/1.1\r\nHost: {}\r\nConnection: close\r\n\r\n'
+    stream.write_all(request.format(TEST_HOST_NAME_IPV4).encode('ascii'))
+    response = stream.read(1024)
+    assert response.startswith(b'HTTP/1.1 200')
+    stream.close()
+
+
+def test_http_proxy_fast_open(fast_open_proxy):
+    proxy = Proxy.from_url(fast_open_proxy, fast_open=True)
+    # the first connection gets a cookie from the proxy, the next ones send data in the SYN
+    for _ in range(2):
+        stream = proxy.connect(dest_host=TEST_HOST_IPV4, dest_port=TEST_PORT_IPV4)
+        sock = stream.socket
+        assert sock.getsockopt(socket.IPPROTO_TCP, TCP_FASTOPEN_CONNECT) == 1
+        syn_data = sent_syn_data(sock)
+        stream.close()
+    assert syn_data == fast_open_enabled()
+
+
+def test_secure_proxy_fast_open(proxy_ssl_context):
+    proxy = Proxy.from_url(HTTPS_PROXY_URL, proxy_ssl=proxy_ssl_context, fast_open=True)
+    # the ClientHello goes in the SYN, on a socket connect() has returned at once for
+    with mock.patch(
+        'python_socks.sync._connect.enable_fast_open',
+        new=enable_fast_open_without_cookie,
+    ):
+        assert make_request(proxy=proxy, url=TEST_URL_IPV4) == 200
+
+
+def test_socks5_proxy_happy_eyeballs(blackhole_server):
+    proxy = Proxy.from_url(
+        SOCKS5_IPV4_HOSTNAME_URL,
+        resolver=SyncBlackholeResolver(),
+        happy_eyeballs_delay=0.1,
+    )
+    status_code = make_request(proxy=proxy, url=TEST_URL_IPV4, timeout=5)
+    assert status_code == 200
+
+
 def test_socks5_proxy_with_invalid_credentials():
     proxy = Proxy.create(
         proxy_type=ProxyType.SOCKS5,
@@ -155,6 +320,24 @@ def test_socks5_proxy_with_invalid_proxy_port(unused_tcp_port):
         make_request(proxy=proxy, url=TEST_URL_IPV4)
 
 
+@pytest.mark.parametrize('secure', (False, True))
+def test_http_proxy_fast_open_with_invalid_proxy_port(
+    unused_tcp_port, secure, proxy_ssl_context
+):
+    proxy = Proxy.from_url(
+        f'http://{PROXY_HOST_IPV4}:{unused_tcp_port}',
+        proxy_ssl=proxy_ssl_context if secure else None,
+        fast_open=True,
+    )
+    # connect() returns at once, that nothing listens shows on the first receive
+    with mock.patch(
+        'python_socks.sync._connect.enable_fast_open',
+        new=enable_fast_open_without_cookie,
+    ):
+        with pytest.raises(ProxyConnectionError):
+            make_request(proxy=proxy, url=TEST_URL_IPV4)
+
+
 @pytest.mark.skipif(SKIP_IPV6_TESTS, reason="TravisCI doesn't support ipv6")
 def test_socks5_proxy_ipv6():
     proxy = Proxy.from_url(SOCKS5_IPV6_URL)
@@ -206,6 +389,27 @@ def test_secure_proxy(url, target_ssl_context, proxy_ssl_context):
     assert status_code == 200
 
 
+def test_secure_proxy_session_resumption(target_ssl_context, proxy_ssl_context):
+    proxy = Proxy.from_url(HTTPS_PROXY_URL, proxy_ssl=proxy_ssl_context)
+    reused = []
+    for _ in range(2):
+        stream = proxy.connect(
+            dest_host=TEST_HOST_NAME_IPV4,
+            dest_port=TEST_PORT_IPV4_HTTPS,
+            dest_ssl=target_ssl_context,
+        )
+        # the session tickets of TLS 1.3 arrive with the first data received
+        stream.write_all(b'GET /ip HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n')
+        assert stream.read(1024).startswith(b'HTTP/1.1 200')
+        reused.append((stream.socket.socket.session_reused, stream.socket.session_reused))
+        stream.close()
+    assert reused == [(False, False), (True, True)]
+    # only the sessions are kept, not the connections
+    sessions = proxy._tls_sessions
+    assert isinstance(sessions.get(proxy_ssl_context, proxy._proxy_host), ssl.SSLSession)
+    assert isinstance(sessions.get(target_ssl_context, TEST_HOST_NAME_IPV4), ssl.SSLSession)
+
+
 def test_http_proxy_with_invalid_credentials():
     proxy = Proxy.create(
         proxy_type=ProxyType.HTTP,
@@ -233,3 +437,168 @@ def test_proxy_chain(url, target_ssl_context):
         ssl_context=target_ssl_context,
     )
     assert status_code == 200
+
+
+def test_proxy_chain_shared_proxy():
+    socks5 = Proxy.from_url(SOCKS5_IPV4_URL)
+    chains = [
+        ProxyChain([socks5, Proxy.from_url(SOCKS4_URL)]),
+        ProxyChain([Proxy.from_url(HTTP_PROXY_URL), socks5]),
+    ]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(make_request, proxy=chain, url=TEST_URL_IPV4)
+            for chain in chains * 4
+        ]
+        assert [f.result() for f in futures] == [200] * 8
+    assert socks5._forward is None
+
+
+@pytest.mark.parametrize('url', (TEST_URL_IPV4, TEST_URL_IPV4_HTTPS))
+def test_pooled_proxy_chain(url, target_ssl_context):
+    proxies = [Proxy.from_url(HTTP_PROXY_URL), Proxy.from_url(SOCKS5_IPV4_URL)]
+    with PooledProxyChain(proxies, size=2) as chain:
+        for _ in range(50):
+            if chain.size == 2:
+                break
+            time.sleep(0.01)
+        assert chain.size == 2
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(
+                    make_request,
+                    proxy=chain,
+                    url=url,
+                    ssl_context=target_ssl_context,
+                )
+                for _ in range(4)
+            ]
+            assert [f.result() for f in futures] == [200] * 4
+
+
+def create_traced_chain(idle_timeout=60):
+    events = []
+    trace_config = TraceConfig()
+    trace_config.on_phase_end.append(events.append)
+    proxies = [
+        Proxy.from_url(HTTP_PROXY_URL, trace_config=trace_config),
+        Proxy.from_url(SOCKS5_IPV4_URL),
+    ]
+    chain = PooledProxyChain(proxies, size=2, idle_timeout=idle_timeout)
+
+    def connects():
+        return sum(e.phase == TracePhase.CONNECT for e in events)
+
+    return chain, connects
+
+
+def wait_for_tunnels(chain, size=2):
+    for _ in range(50):
+        if chain.size == size:
+            break
+        time.sleep(0.01)
+    assert chain.size == size
+
+
+def test_pooled_proxy_chain_takes_parked_tunnels():
+    chain, connects = create_traced_chain()
+    with chain:
+        wait_for_tunnels(chain)
+        assert connects() == 2
+
+        # without refills what connect() takes out of the pool shows
+        with mock.patch.object(chain, '_refill'):
+            for size in (1, 0):
+                assert make_request(proxy=chain, url=TEST_URL_IPV4) == 200
+                assert chain.size == size
+            assert connects() == 2
+
+            # an empty pool opens a tunnel for the caller
+            assert make_request(proxy=chain, url=TEST_URL_IPV4) == 200
+            assert connects() == 3
+
+        assert make_request(proxy=chain, url=TEST_URL_IPV4) == 200
+        wait_for_tunnels(chain)
+        assert connects() == 6
+
+
+def test_pooled_proxy_chain_idle_timeout():
+    chain, connects = create_traced_chain(idle_timeout=0.1)
+    with chain:
+        wait_for_tunnels(chain)
+        parked = list(chain._tunnels)
+        time.sleep(0.2)
+
+        with mock.patch.object(chain, '_refill'):
+            assert make_request(proxy=chain, url=TEST_URL_IPV4) == 200
+            assert chain.size == 0
+            assert connects() == 3
+        assert all(t.stream.socket.fileno() == -1 for t in parked)
+
+
+def test_pooled_proxy_chain_retries_dropped_tunnel():
+    chain, connects = create_traced_chain()
+    with chain:
+        wait_for_tunnels(chain)
+
+        with mock.patch.object(chain, '_refill'):
+            # the most recently parked tunnel is taken first
+            chain._tunnels[-1].stream.socket.shutdown(socket.SHUT_RDWR)
+            assert make_request(proxy=chain, url=TEST_URL_IPV4) == 200
+            assert chain.size == 0
+            assert connects() == 2
+
+
+def test_hedged_proxy(blackhole_server):
+    proxies = [
+        Proxy.from_url(f'socks5://{BLACKHOLE_HOST_IPV4}:{SOCKS5_PROXY_PORT}'),
+        Proxy.from_url(SOCKS5_IPV4_URL),
+    ]
+    proxy = HedgedProxy(proxies, hedge_delay=0.1)
+    status_code = make_request(proxy=proxy, url=TEST_URL_IPV4, timeout=5)  # type: ignore
+    assert status_code == 200
+
+
+def test_hedged_proxy_delay_with_slow_proxy(blackhole_server):
+    proxies = [
+        Proxy.from_url(f'socks5://{BLACKHOLE_HOST_IPV4}:{SOCKS5_PROXY_PORT}'),
+        Proxy.from_url(SOCKS5_IPV4_URL),
+    ]
+    proxy = HedgedProxy(proxies)
+    with mock.patch('python_socks._hedging.DEFAULT_HEDGE_DELAY', 0.05):
+        for _ in range(MIN_SAMPLES):
+            stream = proxy.connect(TEST_HOST_IPV4, TEST_PORT_IPV4, timeout=5)
+            stream.close()
+
+    # the attempts given up on the blackhole count as well, the delay
+    # would otherwise come down to what the other proxy takes
+    assert proxy._hedging.delay() >= 0.05
+
+
+def test_hedged_proxy_with_invalid_credentials():
+    url = f'socks5://{LOGIN}:{PASSWORD}aaa@{PROXY_HOST_IPV4}:{SOCKS5_PROXY_PORT}'
+    proxy = HedgedProxy([Proxy.from_url(url), Proxy.from_url(url)])
+    with pytest.raises(ProxyError):
+        make_request(proxy=proxy, url=TEST_URL_IPV4)  # type: ignore
+
+
+def test_proxy_pool(blackhole_server):
+    dead = Proxy.from_url(
+        f'socks5://{BLACKHOLE_HOST_IPV4}:{SOCKS5_PROXY_PORT}',
+        phase_timeouts=PhaseTimeouts(connect=0.1),
+    )
+    pool = ProxyPool([dead, Proxy.from_url(SOCKS5_IPV4_URL)], failure_threshold=1)
+    with pytest.raises(ProxyTimeoutError):
+        make_request(proxy=pool, url=TEST_URL_IPV4)  # type: ignore
+
+    for _ in range(3):
+        status_code = make_request(proxy=pool, url=TEST_URL_IPV4)  # type: ignore
+        assert status_code == 200
+
+    dead_stats, live_stats = pool.stats()
+    assert dead_stats.circuit_open
+    assert list(dead_stats.error_rates) == ['timeout']
+    assert live_stats.latency is not None
+    assert live_stats.error_rate == 0
+    assert live_stats.in_flight == 0
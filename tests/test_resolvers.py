@@ -1,10 +1,14 @@
+import asyncio
 import socket
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from python_socks.async_.asyncio._resolver import Resolver as AsyncioResolver
+from python_socks.async_.asyncio._resolver import CachingResolver as AsyncioCachingResolver
 from python_socks.sync._resolver import SyncResolver
+from python_socks.sync._resolver import CachingResolver as SyncCachingResolver
 
 RET_FAMILY = socket.AF_INET
 RET_HOST = '127.0.0.1'
@@ -97,3 +101,122 @@ def test_curio_resolver():
             assert host == RET_HOST
 
     curio.run(run)
+
+
+class CountingSyncResolver:
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+
+    def resolve(self, host, port=0, family=socket.AF_UNSPEC):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return RET_FAMILY, RET_HOST
+
+
+class CountingAsyncResolver:
+    def __init__(self):
+        self.calls = 0
+
+    async def resolve(self, host, port=0, family=socket.AF_UNSPEC):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return RET_FAMILY, RET_HOST
+
+
+def test_sync_caching_resolver():
+    inner = CountingSyncResolver()
+    resolver = SyncCachingResolver(resolver=inner)
+    for _ in range(3):
+        assert resolver.resolve(host=TEST_HOST_NAME) == (RET_FAMILY, RET_HOST)
+    assert inner.calls == 1
+
+    resolver.resolve(host=TEST_HOST_NAME, port=80)
+    assert inner.calls == 2
+
+
+def test_sync_caching_resolver_negative():
+    inner = CountingSyncResolver(error=OSError('Can`t resolve'))
+    resolver = SyncCachingResolver(resolver=inner)
+    for _ in range(2):
+        with pytest.raises(OSError):
+            resolver.resolve(host=TEST_HOST_NAME)
+    assert inner.calls == 1
+
+    resolver = SyncCachingResolver(resolver=inner, negative_ttl=0)
+    for _ in range(2):
+        with pytest.raises(OSError):
+            resolver.resolve(host=TEST_HOST_NAME)
+    assert inner.calls == 3
+
+
+def test_sync_caching_resolver_negative_errors_are_not_shared():
+    inner = CountingSyncResolver(error=socket.gaierror(socket.EAI_NONAME, 'Name unknown'))
+    resolver = SyncCachingResolver(resolver=inner)
+    errors = []
+    for _ in range(2):
+        with pytest.raises(socket.gaierror) as exc_info:
+            resolver.resolve(host=TEST_HOST_NAME)
+        errors.append(exc_info.value)
+    assert inner.calls == 1
+    assert errors[0] is not errors[1]
+    assert errors[1].args == (socket.EAI_NONAME, 'Name unknown')
+
+
+def test_sync_caching_resolver_lru():
+    inner = CountingSyncResolver()
+    resolver = SyncCachingResolver(resolver=inner, maxsize=1)
+    resolver.resolve(host='a.example.com')
+    resolver.resolve(host='b.example.com')
+    resolver.resolve(host='a.example.com')
+    assert inner.calls == 3
+
+
+def test_sync_caching_resolver_refreshes_stale_once():
+    deferred = []
+
+    class DeferredThread(threading.Thread):
+        def start(self):
+            deferred.append(self)
+
+    inner = CountingSyncResolver()
+    resolver = SyncCachingResolver(resolver=inner, ttl=0)
+    resolver.resolve(host=TEST_HOST_NAME)
+    # stale hits until the refresh gets to run
+    with patch('threading.Thread', DeferredThread):
+        for _ in range(10):
+            assert resolver.resolve(host=TEST_HOST_NAME) == (RET_FAMILY, RET_HOST)
+    assert len(deferred) == 1
+
+    threading.Thread.start(deferred[0])
+    deferred[0].join()
+    assert inner.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_asyncio_caching_resolver_coalesces_lookups():
+    inner = CountingAsyncResolver()
+    resolver = AsyncioCachingResolver(resolver=inner)
+    results = await asyncio.gather(*[resolver.resolve(host=TEST_HOST_NAME) for _ in range(10)])
+    assert results == [(RET_FAMILY, RET_HOST)] * 10
+    assert inner.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_asyncio_caching_resolver_serves_stale():
+    inner = CountingAsyncResolver()
+    resolver = AsyncioCachingResolver(resolver=inner, ttl=0)
+    assert await resolver.resolve(host=TEST_HOST_NAME) == (RET_FAMILY, RET_HOST)
+    # expired, but still within stale_ttl: served at once and refreshed in background
+    assert await resolver.resolve(host=TEST_HOST_NAME) == (RET_FAMILY, RET_HOST)
+    assert inner.calls == 1
+    await asyncio.sleep(0.05)
+    assert inner.calls == 2
+
+
+def test_asyncio_caching_resolver_created_outside_loop():
+    resolver = AsyncioCachingResolver()
+    for _ in range(2):
+        family, _ = asyncio.run(resolver.resolve(host='127.0.0.1'))
+        assert family == socket.AF_INET
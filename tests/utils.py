@@ -22,3 +22,19 @@ def wait_until_connectable(host, port, timeout=10):
         count += 1
         time.sleep(1)
     return True
+
+
+def fast_open_enabled():
+    """Whether the kernel lets both clients and servers use TCP Fast Open."""
+    try:
+        with open('/proc/sys/net/ipv4/tcp_fastopen') as f:
+            return int(f.read()) & 3 == 3
+    except OSError:  # pragma: no cover
+        return False
+
+
+def sent_syn_data(sock):
+    """Whether the connection of sock was opened with data in the SYN (Linux)."""
+    tcpi_opt_syn_data = 32
+    info = sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_INFO, 8)
+    return bool(info[5] & tcpi_opt_syn_data)